@@ -0,0 +1,4 @@
+-- bots.answer_cache_*：per-bot 語意回答快取（opt-in）。
+-- answer_cache_threshold = 首輪提問與已快取問題的 cosine 門檻。
+ALTER TABLE bots ADD COLUMN IF NOT EXISTS answer_cache_enabled BOOLEAN NOT NULL DEFAULT false;
+ALTER TABLE bots ADD COLUMN IF NOT EXISTS answer_cache_threshold DOUBLE PRECISION NOT NULL DEFAULT 0.95;
@@ -0,0 +1,4 @@
+-- chunk_categories.centroid：自動分類群中心（正規化 embedding 平均，JSON array）
+-- 新上傳的 chunk 以最近 centroid 增量指派，不必整個 KB 重新聚類。
+-- NULL = 手動建立或舊資料；全 KB 都沒有 centroid 時 classify_kb 退回完整聚類。
+ALTER TABLE chunk_categories ADD COLUMN IF NOT EXISTS centroid JSON;
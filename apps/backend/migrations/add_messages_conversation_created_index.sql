@@ -0,0 +1,13 @@
+-- 對話視窗載入（find_window / find_latest_window_by_visitor）
+--
+-- 每輪只查最後 K 則：
+--   WHERE conversation_id = ? ORDER BY created_at DESC LIMIT K
+-- 複合 index 讓 PG 直接從 index 尾端反向掃 K 筆，不再排序整段歷史。
+-- 原本的單欄 ix_messages_conversation_id 是它的 prefix，一併移除以減少寫入成本。
+--
+-- CONCURRENTLY 不能包在 transaction 內，請逐句執行。
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_messages_conversation_created
+    ON messages(conversation_id, created_at);
+
+DROP INDEX CONCURRENTLY IF EXISTS ix_messages_conversation_id;
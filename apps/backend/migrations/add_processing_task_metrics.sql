@@ -0,0 +1,4 @@
+-- processing_tasks.metrics：文件 ingestion pipeline 各 stage 的吞吐量
+-- （context / embed / upsert → batches、items、busy/blocked/wall ms、items_per_sec）。
+-- NULL = 舊資料或非 pipeline 路徑（split_pdf 等）。
+ALTER TABLE processing_tasks ADD COLUMN IF NOT EXISTS metrics JSON;
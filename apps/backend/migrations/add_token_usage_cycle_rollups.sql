@@ -0,0 +1,31 @@
+-- token_usage_cycle_rollups — per (tenant, cycle, category) 的 token 累計
+-- 動機：RecordUsageUseCase 每次 auto-topup 檢查都跑 ComputeTenantQuotaUseCase，
+--       對整個 billing cycle 的 token_usage_records 做兩次 SUM()；月底大租戶
+--       每個 LLM call 都是一次大 aggregate。
+-- 設計：SQLAlchemyUsageRepository.save 在同一個 transaction 內 UPSERT 遞增，
+--       quota 讀取只讀 rollup（O(categories)）。worker cron
+--       reconcile_usage_rollups 以 records 為準修正差異（records 仍是 truth）。
+-- 部署：先跑本 migration（含 backfill），部署新版後 reconcile 會補上
+--       migration 與部署之間舊版寫入的 records。
+
+CREATE TABLE IF NOT EXISTS token_usage_cycle_rollups (
+    tenant_id VARCHAR(36) NOT NULL,
+    cycle_year_month VARCHAR(7) NOT NULL,           -- "YYYY-MM"（UTC）
+    request_type VARCHAR(20) NOT NULL,
+    tokens BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (tenant_id, cycle_year_month, request_type)
+);
+
+INSERT INTO token_usage_cycle_rollups
+    (tenant_id, cycle_year_month, request_type, tokens, updated_at)
+SELECT
+    tenant_id,
+    to_char(created_at AT TIME ZONE 'UTC', 'YYYY-MM'),
+    request_type,
+    SUM(input_tokens + output_tokens + cache_read_tokens + cache_creation_tokens),
+    NOW()
+FROM token_usage_records
+GROUP BY 1, 2, 3
+ON CONFLICT (tenant_id, cycle_year_month, request_type)
+DO UPDATE SET tokens = EXCLUDED.tokens, updated_at = NOW();
@@ -0,0 +1,169 @@
+"""Hybrid retrieval benchmark：各 retrieval mode 組合的 recall@k / MRR / latency。
+
+讀一份 eval set（JSONL，每行 ``{"query": ..., "relevant_chunk_ids": [...]}``），
+對同一個 KB 依序用每組 modes（預設 ``raw`` / ``hybrid`` / ``raw+rewrite`` /
+``raw+rewrite+hybrid``）跑 ``QueryRAGUseCase.retrieve``，印出 recall@k、MRR、
+p50 / p95 latency，作為 bot 是否開 hybrid 的依據（SKU / 型號類 query 建議
+另做一份 eval set 單獨看）。
+
+用法：
+    cd apps/backend && uv run python -m scripts.bench_hybrid_retrieval \\
+        --kb-id xxx --tenant-id T001 --eval-set eval.jsonl --top-k 5 \\
+        --modes raw hybrid raw+rewrite raw+rewrite+hybrid
+
+需要可連線的 Milvus（MILVUS_URI / MILVUS_TOKEN / MILVUS_DB_NAME）與 embedding
+API（OPENAI_API_KEY / EMBEDDING_MODEL / EMBEDDING_BASE_URL，須與建 KB 時相同）；
+rewrite / hyde 走 LLM（環境變數的 provider key）。只讀不寫。BM25 索引第一次
+query 時建立，warm-up query 不算進 latency。
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(
+    0, os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+from src.application.rag.query_rag_use_case import (  # noqa: E402
+    QueryRAGCommand,
+    QueryRAGUseCase,
+)
+from src.domain.knowledge.entity import KnowledgeBase  # noqa: E402
+from src.domain.shared.exceptions import NoRelevantKnowledgeError  # noqa: E402
+from src.infrastructure.embedding.openai_embedding_service import (  # noqa: E402
+    OpenAIEmbeddingService,
+)
+from src.infrastructure.milvus.milvus_vector_store import (  # noqa: E402
+    MilvusVectorStore,
+)
+from src.infrastructure.rag.bm25_lexical_search import (  # noqa: E402
+    Bm25LexicalSearchService,
+)
+
+
+class _StaticKbRepo:
+    """retrieve 只用 find_by_id 確認 KB 存在；bench 不連 DB。"""
+
+    async def find_by_id(self, kb_id: str) -> KnowledgeBase:
+        return KnowledgeBase(name=kb_id)
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[idx]
+
+
+def _load_eval_set(path: str) -> list[dict]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+async def _bench(
+    use_case: QueryRAGUseCase,
+    modes: list[str],
+    eval_set: list[dict],
+    kb_id: str,
+    tenant_id: str,
+    top_k: int,
+) -> dict:
+    def _command(query: str) -> QueryRAGCommand:
+        return QueryRAGCommand(
+            tenant_id=tenant_id,
+            kb_id=kb_id,
+            query=query,
+            top_k=top_k,
+            retrieval_modes=modes,
+        )
+
+    # warm-up：BM25 索引 build / schema cache 不算進 latency
+    try:
+        await use_case.retrieve(_command(eval_set[0]["query"]))
+    except NoRelevantKnowledgeError:
+        pass
+
+    latencies: list[float] = []
+    hits = 0
+    reciprocal_ranks: list[float] = []
+    for case in eval_set:
+        relevant = set(case["relevant_chunk_ids"])
+        start = time.perf_counter()
+        try:
+            result = await use_case.retrieve(_command(case["query"]))
+            retrieved = [s.chunk_id for s in result.sources]
+        except NoRelevantKnowledgeError:
+            retrieved = []
+        latencies.append((time.perf_counter() - start) * 1000)
+        rank = next(
+            (i for i, cid in enumerate(retrieved, start=1) if cid in relevant),
+            None,
+        )
+        if rank is not None:
+            hits += 1
+        reciprocal_ranks.append(1.0 / rank if rank else 0.0)
+    return {
+        "modes": "+".join(modes),
+        f"recall@{top_k}": round(hits / len(eval_set), 4),
+        "mrr": round(statistics.fmean(reciprocal_ranks), 4),
+        "p50_ms": round(statistics.median(latencies), 1),
+        "p95_ms": round(_percentile(latencies, 95), 1),
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--kb-id", required=True)
+    parser.add_argument("--tenant-id", required=True)
+    parser.add_argument("--eval-set", required=True)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        default=["raw", "hybrid", "raw+rewrite", "raw+rewrite+hybrid"],
+        help="每組以 + 連接，例如 raw+hybrid",
+    )
+    args = parser.parse_args()
+
+    eval_set = _load_eval_set(args.eval_set)
+    if not eval_set:
+        parser.error("eval set is empty")
+    store = MilvusVectorStore(
+        uri=os.environ.get("MILVUS_URI", "http://localhost:19530"),
+        token=os.environ.get("MILVUS_TOKEN", ""),
+        db_name=os.environ.get("MILVUS_DB_NAME", "default"),
+    )
+    embedding = OpenAIEmbeddingService(
+        api_key=os.environ["OPENAI_API_KEY"],
+        model=os.environ.get("EMBEDDING_MODEL", "text-embedding-3-large"),
+        base_url=os.environ.get("EMBEDDING_BASE_URL", "https://api.openai.com/v1"),
+    )
+    use_case = QueryRAGUseCase(
+        knowledge_base_repository=_StaticKbRepo(),
+        embedding_service=embedding,
+        vector_store=store,
+        llm_service=None,
+        lexical_search=Bm25LexicalSearchService(vector_store=store),
+    )
+
+    for combo in args.modes:
+        result = await _bench(
+            use_case,
+            combo.split("+"),
+            eval_set,
+            args.kb_id,
+            args.tenant_id,
+            args.top_k,
+        )
+        print(result)
+    await store.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,104 @@
+"""Milvus RPC backend benchmark：executor vs AsyncMilvusClient。
+
+對同一個 collection 同時發 N 個 search（預設 200），分別用
+``backend="executor"``（專屬 ThreadPoolExecutor）與 ``backend="async"``
+（AsyncMilvusClient）跑，印出 latency p50 / p95 / p99、總耗時與 executor
+queue 指標，作為設定 ``MILVUS_BACKEND`` / ``MILVUS_EXECUTOR_WORKERS`` 的依據。
+
+用法：
+    cd apps/backend && uv run python -m scripts.bench_milvus_backends \\
+        --collection kb_xxx --dim 3072 --concurrency 200
+
+需要可連線的 Milvus（讀 MILVUS_URI / MILVUS_TOKEN / MILVUS_DB_NAME），
+只讀不寫；query vector 為隨機向量，量的是 RPC 排程而非召回品質。
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(
+    0, os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+from src.infrastructure.milvus.milvus_vector_store import (  # noqa: E402
+    MilvusVectorStore,
+)
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[idx]
+
+
+async def _bench(
+    backend: str,
+    collection: str,
+    dim: int,
+    concurrency: int,
+    workers: int,
+    top_k: int,
+) -> dict:
+    store = MilvusVectorStore(
+        uri=os.environ.get("MILVUS_URI", "http://localhost:19530"),
+        token=os.environ.get("MILVUS_TOKEN", ""),
+        db_name=os.environ.get("MILVUS_DB_NAME", "default"),
+        backend=backend,
+        executor_workers=workers,
+    )
+    vectors = [[random.random() for _ in range(dim)] for _ in range(concurrency)]
+    # warm-up：schema cache / async channel 建立不算進 latency
+    await store.search(collection, vectors[0], limit=top_k)
+
+    latencies: list[float] = []
+
+    async def _one(vector: list[float]) -> None:
+        start = time.perf_counter()
+        await store.search(collection, vector, limit=top_k)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    wall_start = time.perf_counter()
+    await asyncio.gather(*(_one(v) for v in vectors))
+    wall_ms = (time.perf_counter() - wall_start) * 1000
+    stats = store.runtime_stats()
+    await store.aclose()
+    return {
+        "backend": backend,
+        "wall_ms": round(wall_ms, 1),
+        "p50_ms": round(statistics.median(latencies), 1),
+        "p95_ms": round(_percentile(latencies, 95), 1),
+        "p99_ms": round(_percentile(latencies, 99), 1),
+        "executor": stats["executor"],
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--collection", required=True)
+    parser.add_argument("--dim", type=int, default=3072)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--top-k", type=int, default=5)
+    args = parser.parse_args()
+
+    for backend in ("executor", "async"):
+        result = await _bench(
+            backend,
+            args.collection,
+            args.dim,
+            args.concurrency,
+            args.workers,
+            args.top_k,
+        )
+        print(result)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
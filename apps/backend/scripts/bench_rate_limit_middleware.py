@@ -0,0 +1,182 @@
+"""RateLimitMiddleware overhead benchmark：單次 Lua script vs 逐層 round trip。
+
+以固定速率（預設 2000 RPS）對 ``RateLimitMiddleware`` 直接送 ASGI request
+（下游 app 是 no-op，量到的就是 middleware 本身的延遲），分別跑：
+
+- ``atomic``   ：``RedisRateLimiter.check_layers`` — 所有層一次 script
+- ``per-layer``：``RateLimiterService.check_layers`` 預設實作 — 每層一次
+  round trip（近似舊版逐層 pipeline 的 round trip 數）
+
+設定 loader 走 in-process 快取（repo 為固定值），印出 p50 / p95 / p99、
+實際達到的 RPS 與 loader 命中率。限額設得很高，不會出現 429。
+
+用法：
+    cd apps/backend && uv run python -m scripts.bench_rate_limit_middleware \\
+        --rps 2000 --seconds 10 --tenants 50
+
+需要可連線的 Redis（讀 REDIS_URL，預設 redis://localhost:6379/0）；只寫
+``rl:gcra:bench-*`` key，TTL 一分鐘內自動過期。
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(
+    0, os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+import redis.asyncio as aioredis  # noqa: E402
+
+from src.domain.ratelimit.rate_limiter_service import (  # noqa: E402
+    RateLimiterService,
+)
+from src.infrastructure.auth.jwt_service import JWTService  # noqa: E402
+from src.infrastructure.ratelimit.config_loader import (  # noqa: E402
+    RateLimitConfigLoader,
+)
+from src.infrastructure.ratelimit.redis_rate_limiter import (  # noqa: E402
+    RedisRateLimiter,
+)
+from src.interfaces.api.rate_limit_middleware import (  # noqa: E402
+    RateLimitMiddleware,
+)
+
+_SECRET = "bench-secret"
+
+
+class _PerLayerLimiter(RedisRateLimiter):
+    """逐層呼叫單層 script：每層一次 round trip。"""
+
+    check_layers = RateLimiterService.check_layers
+
+
+class _StaticRepo:
+    async def find_by_tenant_and_group(self, tenant_id, group):
+        return SimpleNamespace(
+            requests_per_minute=10_000_000,
+            burst_size=10_000_000,
+            per_user_requests_per_minute=10_000_000,
+        )
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[idx]
+
+
+async def _noop_app(scope, receive, send) -> None:
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+def _scopes(tenants: int) -> list[dict]:
+    jwt = JWTService(
+        secret_key=_SECRET, algorithm="HS256", access_token_expire_minutes=60
+    )
+    scopes = []
+    for i in range(tenants):
+        token = jwt.create_user_token(f"bench-user-{i}", f"bench-{i}", "user")
+        scopes.append({
+            "type": "http",
+            "path": "/api/v1/rag/query",
+            "client": ("10.0.0.1", 1234),
+            "headers": [(b"authorization", f"Bearer {token}".encode())],
+        })
+    return scopes
+
+
+async def _bench(
+    name: str,
+    limiter: RedisRateLimiter,
+    rps: int,
+    seconds: float,
+    tenants: int,
+) -> dict:
+    loader = RateLimitConfigLoader(
+        rate_limit_config_repo_factory=_StaticRepo, cache_ttl=60
+    )
+    middleware = RateLimitMiddleware(
+        _noop_app,
+        rate_limiter=limiter,
+        config_loader=loader,
+        jwt_secret_key=_SECRET,
+        global_rpm=10_000_000,
+    )
+    scopes = _scopes(tenants)
+    latencies: list[float] = []
+    statuses: dict[int, int] = {}
+
+    async def _receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def _one(scope: dict) -> None:
+        async def _send(message):
+            if message["type"] == "http.response.start":
+                statuses[message["status"]] = statuses.get(message["status"], 0) + 1
+
+        start = time.perf_counter()
+        await middleware(scope, _receive, _send)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    # warm-up：script 載入 + 每個 tenant 的設定進快取
+    await asyncio.gather(*(_one(s) for s in scopes))
+    latencies.clear()
+    statuses.clear()
+
+    total = int(rps * seconds)
+    interval = 1 / rps
+    tasks = []
+    wall_start = time.perf_counter()
+    for i in range(total):
+        # 以絕對時間排程，避免 sleep 誤差累積
+        delay = wall_start + i * interval - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(_one(scopes[i % tenants])))
+    await asyncio.gather(*tasks)
+    wall = time.perf_counter() - wall_start
+    return {
+        "mode": name,
+        "requests": total,
+        "achieved_rps": round(total / wall, 1),
+        "p50_ms": round(statistics.median(latencies), 3),
+        "p95_ms": round(_percentile(latencies, 95), 3),
+        "p99_ms": round(_percentile(latencies, 99), 3),
+        "statuses": statuses,
+        "config_cache": loader.stats(),
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rps", type=int, default=2000)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--tenants", type=int, default=50)
+    args = parser.parse_args()
+
+    redis = aioredis.from_url(
+        os.environ.get("REDIS_URL", "redis://localhost:6379/0"),
+        max_connections=256,
+    )
+    try:
+        for name, limiter in (
+            ("atomic", RedisRateLimiter(redis)),
+            ("per-layer", _PerLayerLimiter(redis)),
+        ):
+            print(
+                await _bench(name, limiter, args.rps, args.seconds, args.tenants)
+            )
+    finally:
+        await redis.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,150 @@
+"""BotRuntimeSnapshotCache — ``_load_bot_config`` 結果的 in-process 快取。
+
+每則訊息都要 resolve bot 設定：bot 查詢、每個 MCP registry binding 一次
+``find_by_id``（N+1）+ env AES 解密、tenant default model、SystemPromptConfig。
+這些結果在設定沒變之前完全一樣，所以整份 cfg 組好後存成不可變的
+``BotRuntimeSnapshot``，hot path 只剩一次 dict lookup。
+
+- key = (tenant_id, bot_id)；bot 不屬於該 tenant 時 build 會 raise，不會進快取
+- system prompt 存未注入動態變數的 template，``to_config`` 時才注入
+  {today}/{now}（否則日期會凍結在 build 當下）
+- 失效：``ConfigInvalidationBus`` 通知（bot → 該 bot；tenant → 該 tenant 的
+  bot；mcp_registry / system_prompt / "*" → 全清），另有 TTL 當保險
+- generation：build 期間若發生失效，build 出來的舊結果不放進快取
+- 解密後的 MCP env 只存在 process 記憶體，不寫進 Redis
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Mapping
+
+from src.application.agent.prompt_assembler import inject_runtime_vars
+from src.domain.shared.config_invalidation import (
+    ALL_KEYS,
+    SCOPE_BOT,
+    SCOPE_GUARD_RULES,
+    SCOPE_KNOWLEDGE_BASE,
+    SCOPE_RATE_LIMIT,
+    SCOPE_TENANT,
+    ConfigInvalidationBus,
+)
+
+SnapshotKey = tuple[str, str]
+
+
+@dataclass(frozen=True)
+class BotRuntimeSnapshot:
+    tenant_id: str
+    bot_id: str
+    version: int
+    config: Mapping[str, Any]
+    built_at: float = field(default_factory=time.monotonic)
+
+    def to_config(self) -> dict[str, Any]:
+        """回傳可修改的淺拷貝（caller 只替換 top-level key，不改巢狀值）。"""
+        cfg = dict(self.config)
+        if cfg.get("system_prompt"):
+            cfg["system_prompt"] = inject_runtime_vars(cfg["system_prompt"])
+        return cfg
+
+
+class BotRuntimeSnapshotCache:
+    def __init__(
+        self,
+        invalidation_bus: ConfigInvalidationBus | None = None,
+        ttl_seconds: float = 300.0,
+        max_entries: int = 2048,
+    ) -> None:
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        self._entries: OrderedDict[SnapshotKey, BotRuntimeSnapshot] = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.stale_builds = 0
+        self.invalidations = 0
+        if invalidation_bus is not None:
+            invalidation_bus.subscribe(self.invalidate)
+
+    @property
+    def generation(self) -> int:
+        """build 前先取；``put`` 時 generation 已變代表 build 期間有失效。"""
+        return self._generation
+
+    def get(self, tenant_id: str, bot_id: str) -> BotRuntimeSnapshot | None:
+        key = (tenant_id, bot_id)
+        with self._lock:
+            snapshot = self._entries.get(key)
+            if snapshot is not None and (
+                time.monotonic() - snapshot.built_at < self._ttl
+            ):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return snapshot
+            if snapshot is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(
+        self,
+        tenant_id: str,
+        bot_id: str,
+        config: dict[str, Any],
+        generation: int,
+    ) -> BotRuntimeSnapshot:
+        snapshot = BotRuntimeSnapshot(
+            tenant_id=tenant_id,
+            bot_id=bot_id,
+            version=generation,
+            config=MappingProxyType(dict(config)),
+        )
+        with self._lock:
+            if generation != self._generation:
+                self.stale_builds += 1
+                return snapshot
+            if self._max_entries <= 0 or self._ttl <= 0:
+                return snapshot
+            self._entries[(tenant_id, bot_id)] = snapshot
+            self._entries.move_to_end((tenant_id, bot_id))
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return snapshot
+
+    def invalidate(self, scope: str, key: str = ALL_KEYS) -> None:
+        if scope in (SCOPE_RATE_LIMIT, SCOPE_GUARD_RULES, SCOPE_KNOWLEDGE_BASE):
+            return  # 限流 / guard 規則 / 知識庫內容不在 snapshot 內
+        with self._lock:
+            self._generation += 1
+            self.invalidations += 1
+            if scope == SCOPE_BOT and key != ALL_KEYS:
+                stale = [k for k in self._entries if k[1] == key]
+            elif scope == SCOPE_TENANT and key != ALL_KEYS:
+                stale = [k for k in self._entries if k[0] == key]
+            else:
+                # mcp_registry / system_prompt 影響面無法便宜地反查 → 全清
+                self._entries.clear()
+                return
+            for k in stale:
+                del self._entries[k]
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self._max_entries,
+                "ttl_seconds": self._ttl,
+                "generation": self._generation,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "stale_builds": self.stale_builds,
+                "invalidations": self.invalidations,
+            }
@@ -30,6 +30,22 @@ def inject_runtime_vars(prompt: str) -> str:
     return prompt
 
 
+def assemble_template(
+    bot_prompt: str | None = None,
+    system_prompt: str = "",
+) -> str:
+    """組裝系統提示詞但保留動態變數 placeholder（供快取，使用時再注入）。"""
+    parts: list[str] = []
+
+    if system_prompt:
+        parts.append(system_prompt)
+
+    if bot_prompt and bot_prompt.strip():
+        parts.append(f"[自定義指令]\n{bot_prompt.strip()}")
+
+    return "\n\n".join(parts)
+
+
 def assemble(
     bot_prompt: str | None = None,
     system_prompt: str = "",
@@ -43,12 +59,6 @@ def assemble(
     Returns:
         組裝後的完整系統提示詞（已注入動態變數）
     """
-    parts: list[str] = []
-
-    if system_prompt:
-        parts.append(system_prompt)
-
-    if bot_prompt and bot_prompt.strip():
-        parts.append(f"[自定義指令]\n{bot_prompt.strip()}")
-
-    return inject_runtime_vars("\n\n".join(parts))
+    return inject_runtime_vars(
+        assemble_template(bot_prompt=bot_prompt, system_prompt=system_prompt)
+    )
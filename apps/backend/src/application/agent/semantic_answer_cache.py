@@ -0,0 +1,325 @@
+"""SemanticAnswerCache — per-bot 語意回答快取（opt-in）。
+
+客服流量大多是同幾百個問題換句話說；每次都跑完整 agent（RAG + LLM）很浪費。
+bot 開啟 ``answer_cache_enabled`` 後，首輪提問的 query embedding 與該 bot
+已快取的問題做 nearest-neighbour 比對，cosine ≥ bot 的
+``answer_cache_threshold`` 就直接回存下來的 answer + sources。
+
+- key = bot_id；每個 bot 一個 bucket，向量存成 normalized float32 矩陣，
+  lookup 是一次 matrix-vector 乘法（per bot 上限 ``max_entries_per_bot``，
+  LRU 淘汰）
+- 版本 = bot 設定 fingerprint + 本 process 的 bot / 各 KB generation；
+  版本不同的 bucket 整個作廢。generation 由 ``ConfigInvalidationBus`` 推進：
+  bot → 該 bot；knowledge_base → 掛該 KB 的 bot；tenant / system_prompt /
+  mcp_registry / "*" → 全清
+- caller 在跑 agent 之前先取 ``version``，``put`` 時版本已變（處理期間
+  KB 或設定被改）就不寫入，避免把舊內容的回答放進快取
+- 另有 TTL 當保險（worker 設定等沒走 bus 的變更）
+- 只存在 process 記憶體；多 replica 各自暖機
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Mapping
+
+import numpy as np
+
+from src.domain.shared.config_invalidation import (
+    ALL_KEYS,
+    SCOPE_BOT,
+    SCOPE_GUARD_RULES,
+    SCOPE_KNOWLEDGE_BASE,
+    SCOPE_RATE_LIMIT,
+    ConfigInvalidationBus,
+)
+
+# 會影響回答內容的 bot runtime 設定
+_FINGERPRINT_KEYS: tuple[str, ...] = (
+    "system_prompt",
+    "llm_params",
+    "kb_ids",
+    "enabled_tools",
+    "rag_top_k",
+    "rag_score_threshold",
+    "tool_rag_params",
+    "show_sources",
+    "customer_service_url",
+    "rerank_enabled",
+    "rerank_model",
+    "rerank_top_n",
+    "rag_retrieval_modes",
+    "query_rewrite_enabled",
+    "query_rewrite_model",
+    "query_rewrite_extra_hint",
+    "hyde_enabled",
+    "hyde_model",
+    "hyde_extra_hint",
+    "intent_routes",
+    "router_model",
+)
+
+
+def config_fingerprint(cfg: Mapping[str, Any]) -> str:
+    """bot runtime config 中影響回答的欄位 hash。
+
+    system_prompt 用注入前的 template。
+    """
+    payload = json.dumps(
+        {k: cfg.get(k) for k in _FINGERPRINT_KEYS},
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class AnswerCacheHit:
+    answer: str
+    sources: list[dict[str, Any]]
+    similarity: float
+    saved_tokens: int
+    question: str
+    age_seconds: float
+
+
+@dataclass
+class _Entry:
+    question: str
+    answer: str
+    sources: list[dict[str, Any]]
+    saved_tokens: int
+    created_at: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class _BotStats:
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    saved_tokens: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "stores": self.stores,
+            "saved_tokens": self.saved_tokens,
+        }
+
+
+class _Bucket:
+    def __init__(self, version: str, kb_ids: tuple[str, ...]) -> None:
+        self.version = version
+        self.kb_ids = kb_ids
+        self.entries: OrderedDict[int, _Entry] = OrderedDict()
+        self.vectors: dict[int, np.ndarray] = {}
+        self._matrix: np.ndarray | None = None
+        self._ids: list[int] = []
+
+    def matrix(self) -> tuple[list[int], np.ndarray | None]:
+        if self._matrix is None and self.vectors:
+            self._ids = list(self.vectors)
+            self._matrix = np.vstack([self.vectors[i] for i in self._ids])
+        return self._ids, self._matrix
+
+    def add(self, entry_id: int, vector: np.ndarray, entry: _Entry) -> None:
+        self.entries[entry_id] = entry
+        self.vectors[entry_id] = vector
+        self._matrix = None
+
+    def remove(self, entry_id: int) -> None:
+        self.entries.pop(entry_id, None)
+        self.vectors.pop(entry_id, None)
+        self._matrix = None
+
+
+def _normalize(vector: list[float]) -> np.ndarray | None:
+    arr = np.asarray(vector, dtype=np.float32)
+    norm = float(np.linalg.norm(arr))
+    if arr.ndim != 1 or norm == 0.0:
+        return None
+    return arr / norm
+
+
+class SemanticAnswerCache:
+    def __init__(
+        self,
+        invalidation_bus: ConfigInvalidationBus | None = None,
+        ttl_seconds: float = 3600.0,
+        max_entries_per_bot: int = 500,
+    ) -> None:
+        self._ttl = ttl_seconds
+        self._max_entries = max(1, max_entries_per_bot)
+        self._buckets: dict[str, _Bucket] = {}
+        self._bot_generations: dict[str, int] = {}
+        self._kb_generations: dict[str, int] = {}
+        self._global_generation = 0
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self._stats: dict[str, _BotStats] = {}
+        self.invalidations = 0
+        self.stale_puts = 0
+        if invalidation_bus is not None:
+            invalidation_bus.subscribe(self.invalidate)
+
+    def version(
+        self, bot_id: str, fingerprint: str, kb_ids: list[str] | None
+    ) -> str:
+        """跑 agent 之前取；``lookup`` / ``put`` 都帶這個值。"""
+        kb_part = ",".join(
+            f"{kb}:{self._kb_generations.get(kb, 0)}"
+            for kb in sorted(kb_ids or [])
+        )
+        return (
+            f"{fingerprint}|{self._global_generation}"
+            f"|{self._bot_generations.get(bot_id, 0)}|{kb_part}"
+        )
+
+    def lookup(
+        self,
+        bot_id: str,
+        version: str,
+        vector: list[float],
+        threshold: float,
+    ) -> AnswerCacheHit | None:
+        stats = self._stats.setdefault(bot_id, _BotStats())
+        query = _normalize(vector)
+        with self._lock:
+            bucket = self._buckets.get(bot_id)
+            if bucket is None or query is None:
+                stats.misses += 1
+                return None
+            if bucket.version != version:
+                del self._buckets[bot_id]
+                stats.misses += 1
+                return None
+            entry_id, similarity = self._nearest(bucket, query)
+            if entry_id is None or similarity < threshold:
+                stats.misses += 1
+                return None
+            entry = bucket.entries[entry_id]
+            age = time.monotonic() - entry.created_at
+            if age >= self._ttl:
+                bucket.remove(entry_id)
+                stats.misses += 1
+                return None
+            bucket.entries.move_to_end(entry_id)
+            stats.hits += 1
+            stats.saved_tokens += entry.saved_tokens
+            return AnswerCacheHit(
+                answer=entry.answer,
+                sources=list(entry.sources),
+                similarity=similarity,
+                saved_tokens=entry.saved_tokens,
+                question=entry.question,
+                age_seconds=age,
+            )
+
+    def put(
+        self,
+        bot_id: str,
+        version: str,
+        kb_ids: list[str] | None,
+        vector: list[float],
+        *,
+        question: str,
+        answer: str,
+        sources: list[dict[str, Any]] | None,
+        saved_tokens: int,
+        threshold: float,
+    ) -> bool:
+        """寫入一筆回答；版本已過期（處理期間有失效）回 False。"""
+        query = _normalize(vector)
+        if query is None or not answer:
+            return False
+        fingerprint = version.split("|", 1)[0]
+        if version != self.version(bot_id, fingerprint, kb_ids):
+            self.stale_puts += 1
+            return False
+        entry = _Entry(
+            question=question,
+            answer=answer,
+            sources=list(sources or []),
+            saved_tokens=saved_tokens,
+        )
+        with self._lock:
+            bucket = self._buckets.get(bot_id)
+            if bucket is None or bucket.version != version:
+                bucket = _Bucket(version, tuple(kb_ids or ()))
+                self._buckets[bot_id] = bucket
+            # 已有夠像的問題 → 以新回答取代，不重複佔位
+            existing, similarity = self._nearest(bucket, query)
+            if existing is not None and similarity >= threshold:
+                bucket.remove(existing)
+            self._next_id += 1
+            bucket.add(self._next_id, query, entry)
+            while len(bucket.entries) > self._max_entries:
+                oldest = next(iter(bucket.entries))
+                bucket.remove(oldest)
+            self._stats.setdefault(bot_id, _BotStats()).stores += 1
+        return True
+
+    @staticmethod
+    def _nearest(
+        bucket: _Bucket, query: np.ndarray
+    ) -> tuple[int | None, float]:
+        ids, matrix = bucket.matrix()
+        if matrix is None or matrix.shape[1] != query.shape[0]:
+            return None, 0.0
+        scores = matrix @ query
+        best = int(np.argmax(scores))
+        return ids[best], float(scores[best])
+
+    def invalidate(self, scope: str, key: str = ALL_KEYS) -> None:
+        if scope in (SCOPE_RATE_LIMIT, SCOPE_GUARD_RULES):
+            return  # 不影響回答內容
+        with self._lock:
+            self.invalidations += 1
+            if scope == SCOPE_BOT and key != ALL_KEYS:
+                self._bot_generations[key] = self._bot_generations.get(key, 0) + 1
+                self._buckets.pop(key, None)
+            elif scope == SCOPE_KNOWLEDGE_BASE and key != ALL_KEYS:
+                self._kb_generations[key] = self._kb_generations.get(key, 0) + 1
+                for bot_id in [
+                    b for b, bucket in self._buckets.items() if key in bucket.kb_ids
+                ]:
+                    del self._buckets[bot_id]
+            else:
+                # tenant / system_prompt / mcp_registry 影響面無法便宜地反查 → 全清
+                self._global_generation += 1
+                self._buckets.clear()
+
+    def stats(self) -> dict[str, Any]:
+        totals = _BotStats()
+        for s in self._stats.values():
+            totals.hits += s.hits
+            totals.misses += s.misses
+            totals.stores += s.stores
+            totals.saved_tokens += s.saved_tokens
+        return {
+            **totals.to_dict(),
+            "ttl_seconds": self._ttl,
+            "max_entries_per_bot": self._max_entries,
+            "bots": len(self._buckets),
+            "entries": sum(len(b.entries) for b in self._buckets.values()),
+            "invalidations": self.invalidations,
+            "stale_puts": self.stale_puts,
+            "per_bot": {
+                bot_id: {
+                    **s.to_dict(),
+                    "entries": len(self._buckets[bot_id].entries)
+                    if bot_id in self._buckets
+                    else 0,
+                }
+                for bot_id, s in self._stats.items()
+            },
+        }
@@ -3,20 +3,31 @@
 import asyncio
 import time
 from collections.abc import AsyncIterator
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING, Any
 from uuid import uuid4
 
 import structlog
 
+from src.application.agent.bot_runtime_snapshot import BotRuntimeSnapshotCache
 from src.application.agent.intent_classifier import IntentClassifier
 from src.application.agent.prompt_assembler import (
     assemble as assemble_prompt,
 )
+from src.application.agent.prompt_assembler import (
+    assemble_template as assemble_prompt_template,
+)
 from src.application.agent.prompt_assembler import (
     inject_runtime_vars,
 )
+from src.application.agent.semantic_answer_cache import (
+    AnswerCacheHit,
+    SemanticAnswerCache,
+)
+from src.application.agent.semantic_answer_cache import (
+    config_fingerprint as answer_cache_fingerprint,
+)
 from src.domain.agent.entity import AgentResponse
 from src.domain.agent.services import AgentService
 from src.domain.bot.entity import Bot
@@ -28,10 +39,13 @@ from src.domain.conversation.entity import Conversation
 from src.domain.conversation.history_strategy import (
     ConversationHistoryStrategy,
     HistoryStrategyConfig,
+    prepend_stored_summary,
 )
 from src.domain.conversation.repository import ConversationRepository
 from src.domain.platform.repository import SystemPromptConfigRepository
 from src.domain.platform.services import EncryptionService
+from src.domain.rag.services import EmbeddingService
+from src.domain.rag.value_objects import Source
 from src.domain.shared.concurrency import ConversationLock
 from src.domain.shared.exceptions import DomainException
 from src.infrastructure.observability.agent_trace_collector import (
@@ -82,6 +96,11 @@ logger = structlog.get_logger(__name__)
 
 _REFUND_METADATA_MARKER = "__refund_metadata"
 
+# 只用到這些工具的回答才進語意快取（其他工具的結果可能因人 / 因時而異，
+# query_dm_with_image 的來源帶 signed URL 會過期）
+_ANSWER_CACHEABLE_TOOLS = frozenset({"direct", "rag_query"})
+_SOURCE_FIELDS = frozenset(f.name for f in fields(Source))
+
 
 def _compute_trace_outcome(nodes: list[dict[str, Any]]) -> str:
     """S-Gov.6a: 從節點 outcome 計算 trace-level outcome。
@@ -101,7 +120,7 @@ def _bump_conversation_counters(conversation: Any) -> None:
 
     在 conv_repo.save() 前呼叫，repo 會把這 2 欄位寫入 PG。
     """
-    conversation.message_count = len(conversation.messages)
+    conversation.message_count = conversation.total_messages
     conversation.last_message_at = datetime.now(timezone.utc)
 
 
@@ -117,6 +136,28 @@ def _build_structured_content(
     return {"contact": contact, "sources": sources}
 
 
+@dataclass(frozen=True)
+class _AnswerCacheProbe:
+    """首輪提問查過語意快取後的狀態；miss 時帶去 ``put``。"""
+
+    bot_id: str
+    version: str
+    vector: list[float]
+    threshold: float
+    kb_ids: list[str] | None
+    hit: AnswerCacheHit | None
+
+
+def _answer_cacheable(
+    tool_calls: list[dict[str, Any]], *, contact: Any, refund_step: Any
+) -> bool:
+    if contact or refund_step:
+        return False
+    return all(
+        tc.get("tool_name", "") in _ANSWER_CACHEABLE_TOOLS for tc in tool_calls
+    )
+
+
 @dataclass(frozen=True)
 class SendMessageCommand:
     tenant_id: str
@@ -150,6 +191,11 @@ class SendMessageUseCase:
         worker_config_repo: WorkerConfigRepository | None = None,
         prompt_guard: Any | None = None,
         tenant_repository: "TenantRepository | None" = None,
+        bot_config_cache: BotRuntimeSnapshotCache | None = None,
+        history_window: int = 0,
+        batch_writer: Any | None = None,
+        answer_cache: SemanticAnswerCache | None = None,
+        embedding_service: EmbeddingService | None = None,
     ) -> None:
         self._agent_service = agent_service
         self._conversation_repo = conversation_repository
@@ -157,6 +203,8 @@ class SendMessageUseCase:
         self._history_strategy = history_strategy
         self._debug = debug
         self._trace_session_factory = trace_session_factory
+        # write-behind buffer（BatchWriter）；有的話 trace 不在 response path 上 commit
+        self._batch_writer = batch_writer
         self._sys_prompt_repo = system_prompt_config_repository
         self._eval_use_case = rag_evaluation_use_case
         self._mcp_registry_repo = mcp_registry_repo
@@ -170,6 +218,12 @@ class SendMessageUseCase:
         self._conversation_lock = conversation_lock
         self._prompt_guard = prompt_guard
         self._tenant_repo = tenant_repository
+        self._bot_config_cache = bot_config_cache
+        # > 0：只載入最後 max(history_window, bot history_limit) 則訊息
+        self._history_window = history_window
+        # per-bot 語意回答快取（bot answer_cache_enabled 才會用）
+        self._answer_cache = answer_cache
+        self._embedding_service = embedding_service
 
     def _build_lock_key(self, command: SendMessageCommand) -> str:
         """Build a lock key for the conversation."""
@@ -182,7 +236,42 @@ class SendMessageUseCase:
     async def _load_bot_config(
         self, command: SendMessageCommand
     ) -> dict[str, Any]:
-        """Resolve Bot config — shared by execute & execute_stream."""
+        """Resolve Bot config — shared by execute & execute_stream.
+
+        有 bot 時走 runtime snapshot 快取；snapshot 不含 per-request 欄位
+        （kb_id、prompt 動態變數），在這裡補上。
+        """
+        if not (command.bot_id and self._bot_repo):
+            return await self._default_bot_config(command)
+
+        cache = self._bot_config_cache
+        snapshot = (
+            cache.get(command.tenant_id, command.bot_id) if cache else None
+        )
+        if snapshot is not None:
+            cfg = snapshot.to_config()
+        else:
+            generation = cache.generation if cache else 0
+            built = await self._build_bot_config(command)
+            if built is None:
+                return await self._default_bot_config(command)
+            if cache:
+                cfg = cache.put(
+                    command.tenant_id, command.bot_id, built, generation
+                ).to_config()
+            else:
+                cfg = built
+                cfg["system_prompt"] = inject_runtime_vars(cfg["system_prompt"])
+
+        cfg["kb_id"] = command.kb_id or (
+            cfg["kb_ids"][0] if cfg["kb_ids"] else command.kb_id
+        )
+        return cfg
+
+    async def _default_bot_config(
+        self, command: SendMessageCommand
+    ) -> dict[str, Any]:
+        """No bot (or bot not found) — still resolve system prompts from DB."""
         cfg: dict[str, Any] = {
             "kb_ids": None,
             "system_prompt": None,
@@ -194,32 +283,31 @@ class SendMessageUseCase:
             "rag_score_threshold": None,
             "show_sources": True,
         }
-        if not (command.bot_id and self._bot_repo):
-            # No bot — still resolve system prompts from DB
-            if self._sys_prompt_repo:
-                sys_cfg = await self._sys_prompt_repo.get()
-                cfg["system_prompt"] = assemble_prompt(
-                    system_prompt=sys_cfg.system_prompt,
-                )
-            return cfg
+        if self._sys_prompt_repo:
+            sys_cfg = await self._sys_prompt_repo.get()
+            cfg["system_prompt"] = assemble_prompt(
+                system_prompt=sys_cfg.system_prompt,
+            )
+        return cfg
+
+    async def _build_bot_config(
+        self, command: SendMessageCommand
+    ) -> dict[str, Any] | None:
+        """從 DB 組出 bot runtime config（可快取部分）；bot 不存在回 None。
+
+        system_prompt 為未注入動態變數的 template。
+        """
         bot = await self._bot_repo.find_by_id(command.bot_id)
         if bot is None:
-            if self._sys_prompt_repo:
-                sys_cfg = await self._sys_prompt_repo.get()
-                cfg["system_prompt"] = assemble_prompt(
-                    system_prompt=sys_cfg.system_prompt,
-                )
-            return cfg
+            return None
         if bot.tenant_id != command.tenant_id:
             msg = (
                 f"Bot '{command.bot_id}' does not belong "
                 f"to tenant '{command.tenant_id}'"
             )
             raise DomainException(msg)
+        cfg: dict[str, Any] = {}
         cfg["kb_ids"] = bot.knowledge_base_ids or None
-        if not cfg["kb_id"] and cfg["kb_ids"]:
-            cfg["kb_id"] = cfg["kb_ids"][0]
-        cfg["system_prompt"] = bot.bot_prompt or None
         llm_params: dict = {
             "temperature": bot.llm_params.temperature,
             "max_tokens": bot.llm_params.max_tokens,
@@ -331,6 +419,10 @@ class SendMessageUseCase:
         cfg["hyde_enabled"] = getattr(bot, "hyde_enabled", False)
         cfg["hyde_model"] = getattr(bot, "hyde_model", "")
         cfg["hyde_extra_hint"] = getattr(bot, "hyde_extra_hint", "")
+        cfg["answer_cache_enabled"] = getattr(bot, "answer_cache_enabled", False)
+        cfg["answer_cache_threshold"] = getattr(
+            bot, "answer_cache_threshold", 0.95
+        )
         cfg["bot_prompt"] = bot.bot_prompt or ""
         cfg["eval_depth"] = getattr(bot, "eval_depth", "off")
         cfg["eval_provider"] = getattr(bot, "eval_provider", "")
@@ -359,10 +451,12 @@ class SendMessageUseCase:
             resolved_system_prompt = bot.base_prompt or sys_cfg.system_prompt
 
         # Pre-assemble the full system prompt (agent services use it directly)
-        cfg["system_prompt"] = assemble_prompt(
+        cfg["system_prompt"] = assemble_prompt_template(
             bot_prompt=bot.bot_prompt,
             system_prompt=resolved_system_prompt,
         )
+        # 語意回答快取的設定版本（用注入 {today}/{now} 前的 template）
+        cfg["answer_cache_fingerprint"] = answer_cache_fingerprint(cfg)
 
         return cfg
 
@@ -426,7 +520,7 @@ class SendMessageUseCase:
             return
         if not self._resolve_identity or not self._extract_memory:
             return
-        if not self._should_extract_memory(bot_cfg, len(conversation.messages)):
+        if not self._should_extract_memory(bot_cfg, conversation.total_messages):
             return
 
         try:
@@ -465,6 +559,7 @@ class SendMessageUseCase:
         self,
         history: list | None,
         history_limit: int | None,
+        stored_summary: str | None = None,
     ) -> tuple[list | None, str, str]:
         """Process history via strategy, return (history, ctx, router).
 
@@ -498,6 +593,9 @@ class SendMessageUseCase:
                     history_len=len(history),
                     fallback_chars=len(history_context),
                 )
+            history_context = prepend_stored_summary(
+                history_context, stored_summary
+            )
         elif history and history_limit is not None:
             # 沒注入 strategy（理論不應發生，但要 graceful）
             history = history[-history_limit:]
@@ -678,28 +776,14 @@ class SendMessageUseCase:
         return await self._execute_inner(command)
 
     async def _execute_inner(self, command: SendMessageCommand) -> AgentResponse:
-        conversation = await self._load_or_create_conversation(command)
-
-        history = conversation.messages if conversation.messages else None
-        metadata = self._extract_metadata(conversation)
-
         bot_cfg = await self._load_bot_config(command)
 
-        # Inject rerank config into metadata for RAG tool
-        metadata["rerank_enabled"] = bot_cfg.get("rerank_enabled", False)
-        metadata["rerank_model"] = bot_cfg.get("rerank_model", "")
-        metadata["rerank_top_n"] = bot_cfg.get("rerank_top_n", 20)
-        # Issue #43 — Bot-level RAG retrieval modes
-        metadata["rag_retrieval_modes"] = list(
-            bot_cfg.get("rag_retrieval_modes", ["raw"]) or ["raw"]
-        )
-        metadata["query_rewrite_model"] = bot_cfg.get("query_rewrite_model", "")
-        metadata["query_rewrite_extra_hint"] = bot_cfg.get(
-            "query_rewrite_extra_hint", ""
+        conversation = await self._load_or_create_conversation(
+            command, bot_cfg["history_limit"]
         )
-        metadata["hyde_model"] = bot_cfg.get("hyde_model", "")
-        metadata["hyde_extra_hint"] = bot_cfg.get("hyde_extra_hint", "")
-        metadata["bot_prompt"] = bot_cfg.get("bot_prompt", "")
+
+        history = conversation.messages if conversation.messages else None
+        metadata = self._agent_metadata(conversation, bot_cfg)
 
         # 提早 start AgentTraceCollector — guard 命中時要 add_node，否則
         # 在 agent_service.start() 之前 add_node 會被 trace=None 吞掉
@@ -746,9 +830,18 @@ class SendMessageUseCase:
                     guard_rule_matched=guard_result.rule_matched,
                 )
 
+        cache_probe = await self._probe_answer_cache(command, bot_cfg, conversation)
+        if cache_probe is not None and cache_probe.hit is not None:
+            return await self._cached_response(
+                command, conversation, cache_probe.hit
+            )
+
         history, history_context, router_context = (
             await self._resolve_history(
-                history, bot_cfg["history_limit"]
+                history,
+                bot_cfg["history_limit"],
+                # 視窗外的舊訊息以 DB 摘要代替
+                conversation.summary if conversation.history_offset else None,
             )
         )
 
@@ -827,6 +920,19 @@ class SendMessageUseCase:
                 # Sprint A++ Guard UX
                 response.guard_blocked = "output"
                 response.guard_rule_matched = guard_result.rule_matched
+                cache_probe = None  # 被攔截的回答不進快取
+
+        self._store_answer(
+            cache_probe,
+            command,
+            bot_cfg,
+            response.answer,
+            tool_calls=response.tool_calls,
+            contact=response.contact,
+            refund_step=response.refund_step,
+            sources=retrieved_chunks,
+            saved_tokens=response.usage.total_tokens if response.usage else 0,
+        )
 
         conversation.add_message("user", command.message)
         assistant_msg = conversation.add_message(
@@ -855,23 +961,10 @@ class SendMessageUseCase:
         await self._fire_memory_extraction(command, bot_cfg, conversation)
 
         # Fire-and-forget: background evaluation
-        trace_id = str(uuid4())
-        eval_depth = bot_cfg.get("eval_depth", "off")
-        if eval_depth != "off" and self._eval_use_case:
-            from src.infrastructure.queue.arq_pool import enqueue
-            # Sources must be JSON serializable
-            sources_dicts = [
-                s.to_dict() if hasattr(s, "to_dict") else s
-                for s in response.sources
-            ]
-            await enqueue(
-                "run_evaluation",
-                eval_depth, command.message, response.answer,
-                sources_dicts, response.tool_calls,
-                command.tenant_id, trace_id,
-                bot_cfg.get("eval_provider", ""),
-                bot_cfg.get("eval_model", ""),
-            )
+        await self._enqueue_evaluation(
+            command, bot_cfg, response.answer, response.sources,
+            response.tool_calls,
+        )
 
         return response
 
@@ -896,28 +989,14 @@ class SendMessageUseCase:
     async def _execute_stream_inner(
         self, command: SendMessageCommand
     ) -> AsyncIterator[dict[str, Any]]:
-        conversation = await self._load_or_create_conversation(command)
-
-        history = conversation.messages if conversation.messages else None
-        metadata = self._extract_metadata(conversation)
-
         bot_cfg = await self._load_bot_config(command)
 
-        # Inject rerank config into metadata for RAG tool
-        metadata["rerank_enabled"] = bot_cfg.get("rerank_enabled", False)
-        metadata["rerank_model"] = bot_cfg.get("rerank_model", "")
-        metadata["rerank_top_n"] = bot_cfg.get("rerank_top_n", 20)
-        # Issue #43 — Bot-level RAG retrieval modes
-        metadata["rag_retrieval_modes"] = list(
-            bot_cfg.get("rag_retrieval_modes", ["raw"]) or ["raw"]
-        )
-        metadata["query_rewrite_model"] = bot_cfg.get("query_rewrite_model", "")
-        metadata["query_rewrite_extra_hint"] = bot_cfg.get(
-            "query_rewrite_extra_hint", ""
+        conversation = await self._load_or_create_conversation(
+            command, bot_cfg["history_limit"]
         )
-        metadata["hyde_model"] = bot_cfg.get("hyde_model", "")
-        metadata["hyde_extra_hint"] = bot_cfg.get("hyde_extra_hint", "")
-        metadata["bot_prompt"] = bot_cfg.get("bot_prompt", "")
+
+        history = conversation.messages if conversation.messages else None
+        metadata = self._agent_metadata(conversation, bot_cfg)
 
         # 提早 start AgentTraceCollector — guard 命中時要 add_node，否則
         # 在 agent_service.start() 之前 add_node 會被 trace=None 吞掉
@@ -967,9 +1046,20 @@ class SendMessageUseCase:
                 yield {"type": "done"}
                 return
 
+        cache_probe = await self._probe_answer_cache(command, bot_cfg, conversation)
+        if cache_probe is not None and cache_probe.hit is not None:
+            async for event in self._stream_cached_reply(
+                command, bot_cfg, conversation, cache_probe.hit
+            ):
+                yield event
+            return
+
         history, history_context, router_context = (
             await self._resolve_history(
-                history, bot_cfg["history_limit"]
+                history,
+                bot_cfg["history_limit"],
+                # 視窗外的舊訊息以 DB 摘要代替
+                conversation.summary if conversation.history_offset else None,
             )
         )
 
@@ -998,6 +1088,7 @@ class SendMessageUseCase:
         sources_list: list[dict[str, Any]] = []
         contact_payload: dict[str, Any] | None = None
         refund_step_value: str | None = None
+        usage_tokens = 0
 
         t0 = time.perf_counter()
         async for event in self._agent_service.process_message_stream(
@@ -1032,27 +1123,11 @@ class SendMessageUseCase:
             elif event["type"] == "refund_step":
                 refund_step_value = event.get("refund_step")
                 continue  # Internal metadata, not sent to client
-            # Non-debug: hide "direct" tool_calls entirely, strip reasoning for others
-            if event["type"] == "tool_calls" and not self._debug:
-                tcs = event.get("tool_calls", [])
-                # "direct" means no tool used — nothing to show
-                if all(tc.get("tool_name") == "direct" for tc in tcs):
-                    continue
-                event = {
-                    "type": "tool_calls",
-                    "tool_calls": [
-                        {
-                            "tool_name": tc.get("tool_name", ""),
-                            "label": tc.get("label", ""),
-                            "reasoning": "",
-                        }
-                        for tc in tcs
-                    ],
-                }
-            # Suppress sources event when bot has show_sources=False
-            if event["type"] == "sources" and not bot_cfg["show_sources"]:
-                continue
-            yield event
+            elif event["type"] == "usage":
+                usage_tokens = int(event.get("total_tokens") or 0)
+            client_event = self._client_stream_event(event, bot_cfg)
+            if client_event is not None:
+                yield client_event
         latency_ms = int((time.perf_counter() - t0) * 1000)
 
         # ── Prompt Guard: output check on accumulated answer (Option B) ──
@@ -1077,8 +1152,20 @@ class SendMessageUseCase:
                     "rule_matched": output_guard.rule_matched,
                     "replacement": full_answer,
                 }
+                cache_probe = None  # 被攔截的回答不進快取
 
         retrieved_chunks = sources_list if sources_list else None
+        self._store_answer(
+            cache_probe,
+            command,
+            bot_cfg,
+            full_answer,
+            tool_calls=tool_calls,
+            contact=contact_payload,
+            refund_step=refund_step_value,
+            sources=retrieved_chunks,
+            saved_tokens=usage_tokens,
+        )
         structured_content = _build_structured_content(
             contact=contact_payload,
             sources=retrieved_chunks,
@@ -1122,22 +1209,9 @@ class SendMessageUseCase:
         await self._fire_memory_extraction(command, bot_cfg, conversation)
 
         # Fire-and-forget: background evaluation
-        trace_id = str(uuid4())
-        eval_depth = bot_cfg.get("eval_depth", "off")
-        if eval_depth != "off" and self._eval_use_case:
-            from src.infrastructure.queue.arq_pool import enqueue
-            sources_dicts = [
-                s if isinstance(s, dict) else s
-                for s in sources_list
-            ]
-            await enqueue(
-                "run_evaluation",
-                eval_depth, command.message, full_answer,
-                sources_dicts, tool_calls,
-                command.tenant_id, trace_id,
-                bot_cfg.get("eval_provider", ""),
-                bot_cfg.get("eval_model", ""),
-            )
+        await self._enqueue_evaluation(
+            command, bot_cfg, full_answer, sources_list, tool_calls
+        )
 
         yield {
             "type": "message_id",
@@ -1152,13 +1226,262 @@ class SendMessageUseCase:
             done_event["trace_id"] = stream_trace_id
         yield done_event
 
+    async def _probe_answer_cache(
+        self,
+        command: SendMessageCommand,
+        bot_cfg: dict[str, Any],
+        conversation: Conversation,
+    ) -> _AnswerCacheProbe | None:
+        """首輪提問查語意回答快取；不適用（未開啟 / 有歷史 / 有記憶）回 None。
+
+        有歷史的提問語意依賴上下文，個人記憶會讓回答因人而異，都不快取。
+        """
+        cache = self._answer_cache
+        bot_id = bot_cfg.get("bot_id", "")
+        if (
+            cache is None
+            or self._embedding_service is None
+            or not bot_id
+            or not bot_cfg.get("answer_cache_enabled", False)
+            or conversation.messages
+            or bot_cfg.get("memory_enabled", False)
+        ):
+            return None
+        start_ms = AgentTraceCollector.offset_ms()
+        # 在 embed 之前取版本：embed 期間若有失效，put 時會被擋下
+        version = cache.version(
+            bot_id, bot_cfg.get("answer_cache_fingerprint", ""), bot_cfg["kb_ids"]
+        )
+        try:
+            vector = await self._embedding_service.embed_query(command.message)
+        except Exception:
+            logger.warning("answer_cache.embed_failed", bot_id=bot_id, exc_info=True)
+            return None
+        threshold = float(bot_cfg.get("answer_cache_threshold", 0.95))
+        hit = cache.lookup(bot_id, version, vector, threshold)
+        AgentTraceCollector.add_node(
+            node_type="answer_cache",
+            label="semantic cache hit" if hit else "semantic cache miss",
+            parent_id=None,
+            start_ms=start_ms,
+            end_ms=AgentTraceCollector.offset_ms(),
+            similarity=round(hit.similarity, 4) if hit else None,
+            saved_tokens=hit.saved_tokens if hit else 0,
+            cached_question=hit.question if hit else "",
+        )
+        if hit is not None:
+            logger.info(
+                "answer_cache.hit",
+                bot_id=bot_id,
+                similarity=round(hit.similarity, 4),
+                saved_tokens=hit.saved_tokens,
+                age_seconds=round(hit.age_seconds, 1),
+            )
+        return _AnswerCacheProbe(
+            bot_id=bot_id,
+            version=version,
+            vector=vector,
+            threshold=threshold,
+            kb_ids=bot_cfg["kb_ids"],
+            hit=hit,
+        )
+
+    async def _enqueue_evaluation(
+        self,
+        command: SendMessageCommand,
+        bot_cfg: dict[str, Any],
+        answer: str,
+        sources: list[Any],
+        tool_calls: list[dict[str, Any]],
+    ) -> None:
+        eval_depth = bot_cfg.get("eval_depth", "off")
+        if eval_depth == "off" or not self._eval_use_case:
+            return
+        from src.infrastructure.queue.arq_pool import enqueue
+        # Sources must be JSON serializable
+        sources_dicts = [
+            s.to_dict() if hasattr(s, "to_dict") else s for s in sources
+        ]
+        await enqueue(
+            "run_evaluation",
+            eval_depth, command.message, answer,
+            sources_dicts, tool_calls,
+            command.tenant_id, str(uuid4()),
+            bot_cfg.get("eval_provider", ""),
+            bot_cfg.get("eval_model", ""),
+        )
+
+    def _agent_metadata(
+        self, conversation: Conversation, bot_cfg: dict[str, Any]
+    ) -> dict[str, Any]:
+        metadata = self._extract_metadata(conversation)
+
+        # Inject rerank config into metadata for RAG tool
+        metadata["rerank_enabled"] = bot_cfg.get("rerank_enabled", False)
+        metadata["rerank_model"] = bot_cfg.get("rerank_model", "")
+        metadata["rerank_top_n"] = bot_cfg.get("rerank_top_n", 20)
+        # Issue #43 — Bot-level RAG retrieval modes
+        metadata["rag_retrieval_modes"] = list(
+            bot_cfg.get("rag_retrieval_modes", ["raw"]) or ["raw"]
+        )
+        metadata["query_rewrite_model"] = bot_cfg.get("query_rewrite_model", "")
+        metadata["query_rewrite_extra_hint"] = bot_cfg.get(
+            "query_rewrite_extra_hint", ""
+        )
+        metadata["hyde_model"] = bot_cfg.get("hyde_model", "")
+        metadata["hyde_extra_hint"] = bot_cfg.get("hyde_extra_hint", "")
+        metadata["bot_prompt"] = bot_cfg.get("bot_prompt", "")
+        return metadata
+
+    def _client_stream_event(
+        self, event: dict[str, Any], bot_cfg: dict[str, Any]
+    ) -> dict[str, Any] | None:
+        """agent stream event → 送給 client 的版本；None 代表不送。"""
+        # Non-debug: hide "direct" tool_calls entirely, strip reasoning for others
+        if event["type"] == "tool_calls" and not self._debug:
+            tcs = event.get("tool_calls", [])
+            # "direct" means no tool used — nothing to show
+            if all(tc.get("tool_name") == "direct" for tc in tcs):
+                return None
+            return {
+                "type": "tool_calls",
+                "tool_calls": [
+                    {
+                        "tool_name": tc.get("tool_name", ""),
+                        "label": tc.get("label", ""),
+                        "reasoning": "",
+                    }
+                    for tc in tcs
+                ],
+            }
+        # Suppress sources event when bot has show_sources=False
+        if event["type"] == "sources" and not bot_cfg["show_sources"]:
+            return None
+        return event
+
+    async def _cached_response(
+        self,
+        command: SendMessageCommand,
+        conversation: Conversation,
+        hit: AnswerCacheHit,
+    ) -> AgentResponse:
+        """快取命中（非串流）：寫入對話與 trace，回傳快取的回答。"""
+        assistant_msg = await self._save_cached_reply(command, conversation, hit)
+        await self._persist_agent_trace(
+            conversation_id=conversation.id.value,
+            message_id=assistant_msg.id.value,
+            latency_ms=int(AgentTraceCollector.offset_ms()),
+            source=command.identity_source or "web",
+        )
+        return AgentResponse(
+            answer=hit.answer,
+            sources=[
+                Source(**{k: v for k, v in s.items() if k in _SOURCE_FIELDS})
+                for s in hit.sources
+            ],
+            conversation_id=conversation.id.value,
+            message_id=assistant_msg.id.value,
+        )
+
+    async def _stream_cached_reply(
+        self,
+        command: SendMessageCommand,
+        bot_cfg: dict[str, Any],
+        conversation: Conversation,
+        hit: AnswerCacheHit,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """快取命中（串流）：事件順序與一般回覆相同。"""
+        yield {"type": "token", "content": hit.answer}
+        if hit.sources and bot_cfg["show_sources"]:
+            yield {"type": "sources", "sources": hit.sources}
+        assistant_msg = await self._save_cached_reply(command, conversation, hit)
+        current_trace = AgentTraceCollector.current()
+        trace_id = current_trace.trace_id if current_trace else None
+        await self._persist_agent_trace(
+            conversation_id=conversation.id.value,
+            message_id=assistant_msg.id.value,
+            latency_ms=int(AgentTraceCollector.offset_ms()),
+            source=command.identity_source or "web",
+        )
+        yield {"type": "message_id", "message_id": assistant_msg.id.value}
+        yield {"type": "conversation_id", "conversation_id": conversation.id.value}
+        done: dict[str, Any] = {"type": "done"}
+        if trace_id:
+            done["trace_id"] = trace_id
+        yield done
+
+    def _store_answer(
+        self,
+        probe: _AnswerCacheProbe | None,
+        command: SendMessageCommand,
+        bot_cfg: dict[str, Any],
+        answer: str,
+        *,
+        tool_calls: list[dict[str, Any]],
+        contact: Any,
+        refund_step: str | None,
+        sources: list[dict[str, Any]] | None,
+        saved_tokens: int,
+    ) -> None:
+        """可快取的回答寫回語意快取（probe 為 None 代表不適用或已被攔截）。"""
+        if (
+            probe is None
+            or self._answer_cache is None
+            # worker routing 改過 prompt / 工具，不同說法可能分到不同 worker
+            or bot_cfg.get("_worker_matched_info")
+            or not _answer_cacheable(
+                tool_calls, contact=contact, refund_step=refund_step
+            )
+        ):
+            return
+        self._answer_cache.put(
+            probe.bot_id,
+            probe.version,
+            probe.kb_ids,
+            probe.vector,
+            question=command.message,
+            answer=answer,
+            sources=sources,
+            saved_tokens=saved_tokens,
+            threshold=probe.threshold,
+        )
+
+    async def _save_cached_reply(
+        self,
+        command: SendMessageCommand,
+        conversation: Conversation,
+        hit: AnswerCacheHit,
+    ) -> Any:
+        """快取命中：照一般回覆寫入對話與 trace，回傳 assistant message。"""
+        latency_ms = int(AgentTraceCollector.offset_ms())
+        retrieved_chunks = hit.sources or None
+        conversation.add_message("user", command.message)
+        assistant_msg = conversation.add_message(
+            "assistant",
+            hit.answer,
+            latency_ms=latency_ms,
+            retrieved_chunks=retrieved_chunks,
+            structured_content=_build_structured_content(
+                contact=None, sources=retrieved_chunks
+            ),
+        )
+        _bump_conversation_counters(conversation)
+        await self._conversation_repo.save(conversation)
+        return assistant_msg
+
     async def _load_or_create_conversation(
-        self, command: SendMessageCommand
+        self, command: SendMessageCommand, history_limit: int | None = None
     ) -> Conversation:
         if command.conversation_id:
-            existing = await self._conversation_repo.find_by_id(
-                command.conversation_id
-            )
+            if self._history_window > 0:
+                existing = await self._conversation_repo.find_window(
+                    command.conversation_id,
+                    max(self._history_window, history_limit or 0),
+                )
+            else:
+                existing = await self._conversation_repo.find_by_id(
+                    command.conversation_id
+                )
             if existing is not None:
                 return existing
 
@@ -1178,7 +1501,7 @@ class SendMessageUseCase:
                 return
 
             session_factory = self._trace_session_factory
-            if session_factory is None:
+            if session_factory is None and self._batch_writer is None:
                 return
 
             trace.conversation_id = conversation_id
@@ -1212,6 +1535,11 @@ class SendMessageUseCase:
                 total_tokens=trace.total_tokens,
                 outcome=outcome,
             )
+            if self._batch_writer is not None and self._batch_writer.accepting:
+                self._batch_writer.offer(row)  # queue 滿時丟棄並計數
+                return
+            if session_factory is None:
+                return
             async with session_factory() as session:
                 session.add(row)
                 await session.commit()
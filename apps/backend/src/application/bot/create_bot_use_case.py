@@ -66,6 +66,8 @@ class CreateBotCommand:
     hyde_enabled: bool = False
     hyde_model: str = ""
     hyde_extra_hint: str = ""
+    answer_cache_enabled: bool = False
+    answer_cache_threshold: float = 0.95
     # Per-tool RAG 參數覆蓋：{tool_name: {rag_top_k, rag_score_threshold, rerank_*}}
     tool_configs: dict = field(default_factory=dict)
     customer_service_url: str = ""
@@ -172,6 +174,8 @@ class CreateBotUseCase:
             hyde_enabled=command.hyde_enabled,
             hyde_model=command.hyde_model,
             hyde_extra_hint=command.hyde_extra_hint,
+            answer_cache_enabled=command.answer_cache_enabled,
+            answer_cache_threshold=command.answer_cache_threshold,
             tool_configs={
                 name: ToolRagConfig(
                     rag_top_k=cfg.get("rag_top_k"),
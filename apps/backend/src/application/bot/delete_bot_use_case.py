@@ -2,6 +2,10 @@
 
 from src.domain.bot.repository import BotRepository
 from src.domain.shared.cache_service import CacheService
+from src.domain.shared.config_invalidation import (
+    SCOPE_BOT,
+    ConfigInvalidationBus,
+)
 from src.domain.shared.exceptions import EntityNotFoundError
 
 
@@ -10,9 +14,11 @@ class DeleteBotUseCase:
         self,
         bot_repository: BotRepository,
         cache_service: CacheService | None = None,
+        config_invalidation_bus: ConfigInvalidationBus | None = None,
     ) -> None:
         self._bot_repo = bot_repository
         self._cache_service = cache_service
+        self._invalidation_bus = config_invalidation_bus
 
     async def execute(self, bot_id: str) -> None:
         bot = await self._bot_repo.find_by_id(bot_id)
@@ -25,3 +31,5 @@ class DeleteBotUseCase:
             await self._cache_service.delete(
                 f"bot:sc:{bot.short_code.value}"
             )
+        if self._invalidation_bus is not None:
+            await self._invalidation_bus.publish(SCOPE_BOT, bot_id)
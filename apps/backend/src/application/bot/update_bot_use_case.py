@@ -16,6 +16,10 @@ from src.domain.bot.repository import BotRepository
 from src.domain.platform.services import EncryptionService
 from src.domain.rag.retrieval_mode import normalize_modes, validate_modes
 from src.domain.shared.cache_service import CacheService
+from src.domain.shared.config_invalidation import (
+    SCOPE_BOT,
+    ConfigInvalidationBus,
+)
 from src.domain.shared.exceptions import EntityNotFoundError, ValidationError
 
 _UNSET = object()
@@ -71,6 +75,8 @@ class UpdateBotCommand:
     hyde_enabled: object = _UNSET
     hyde_model: object = _UNSET
     hyde_extra_hint: object = _UNSET
+    answer_cache_enabled: object = _UNSET
+    answer_cache_threshold: object = _UNSET
     tool_configs: object = _UNSET
     customer_service_url: object = _UNSET
     intent_routes: object = _UNSET
@@ -87,10 +93,12 @@ class UpdateBotUseCase:
         bot_repository: BotRepository,
         cache_service: CacheService | None = None,
         encryption_service: EncryptionService | None = None,
+        config_invalidation_bus: ConfigInvalidationBus | None = None,
     ) -> None:
         self._bot_repo = bot_repository
         self._cache_service = cache_service
         self._encryption = encryption_service
+        self._invalidation_bus = config_invalidation_bus
 
     @staticmethod
     def _apply_updates(bot: Bot, command: UpdateBotCommand) -> None:
@@ -150,6 +158,10 @@ class UpdateBotUseCase:
             bot.hyde_model = command.hyde_model  # type: ignore[assignment]
         if command.hyde_extra_hint is not _UNSET:
             bot.hyde_extra_hint = command.hyde_extra_hint  # type: ignore[assignment]
+        if command.answer_cache_enabled is not _UNSET:
+            bot.answer_cache_enabled = command.answer_cache_enabled  # type: ignore[assignment]
+        if command.answer_cache_threshold is not _UNSET:
+            bot.answer_cache_threshold = command.answer_cache_threshold  # type: ignore[assignment]
         if command.tool_configs is not _UNSET:
             bot.tool_configs = {
                 name: ToolRagConfig(
@@ -263,5 +275,7 @@ class UpdateBotUseCase:
         if self._cache_service is not None:
             await self._cache_service.delete(f"bot:{command.bot_id}")
             await self._cache_service.delete(f"bot:sc:{bot.short_code.value}")
+        if self._invalidation_bus is not None:
+            await self._invalidation_bus.publish(SCOPE_BOT, command.bot_id)
 
         return bot
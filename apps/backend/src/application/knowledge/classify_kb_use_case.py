@@ -2,8 +2,15 @@
 
 Orchestrates: fetch chunks/vectors → cluster → name → save categories → assign chunks.
 Runs as arq background job.
+
+- 大 KB：只抓 ``max_cluster_sample`` 個 chunk 的向量做聚類 + 命名，其餘分頁
+  抓向量、以最近 centroid 指派（記憶體與 CPU 都有上限）
+- ``incremental=True``（文件上傳後自動觸發）：既有 category 有 centroid 時只
+  指派尚未分類的新 chunk；新 chunk 佔比超過 ``incremental_max_new_ratio``
+  或沒有 centroid 時退回完整聚類
 """
 
+import random
 from typing import TYPE_CHECKING
 
 from src.domain.knowledge.repository import (
@@ -34,6 +41,9 @@ class ClassifyKbUseCase:
         vector_store: VectorStore,
         classification_service: ClusterClassificationService,
         record_usage: "RecordUsageUseCase | None" = None,
+        max_cluster_sample: int = 2000,
+        assign_batch_size: int = 1000,
+        incremental_max_new_ratio: float = 0.3,
     ) -> None:
         self._kb_repo = knowledge_base_repository
         self._doc_repo = document_repository
@@ -41,16 +51,24 @@ class ClassifyKbUseCase:
         self._vector_store = vector_store
         self._classification = classification_service
         self._record_usage = record_usage
+        self._max_cluster_sample = max_cluster_sample
+        self._assign_batch_size = max(1, assign_batch_size)
+        self._incremental_max_new_ratio = incremental_max_new_ratio
 
-    async def execute(self, kb_id: str, tenant_id: str) -> None:
+    async def execute(
+        self, kb_id: str, tenant_id: str, incremental: bool = False
+    ) -> None:
         log = logger.bind(kb_id=kb_id, tenant_id=tenant_id)
-        log.info("classify_kb.start")
+        log.info("classify_kb.start", incremental=incremental)
 
         kb = await self._kb_repo.find_by_id(kb_id)
         if kb is None:
             log.warning("classify_kb.kb_not_found")
             return
 
+        if incremental and await self._assign_new_chunks(kb_id, log):
+            return
+
         # 1. Get all chunk IDs in this KB
         chunk_ids_by_doc = await self._doc_repo.find_chunk_ids_by_kb(kb_id)
         all_chunk_ids: list[str] = []
@@ -61,11 +79,14 @@ class ClassifyKbUseCase:
             log.info("classify_kb.no_chunks")
             return
 
-        # 2. Fetch vectors from Milvus
+        # 2. Fetch vectors from Milvus（大 KB 只抓 sample，其餘在 step 3b 分頁指派）
         collection = f"kb_{kb_id}"
+        sample_ids = all_chunk_ids
+        if 0 < self._max_cluster_sample < len(all_chunk_ids):
+            sample_ids = random.sample(all_chunk_ids, self._max_cluster_sample)
         try:
             results = await self._vector_store.fetch_vectors(
-                collection, all_chunk_ids
+                collection, sample_ids
             )
         except Exception:
             log.warning("classify_kb.fetch_vectors_failed", exc_info=True)
@@ -109,6 +130,14 @@ class ClassifyKbUseCase:
             log.info("classify_kb.no_categories_generated")
             return
 
+        # 3b. sample 以外的 chunk：分頁抓向量、指派到最近 centroid
+        if len(sample_ids) < len(all_chunk_ids):
+            sampled = set(sample_ids)
+            rest = [cid for cid in all_chunk_ids if cid not in sampled]
+            chunk_to_cat.update(
+                await self._assign_in_pages(collection, rest, categories, log)
+            )
+
         # Token-Gov.0: 記錄 auto-classification token 用量
         # S-LLM-Cache.1: 加上 cache_read / cache_creation 欄位
         # Session refresh fix：LLM 長時間呼叫後 ContextVar session 可能已超時
@@ -163,16 +192,18 @@ class ClassifyKbUseCase:
         from src.infrastructure.db.models.chunk_model import ChunkModel
 
         async with async_session_factory() as session:
-            for cat in categories:
-                chunk_ids_for_cat = [
-                    cid for cid, cat_id in chunk_to_cat.items()
-                    if cat_id == cat.id
-                ]
-                if chunk_ids_for_cat:
+            for cat_id, chunk_ids_for_cat in _group_by_category(
+                chunk_to_cat
+            ).items():
+                for i in range(0, len(chunk_ids_for_cat), self._assign_batch_size):
                     await session.execute(
                         update(ChunkModel)
-                        .where(ChunkModel.id.in_(chunk_ids_for_cat))
-                        .values(category_id=cat.id)
+                        .where(
+                            ChunkModel.id.in_(
+                                chunk_ids_for_cat[i : i + self._assign_batch_size]
+                            )
+                        )
+                        .values(category_id=cat_id)
                     )
             await session.commit()
 
@@ -184,3 +215,81 @@ class ClassifyKbUseCase:
             categories=len(categories),
             classified_chunks=len(chunk_to_cat),
         )
+
+    async def _assign_in_pages(
+        self,
+        collection: str,
+        chunk_ids: list[str],
+        categories: list,
+        log,
+        update_centroids: bool = False,
+    ) -> dict[str, str]:
+        """分頁抓向量並指派到最近 centroid；某頁抓不到就略過（留待下次分類）。"""
+        chunk_to_cat: dict[str, str] = {}
+        for i in range(0, len(chunk_ids), self._assign_batch_size):
+            page = chunk_ids[i : i + self._assign_batch_size]
+            try:
+                results = await self._vector_store.fetch_vectors(collection, page)
+            except Exception:
+                log.warning(
+                    "classify_kb.assign_fetch_failed", page_size=len(page), exc_info=True
+                )
+                continue
+            if not results:
+                continue
+            cat_ids = await self._classification.assign(
+                [r[1] for r in results],
+                categories,
+                update_centroids=update_centroids,
+            )
+            chunk_to_cat.update(zip((r[0] for r in results), cat_ids, strict=True))
+        return chunk_to_cat
+
+    async def _assign_new_chunks(self, kb_id: str, log) -> bool:
+        """增量分類；回傳 False 代表需要退回完整聚類。"""
+        categories = [
+            c for c in await self._cat_repo.find_by_kb(kb_id) if c.centroid
+        ]
+        if not categories:
+            log.info("classify_kb.incremental_fallback", reason="no_centroids")
+            return False
+
+        new_ids = await self._cat_repo.find_unclassified_chunk_ids(kb_id)
+        classified = sum(c.chunk_count for c in categories)
+        if len(new_ids) > (classified + len(new_ids)) * self._incremental_max_new_ratio:
+            log.info(
+                "classify_kb.incremental_fallback",
+                reason="too_many_new_chunks",
+                new_chunks=len(new_ids),
+                classified_chunks=classified,
+            )
+            return False
+
+        chunk_to_cat = await self._assign_in_pages(
+            f"kb_{kb_id}", new_ids, categories, log, update_centroids=True
+        )
+        if chunk_to_cat:
+            size = self._assign_batch_size
+            for cat_id, chunk_ids in _group_by_category(chunk_to_cat).items():
+                # 與完整聚類一樣分頁 UPDATE，避免 IN (...) 超過 driver 參數上限
+                for i in range(0, len(chunk_ids), size):
+                    await self._cat_repo.assign_chunks(
+                        cat_id, chunk_ids[i : i + size]
+                    )
+            await self._cat_repo.update_centroids(
+                {c.id: c.centroid for c in categories if c.centroid}
+            )
+        await self._cat_repo.update_chunk_counts(kb_id)
+        log.info(
+            "classify_kb.incremental_done",
+            categories=len(categories),
+            classified_chunks=len(chunk_to_cat),
+        )
+        return True
+
+
+def _group_by_category(chunk_to_cat: dict[str, str]) -> dict[str, list[str]]:
+    grouped: dict[str, list[str]] = {}
+    for chunk_id, cat_id in chunk_to_cat.items():
+        grouped.setdefault(cat_id, []).append(chunk_id)
+    return grouped
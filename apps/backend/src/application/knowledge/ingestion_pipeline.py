@@ -0,0 +1,173 @@
+"""IngestionPipeline — 文件 ingestion 的 streaming stage pipeline。
+
+``ProcessDocumentUseCase`` 原本是嚴格分段：全部 chunk 產 context → 全部
+embed → 一次 upsert 全部向量。大文件整份向量留在記憶體，而且 embedding API
+等 Milvus、Milvus 等 embedding，兩邊輪流閒置。
+
+改成 chunk batch 依序流過各 stage（context → embed → upsert），stage 之間是
+bounded queue：
+
+- 每個 stage 有自己的併發上限（N 個 worker 搶同一條 input queue）
+- 下游塞滿時上游 ``put`` 會等（backpressure），所以同時在途的 batch 最多
+  約 ``Σ(concurrency) + Σ(queue_size)``，向量記憶體是 O(在途 batch)
+- 任一 stage 失敗 → 取消其餘 worker 並等它們結束，原例外往外拋
+- 每個 stage 記錄 batches / items / busy / blocked / wall time 與 items/s，
+  由呼叫端寫進 processing task 的 metrics
+
+最後一個 stage 的輸出依完成順序回傳（呼叫端自行排序）。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+StageFn = Callable[[Any], Awaitable[Any]]
+
+_DONE = object()
+
+
+@dataclass(frozen=True)
+class Stage:
+    name: str
+    fn: StageFn
+    concurrency: int = 1
+
+
+@dataclass
+class StageStats:
+    name: str
+    concurrency: int
+    batches: int = 0
+    items: int = 0
+    busy_seconds: float = 0.0  # 各 worker 執行 fn 的時間總和
+    blocked_seconds: float = 0.0  # 等下游 queue 有空位的時間（backpressure）
+    started_at: float | None = field(default=None, repr=False)
+    finished_at: float | None = field(default=None, repr=False)
+
+    @property
+    def wall_seconds(self) -> float:
+        if self.started_at is None or self.finished_at is None:
+            return 0.0
+        return self.finished_at - self.started_at
+
+    def to_dict(self) -> dict[str, Any]:
+        wall = self.wall_seconds
+        return {
+            "concurrency": self.concurrency,
+            "batches": self.batches,
+            "items": self.items,
+            "busy_ms": round(self.busy_seconds * 1000),
+            "blocked_ms": round(self.blocked_seconds * 1000),
+            "wall_ms": round(wall * 1000),
+            "items_per_sec": round(self.items / wall, 2) if wall > 0 else 0.0,
+        }
+
+
+class IngestionPipeline:
+    def __init__(
+        self,
+        stages: list[Stage],
+        queue_size: int = 2,
+        item_count: Callable[[Any], int] = len,
+    ) -> None:
+        if not stages:
+            raise ValueError("IngestionPipeline requires at least one stage")
+        self._stages = stages
+        self._queue_size = max(1, queue_size)
+        self._item_count = item_count
+        self.stats = {
+            s.name: StageStats(name=s.name, concurrency=max(1, s.concurrency))
+            for s in stages
+        }
+
+    async def run(self, batches: Iterable[Any]) -> list[Any]:
+        queues: list[asyncio.Queue[Any]] = [
+            asyncio.Queue(maxsize=self._queue_size) for _ in self._stages
+        ]
+        results: list[Any] = []
+        tasks = [asyncio.create_task(self._feed(batches, queues[0]))]
+        for i, stage in enumerate(self._stages):
+            out = queues[i + 1] if i + 1 < len(self._stages) else None
+            tasks.append(
+                asyncio.create_task(self._run_stage(stage, queues[i], out, results))
+            )
+        try:
+            done, pending = await asyncio.wait(
+                tasks, return_when=asyncio.FIRST_EXCEPTION
+            )
+            for task in done:
+                if task.exception() is not None:
+                    raise task.exception()  # type: ignore[misc]
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        return results
+
+    def _workers(self, index: int) -> int:
+        return self.stats[self._stages[index].name].concurrency
+
+    async def _feed(self, batches: Iterable[Any], queue: asyncio.Queue[Any]) -> None:
+        for batch in batches:
+            await queue.put(batch)
+        for _ in range(self._workers(0)):
+            await queue.put(_DONE)
+
+    async def _run_stage(
+        self,
+        stage: Stage,
+        inbox: asyncio.Queue[Any],
+        outbox: asyncio.Queue[Any] | None,
+        results: list[Any],
+    ) -> None:
+        stats = self.stats[stage.name]
+        workers = [
+            asyncio.create_task(self._worker(stage, stats, inbox, outbox, results))
+            for _ in range(stats.concurrency)
+        ]
+        try:
+            await asyncio.gather(*workers)
+        except BaseException:
+            for worker in workers:
+                worker.cancel()
+            # 等 worker 真的結束：run() 回來時不能還有 upsert 在途
+            await asyncio.gather(*workers, return_exceptions=True)
+            raise
+        if outbox is not None:
+            index = self._stages.index(stage)
+            for _ in range(self._workers(index + 1)):
+                await outbox.put(_DONE)
+
+    async def _worker(
+        self,
+        stage: Stage,
+        stats: StageStats,
+        inbox: asyncio.Queue[Any],
+        outbox: asyncio.Queue[Any] | None,
+        results: list[Any],
+    ) -> None:
+        while True:
+            batch = await inbox.get()
+            if batch is _DONE:
+                return
+            t0 = time.perf_counter()
+            if stats.started_at is None:
+                stats.started_at = t0
+            output = await stage.fn(batch)
+            t1 = time.perf_counter()
+            stats.busy_seconds += t1 - t0
+            stats.batches += 1
+            stats.items += self._item_count(batch)
+            stats.finished_at = t1
+            if outbox is None:
+                results.append(output)
+            else:
+                await outbox.put(output)
+                stats.blocked_seconds += time.perf_counter() - t1
+
+    def metrics(self) -> dict[str, dict[str, Any]]:
+        return {name: s.to_dict() for name, s in self.stats.items()}
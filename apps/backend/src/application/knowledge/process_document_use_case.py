@@ -1,7 +1,11 @@
 import asyncio
 import time
+from dataclasses import dataclass, field
+from functools import partial
 
+from src.application.knowledge.ingestion_pipeline import IngestionPipeline, Stage
 from src.application.usage.record_usage_use_case import RecordUsageUseCase
+from src.domain.knowledge.entity import Chunk, Document, KnowledgeBase
 from src.domain.knowledge.repository import (
     DocumentRepository,
     KnowledgeBaseRepository,
@@ -48,6 +52,48 @@ async def _update_progress(task_id: str, progress: int) -> None:
         pass
 
 
+def _token_attr(service: object, name: str) -> int:
+    value = getattr(service, name, 0)
+    return value if isinstance(value, int) else 0
+
+
+@dataclass
+class _IngestBatch:
+    index: int
+    chunks: list[Chunk]
+    vectors: list[list[float]] | None = None
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+
+def _empty_usage() -> dict[str, int]:
+    return {
+        "ctx_in": 0, "ctx_out": 0, "ctx_cache_read": 0,
+        "ctx_cache_creation": 0, "embed": 0,
+    }
+
+
+@dataclass
+class _IngestRun:
+    """單次 ingestion pipeline 各 stage 共用的狀態。"""
+
+    document_id: str
+    document: Document
+    task_id: str
+    content: str
+    language: str
+    context_model: str
+    collection: str
+    total: int
+    usage: dict[str, int] = field(default_factory=_empty_usage)
+    collection_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    collection_ready: bool = False
+    upsert_started: bool = False  # 已有向量寫進 Milvus（失敗時要清掉）
+    upserted: int = 0
+    last_pct: int = 75
+
+
 class ProcessDocumentUseCase:
     def __init__(
         self,
@@ -63,6 +109,11 @@ class ProcessDocumentUseCase:
         record_usage_use_case: RecordUsageUseCase | None = None,
         chunk_context_service: ChunkContextService | None = None,
         tenant_repository: TenantRepository | None = None,
+        ingest_batch_size: int = 50,
+        ingest_queue_size: int = 2,
+        context_concurrency: int = 2,
+        embed_concurrency: int = 2,
+        upsert_concurrency: int = 2,
     ) -> None:
         self._doc_repo = document_repository
         self._task_repo = processing_task_repository
@@ -76,11 +127,19 @@ class ProcessDocumentUseCase:
         self._record_usage = record_usage_use_case
         self._context_service = chunk_context_service
         self._tenant_repo = tenant_repository
+        self._ingest_batch_size = max(1, ingest_batch_size)
+        self._ingest_queue_size = ingest_queue_size
+        self._context_concurrency = context_concurrency
+        self._embed_concurrency = embed_concurrency
+        self._upsert_concurrency = upsert_concurrency
 
     async def execute(
         self, document_id: str, task_id: str
     ) -> None:
         log = logger.bind(document_id=document_id, task_id=task_id)
+        document: Document | None = None
+        run: _IngestRun | None = None
+        chunks_saved = False
         try:
             t_total = time.perf_counter()
             log.info("document.process.start")
@@ -108,114 +167,16 @@ class ProcessDocumentUseCase:
                 document_id, "processing"
             )
 
-            # Load raw content: prefer file storage, fallback to DB BYTEA
-            raw_content = None
-            if document.storage_path:
-                try:
-                    raw_content = await self._file_storage.load(
-                        document.storage_path
-                    )
-                except FileNotFoundError:
-                    log.warning("document.file_storage.missing")
-            if raw_content is None:
-                raw_content = document.raw_content
+            raw_content = await self._load_raw_content(document, log)
 
             # Fetch KB to get ocr_mode
             kb = await self._kb_repo.find_by_id(document.kb_id)
             ocr_mode = kb.ocr_mode if kb else "general"
 
-            # ── Parse raw content → text ──
-            # Determine if this is a long-running OCR path
-            needs_ocr = (
-                raw_content
-                and (
-                    document.content_type.startswith("image/")
-                    or (document.content_type == "application/pdf" and ocr_mode == "catalog")
-                )
+            content, parse_ms = await self._parse_content(
+                document_id, document, raw_content, ocr_mode, task_id, log
             )
 
-            # OCR is long-running (10s+/page). Close session before OCR
-            # to return the connection to the pool. Non-OCR (JSON/TXT/CSV)
-            # is fast and doesn't need session close.
-            if needs_ocr and hasattr(self._doc_repo, '_session'):
-                try:
-                    await self._doc_repo._session.close()
-                except Exception:
-                    pass
-
-            if raw_content:
-                t0 = time.perf_counter()
-
-                # PNG/image: single page OCR (child of split PDF)
-                if document.content_type.startswith("image/") and hasattr(self._file_parser, "_ocr"):
-                    ocr_engine = self._file_parser._ocr
-                    from src.infrastructure.file_parser.ocr_engines.claude_vision_ocr import (
-                        OCR_PROMPTS,
-                    )
-                    prompt = OCR_PROMPTS.get(ocr_mode, OCR_PROMPTS.get("general", ""))
-                    content = await ocr_engine.ocr_page(raw_content, prompt=prompt)
-                    await _update_progress(task_id, 70)
-
-                # PDF: use async path with progress callback (no DB held)
-                elif (
-                    document.content_type == "application/pdf"
-                    and hasattr(self._file_parser, "parse_pdf_async")
-                ):
-                    async def _on_progress(done: int, total: int) -> None:
-                        pct = round(done / total * 70) if total else 0
-                        await _update_progress(task_id, pct)
-                        log.info("ocr.progress", done=done, total=total)
-
-                    content = await self._file_parser.parse_pdf_async(
-                        raw_content,
-                        ocr_mode=ocr_mode,
-                        on_progress=_on_progress,
-                    )
-                else:
-                    content = await asyncio.to_thread(
-                        self._file_parser.parse,
-                        raw_content,
-                        document.content_type,
-                        ocr_mode,
-                    )
-
-                parse_ms = round((time.perf_counter() - t0) * 1000)
-                log.info("document.parse.done", duration_ms=parse_ms)
-
-                # Refresh session after long OCR — old connection may be dead
-                if needs_ocr and hasattr(self._doc_repo, '_session'):
-                    try:
-                        from src.infrastructure.db.engine import async_session_factory
-                        new_session = async_session_factory()
-                        self._doc_repo._session = new_session
-                        self._task_repo._session = new_session
-                        self._kb_repo._session = new_session
-                    except Exception:
-                        pass
-
-                await self._doc_repo.update_content(document_id, content)
-
-                # Record OCR token usage if applicable
-                if self._record_usage and hasattr(self._file_parser, "last_input_tokens"):
-                    in_tok = self._file_parser.last_input_tokens
-                    out_tok = self._file_parser.last_output_tokens
-                    if in_tok > 0 or out_tok > 0:
-                        model = getattr(self._file_parser, "last_model", "claude-haiku-4-5-20251001")
-                        await self._record_usage.execute(
-                            tenant_id=document.tenant_id,
-                            request_type="ocr",
-                            usage=TokenUsage(
-                                model=model,
-                                input_tokens=in_tok,
-                                output_tokens=out_tok,
-                            ),
-                            kb_id=document.kb_id,
-                        )
-            else:
-                # Fallback for legacy documents without raw_content
-                content = document.content
-                parse_ms = 0
-
             # Pre-process: normalize + boilerplate removal
             t0 = time.perf_counter()
             preprocessed = TextPreprocessor.preprocess(
@@ -241,224 +202,73 @@ class ProcessDocumentUseCase:
             # Empty chunks early return
             if not chunks:
                 log.warning("document.process.empty")
-                await self._doc_repo.update_status(
-                    document_id, "processed", chunk_count=0
-                )
-                await self._task_repo.update_status(task_id, "completed", progress=100)
+                await self._complete_empty(document_id, task_id)
                 return
 
-            # Calculate chunk quality (before filtering, for full picture)
-            quality = ChunkQualityService.calculate(chunks)
-            await self._doc_repo.update_quality(
-                document_id,
-                quality_score=quality.score,
-                avg_chunk_length=quality.avg_chunk_length,
-                min_chunk_length=quality.min_chunk_length,
-                max_chunk_length=quality.max_chunk_length,
-                quality_issues=list(quality.issues),
-            )
-            log.info(
-                "document.quality.calculated",
-                quality_score=quality.score,
-                issues=quality.issues,
-            )
-
-            # Filter low-quality chunks
-            filter_result = ChunkFilterService.filter(chunks)
-            if filter_result.rejected_count:
-                log.info(
-                    "document.chunks.filtered",
-                    rejected=filter_result.rejected_count,
-                )
-            chunks = filter_result.accepted
-
-            # Deduplicate
-            pre_dedup = len(chunks)
-            chunks = ChunkDeduplicationService.deduplicate(chunks)
-            if len(chunks) < pre_dedup:
-                log.info(
-                    "document.chunks.deduplicated",
-                    before=pre_dedup,
-                    after=len(chunks),
-                )
+            chunks = await self._filter_chunks(document_id, chunks, log)
 
             # Empty after filtering/dedup
             if not chunks:
                 log.warning("document.process.empty_after_filter")
-                await self._doc_repo.update_status(
-                    document_id, "processed", chunk_count=0
-                )
-                await self._task_repo.update_status(task_id, "completed", progress=100)
+                await self._complete_empty(document_id, task_id)
                 return
 
             # ── Contextual Enrichment (Contextual Retrieval) ──
-            # Resolve: KB setting → tenant default → skip
-            context_model = getattr(kb, "context_model", "") if kb else ""
-            if not context_model and self._tenant_repo:
-                try:
-                    tenant = await self._tenant_repo.find_by_id(document.tenant_id)
-                    context_model = getattr(tenant, "default_context_model", "") if tenant else ""
-                except Exception:
-                    pass
-            if self._context_service and context_model:
+            context_model = await self._resolve_context_model(kb, document)
+            with_context = bool(self._context_service and context_model)
+            if with_context:
                 # Close session before LLM calls (same pattern as OCR)
-                if hasattr(self._doc_repo, '_session'):
-                    try:
-                        await self._doc_repo._session.close()
-                    except Exception:
-                        pass
-
-                t0 = time.perf_counter()
-                chunks = await self._context_service.generate_contexts(
-                    content, chunks, model=context_model
-                )
-                ctx_ms = round((time.perf_counter() - t0) * 1000)
-                ctx_count = sum(1 for c in chunks if c.context_text)
+                await self._close_session()
+
+            # 75% — ingestion pipeline start
+            await _update_progress(task_id, 75)
+
+            run = _IngestRun(
+                document_id=document_id,
+                document=document,
+                task_id=task_id,
+                content=content,
+                language=language,
+                context_model=context_model,
+                collection=f"kb_{document.kb_id}",
+                total=len(chunks),
+            )
+            t0 = time.perf_counter()
+            chunks, pipeline_metrics = await self._run_pipeline(
+                run, chunks, with_context
+            )
+            pipeline_ms = round((time.perf_counter() - t0) * 1000)
+            log.info(
+                "document.pipeline.done",
+                collection=run.collection,
+                point_count=len(chunks),
+                duration_ms=pipeline_ms,
+                stages=pipeline_metrics,
+            )
+            if with_context:
                 log.info(
                     "document.context.done",
-                    enriched=ctx_count,
+                    enriched=sum(1 for c in chunks if c.context_text),
                     total=len(chunks),
-                    duration_ms=ctx_ms,
                 )
-
                 # Refresh session after LLM calls — must be done **before**
                 # record_usage（否則 usage_repo._session 仍是已關閉的 session
                 # → record_usage.save 沉默失敗，token 永遠寫不進 DB）。
-                # S-LLM-Cache.1 fix：同步 refresh record_usage 的 inner repo session。
-                if hasattr(self._doc_repo, '_session'):
-                    try:
-                        from src.infrastructure.db.engine import async_session_factory
-                        new_session = async_session_factory()
-                        self._doc_repo._session = new_session
-                        self._task_repo._session = new_session
-                        self._kb_repo._session = new_session
-                        # 關鍵：record_usage 的 usage_repository 也綁同一個
-                        # ContextVar session（已被 close 了），需顯式 refresh
-                        if (
-                            self._record_usage is not None
-                            and hasattr(self._record_usage, "_repo")
-                            and hasattr(self._record_usage._repo, "_session")
-                        ):
-                            self._record_usage._repo._session = new_session
-                    except Exception:
-                        pass
-
-                # Token-Gov.0: 記錄 contextual retrieval token 用量
-                # S-LLM-Cache.1: 加上 cache_read / cache_creation 欄位
-                if self._record_usage and getattr(
-                    self._context_service, "last_input_tokens", 0
-                ) + getattr(
-                    self._context_service, "last_output_tokens", 0
-                ) > 0:
-                    ctx_in = self._context_service.last_input_tokens
-                    ctx_out = self._context_service.last_output_tokens
-                    ctx_cache_read = getattr(
-                        self._context_service, "last_cache_read_tokens", 0
-                    )
-                    ctx_cache_creation = getattr(
-                        self._context_service, "last_cache_creation_tokens", 0
-                    )
-                    ctx_model = getattr(
-                        self._context_service, "last_model", context_model
-                    )
-                    await self._record_usage.execute(
-                        tenant_id=document.tenant_id,
-                        request_type=UsageCategory.CONTEXTUAL_RETRIEVAL.value,
-                        usage=TokenUsage(
-                            model=ctx_model,
-                            input_tokens=ctx_in,
-                            output_tokens=ctx_out,
-                            cache_read_tokens=ctx_cache_read,
-                            cache_creation_tokens=ctx_cache_creation,
-                        ),
-                        kb_id=document.kb_id,
-                    )
-
-                await _update_progress(task_id, 73)
+                self._refresh_sessions(include_usage=True)
 
-            # 75% — chunks saved
-            await _update_progress(task_id, 75)
+            await self._record_pipeline_usage(run)
 
-            # Save chunks to DB
+            # Save chunks to DB（context_text 要等 pipeline 跑完才齊）
             t0 = time.perf_counter()
             await self._doc_repo.save_chunks(chunks)
+            chunks_saved = True
             save_ms = round((time.perf_counter() - t0) * 1000)
             log.info("document.chunks.saved", chunk_count=len(chunks), duration_ms=save_ms)
 
-            # 80% — embedding
-            await _update_progress(task_id, 80)
-
-            # Embed chunks (with context if available)
-            t0 = time.perf_counter()
-            texts = [
-                f"{c.context_text}\n\n{c.content}" if c.context_text else c.content
-                for c in chunks
-            ]
-            vectors = await self._embedding.embed_texts(texts)
-            embed_ms = round((time.perf_counter() - t0) * 1000)
-            log.info("document.embed.done", vector_count=len(vectors), duration_ms=embed_ms)
-
-            # Record embedding token usage
-            if self._record_usage and hasattr(self._embedding, "last_total_tokens"):
-                embed_tokens = self._embedding.last_total_tokens
-                if embed_tokens > 0:
-                    embed_model = getattr(self._embedding, "_model", "text-embedding-3-large")
-                    await self._record_usage.execute(
-                        tenant_id=document.tenant_id,
-                        request_type="embedding",
-                        usage=TokenUsage(
-                            model=embed_model,
-                            input_tokens=embed_tokens,
-                            output_tokens=0,
-                        ),
-                        kb_id=document.kb_id,
-                    )
-
-            # 90% — upserting vectors
-            await _update_progress(task_id, 90)
-
-            # Ensure Milvus collection exists
-            collection = f"kb_{document.kb_id}"
-            vector_size = len(vectors[0]) if vectors else 3072
-            await self._vector_store.ensure_collection(
-                collection, vector_size
-            )
-
-            # Upsert vectors with tenant_id in payload
-            t0 = time.perf_counter()
-            chunk_ids = [c.id.value for c in chunks]
-            # Issue #44: propagate document.source / source_id to every chunk
-            # payload so DELETE /by-source filter expressions can find them.
-            doc_source = getattr(document, "source", "") or ""
-            doc_source_id = getattr(document, "source_id", "") or ""
-            payloads = [
-                {
-                    "tenant_id": document.tenant_id,
-                    "document_id": document_id,
-                    "content": c.content,
-                    "chunk_index": c.chunk_index,
-                    "content_type": document.content_type,
-                    "language": language,
-                    "source": doc_source,
-                    "source_id": doc_source_id,
-                    **{
-                        k: v
-                        for k, v in c.metadata.items()
-                        if k not in ("document_id", "tenant_id", "source", "source_id")
-                    },
-                }
-                for c in chunks
-            ]
-            await self._vector_store.upsert(
-                collection, chunk_ids, vectors, payloads
-            )
-            upsert_ms = round((time.perf_counter() - t0) * 1000)
-            log.info(
-                "document.upsert.done",
-                collection=collection,
-                point_count=len(chunk_ids),
-                duration_ms=upsert_ms,
-            )
+            try:
+                await self._task_repo.update_metrics(task_id, pipeline_metrics)
+            except Exception:
+                log.warning("document.metrics.save_failed", exc_info=True)
 
             # If child document (PDF page), generate semantic filename
             # 共用 helper — process + reprocess 都呼叫，避免 pipeline drift
@@ -496,9 +306,8 @@ class ProcessDocumentUseCase:
                 parse_ms=parse_ms,
                 preprocess_ms=preprocess_ms,
                 split_ms=split_ms,
+                pipeline_ms=pipeline_ms,
                 save_ms=save_ms,
-                embed_ms=embed_ms,
-                upsert_ms=upsert_ms,
                 chunk_count=len(chunks),
             )
 
@@ -517,26 +326,389 @@ class ProcessDocumentUseCase:
 
         except Exception as e:
             log.exception("document.process.failed", error=str(e))
-            # Update task → failed
-            await self._task_repo.update_status(
-                task_id,
-                "failed",
-                error_message=str(e),
-            )
-            # Update document → failed
-            try:
-                await self._doc_repo.update_status(document_id, "failed")
-            except Exception:
-                log.exception("document.status_update.failed")
-            # Auto-classify on failure too (all done = trigger)
+            # pipeline 已寫進 Milvus、但 chunk 還沒存進 DB：向量可被搜到卻
+            # 沒有對應的 chunk row，重試時又會再寫一份 → 整份文件的向量刪掉
+            if run is not None and run.upsert_started and not chunks_saved:
+                await self._discard_vectors(run, log)
+            await self._mark_failed(document_id, task_id, document, e, log)
+            # Re-raise so safe_background_task can write to Error Tracking
+            raise
+
+    async def _mark_failed(
+        self,
+        document_id: str,
+        task_id: str,
+        document: Document | None,
+        error: Exception,
+        log,
+    ) -> None:
+        # Update task → failed
+        await self._task_repo.update_status(
+            task_id,
+            "failed",
+            error_message=str(error),
+        )
+        # Update document → failed
+        try:
+            await self._doc_repo.update_status(document_id, "failed")
+        except Exception:
+            log.exception("document.status_update.failed")
+        # Auto-classify on failure too (all done = trigger)
+        if document is not None:
             try:
                 await self._maybe_trigger_classification(
                     document.kb_id, document.tenant_id, log
                 )
             except Exception:
                 pass
-            # Re-raise so safe_background_task can write to Error Tracking
-            raise
+
+    async def _load_raw_content(self, document: Document, log) -> bytes | None:
+        """Load raw content: prefer file storage, fallback to DB BYTEA."""
+        if document.storage_path:
+            try:
+                return await self._file_storage.load(document.storage_path)
+            except FileNotFoundError:
+                log.warning("document.file_storage.missing")
+        return document.raw_content
+
+    async def _parse_content(
+        self,
+        document_id: str,
+        document: Document,
+        raw_content: bytes | None,
+        ocr_mode: str,
+        task_id: str,
+        log,
+    ) -> tuple[str, int]:
+        """Parse raw content → text；回傳 (content, parse_ms)。"""
+        if not raw_content:
+            # Fallback for legacy documents without raw_content
+            return document.content, 0
+
+        # Determine if this is a long-running OCR path
+        needs_ocr = document.content_type.startswith("image/") or (
+            document.content_type == "application/pdf" and ocr_mode == "catalog"
+        )
+
+        # OCR is long-running (10s+/page). Close session before OCR
+        # to return the connection to the pool. Non-OCR (JSON/TXT/CSV)
+        # is fast and doesn't need session close.
+        if needs_ocr:
+            await self._close_session()
+
+        t0 = time.perf_counter()
+
+        # PNG/image: single page OCR (child of split PDF)
+        if document.content_type.startswith("image/") and hasattr(self._file_parser, "_ocr"):
+            ocr_engine = self._file_parser._ocr
+            from src.infrastructure.file_parser.ocr_engines.claude_vision_ocr import (
+                OCR_PROMPTS,
+            )
+            prompt = OCR_PROMPTS.get(ocr_mode, OCR_PROMPTS.get("general", ""))
+            content = await ocr_engine.ocr_page(raw_content, prompt=prompt)
+            await _update_progress(task_id, 70)
+
+        # PDF: use async path with progress callback (no DB held)
+        elif (
+            document.content_type == "application/pdf"
+            and hasattr(self._file_parser, "parse_pdf_async")
+        ):
+            async def _on_progress(done: int, total: int) -> None:
+                pct = round(done / total * 70) if total else 0
+                await _update_progress(task_id, pct)
+                log.info("ocr.progress", done=done, total=total)
+
+            async def _on_page(page_number: int, text: str) -> None:
+                log.info("ocr.page_done", page=page_number, chars=len(text))
+
+            content = await self._file_parser.parse_pdf_async(
+                raw_content,
+                ocr_mode=ocr_mode,
+                on_progress=_on_progress,
+                on_page=_on_page,
+            )
+        else:
+            content = await asyncio.to_thread(
+                self._file_parser.parse,
+                raw_content,
+                document.content_type,
+                ocr_mode,
+            )
+
+        parse_ms = round((time.perf_counter() - t0) * 1000)
+        log.info("document.parse.done", duration_ms=parse_ms)
+
+        # Refresh session after long OCR — old connection may be dead
+        if needs_ocr:
+            self._refresh_sessions(include_usage=False)
+
+        await self._doc_repo.update_content(document_id, content)
+
+        # Record OCR token usage if applicable
+        if self._record_usage and hasattr(self._file_parser, "last_input_tokens"):
+            in_tok = self._file_parser.last_input_tokens
+            out_tok = self._file_parser.last_output_tokens
+            if in_tok > 0 or out_tok > 0:
+                model = getattr(self._file_parser, "last_model", "claude-haiku-4-5-20251001")
+                await self._record_usage.execute(
+                    tenant_id=document.tenant_id,
+                    request_type="ocr",
+                    usage=TokenUsage(
+                        model=model,
+                        input_tokens=in_tok,
+                        output_tokens=out_tok,
+                    ),
+                    kb_id=document.kb_id,
+                )
+        return content, parse_ms
+
+    async def _filter_chunks(
+        self, document_id: str, chunks: list[Chunk], log
+    ) -> list[Chunk]:
+        """記錄品質指標後過濾低品質 chunk 並去重。"""
+        # Calculate chunk quality (before filtering, for full picture)
+        quality = ChunkQualityService.calculate(chunks)
+        await self._doc_repo.update_quality(
+            document_id,
+            quality_score=quality.score,
+            avg_chunk_length=quality.avg_chunk_length,
+            min_chunk_length=quality.min_chunk_length,
+            max_chunk_length=quality.max_chunk_length,
+            quality_issues=list(quality.issues),
+        )
+        log.info(
+            "document.quality.calculated",
+            quality_score=quality.score,
+            issues=quality.issues,
+        )
+
+        # Filter low-quality chunks
+        filter_result = ChunkFilterService.filter(chunks)
+        if filter_result.rejected_count:
+            log.info(
+                "document.chunks.filtered",
+                rejected=filter_result.rejected_count,
+            )
+        chunks = filter_result.accepted
+
+        # Deduplicate
+        pre_dedup = len(chunks)
+        chunks = ChunkDeduplicationService.deduplicate(chunks)
+        if len(chunks) < pre_dedup:
+            log.info(
+                "document.chunks.deduplicated",
+                before=pre_dedup,
+                after=len(chunks),
+            )
+        return chunks
+
+    async def _complete_empty(self, document_id: str, task_id: str) -> None:
+        await self._doc_repo.update_status(
+            document_id, "processed", chunk_count=0
+        )
+        await self._task_repo.update_status(task_id, "completed", progress=100)
+
+    async def _resolve_context_model(
+        self, kb: KnowledgeBase | None, document: Document
+    ) -> str:
+        """Resolve: KB setting → tenant default → skip。"""
+        context_model = getattr(kb, "context_model", "") if kb else ""
+        if not context_model and self._tenant_repo:
+            try:
+                tenant = await self._tenant_repo.find_by_id(document.tenant_id)
+                context_model = getattr(tenant, "default_context_model", "") if tenant else ""
+            except Exception:
+                pass
+        return context_model
+
+    async def _close_session(self) -> None:
+        if hasattr(self._doc_repo, '_session'):
+            try:
+                await self._doc_repo._session.close()
+            except Exception:
+                pass
+
+    def _refresh_sessions(self, *, include_usage: bool) -> None:
+        """長時間 OCR / LLM 呼叫後換新 session（舊連線可能已斷）。"""
+        if not hasattr(self._doc_repo, '_session'):
+            return
+        try:
+            from src.infrastructure.db.engine import async_session_factory
+            new_session = async_session_factory()
+            self._doc_repo._session = new_session
+            self._task_repo._session = new_session
+            self._kb_repo._session = new_session
+            # S-LLM-Cache.1 fix：record_usage 的 usage_repository 也綁同一個
+            # ContextVar session（已被 close 了），需顯式 refresh
+            if (
+                include_usage
+                and self._record_usage is not None
+                and hasattr(self._record_usage, "_repo")
+                and hasattr(self._record_usage._repo, "_session")
+            ):
+                self._record_usage._repo._session = new_session
+        except Exception:
+            pass
+
+    async def _run_pipeline(
+        self, run: _IngestRun, chunks: list[Chunk], with_context: bool
+    ) -> tuple[list[Chunk], dict]:
+        """Streaming ingestion：context → embed → upsert。
+
+        chunk batch 流過各 stage，stage 間 bounded queue；同時在途的向量只有
+        幾個 batch，embedding 與 Milvus 互相重疊。回傳依 chunk 順序排好的
+        chunks 與各 stage metrics。
+        """
+        stages = []
+        if with_context:
+            stages.append(
+                Stage(
+                    "context",
+                    partial(self._context_stage, run),
+                    self._context_concurrency,
+                )
+            )
+        stages.append(
+            Stage("embed", partial(self._embed_stage, run), self._embed_concurrency)
+        )
+        stages.append(
+            Stage(
+                "upsert", partial(self._upsert_stage, run), self._upsert_concurrency
+            )
+        )
+        pipeline = IngestionPipeline(stages, queue_size=self._ingest_queue_size)
+
+        size = self._ingest_batch_size
+        done_batches = await pipeline.run(
+            _IngestBatch(index=i // size, chunks=chunks[i : i + size])
+            for i in range(0, len(chunks), size)
+        )
+        ordered = [
+            c
+            for batch in sorted(done_batches, key=lambda b: b.index)
+            for c in batch.chunks
+        ]
+        return ordered, pipeline.metrics()
+
+    async def _context_stage(
+        self, run: _IngestRun, batch: _IngestBatch
+    ) -> _IngestBatch:
+        svc = self._context_service
+        batch.chunks = await svc.generate_contexts(
+            run.content, batch.chunks, model=run.context_model
+        )
+        # await 回來到下一個 await 之間不會交錯 → 讀到的是本次用量
+        usage = run.usage
+        usage["ctx_in"] += _token_attr(svc, "last_input_tokens")
+        usage["ctx_out"] += _token_attr(svc, "last_output_tokens")
+        usage["ctx_cache_read"] += _token_attr(svc, "last_cache_read_tokens")
+        usage["ctx_cache_creation"] += _token_attr(
+            svc, "last_cache_creation_tokens"
+        )
+        return batch
+
+    async def _embed_stage(
+        self, run: _IngestRun, batch: _IngestBatch
+    ) -> _IngestBatch:
+        texts = [
+            f"{c.context_text}\n\n{c.content}" if c.context_text else c.content
+            for c in batch.chunks
+        ]
+        batch.vectors = await self._embedding.embed_texts(texts)
+        run.usage["embed"] += _token_attr(self._embedding, "last_total_tokens")
+        return batch
+
+    async def _upsert_stage(
+        self, run: _IngestRun, batch: _IngestBatch
+    ) -> _IngestBatch:
+        document = run.document
+        vectors = batch.vectors or []
+        async with run.collection_lock:
+            if not run.collection_ready:
+                # Ensure Milvus collection exists
+                vector_size = len(vectors[0]) if vectors else 3072
+                await self._vector_store.ensure_collection(
+                    run.collection, vector_size
+                )
+                run.collection_ready = True
+        # Issue #44: propagate document.source / source_id to every chunk
+        # payload so DELETE /by-source filter expressions can find them.
+        payloads = [
+            {
+                "tenant_id": document.tenant_id,
+                "document_id": run.document_id,
+                "content": c.content,
+                "chunk_index": c.chunk_index,
+                "content_type": document.content_type,
+                "language": run.language,
+                "source": getattr(document, "source", "") or "",
+                "source_id": getattr(document, "source_id", "") or "",
+                **{
+                    k: v
+                    for k, v in c.metadata.items()
+                    if k not in ("document_id", "tenant_id", "source", "source_id")
+                },
+            }
+            for c in batch.chunks
+        ]
+        run.upsert_started = True
+        await self._vector_store.upsert(
+            run.collection, [c.id.value for c in batch.chunks], vectors, payloads
+        )
+        batch.vectors = None  # 向量已寫入 Milvus，不再留在記憶體
+        run.upserted += len(batch.chunks)
+        pct = 75 + round(run.upserted / run.total * 20)
+        if pct > run.last_pct:
+            run.last_pct = pct
+            await _update_progress(run.task_id, pct)
+        return batch
+
+    async def _discard_vectors(self, run: _IngestRun, log) -> None:
+        try:
+            await self._vector_store.delete(
+                run.collection,
+                {"document_id": run.document_id},
+                raise_on_error=True,
+            )
+            log.info("document.vectors.discarded", collection=run.collection)
+        except Exception:
+            log.exception("document.vectors.discard_failed")
+
+    async def _record_pipeline_usage(self, run: _IngestRun) -> None:
+        document = run.document
+        usage = run.usage
+        # Token-Gov.0: 記錄 contextual retrieval token 用量
+        # S-LLM-Cache.1: 加上 cache_read / cache_creation 欄位
+        if self._record_usage and usage["ctx_in"] + usage["ctx_out"] > 0:
+            ctx_model = getattr(
+                self._context_service, "last_model", run.context_model
+            ) or run.context_model
+            await self._record_usage.execute(
+                tenant_id=document.tenant_id,
+                request_type=UsageCategory.CONTEXTUAL_RETRIEVAL.value,
+                usage=TokenUsage(
+                    model=ctx_model,
+                    input_tokens=usage["ctx_in"],
+                    output_tokens=usage["ctx_out"],
+                    cache_read_tokens=usage["ctx_cache_read"],
+                    cache_creation_tokens=usage["ctx_cache_creation"],
+                ),
+                kb_id=document.kb_id,
+            )
+
+        # Record embedding token usage
+        if self._record_usage and usage["embed"] > 0:
+            embed_model = getattr(self._embedding, "_model", "text-embedding-3-large")
+            await self._record_usage.execute(
+                tenant_id=document.tenant_id,
+                request_type="embedding",
+                usage=TokenUsage(
+                    model=embed_model,
+                    input_tokens=usage["embed"],
+                    output_tokens=0,
+                ),
+                kb_id=document.kb_id,
+            )
 
     # _rename_child_page 已抽到 _child_rename.py 共用（process + reprocess 都呼叫）
 
@@ -567,7 +739,8 @@ class ProcessDocumentUseCase:
             log.info("classify_kb.check", kb_id=kb_id, pending=pending)
             if pending == 0:
                 from src.infrastructure.queue.arq_pool import enqueue
-                await enqueue("classify_kb", kb_id, tenant_id)
+                # 增量：既有分類有 centroid 時只指派新 chunk
+                await enqueue("classify_kb", kb_id, tenant_id, True)
                 log.info("classify_kb.auto_triggered", kb_id=kb_id)
         except Exception:
             log.warning("classify_kb.auto_trigger_failed", exc_info=True)
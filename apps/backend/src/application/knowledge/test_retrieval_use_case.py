@@ -44,7 +44,7 @@ class TestRetrievalCommand:
     # === Real-RAG 對齊參數 ===
     score_threshold: float = 0.0  # Playground 預設 0.0；real RAG 預設 0.3
     rerank_enabled: bool = False
-    rerank_model: str = ""  # 空 → llm_rerank 預設 (claude-haiku-4-5)
+    rerank_model: str = ""  # 空 → LLM rerank 預設 (claude-haiku-4-5)；local:lexical → 本地
     rerank_top_n: int = 20
     # Issue #43 — multi-mode retrieval
     # retrieval_modes 為空 → 兼容舊參數 query_rewrite_enabled 自動轉換
@@ -31,6 +31,7 @@ from src.domain.conversation.feedback_value_objects import (
 from src.domain.conversation.history_strategy import (
     ConversationHistoryStrategy,
     HistoryStrategyConfig,
+    prepend_stored_summary,
 )
 from src.domain.conversation.repository import ConversationRepository
 from src.domain.line.entity import LinePostbackEvent, LineTextMessageEvent
@@ -121,6 +122,8 @@ class HandleWebhookUseCase:
         intent_classifier: Any | None = None,
         worker_config_repo: Any | None = None,
         history_strategy: ConversationHistoryStrategy | None = None,
+        history_window: int = 0,
+        batch_writer: Any | None = None,
     ):
         self._agent_service = agent_service
         self._bot_repository = bot_repository
@@ -138,11 +141,14 @@ class HandleWebhookUseCase:
         self._conversation_lock = conversation_lock
         self._conversation_timeout = timedelta(minutes=conversation_timeout_minutes)
         self._trace_session_factory = trace_session_factory
+        self._batch_writer = batch_writer
         # Issue: dev-vm 5/4 trace 顯示 LINE 多輪對話 history_loaded_status="lost"
         # — 因為原本沒過 history_strategy 直接傳 raw history list，
         # process_message(history_context="") 讓 react_agent 沒 inject 對話歷史。
         # 加 strategy 後與 send_message_use_case 行為對齊。
         self._history_strategy = history_strategy
+        # > 0：只載入最後 max(history_window, bot history_limit) 則訊息
+        self._history_window = history_window
 
     async def _get_bot_cached(self, bot_id: str) -> Bot | None:
         """Redis 快取查 Bot（by ID），預設 120 秒 TTL。"""
@@ -302,9 +308,18 @@ class HandleWebhookUseCase:
     ) -> Conversation:
         """Find or create conversation for a LINE user, with timeout segmentation."""
         if self._conversation_repo:
-            existing = await self._conversation_repo.find_latest_by_visitor(
-                user_id, bot.id.value
-            )
+            if self._history_window > 0:
+                existing = (
+                    await self._conversation_repo.find_latest_window_by_visitor(
+                        user_id,
+                        bot.id.value,
+                        max(self._history_window, bot.llm_params.history_limit),
+                    )
+                )
+            else:
+                existing = await self._conversation_repo.find_latest_by_visitor(
+                    user_id, bot.id.value
+                )
             if existing and existing.messages:
                 last_msg = existing.messages[-1]
                 elapsed = datetime.now(timezone.utc) - last_msg.created_at
@@ -367,6 +382,11 @@ class HandleWebhookUseCase:
                     history_len=len(history),
                     fallback_chars=len(history_context),
                 )
+            if conversation.history_offset:
+                # 視窗外的舊訊息以 DB 摘要代替
+                history_context = prepend_stored_summary(
+                    history_context, conversation.summary
+                )
 
         llm_params: dict = {
             "temperature": bot.llm_params.temperature,
@@ -530,12 +550,12 @@ class HandleWebhookUseCase:
             # S-Gov.6b: bump counters for cron pending-summary detection
             from datetime import datetime, timezone
 
-            conversation.message_count = len(conversation.messages)
+            conversation.message_count = conversation.total_messages
             conversation.last_message_at = datetime.now(timezone.utc)
             await self._conversation_repo.save(conversation)
 
         # Persist agent trace to DB
-        if trace and self._trace_session_factory:
+        if trace and (self._trace_session_factory or self._batch_writer):
             try:
                 from src.infrastructure.db.models.agent_trace_model import AgentExecutionTraceModel
                 trace.conversation_id = conversation.id.value
@@ -555,9 +575,12 @@ class HandleWebhookUseCase:
                     total_ms=trace.total_ms,
                     total_tokens=trace.total_tokens,
                 )
-                async with self._trace_session_factory() as session:
-                    session.add(row)
-                    await session.commit()
+                if self._batch_writer is not None and self._batch_writer.accepting:
+                    self._batch_writer.offer(row)
+                elif self._trace_session_factory:
+                    async with self._trace_session_factory() as session:
+                        session.add(row)
+                        await session.commit()
             except Exception:
                 logger.warning("line.trace_persist_failed", exc_info=True)
 
@@ -2,6 +2,9 @@
 
 對應既有 scripts/rebuild_milvus_scalar_index.py 的單 collection 版本，
 提供 admin API 用於新建 collection 後的 INVERTED index 重建。
+
+帶 ``partition_key`` 時改走 layout 遷移（``VectorStore.migrate_partition_key``）：
+Milvus 無法就地變更 partition key，需重建 collection 並複製資料。
 """
 
 from __future__ import annotations
@@ -20,6 +23,9 @@ logger = structlog.get_logger(__name__)
 class RebuildIndexCommand:
     collection_name: str
     actor: str = ""
+    # None = 只重建 scalar index；"" = 移除 partition key；
+    # "tenant_id" / "document_id" = 遷移到該 partition-key layout
+    partition_key: str | None = None
 
 
 class RebuildIndexUseCase:
@@ -29,6 +35,9 @@ class RebuildIndexUseCase:
     async def execute(
         self, command: RebuildIndexCommand
     ) -> dict[str, Any]:
+        if command.partition_key is not None:
+            return await self._migrate_partition_key(command)
+
         # 具體 rebuild 動作由 VectorStore.rebuild_scalar_indexes 實作
         # (infrastructure/milvus 端加，預設空操作)
         rebuilder = getattr(self._vs, "rebuild_scalar_indexes", None)
@@ -47,3 +56,23 @@ class RebuildIndexUseCase:
             result=result,
         )
         return {"status": "ok", "collection": command.collection_name, **result}
+
+    async def _migrate_partition_key(
+        self, command: RebuildIndexCommand
+    ) -> dict[str, Any]:
+        migrator = getattr(self._vs, "migrate_partition_key", None)
+        if migrator is None:
+            logger.warning(
+                "milvus.partition_key_migration.not_supported",
+                collection=command.collection_name,
+            )
+            return {"status": "not_supported", "collection": command.collection_name}
+
+        result = await migrator(command.collection_name, command.partition_key)
+        logger.info(
+            "kb_studio.milvus.partition_key_migration",
+            collection=command.collection_name,
+            actor=command.actor,
+            result=result,
+        )
+        return {"status": "ok", "collection": command.collection_name, **result}
@@ -1,14 +1,22 @@
 """刪除 MCP Server 註冊用例"""
 
 from src.domain.platform.repository import McpServerRegistrationRepository
+from src.domain.shared.config_invalidation import (
+    SCOPE_MCP_REGISTRY,
+    ConfigInvalidationBus,
+)
 
 
 class DeleteMcpServerUseCase:
     def __init__(
         self,
         mcp_server_repository: McpServerRegistrationRepository,
+        config_invalidation_bus: ConfigInvalidationBus | None = None,
     ) -> None:
         self._repo = mcp_server_repository
+        self._invalidation_bus = config_invalidation_bus
 
     async def execute(self, server_id: str) -> None:
         await self._repo.delete(server_id)
+        if self._invalidation_bus is not None:
+            await self._invalidation_bus.publish(SCOPE_MCP_REGISTRY, server_id)
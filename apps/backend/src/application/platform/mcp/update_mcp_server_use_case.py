@@ -6,6 +6,10 @@ from datetime import datetime, timezone
 from src.domain.platform.entity import McpServerRegistration
 from src.domain.platform.repository import McpServerRegistrationRepository
 from src.domain.platform.value_objects import McpRegistryToolMeta
+from src.domain.shared.config_invalidation import (
+    SCOPE_MCP_REGISTRY,
+    ConfigInvalidationBus,
+)
 from src.domain.shared.exceptions import EntityNotFoundError
 
 _SIMPLE_FIELDS = (
@@ -35,8 +39,10 @@ class UpdateMcpServerUseCase:
     def __init__(
         self,
         mcp_server_repository: McpServerRegistrationRepository,
+        config_invalidation_bus: ConfigInvalidationBus | None = None,
     ) -> None:
         self._repo = mcp_server_repository
+        self._invalidation_bus = config_invalidation_bus
 
     async def execute(
         self, command: UpdateMcpServerCommand
@@ -50,6 +56,10 @@ class UpdateMcpServerUseCase:
         self._apply_updates(server, command)
         server.updated_at = datetime.now(timezone.utc)
         await self._repo.save(server)
+        if self._invalidation_bus is not None:
+            await self._invalidation_bus.publish(
+                SCOPE_MCP_REGISTRY, command.server_id
+            )
         return server
 
     @staticmethod
@@ -5,6 +5,10 @@ from datetime import datetime, timezone
 
 from src.domain.platform.entity import SystemPromptConfig
 from src.domain.platform.repository import SystemPromptConfigRepository
+from src.domain.shared.config_invalidation import (
+    SCOPE_SYSTEM_PROMPT,
+    ConfigInvalidationBus,
+)
 
 
 class GetSystemPromptsUseCase:
@@ -24,9 +28,12 @@ class UpdateSystemPromptsCommand:
 
 class UpdateSystemPromptsUseCase:
     def __init__(
-        self, system_prompt_config_repository: SystemPromptConfigRepository
+        self,
+        system_prompt_config_repository: SystemPromptConfigRepository,
+        config_invalidation_bus: ConfigInvalidationBus | None = None,
     ) -> None:
         self._repo = system_prompt_config_repository
+        self._invalidation_bus = config_invalidation_bus
 
     async def execute(
         self, command: UpdateSystemPromptsCommand
@@ -35,4 +42,6 @@ class UpdateSystemPromptsUseCase:
         config.system_prompt = command.system_prompt
         config.updated_at = datetime.now(timezone.utc)
         await self._repo.save(config)
+        if self._invalidation_bus is not None:
+            await self._invalidation_bus.publish(SCOPE_SYSTEM_PROMPT)
         return config
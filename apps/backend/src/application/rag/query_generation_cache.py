@@ -0,0 +1,114 @@
+"""QueryGenerationCache — rewrite / HyDE 生成結果的跨 request 快取。
+
+``rewrite`` / ``hyde`` mode 每次 retrieve 都要多一趟 0.5–2 秒的 LLM call，
+而同一句 FAQ 一天會被問上千次。這裡把生成結果存進 ``TwoTierCache``
+（L1 process LRU + L2 Redis，跨 pod 共享）：
+
+- key = (kind, model, bot prompt hash, extra hint, 正規化 query)
+  —— bot 改 prompt / hint / model 自然換 key，不需要另外作廢
+- 生成結果與原 query 相同視為 fallback（``rewrite_query`` / ``generate_hyde``
+  失敗時回原 query），不寫入，下次照樣重試
+- 同一 key 併發 miss 時 single-flight：只打一次 LLM，其餘等同一個 task
+- 生成 task 與 caller 分離（shield）：caller 放棄等待時生成照樣完成並寫入
+  快取（speculative retrieval 超出 latency budget 的情況）
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import re
+import unicodedata
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from src.infrastructure.cache.two_tier_cache import TwoTierCache
+from src.infrastructure.logging import get_logger
+
+logger = get_logger(__name__)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """NFKC + 壓空白 + casefold；快取 key 用，不影響送出去的 query。"""
+    query = unicodedata.normalize("NFKC", query)
+    return _WHITESPACE_RE.sub(" ", query).strip().casefold()
+
+
+class QueryGenerationCache:
+    def __init__(self, cache: TwoTierCache) -> None:
+        self._cache = cache
+        self._inflight: dict[str, asyncio.Task[str]] = {}
+        self._stats: dict[str, dict[str, int]] = {}
+
+    @staticmethod
+    def key(
+        kind: str,
+        query: str,
+        model: str = "",
+        bot_system_prompt: str = "",
+        extra_hint: str = "",
+    ) -> str:
+        prompt_hash = (
+            hashlib.sha1(bot_system_prompt.encode("utf-8")).hexdigest()
+            if bot_system_prompt
+            else ""
+        )
+        raw = json.dumps(
+            [kind, model, prompt_hash, extra_hint.strip(), normalize_query(query)],
+            ensure_ascii=False,
+        )
+        return f"{kind}:{hashlib.sha1(raw.encode('utf-8')).hexdigest()}"
+
+    async def get_or_generate(
+        self,
+        kind: str,
+        query: str,
+        generate: Callable[[], Awaitable[str]],
+        *,
+        model: str = "",
+        bot_system_prompt: str = "",
+        extra_hint: str = "",
+    ) -> str:
+        """命中回快取值；miss 時呼叫 ``generate()`` 並寫回。"""
+        stats = self._stats.setdefault(
+            kind, {"hits": 0, "misses": 0, "stores": 0, "fallbacks": 0}
+        )
+        key = self.key(kind, query, model, bot_system_prompt, extra_hint)
+        cached = await self._cache.get(key)
+        if cached is not None:
+            stats["hits"] += 1
+            return cached.decode("utf-8")
+        stats["misses"] += 1
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._generate(kind, query, key, generate))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _generate(
+        self,
+        kind: str,
+        query: str,
+        key: str,
+        generate: Callable[[], Awaitable[str]],
+    ) -> str:
+        text = await generate()
+        stats = self._stats[kind]
+        if not text or text == query:
+            stats["fallbacks"] += 1
+            return text or query
+        await self._cache.set(key, text.encode("utf-8"))
+        stats["stores"] += 1
+        return text
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            **self._cache.stats(),
+            "inflight": len(self._inflight),
+            "per_kind": {kind: dict(s) for kind, s in self._stats.items()},
+        }
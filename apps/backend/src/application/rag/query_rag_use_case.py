@@ -1,6 +1,9 @@
 """RAG 查詢用例"""
 
 import asyncio
+import dataclasses
+import hashlib
+import json
 import time
 from collections.abc import AsyncIterator
 from dataclasses import dataclass, field
@@ -8,18 +11,32 @@ from typing import Any
 
 from src.application.rag._hyde_generator import generate_hyde
 from src.application.rag._query_rewriter import rewrite_query
+from src.application.rag.query_generation_cache import (
+    QueryGenerationCache,
+    normalize_query,
+)
+from src.application.rag.retrieval_result_cache import (
+    CachedHit,
+    RetrievalResultCache,
+)
 from src.domain.knowledge.repository import KnowledgeBaseRepository
+from src.domain.rag.fusion import DEFAULT_RRF_K, reciprocal_rank_fusion
 from src.domain.rag.retrieval_mode import (
     RetrievalMode,
     normalize_modes,
     validate_modes,
 )
-from src.domain.rag.services import EmbeddingService, LLMService, VectorStore
-from src.domain.rag.value_objects import RAGResponse, Source
+from src.domain.rag.services import (
+    EmbeddingService,
+    LexicalSearchService,
+    LLMService,
+    VectorStore,
+)
+from src.domain.rag.value_objects import RAGResponse, SearchResult, Source
 from src.domain.shared.exceptions import EntityNotFoundError, NoRelevantKnowledgeError
 from src.infrastructure.logging import get_logger
 from src.infrastructure.observability.agent_trace_collector import AgentTraceCollector
-from src.infrastructure.rag.llm_reranker import llm_rerank
+from src.infrastructure.rag.reranker import RerankService
 
 logger = get_logger(__name__)
 
@@ -67,6 +84,19 @@ class RetrieveResult:
     mode_queries: dict[str, str] = field(default_factory=dict)
 
 
+@dataclass
+class _DenseRetrieval:
+    mode_queries: dict[str, str]
+    ordered_modes: list[str]
+    # mode → per-kb 結果（順序同 kb_ids）
+    mode_results: dict[str, list[list[SearchResult]]]
+    gen_ms: int = 0
+    embed_ms: int = 0
+    search_ms: int = 0
+    # speculative 模式下超過 latency budget、沒併入結果的 mode
+    late_modes: list[str] = field(default_factory=list)
+
+
 class QueryRAGUseCase:
     def __init__(
         self,
@@ -76,6 +106,12 @@ class QueryRAGUseCase:
         llm_service: LLMService,
         api_key_resolver=None,
         record_usage=None,  # Token-Gov.0: 給 reranker 記錄 token 用量
+        lexical_search: LexicalSearchService | None = None,
+        rrf_k: int = DEFAULT_RRF_K,
+        reranker: RerankService | None = None,
+        retrieval_cache: RetrievalResultCache | None = None,
+        generation_cache: QueryGenerationCache | None = None,
+        speculative_budget_ms: int = 0,
     ) -> None:
         self._kb_repo = knowledge_base_repository
         self._embedding_service = embedding_service
@@ -83,6 +119,13 @@ class QueryRAGUseCase:
         self._llm_service = llm_service
         self._api_key_resolver = api_key_resolver  # async (provider_name) -> str
         self._record_usage = record_usage
+        self._lexical_search = lexical_search  # None → hybrid 退化成純向量
+        self._rrf_k = rrf_k
+        self._reranker = reranker or RerankService()
+        self._retrieval_cache = retrieval_cache
+        self._generation_cache = generation_cache
+        # >0：raw 向量檢索不等 rewrite/hyde，生成超過 budget 就只用 raw 結果
+        self._speculative_budget_ms = speculative_budget_ms
 
     async def _resolve_mode_queries(
         self, command: QueryRAGCommand, modes: list[str]
@@ -99,23 +142,35 @@ class QueryRAGUseCase:
         if RetrievalMode.REWRITE.value in modes:
             gen_tasks.append((
                 RetrievalMode.REWRITE.value,
-                rewrite_query(
-                    command.query,
-                    model=command.query_rewrite_model,
-                    bot_system_prompt=command.bot_system_prompt,
-                    extra_hint=command.query_rewrite_extra_hint,
-                    api_key_resolver=self._api_key_resolver,
+                self._memoized(
+                    RetrievalMode.REWRITE.value,
+                    command,
+                    command.query_rewrite_model,
+                    command.query_rewrite_extra_hint,
+                    lambda: rewrite_query(
+                        command.query,
+                        model=command.query_rewrite_model,
+                        bot_system_prompt=command.bot_system_prompt,
+                        extra_hint=command.query_rewrite_extra_hint,
+                        api_key_resolver=self._api_key_resolver,
+                    ),
                 ),
             ))
         if RetrievalMode.HYDE.value in modes:
             gen_tasks.append((
                 RetrievalMode.HYDE.value,
-                generate_hyde(
-                    command.query,
-                    model=command.hyde_model,
-                    bot_system_prompt=command.bot_system_prompt,
-                    extra_hint=command.hyde_extra_hint,
-                    api_key_resolver=self._api_key_resolver,
+                self._memoized(
+                    RetrievalMode.HYDE.value,
+                    command,
+                    command.hyde_model,
+                    command.hyde_extra_hint,
+                    lambda: generate_hyde(
+                        command.query,
+                        model=command.hyde_model,
+                        bot_system_prompt=command.bot_system_prompt,
+                        extra_hint=command.hyde_extra_hint,
+                        api_key_resolver=self._api_key_resolver,
+                    ),
                 ),
             ))
 
@@ -130,12 +185,297 @@ class QueryRAGUseCase:
                 mode_queries[mode] = text or command.query
         return mode_queries
 
+    async def _memoized(
+        self,
+        kind: str,
+        command: QueryRAGCommand,
+        model: str,
+        extra_hint: str,
+        generate: Any,
+    ) -> str:
+        """有 generation cache 時經快取取 rewrite/hyde 結果，否則直接生成。"""
+        if self._generation_cache is None:
+            return await generate()
+        return await self._generation_cache.get_or_generate(
+            kind,
+            command.query,
+            generate,
+            model=model,
+            bot_system_prompt=command.bot_system_prompt,
+            extra_hint=extra_hint,
+        )
+
+    @staticmethod
+    def _retrieval_cache_key(
+        command: QueryRAGCommand, modes: list[str], kb_ids: list[str]
+    ) -> str:
+        """影響檢索結果的所有參數（KB 內容版本另由 cache 的 version 比對）。"""
+        query = normalize_query(command.query)
+        raw = json.dumps(
+            {
+                "tenant_id": command.tenant_id,
+                "kb_ids": sorted(kb_ids),
+                "query": query,
+                "modes": modes,
+                "top_k": command.top_k,
+                "score_threshold": command.score_threshold,
+                "filters": command.extra_filters or {},
+                "rerank": [
+                    command.rerank_enabled,
+                    command.rerank_model,
+                    command.rerank_top_n,
+                ],
+                "rewrite": [
+                    command.query_rewrite_model,
+                    command.query_rewrite_extra_hint,
+                ],
+                "hyde": [command.hyde_model, command.hyde_extra_hint],
+                "bot_system_prompt": command.bot_system_prompt,
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _cached_result(
+        self, command: QueryRAGCommand, cache_key: str, version: str
+    ) -> RetrieveResult | None:
+        assert self._retrieval_cache is not None
+        t0 = time.perf_counter()
+        cached = self._retrieval_cache.get(command.tenant_id, cache_key, version)
+        if cached is None:
+            return None
+        lookup_ms = int((time.perf_counter() - t0) * 1000)
+        AgentTraceCollector.add_node(
+            node_type="tool_result",
+            label="RAG 檢索快取",
+            parent_id=(
+                AgentTraceCollector.find_last_node_by("tool_call", "rag_query")
+                or AgentTraceCollector.tool_parent()
+            ),
+            start_ms=AgentTraceCollector.offset_ms() - lookup_ms,
+            end_ms=AgentTraceCollector.offset_ms(),
+            cache_hit=True,
+            age_seconds=round(cached.age_seconds, 1),
+            result_count=len(cached.hits),
+            top_score=round(cached.hits[0].score, 4),
+            mode_queries=cached.mode_queries,
+        )
+        logger.info(
+            "rag.retrieve.cache_hit",
+            tenant_id=command.tenant_id,
+            result_count=len(cached.hits),
+            age_seconds=round(cached.age_seconds, 1),
+        )
+        return RetrieveResult(
+            chunks=[p.get("content", "") for p in cached.payloads],
+            sources=[
+                Source(
+                    document_name=p.get("document_name", ""),
+                    content_snippet=(p.get("content") or "")[:200],
+                    score=hit.score,
+                    chunk_id=hit.chunk_id,
+                    document_id=p.get("document_id", ""),
+                    kb_id=hit.kb_id,
+                )
+                for hit, p in zip(cached.hits, cached.payloads, strict=True)
+            ],
+            mode_queries=cached.mode_queries,
+        )
+
+    async def _lexical_search_all(
+        self, query: str, kb_ids: list[str], limit: int, filters: dict[str, Any]
+    ) -> tuple[list[list[SearchResult]], int, bool]:
+        """hybrid mode：每個 kb 跑一次 BM25；失敗只 log，該路當作沒命中。
+
+        回傳 (per-kb 結果, 耗時 ms, 是否有 kb 沿用了已失效的舊索引)。
+        """
+        assert self._lexical_search is not None
+        t0 = time.perf_counter()
+        results = await asyncio.gather(
+            *(
+                self._lexical_search.search(
+                    collection=f"kb_{kid}",
+                    query=query,
+                    limit=limit,
+                    filters=filters,
+                )
+                for kid in kb_ids
+            ),
+            return_exceptions=True,
+        )
+        out: list[list[SearchResult]] = []
+        for kid, r in zip(kb_ids, results, strict=True):
+            if isinstance(r, BaseException):
+                logger.warning(
+                    "rag.retrieve.lexical_failed", kb_id=kid, error=str(r)
+                )
+                out.append([])
+            else:
+                out.append(r)
+        stale = any(
+            self._lexical_search.is_stale(
+                f"kb_{kid}", str(filters.get("tenant_id", ""))
+            )
+            for kid in kb_ids
+        )
+        return out, int((time.perf_counter() - t0) * 1000), stale
+
+    async def _search_modes(
+        self,
+        modes: list[str],
+        mode_queries: dict[str, str],
+        kb_ids: list[str],
+        limit: int,
+        score_threshold: float,
+        filters: dict[str, Any],
+    ) -> tuple[dict[str, list[list[SearchResult]]], int, int]:
+        """一次 embed 所有 mode query；每個 kb 一次 multi-vector search
+        （所有 mode vector 同一 RPC），kb 之間並行。
+
+        回傳 (mode → per-kb 結果, embed ms, search ms)。
+        """
+        t0 = time.perf_counter()
+        query_vectors = await self._embedding_service.embed_queries(
+            [mode_queries[m] for m in modes]
+        )
+        embed_ms = int((time.perf_counter() - t0) * 1000)
+
+        t0 = time.perf_counter()
+        per_kb_results = await asyncio.gather(
+            *(
+                self._vector_store.search_many(
+                    collection=f"kb_{kid}",
+                    query_vectors=query_vectors,
+                    limit=limit,
+                    score_threshold=score_threshold,
+                    filters=filters,
+                )
+                for kid in kb_ids
+            )
+        )
+        search_ms = int((time.perf_counter() - t0) * 1000)
+        mode_results = {
+            mode: [per_kb_results[k][i] for k in range(len(kb_ids))]
+            for i, mode in enumerate(modes)
+        }
+        return mode_results, embed_ms, search_ms
+
+    async def _dense_retrieve(
+        self,
+        command: QueryRAGCommand,
+        dense_modes: list[str],
+        kb_ids: list[str],
+        limit: int,
+        filters: dict[str, Any],
+    ) -> _DenseRetrieval:
+        generated = [m for m in dense_modes if m != RetrievalMode.RAW.value]
+        if (
+            self._speculative_budget_ms > 0
+            and generated
+            and RetrievalMode.RAW.value in dense_modes
+        ):
+            return await self._speculative_retrieve(
+                command, dense_modes, generated, kb_ids, limit, filters
+            )
+
+        t0 = time.perf_counter()
+        mode_queries = await self._resolve_mode_queries(command, dense_modes)
+        gen_ms = int((time.perf_counter() - t0) * 1000)
+        ordered_modes = [m for m in dense_modes if m in mode_queries]
+        mode_results, embed_ms, search_ms = await self._search_modes(
+            ordered_modes,
+            mode_queries,
+            kb_ids,
+            limit,
+            command.score_threshold,
+            filters,
+        )
+        return _DenseRetrieval(
+            mode_queries=mode_queries,
+            ordered_modes=ordered_modes,
+            mode_results=mode_results,
+            gen_ms=gen_ms,
+            embed_ms=embed_ms,
+            search_ms=search_ms,
+        )
+
+    async def _speculative_retrieve(
+        self,
+        command: QueryRAGCommand,
+        dense_modes: list[str],
+        generated: list[str],
+        kb_ids: list[str],
+        limit: int,
+        filters: dict[str, Any],
+    ) -> _DenseRetrieval:
+        """raw 向量檢索不等 rewrite/hyde 生成；生成在 latency budget 內回來才
+        embed + search 併入，否則只用 raw 結果。
+
+        超時的生成 task 會被 cancel；有 generation cache 時實際的 LLM call
+        與 caller 分離，仍會完成並寫入快取，下次同一 query 直接命中。
+        """
+        raw = RetrievalMode.RAW.value
+        t_start = time.perf_counter()
+        gen_task = asyncio.ensure_future(
+            self._resolve_mode_queries(command, generated)
+        )
+        mode_queries = {raw: command.query}
+        mode_results, embed_ms, search_ms = await self._search_modes(
+            [raw], mode_queries, kb_ids, limit, command.score_threshold, filters
+        )
+
+        remaining = self._speculative_budget_ms / 1000 - (
+            time.perf_counter() - t_start
+        )
+        done, _ = await asyncio.wait({gen_task}, timeout=max(0.0, remaining))
+        gen_ms = int((time.perf_counter() - t_start) * 1000)
+        late_modes: list[str] = []
+        if gen_task in done:
+            mode_queries.update(gen_task.result())
+            gen_results, gen_embed_ms, gen_search_ms = await self._search_modes(
+                generated,
+                mode_queries,
+                kb_ids,
+                limit,
+                command.score_threshold,
+                filters,
+            )
+            mode_results.update(gen_results)
+            embed_ms += gen_embed_ms
+            search_ms += gen_search_ms
+        else:
+            gen_task.cancel()
+            late_modes = generated
+            logger.info(
+                "rag.retrieve.speculative_fallback",
+                budget_ms=self._speculative_budget_ms,
+                dropped_modes=late_modes,
+            )
+        return _DenseRetrieval(
+            mode_queries=mode_queries,
+            ordered_modes=[m for m in dense_modes if m in mode_queries],
+            mode_results=mode_results,
+            gen_ms=gen_ms,
+            embed_ms=embed_ms,
+            search_ms=search_ms,
+            late_modes=late_modes,
+        )
+
     async def retrieve(self, command: QueryRAGCommand) -> RetrieveResult:
         """只做 embed + search，不呼叫 LLM。供 Agent tool 使用。
 
         Issue #43: 多 retrieval mode（raw / rewrite / hyde）並行展開 →
         對每個 (mode, kb_id) 呼叫向量搜尋 → 結果 union by chunk_id
         （保留最高分）→ 既有 rerank + top_k 流程不變。
+
+        含 ``hybrid`` 時：原始 query 另跑 BM25（與向量 search 並行），
+        所有 (mode, kb) 向量結果與 lexical 結果以 RRF 合併排序，
+        score 換成 fused score / 最高 fused score（0~1]。
+
+        rewrite/hyde 生成經 generation cache 跨 request 共用；設了
+        speculative budget 時 raw 向量檢索先跑，生成超時的 mode 不併入。
         """
         t_total = time.perf_counter()
         effective_kb_ids = command.kb_ids or [command.kb_id]
@@ -149,43 +489,20 @@ class QueryRAGUseCase:
         modes = normalize_modes(list(command.retrieval_modes))
         validate_modes(modes)
 
+        # 結果快取：version 在檢索前取，檢索期間 KB 有變更就不寫回
+        cache_key = cache_version = ""
+        if self._retrieval_cache is not None:
+            cache_key = self._retrieval_cache_key(command, modes, effective_kb_ids)
+            cache_version = self._retrieval_cache.version(effective_kb_ids)
+            cached_result = self._cached_result(command, cache_key, cache_version)
+            if cached_result is not None:
+                return cached_result
+
         for kid in effective_kb_ids:
             kb = await self._kb_repo.find_by_id(kid)
             if kb is None:
                 raise EntityNotFoundError("KnowledgeBase", kid)
 
-        # 1. 為每個 mode 產出實際 query 字串（rewrite/hyde 並行 LLM call）
-        t0 = time.perf_counter()
-        mode_queries = await self._resolve_mode_queries(command, modes)
-        gen_ms = int((time.perf_counter() - t0) * 1000)
-
-        # 2. 為每條 query 並行 embed
-        t0 = time.perf_counter()
-        ordered_modes = [m for m in modes if m in mode_queries]
-        query_vectors_list = await asyncio.gather(
-            *(
-                self._embedding_service.embed_query(mode_queries[m])
-                for m in ordered_modes
-            )
-        )
-        mode_vectors: dict[str, list[float]] = dict(
-            zip(ordered_modes, query_vectors_list, strict=True)
-        )
-        embed_ms = int((time.perf_counter() - t0) * 1000)
-
-        search_limit = (
-            command.rerank_top_n
-            if command.rerank_enabled
-            else command.top_k
-        )
-
-        # 3. 對 (mode × kb_id) 笛卡爾積並行搜尋
-        t0 = time.perf_counter()
-        plan: list[tuple[str, str]] = [
-            (mode, kid)
-            for mode in ordered_modes
-            for kid in effective_kb_ids
-        ]
         # Issue #44 Phase 3: tenant_id is mandatory; caller may supply
         # additional first-class metadata filters via extra_filters. We
         # explicitly drop any incoming tenant_id key so a misbehaving
@@ -197,17 +514,49 @@ class QueryRAGUseCase:
                     continue
                 base_filters[k] = v
 
-        search_tasks = [
-            self._vector_store.search(
-                collection=f"kb_{kid}",
-                query_vector=mode_vectors[mode],
-                limit=search_limit,
-                score_threshold=command.score_threshold,
-                filters=base_filters,
+        search_limit = (
+            command.rerank_top_n
+            if command.rerank_enabled
+            else command.top_k
+        )
+
+        # hybrid 不是一條向量 query：拆出來另跑 lexical；只選 hybrid 時向量端用 raw
+        hybrid = RetrievalMode.HYBRID.value in modes
+        dense_modes = [m for m in modes if m != RetrievalMode.HYBRID.value]
+        if not dense_modes:
+            dense_modes = [RetrievalMode.RAW.value]
+        use_lexical = hybrid and self._lexical_search is not None
+
+        # 1–3. 每個 mode 產出 query（rewrite/hyde 並行 LLM call）→ 一次 embed →
+        #      每個 kb 一次 multi-vector search；hybrid 的 BM25 與整段並行
+        lexical_results: list[list[SearchResult]] = []
+        lexical_ms = 0
+        lexical_stale = False
+        if use_lexical:
+            dense, lexical = await asyncio.gather(
+                self._dense_retrieve(
+                    command, dense_modes, effective_kb_ids, search_limit, base_filters
+                ),
+                self._lexical_search_all(
+                    command.query, effective_kb_ids, search_limit, base_filters
+                ),
+            )
+            lexical_results, lexical_ms, lexical_stale = lexical
+        else:
+            dense = await self._dense_retrieve(
+                command, dense_modes, effective_kb_ids, search_limit, base_filters
             )
-            for mode, kid in plan
+        mode_queries = dense.mode_queries
+        ordered_modes = dense.ordered_modes
+        gen_ms, embed_ms, search_ms = dense.gen_ms, dense.embed_ms, dense.search_ms
+        # plan 維持 mode-major 順序（同分時 union 的 kb 歸屬與既有行為一致）
+        plan: list[tuple[str, str]] = [
+            (mode, kid) for mode in ordered_modes for kid in effective_kb_ids
+        ]
+        kb_index = {kid: i for i, kid in enumerate(effective_kb_ids)}
+        search_results: list[Any] = [
+            dense.mode_results[mode][kb_index[kid]] for mode, kid in plan
         ]
-        search_results = await asyncio.gather(*search_tasks)
 
         # 4. Union by chunk_id — 保留最高分；記錄該 chunk 由哪些 mode 命中
         # mode_hit_map: chunk_id → set(modes); kb_map: chunk_id → kb_id
@@ -221,10 +570,41 @@ class QueryRAGUseCase:
                 if cid not in merged or r.score > merged[cid].score:
                     merged[cid] = r
                     kb_map[cid] = kid
-        all_results: list[Any] = sorted(
-            merged.values(), key=lambda r: r.score, reverse=True
-        )
-        search_ms = int((time.perf_counter() - t0) * 1000)
+
+        lexical_count = 0
+        if use_lexical:
+            for kid, batch in zip(effective_kb_ids, lexical_results, strict=True):
+                for r in batch:
+                    lexical_count += 1
+                    mode_hit_map.setdefault(r.id, set()).add(
+                        RetrievalMode.HYBRID.value
+                    )
+                    if r.id not in merged:
+                        merged[r.id] = r
+                        kb_map[r.id] = kid
+            fused = reciprocal_rank_fusion(
+                [[r.id for r in batch] for batch in search_results]
+                + [[r.id for r in batch] for batch in lexical_results],
+                k=self._rrf_k,
+            )
+            top_fused = max(fused.values(), default=0.0) or 1.0
+            all_results = sorted(
+                (
+                    dataclasses.replace(r, score=fused[cid] / top_fused)
+                    for cid, r in merged.items()
+                ),
+                key=lambda r: r.score,
+                reverse=True,
+            )
+            ordered_modes = [*ordered_modes, RetrievalMode.HYBRID.value]
+            mode_queries = {
+                **mode_queries,
+                RetrievalMode.HYBRID.value: command.query,
+            }
+        else:
+            all_results = sorted(
+                merged.values(), key=lambda r: r.score, reverse=True
+            )
 
         # Trace: vector search results
         # parent_id 用 label-based 反查 — ContextVar tool_parent() 在 LLM parallel
@@ -253,29 +633,35 @@ class QueryRAGUseCase:
                 }
                 for i, r in enumerate(all_results)
             ],
+            **(
+                {
+                    "fusion": "rrf",
+                    "lexical_ms": lexical_ms,
+                    "lexical_count": lexical_count,
+                }
+                if use_lexical
+                else {}
+            ),
+            **(
+                {"speculative_dropped_modes": dense.late_modes}
+                if dense.late_modes
+                else {}
+            ),
         )
 
         # 5. Rerank if enabled — 用 raw query 作 rerank judge
-        # （rerank LLM 看的是「使用者真正想問什麼」，不是改寫過或假答案）
+        # （rerank 看的是「使用者真正想問什麼」，不是改寫過或假答案）；
+        # backend 由 rerank_model 決定（LLM / local:lexical）
         final_k = command.top_k
         if command.rerank_enabled and len(all_results) > final_k:
-            rerank_input = all_results[:search_limit]
-            reranked = await llm_rerank(
+            results = await self._reranker.rerank(
                 query=command.query,
-                chunks=[
-                    {"content": r.payload.get("content", ""), "_idx": i}
-                    for i, r in enumerate(rerank_input)
-                ],
-                model=command.rerank_model or "claude-haiku-4-5-20251001",
+                results=all_results[:search_limit],
                 top_k=final_k,
-                record_usage=self._record_usage,
+                model=command.rerank_model,
                 tenant_id=command.tenant_id,
+                record_usage=self._record_usage,
             )
-            results = []
-            for rc in reranked:
-                idx = rc.get("_idx", 0)
-                if idx < len(rerank_input):
-                    results.append(rerank_input[idx])
         else:
             results = all_results[:command.top_k]
 
@@ -296,8 +682,10 @@ class QueryRAGUseCase:
             total_ms=total_ms,
             embed_ms=embed_ms,
             search_ms=search_ms,
+            lexical_ms=lexical_ms,
             gen_ms=gen_ms,
             modes=ordered_modes,
+            dropped_modes=dense.late_modes,
             kb_count=len(effective_kb_ids),
             result_count=len(results),
         )
@@ -314,6 +702,26 @@ class QueryRAGUseCase:
             for r in results
         ]
 
+        # speculative 丟掉了 rewrite/hyde 的結果、BM25 沿用失效前的舊索引時都不進
+        # 快取（version 已推進，寫進去會把降級 / 舊結果留 TTL 那麼久）
+        if (
+            self._retrieval_cache is not None
+            and not dense.late_modes
+            and not lexical_stale
+        ):
+            self._retrieval_cache.put(
+                command.tenant_id,
+                cache_key,
+                cache_version,
+                effective_kb_ids,
+                hits=[
+                    CachedHit(chunk_id=r.id, kb_id=kb_map.get(r.id, ""), score=r.score)
+                    for r in results
+                ],
+                payloads=[r.payload for r in results],
+                mode_queries=mode_queries,
+            )
+
         return RetrieveResult(
             chunks=[r.payload.get("content", "") for r in results],
             sources=sources,
@@ -0,0 +1,204 @@
+"""RetrievalResultCache — ``QueryRAGUseCase.retrieve`` 的結果快取。
+
+同一個 FAQ 被很多訪客問、ReAct loop 內 agent 重複查同一句時，每次都重跑
+rewrite / hyde 生成、embedding、Milvus search（+ rerank）。這裡快取最終排序：
+
+- key = caller 組好的字串（正規化 query + modes + top_k + threshold + filters +
+  rerank / rewrite / hyde 設定）+ 各 KB 的 version
+- KB version = process 內 per-KB 單調遞增 generation，由
+  ``ConfigInvalidationBus`` 的 ``knowledge_base:{kb_id}`` 推進（
+  ``KnowledgeChangeNotifier`` 在 upsert / delete / drop 成功後 publish）；
+  version 不同的 entry 直接作廢
+- entry 只存 (chunk_id, kb_id, score) 與 mode_queries；chunk 內容放在另一個
+  較小的 chunk cache（key = (kb_id, chunk_id)），命中時 hydrate，缺任一筆
+  視為 miss
+- caller 在檢索之前先取 ``version``，``put`` 時版本已變就不寫入
+- 只存 process 記憶體；hit ratio 依 tenant 分開統計
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+
+from src.domain.shared.config_invalidation import (
+    ALL_KEYS,
+    SCOPE_KNOWLEDGE_BASE,
+    ConfigInvalidationBus,
+)
+
+# chunk cache 只留組 RetrieveResult 需要的 payload 欄位
+_CHUNK_FIELDS: tuple[str, ...] = ("content", "document_name", "document_id")
+
+
+@dataclass(frozen=True)
+class CachedHit:
+    chunk_id: str
+    kb_id: str
+    score: float
+
+
+@dataclass(frozen=True)
+class CachedRetrieval:
+    hits: list[CachedHit]
+    payloads: list[dict[str, Any]]
+    mode_queries: dict[str, str]
+    age_seconds: float
+
+
+@dataclass
+class _Entry:
+    version: str
+    hits: list[CachedHit]
+    mode_queries: dict[str, str]
+    created_at: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class _TenantStats:
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "stores": self.stores,
+        }
+
+
+class RetrievalResultCache:
+    def __init__(
+        self,
+        invalidation_bus: ConfigInvalidationBus | None = None,
+        ttl_seconds: float = 300.0,
+        max_entries: int = 2000,
+        max_chunks: int = 5000,
+    ) -> None:
+        self._ttl = ttl_seconds
+        self._max_entries = max(1, max_entries)
+        self._max_chunks = max(1, max_chunks)
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._chunks: OrderedDict[tuple[str, str], dict[str, Any]] = OrderedDict()
+        self._kb_generations: dict[str, int] = {}
+        self._global_generation = 0
+        self._lock = threading.Lock()
+        self._stats: dict[str, _TenantStats] = {}
+        self.invalidations = 0
+        self.stale_puts = 0
+        self.hydration_misses = 0
+        if invalidation_bus is not None:
+            invalidation_bus.subscribe(self.invalidate)
+
+    def version(self, kb_ids: list[str]) -> str:
+        """檢索之前取；``get`` / ``put`` 都帶這個值。"""
+        kb_part = ",".join(
+            f"{kb}:{self._kb_generations.get(kb, 0)}" for kb in sorted(kb_ids)
+        )
+        return f"{self._global_generation}|{kb_part}"
+
+    def get(self, tenant_id: str, key: str, version: str) -> CachedRetrieval | None:
+        stats = self._stats.setdefault(tenant_id, _TenantStats())
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                stats.misses += 1
+                return None
+            age = time.monotonic() - entry.created_at
+            if entry.version != version or age >= self._ttl:
+                del self._entries[key]
+                stats.misses += 1
+                return None
+            payloads: list[dict[str, Any]] = []
+            for hit in entry.hits:
+                payload = self._chunks.get((hit.kb_id, hit.chunk_id))
+                if payload is None:
+                    # chunk 已被擠出 chunk cache → 整筆重跑
+                    del self._entries[key]
+                    self.hydration_misses += 1
+                    stats.misses += 1
+                    return None
+                self._chunks.move_to_end((hit.kb_id, hit.chunk_id))
+                payloads.append(payload)
+            self._entries.move_to_end(key)
+            stats.hits += 1
+            return CachedRetrieval(
+                hits=list(entry.hits),
+                payloads=payloads,
+                mode_queries=dict(entry.mode_queries),
+                age_seconds=age,
+            )
+
+    def put(
+        self,
+        tenant_id: str,
+        key: str,
+        version: str,
+        kb_ids: list[str],
+        hits: list[CachedHit],
+        payloads: list[dict[str, Any]],
+        mode_queries: dict[str, str],
+    ) -> bool:
+        """寫入一次檢索結果；版本已過期（檢索期間 KB 有變更）回 False。"""
+        if not hits:
+            return False
+        if version != self.version(kb_ids):
+            self.stale_puts += 1
+            return False
+        with self._lock:
+            for hit, payload in zip(hits, payloads, strict=True):
+                self._chunks[(hit.kb_id, hit.chunk_id)] = {
+                    k: payload.get(k, "") for k in _CHUNK_FIELDS
+                }
+                self._chunks.move_to_end((hit.kb_id, hit.chunk_id))
+            while len(self._chunks) > self._max_chunks:
+                self._chunks.popitem(last=False)
+            self._entries[key] = _Entry(
+                version=version, hits=list(hits), mode_queries=dict(mode_queries)
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+            self._stats.setdefault(tenant_id, _TenantStats()).stores += 1
+        return True
+
+    def invalidate(self, scope: str, key: str = ALL_KEYS) -> None:
+        if scope != SCOPE_KNOWLEDGE_BASE:
+            return  # bot / tenant 等設定不影響檢索結果（相關參數都在 key 裡）
+        with self._lock:
+            self.invalidations += 1
+            if key != ALL_KEYS:
+                self._kb_generations[key] = self._kb_generations.get(key, 0) + 1
+                for chunk_key in [c for c in self._chunks if c[0] == key]:
+                    del self._chunks[chunk_key]
+            else:
+                self._global_generation += 1
+                self._entries.clear()
+                self._chunks.clear()
+
+    def stats(self) -> dict[str, Any]:
+        totals = _TenantStats()
+        for s in self._stats.values():
+            totals.hits += s.hits
+            totals.misses += s.misses
+            totals.stores += s.stores
+        return {
+            **totals.to_dict(),
+            "ttl_seconds": self._ttl,
+            "entries": len(self._entries),
+            "max_entries": self._max_entries,
+            "chunks": len(self._chunks),
+            "max_chunks": self._max_chunks,
+            "invalidations": self.invalidations,
+            "stale_puts": self.stale_puts,
+            "hydration_misses": self.hydration_misses,
+            "per_tenant": {
+                tenant_id: s.to_dict() for tenant_id, s in self._stats.items()
+            },
+        }
@@ -1,6 +1,11 @@
 from src.domain.ratelimit.entity import RateLimitConfig
 from src.domain.ratelimit.repository import RateLimitConfigRepository
 from src.domain.ratelimit.value_objects import EndpointGroup, RateLimitConfigId
+from src.domain.shared.config_invalidation import (
+    ALL_KEYS,
+    SCOPE_RATE_LIMIT,
+    ConfigInvalidationBus,
+)
 
 DEFAULT_CONFIGS = [
     {
@@ -32,9 +37,12 @@ DEFAULT_CONFIGS = [
 
 class SeedDefaultsUseCase:
     def __init__(
-        self, rate_limit_config_repository: RateLimitConfigRepository
+        self,
+        rate_limit_config_repository: RateLimitConfigRepository,
+        config_invalidation_bus: ConfigInvalidationBus | None = None,
     ) -> None:
         self._repo = rate_limit_config_repository
+        self._invalidation_bus = config_invalidation_bus
 
     async def execute(self) -> int:
         """Seed default configs if missing. Returns count created."""
@@ -57,4 +65,7 @@ class SeedDefaultsUseCase:
                 await self._repo.save(config)
                 created += 1
 
+        if created and self._invalidation_bus is not None:
+            # 快取裡可能是 hardcoded fallback → 全清
+            await self._invalidation_bus.publish(SCOPE_RATE_LIMIT, ALL_KEYS)
         return created
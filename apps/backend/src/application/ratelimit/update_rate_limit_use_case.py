@@ -4,6 +4,11 @@ from datetime import datetime, timezone
 from src.domain.ratelimit.entity import RateLimitConfig
 from src.domain.ratelimit.repository import RateLimitConfigRepository
 from src.domain.ratelimit.value_objects import EndpointGroup, RateLimitConfigId
+from src.domain.shared.config_invalidation import (
+    ALL_KEYS,
+    SCOPE_RATE_LIMIT,
+    ConfigInvalidationBus,
+)
 from src.domain.shared.exceptions import DomainException
 
 
@@ -24,9 +29,12 @@ class UpdateRateLimitCommand:
 
 class UpdateRateLimitUseCase:
     def __init__(
-        self, rate_limit_config_repository: RateLimitConfigRepository
+        self,
+        rate_limit_config_repository: RateLimitConfigRepository,
+        config_invalidation_bus: ConfigInvalidationBus | None = None,
     ) -> None:
         self._repo = rate_limit_config_repository
+        self._invalidation_bus = config_invalidation_bus
 
     async def execute(self, command: UpdateRateLimitCommand) -> RateLimitConfig:
         if command.caller_role != "system_admin":
@@ -44,6 +52,7 @@ class UpdateRateLimitUseCase:
             )
             existing.updated_at = datetime.now(timezone.utc)
             await self._repo.save(existing)
+            await self._publish_invalidation(command.tenant_id)
             return existing
 
         config = RateLimitConfig(
@@ -55,4 +64,13 @@ class UpdateRateLimitUseCase:
             per_user_requests_per_minute=command.per_user_requests_per_minute,
         )
         await self._repo.save(config)
+        await self._publish_invalidation(command.tenant_id)
         return config
+
+    async def _publish_invalidation(self, tenant_id: str | None) -> None:
+        if self._invalidation_bus is None:
+            return
+        # 預設設定（tenant_id=None）是所有 tenant 的 fallback → 全清
+        await self._invalidation_bus.publish(
+            SCOPE_RATE_LIMIT, tenant_id or ALL_KEYS
+        )
@@ -1,6 +1,10 @@
 from dataclasses import dataclass
 
 from src.domain.security.guard_config import GuardRulesConfig, GuardRulesConfigRepository
+from src.domain.shared.config_invalidation import (
+    SCOPE_GUARD_RULES,
+    ConfigInvalidationBus,
+)
 from src.application.security.prompt_guard_service import (
     DEFAULT_INPUT_RULES,
     DEFAULT_OUTPUT_KEYWORDS,
@@ -37,8 +41,13 @@ class UpdateGuardRulesCommand:
 
 
 class UpdateGuardRulesUseCase:
-    def __init__(self, repo: GuardRulesConfigRepository) -> None:
+    def __init__(
+        self,
+        repo: GuardRulesConfigRepository,
+        config_invalidation_bus: ConfigInvalidationBus | None = None,
+    ) -> None:
         self._repo = repo
+        self._invalidation_bus = config_invalidation_bus
 
     async def execute(self, command: UpdateGuardRulesCommand) -> GuardRulesConfig:
         config = GuardRulesConfig(
@@ -52,12 +61,18 @@ class UpdateGuardRulesUseCase:
             blocked_response=command.blocked_response,
         )
         await self._repo.save(config)
+        await _publish_invalidation(self._invalidation_bus)
         return config
 
 
 class ResetGuardRulesUseCase:
-    def __init__(self, repo: GuardRulesConfigRepository) -> None:
+    def __init__(
+        self,
+        repo: GuardRulesConfigRepository,
+        config_invalidation_bus: ConfigInvalidationBus | None = None,
+    ) -> None:
         self._repo = repo
+        self._invalidation_bus = config_invalidation_bus
 
     async def execute(self) -> GuardRulesConfig:
         config = GuardRulesConfig(
@@ -68,4 +83,11 @@ class ResetGuardRulesUseCase:
             output_guard_prompt=DEFAULT_OUTPUT_GUARD_PROMPT,
         )
         await self._repo.save(config)
+        await _publish_invalidation(self._invalidation_bus)
         return config
+
+
+async def _publish_invalidation(bus: ConfigInvalidationBus | None) -> None:
+    # 各 process 的 GuardRulesetCache 收到後重新讀設定並重編規則
+    if bus is not None:
+        await bus.publish(SCOPE_GUARD_RULES)
@@ -0,0 +1,199 @@
+"""CompiledGuardRuleset — 預編譯的 Prompt Guard 規則 + in-process 快取。
+
+``PromptGuardService`` 原本每則訊息都：查一次 ``GuardRulesConfig``（DB）、
+逐條 ``re.search(pattern_str, ...)``、每條 keyword 各做一次 ``message.lower()``
++ substring 掃描。規則只有 admin 改設定時才會變，所以整份規則編譯成
+``CompiledGuardRuleset``，以設定內容的 fingerprint 當版本快取在 process 內。
+
+- regex 規則：預先 ``re.compile(..., IGNORECASE)``；編譯失敗的規則直接略過
+  （與原本 ``except re.error: continue`` 相同）
+- keyword 規則：合併成一個 alternation regex 做 multi-pattern prefilter，
+  一次掃描判斷「有沒有任何 keyword 出現」；絕大多數訊息不命中，只在
+  prefilter 命中時才逐條確認是哪一條（保留「依規則順序第一條命中」的語意）
+- 失效：``ConfigInvalidationBus`` 的 guard_rules scope（規則更新 / 重設時
+  publish），另有 TTL 當保險；TTL 到期重新讀設定，fingerprint 沒變就沿用
+  已編譯的 ruleset
+
+沒用 Aho-Corasick 套件：keyword 數量是個位數到數十，CPython ``re`` 的
+alternation 在 C 裡掃描，比純 Python 的 automaton 快，也不多一個相依。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+from src.domain.security.guard_config import GuardRulesConfig
+from src.domain.shared.config_invalidation import (
+    ALL_KEYS,
+    SCOPE_GUARD_RULES,
+    ConfigInvalidationBus,
+)
+from src.infrastructure.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def config_fingerprint(config: GuardRulesConfig) -> str:
+    payload = json.dumps(
+        [config.input_rules, config.output_keywords],
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _alternation(words: list[str], flags: int = 0) -> re.Pattern[str] | None:
+    if not words:
+        return None
+    # 長的排前面：同一起點時優先吃較長的 keyword（只影響 prefilter，不影響結果）
+    ordered = sorted(set(words), key=len, reverse=True)
+    return re.compile("|".join(re.escape(w) for w in ordered), flags)
+
+
+@dataclass(frozen=True)
+class _InputRule:
+    pattern: str
+    regex: re.Pattern[str] | None  # None = keyword（比對 lower 後的字串）
+    keyword: str = ""
+
+
+class CompiledGuardRuleset:
+    def __init__(self, config: GuardRulesConfig, version: str = "") -> None:
+        self.config = config
+        self.version = version or config_fingerprint(config)
+        self.invalid_patterns: list[str] = []
+
+        rules: list[_InputRule] = []
+        keywords: list[str] = []
+        for rule in config.input_rules:
+            if not rule.get("enabled", True):
+                continue
+            pattern = rule.get("pattern", "")
+            rule_type = rule.get("type", "keyword")
+            if rule_type == "regex":
+                try:
+                    compiled = re.compile(pattern, re.IGNORECASE)
+                except re.error:
+                    self.invalid_patterns.append(pattern)
+                    continue
+                rules.append(_InputRule(pattern=pattern, regex=compiled))
+            elif rule_type == "keyword":
+                keyword = pattern.lower()
+                rules.append(_InputRule(pattern=pattern, regex=None, keyword=keyword))
+                keywords.append(keyword)
+        self._input_rules = tuple(rules)
+        self._input_keywords = _alternation(keywords)
+
+        self._output_keywords = tuple(
+            kw.get("keyword", "")
+            for kw in config.output_keywords
+            if kw.get("enabled", True) and kw.get("keyword", "")
+        )
+        self._output_prefilter = _alternation(list(self._output_keywords))
+
+    def match_input(self, message: str) -> str | None:
+        """回傳第一條命中的規則 pattern（依設定順序）；沒命中回 None。"""
+        lowered: str | None = None
+        keyword_hit = False
+        if self._input_keywords is not None:
+            lowered = message.lower()
+            keyword_hit = self._input_keywords.search(lowered) is not None
+        for rule in self._input_rules:
+            if rule.regex is not None:
+                if rule.regex.search(message):
+                    return rule.pattern
+            elif keyword_hit and rule.keyword in lowered:  # type: ignore[operator]
+                return rule.pattern
+        return None
+
+    def match_output(self, response: str) -> list[str]:
+        """回傳出現在 response 內的 output keyword（依設定順序）。"""
+        if self._output_prefilter is None or not self._output_prefilter.search(
+            response
+        ):
+            return []
+        return [kw for kw in self._output_keywords if kw in response]
+
+
+class GuardRulesetCache:
+    """單一 ruleset 的 in-process 快取；TTL 到期以 fingerprint 判斷要不要重編。"""
+
+    def __init__(
+        self,
+        invalidation_bus: ConfigInvalidationBus | None = None,
+        ttl_seconds: float = 60.0,
+    ) -> None:
+        self._ttl = ttl_seconds
+        self._ruleset: CompiledGuardRuleset | None = None
+        self._loaded_at = 0.0
+        self._generation = 0
+        self._lock: asyncio.Lock | None = None
+        self.hits = 0
+        self.misses = 0
+        self.compiles = 0
+        self.invalidations = 0
+        if invalidation_bus is not None:
+            invalidation_bus.subscribe(self.invalidate)
+
+    async def get(
+        self, loader: Callable[[], Awaitable[GuardRulesConfig]]
+    ) -> CompiledGuardRuleset:
+        ruleset = self._ruleset
+        if ruleset is not None and time.monotonic() - self._loaded_at < self._ttl:
+            self.hits += 1
+            return ruleset
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            # 等鎖期間別人可能已經載入
+            ruleset = self._ruleset
+            if ruleset is not None and time.monotonic() - self._loaded_at < self._ttl:
+                self.hits += 1
+                return ruleset
+            self.misses += 1
+            generation = self._generation
+            config = await loader()
+            version = config_fingerprint(config)
+            if ruleset is None or ruleset.version != version:
+                ruleset = CompiledGuardRuleset(config, version)
+                self.compiles += 1
+                if ruleset.invalid_patterns:
+                    logger.warning(
+                        "guard.invalid_patterns_skipped",
+                        patterns=ruleset.invalid_patterns,
+                    )
+            else:
+                # 規則沒變：沿用已編譯的 ruleset，但換上新讀到的其他設定
+                # （blocked_response / llm guard 開關等）
+                ruleset.config = config
+            if generation == self._generation and self._ttl > 0:
+                self._ruleset = ruleset
+                self._loaded_at = time.monotonic()
+            return ruleset
+
+    def invalidate(self, scope: str, key: str = ALL_KEYS) -> None:
+        if scope not in (SCOPE_GUARD_RULES, ALL_KEYS):
+            return
+        self._generation += 1
+        self.invalidations += 1
+        self._loaded_at = 0.0  # 下次 get 重新讀設定（規則沒變就不重編）
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        ruleset = self._ruleset
+        return {
+            "version": ruleset.version if ruleset else None,
+            "ttl_seconds": self._ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "compiles": self.compiles,
+            "invalidations": self.invalidations,
+        }
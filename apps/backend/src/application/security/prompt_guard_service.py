@@ -8,9 +8,12 @@ Flow:
 
 from __future__ import annotations
 
-import re
 from typing import Callable, Awaitable
 
+from src.application.security.guard_ruleset import (
+    CompiledGuardRuleset,
+    GuardRulesetCache,
+)
 from src.domain.security.guard_config import (
     GuardLogRepository,
     GuardResult,
@@ -121,11 +124,14 @@ class PromptGuardService:
         guard_log_repo: GuardLogRepository,
         record_usage: RecordUsageUseCase | None = None,
         api_key_resolver: Callable[[str], Awaitable[str]] | None = None,
+        ruleset_cache: GuardRulesetCache | None = None,
     ) -> None:
         self._rules_repo = guard_rules_repo
         self._log_repo = guard_log_repo
         self._record_usage = record_usage
         self._api_key_resolver = api_key_resolver
+        # 沒注入時（測試 / 單獨使用）每個 service instance 各自快取
+        self._ruleset_cache = ruleset_cache or GuardRulesetCache(ttl_seconds=0)
 
     async def _get_config(self) -> GuardRulesConfig:
         config = await self._rules_repo.get()
@@ -136,6 +142,9 @@ class PromptGuardService:
             )
         return config
 
+    async def _get_ruleset(self) -> CompiledGuardRuleset:
+        return await self._ruleset_cache.get(self._get_config)
+
     async def check_input(
         self,
         message: str,
@@ -143,77 +152,64 @@ class PromptGuardService:
         bot_id: str | None = None,
         user_id: str | None = None,
     ) -> GuardResult:
-        config = await self._get_config()
-
-        for rule in config.input_rules:
-            if not rule.get("enabled", True):
-                continue
-            pattern = rule.get("pattern", "")
-            rule_type = rule.get("type", "keyword")
-
-            matched = False
-            if rule_type == "regex":
-                try:
-                    matched = bool(re.search(pattern, message, re.IGNORECASE))
-                except re.error:
-                    continue
-            elif rule_type == "keyword":
-                matched = pattern.lower() in message.lower()
-
-            if matched:
-                logger.warning(
-                    "guard.input_blocked",
-                    rule=pattern,
+        ruleset = await self._get_ruleset()
+        config = ruleset.config
+
+        pattern = ruleset.match_input(message)
+        if pattern is not None:
+            logger.warning(
+                "guard.input_blocked",
+                rule=pattern,
+                tenant_id=tenant_id,
+                bot_id=bot_id,
+            )
+            # Sprint A++: 加 trace node 讓 agent DAG 顯示攔截
+            try:
+                from src.infrastructure.observability.agent_trace_collector import (
+                    AgentTraceCollector,
+                )
+
+                now_ms = AgentTraceCollector.offset_ms()
+                AgentTraceCollector.add_node(
+                    node_type="guard_input_blocked",
+                    label=f"🛡️ input blocked: {pattern[:60]}",
+                    parent_id=None,
+                    start_ms=now_ms,
+                    end_ms=now_ms,
+                    token_usage=None,
+                    outcome="failed",
+                    rule_matched=pattern,
+                    error_message="Prompt injection rule matched",
+                )
+            except Exception:
+                logger.debug("guard.trace_add_failed", exc_info=True)
+
+            # Sprint A++ 修 silent swallow — 錯誤要浮現才抓得到 bug
+            try:
+                await self._log_repo.save_log(
                     tenant_id=tenant_id,
                     bot_id=bot_id,
-                )
-                # Sprint A++: 加 trace node 讓 agent DAG 顯示攔截
-                try:
-                    from src.infrastructure.observability.agent_trace_collector import (
-                        AgentTraceCollector,
-                    )
-
-                    now_ms = AgentTraceCollector.offset_ms()
-                    AgentTraceCollector.add_node(
-                        node_type="guard_input_blocked",
-                        label=f"🛡️ input blocked: {pattern[:60]}",
-                        parent_id=None,
-                        start_ms=now_ms,
-                        end_ms=now_ms,
-                        token_usage=None,
-                        outcome="failed",
-                        rule_matched=pattern,
-                        error_message="Prompt injection rule matched",
-                    )
-                except Exception:
-                    logger.debug("guard.trace_add_failed", exc_info=True)
-
-                # Sprint A++ 修 silent swallow — 錯誤要浮現才抓得到 bug
-                try:
-                    await self._log_repo.save_log(
-                        tenant_id=tenant_id,
-                        bot_id=bot_id,
-                        user_id=user_id,
-                        log_type="input_blocked",
-                        rule_matched=pattern,
-                        user_message=message[:2000],
-                        ai_response=None,
-                    )
-                except Exception:
-                    logger.warning(
-                        "guard.log_save_failed",
-                        tenant_id=tenant_id,
-                        bot_id=bot_id,
-                        log_type="input_blocked",
-                        exc_info=True,
-                    )
-
-                return GuardResult(
-                    passed=False,
-                    blocked_response=config.blocked_response,
+                    user_id=user_id,
+                    log_type="input_blocked",
                     rule_matched=pattern,
+                    user_message=message[:2000],
+                    ai_response=None,
+                )
+            except Exception:
+                logger.warning(
+                    "guard.log_save_failed",
+                    tenant_id=tenant_id,
+                    bot_id=bot_id,
+                    log_type="input_blocked",
+                    exc_info=True,
                 )
 
+            return GuardResult(
+                passed=False,
+                blocked_response=config.blocked_response,
+                rule_matched=pattern,
+            )
+
         return GuardResult(passed=True)
 
     async def check_output(
@@ -224,16 +220,13 @@ class PromptGuardService:
         user_id: str | None = None,
         user_message: str = "",
     ) -> GuardResult:
-        config = await self._get_config()
+        ruleset = await self._get_ruleset()
+        config = ruleset.config
 
-        # Keyword check
-        hit_count = sum(
-            1
-            for kw in config.output_keywords
-            if kw.get("enabled", True) and kw.get("keyword", "") in response
-        )
+        # Keyword check（prefilter 一次掃描；多數回答不命中任何 keyword）
+        hits = ruleset.match_output(response)
 
-        if hit_count < 2:
+        if len(hits) < 2:
             return GuardResult(passed=True)
 
         # LLM Guard (optional)
@@ -242,11 +235,7 @@ class PromptGuardService:
             if not is_leaked:
                 return GuardResult(passed=True)
 
-        matched_keywords = ", ".join(
-            kw["keyword"]
-            for kw in config.output_keywords
-            if kw.get("enabled") and kw.get("keyword", "") in response
-        )
+        matched_keywords = ", ".join(hits)
         logger.warning(
             "guard.output_blocked",
             keywords=matched_keywords,
@@ -19,6 +19,10 @@ from dataclasses import dataclass, field
 from typing import Any
 
 from src.domain.plan.repository import PlanRepository
+from src.domain.shared.config_invalidation import (
+    SCOPE_TENANT,
+    ConfigInvalidationBus,
+)
 from src.domain.shared.exceptions import DomainException, EntityNotFoundError
 from src.domain.tenant.entity import Tenant
 from src.domain.tenant.repository import TenantRepository
@@ -48,9 +52,11 @@ class UpdateTenantUseCase:
         self,
         tenant_repository: TenantRepository,
         plan_repository: PlanRepository | None = None,
+        config_invalidation_bus: ConfigInvalidationBus | None = None,
     ) -> None:
         self._tenant_repo = tenant_repository
         self._plan_repo = plan_repository
+        self._invalidation_bus = config_invalidation_bus
 
     async def execute(self, command: UpdateTenantCommand) -> Tenant:  # noqa: C901
         tenant = await self._tenant_repo.find_by_id(command.tenant_id)
@@ -87,4 +93,7 @@ class UpdateTenantUseCase:
             tenant.default_intent_model = command.default_intent_model
 
         await self._tenant_repo.save(tenant)
+        if self._invalidation_bus is not None:
+            # default_intent/summary_model 會進 bot runtime snapshot
+            await self._invalidation_bus.publish(SCOPE_TENANT, command.tenant_id)
         return tenant
@@ -0,0 +1,42 @@
+"""Reconcile Usage Rollups Use Case
+
+token_usage_cycle_rollups 由 usage repository 在寫 record 的同一個
+transaction 內遞增；records 仍是唯一 truth。這個 use case 由 worker cron
+定期觸發，把本月與上月的 rollup 對齊 records（涵蓋 migration 前後舊版寫入、
+手動 SQL 清理 / backfill 等繞過 repository 的修改）。
+"""
+
+from datetime import datetime, timezone
+
+import structlog
+
+from src.domain.usage.repository import UsageRepository
+
+logger = structlog.get_logger(__name__)
+
+
+def _previous_cycle(cycle: str) -> str:
+    year, month = (int(p) for p in cycle.split("-"))
+    if month == 1:
+        return f"{year - 1}-12"
+    return f"{year}-{month - 1:02d}"
+
+
+class ReconcileUsageRollupsUseCase:
+    def __init__(self, usage_repository: UsageRepository) -> None:
+        self._repo = usage_repository
+
+    async def execute(self, now: datetime | None = None) -> dict[str, int]:
+        """回傳 {cycle: 修正的 (tenant, category) 列數}。"""
+        current = (now or datetime.now(timezone.utc)).strftime("%Y-%m")
+        corrected: dict[str, int] = {}
+        # 上月：跨月時最後幾筆 record 可能在 reconcile 前才寫入
+        for cycle in (_previous_cycle(current), current):
+            corrected[cycle] = await self._repo.reconcile_cycle_rollups(cycle)
+            if corrected[cycle]:
+                logger.warning(
+                    "usage_rollup.drift_corrected",
+                    cycle=cycle,
+                    rows=corrected[cycle],
+                )
+        return corrected
@@ -19,6 +19,11 @@ class Settings(BaseSettings):
     milvus_uri: str = "http://localhost:19530"
     milvus_token: str = ""
     milvus_db_name: str = "default"
+    milvus_backend: str = "executor"  # "executor" | "async" (AsyncMilvusClient)
+    milvus_executor_workers: int = 16
+    # 新建 collection 的 partition key："" | "tenant_id" | "document_id"
+    milvus_partition_key: str = ""
+    milvus_num_partitions: int = 16
 
     # JWT
     jwt_secret_key: str = "dev-secret-key-change-in-production"
@@ -54,12 +59,30 @@ class Settings(BaseSettings):
     embedding_model: str = ""
     embedding_base_url: str = ""
     embedding_vector_size: int = 3072
-    embedding_batch_size: int = 50
+    embedding_batch_size: int = 50  # 單批筆數上限
     embedding_max_retries: int = 5
     embedding_timeout: float = 120.0
-    embedding_batch_delay: float = 1.0
     embedding_retry_after_multiplier: float = 1.0
-    embedding_min_batch_size: int = 10
+    # Embedding scheduler：單批估算 token 上限（OpenAI 單一 request 上限 300k）、
+    # AIMD 併發（429 減半、成功逐步 +1；process 內同 key/model 共用）
+    embedding_max_batch_tokens: int = 100_000
+    embedding_initial_concurrency: int = 2
+    embedding_max_concurrency: int = 8
+    # chat query embedding 的獨立 lane（不排在 ingest 批次後面、不受 bulk 429 暫停）
+    embedding_query_concurrency: int = 4
+    # Embedding HTTP connection pool（process-wide，跨 request 共用）
+    embedding_pool_max_connections: int = 20
+    embedding_pool_max_keepalive: int = 10
+    embedding_pool_keepalive_expiry: float = 60.0
+    embedding_http2: bool = True  # 未安裝 h2 時自動退回 HTTP/1.1 keep-alive
+    # Query embedding cache（LRU + Redis 兩層，只快取 embed_query）
+    query_embedding_cache_enabled: bool = True
+    query_embedding_cache_max_entries: int = 2048
+    query_embedding_cache_ttl: int = 86400
+    # Query embedding micro-batching（併發 embed_query 合併成一次 request）
+    embedding_coalesce_enabled: bool = True
+    embedding_coalesce_max_wait_ms: float = 5.0
+    embedding_coalesce_max_batch_size: int = 32
 
     # LLM
     llm_max_tokens: int = 1024
@@ -74,15 +97,99 @@ class Settings(BaseSettings):
     # Agent Timeout
     agent_llm_request_timeout: int = 120  # 單次 LLM API 請求 HTTP 超時（秒）
     agent_stream_timeout: int = 180  # 整個 Agent 迴圈（含多次工具呼叫）總超時（秒）
+    react_graph_cache_max_entries: int = 256  # 已編譯 ReAct graph template 上限
+    # ReAct chat model client pool（process-wide，false = 每則訊息 new ChatModel）
+    chat_model_pool_enabled: bool = True
+    chat_model_pool_max_connections: int = 50
+    chat_model_pool_max_keepalive: int = 20
+    chat_model_pool_keepalive_expiry: float = 60.0
+    chat_model_http2: bool = True  # 未安裝 h2 時自動退回 HTTP/1.1 keep-alive
+
+    # Bot runtime snapshot（_load_bot_config 結果）in-process 快取；
+    # 設定更新經 Redis pub/sub 失效，TTL 為保險
+    bot_config_cache_enabled: bool = True
+    bot_config_cache_ttl: int = 300
+    bot_config_cache_max_entries: int = 2048
+
+    # 語意回答快取（bot answer_cache_enabled 才生效）；bot / KB 變更經
+    # Redis pub/sub 失效，TTL 為保險（worker 設定等沒走 pub/sub 的變更）
+    answer_cache_ttl: int = 3600
+    answer_cache_max_entries_per_bot: int = 500
+    # kb_* 寫入後 publish knowledge_base:{kb_id} 的合併窗口（秒）；0 = 每次寫入都 publish
+    kb_change_notify_debounce_seconds: float = 2.0
+
+    # MCP session pool（false = 每則訊息重新 connect / initialize）
+    mcp_session_pool_enabled: bool = True
+    mcp_max_sessions_per_server: int = 4
+    mcp_session_idle_ttl: float = 300.0  # 閒置多久回收 session（秒）
+    mcp_tool_schema_ttl: float = 300.0  # list_tools 結果快取（秒）
+    mcp_health_check_interval: float = 30.0  # 閒置超過此秒數，lease 前先 ping
 
     # Conversation History Strategy
     # "full" | "sliding_window" | "summary_recent" | "rag_history"
     history_strategy: str = "sliding_window"
     history_recent_turns: int = 3
+    # 每輪只載入最後 N 則訊息（至少 bot history_limit）+ DB 摘要；0 = 載入完整歷史
+    conversation_history_window: int = 40
+
+    # Prompt guard 預編譯規則的 in-process 快取（秒）；規則更新時經
+    # ConfigInvalidationBus 立即失效，TTL 只是保險
+    guard_rules_cache_ttl: float = 60.0
+
+    # KB 自動分類：超過 sample 上限只對 sample 聚類，其餘以最近 centroid 指派；
+    # 聚類跑在 process pool（0 = thread）；上傳後增量指派，新 chunk 佔比超過
+    # ratio 才整個 KB 重新聚類
+    classification_max_cluster_sample: int = 2000
+    classification_assign_batch_size: int = 1000
+    classification_process_workers: int = 1
+    classification_incremental_max_new_ratio: float = 0.3
+
+    # request log / agent trace / usage record write-behind 批次寫入
+    # （false = 每筆各自 session + commit）
+    batch_writer_enabled: bool = True
+    batch_writer_max_batch: int = 500
+    batch_writer_flush_interval: float = 0.5  # 秒
+    batch_writer_max_queue: int = 10000
+    batch_writer_drain_timeout: float = 10.0  # shutdown 時 flush 剩餘資料的上限（秒）
+    batch_writer_retry_attempts: int = 5  # 連線類錯誤整批重試次數（含第一次）
+    batch_writer_retry_backoff: float = 0.5  # 秒，每次加倍
+
+    # PDF OCR streaming pipeline：最多 N 頁同時 render 完在 OCR（峰值記憶體 ∝ N）
+    ocr_pipeline_window: int = 5
+    ocr_render_dpi: int = 200
+
+    # 文件 ingestion pipeline（context → embed → upsert 以 chunk batch 串流重疊）：
+    # batch 大小、stage 間 queue 容量、各 stage 併發上限
+    ingest_batch_size: int = 50
+    ingest_queue_size: int = 2
+    ingest_context_concurrency: int = 2
+    ingest_embed_concurrency: int = 2
+    ingest_upsert_concurrency: int = 2
 
     # RAG
     rag_score_threshold: float = 0.3
     rag_top_k: int = 5
+    # hybrid retrieval：RRF k 值；BM25 索引 per (KB, tenant) 由 Milvus scan 建立，
+    # KB 寫入後標 dirty，距上次 build 未滿 min_rebuild_interval 先沿用舊索引
+    rag_rrf_k: int = 60
+    lexical_index_ttl: int = 600
+    lexical_index_min_rebuild_interval: float = 30.0
+    lexical_index_max_indexes: int = 64
+    # rerank 分數快取（key = backend + query hash + chunk_id）；LLM backend 單批上限
+    rerank_cache_max_entries: int = 20000
+    rerank_cache_ttl: int = 3600
+    rerank_llm_batch_size: int = 20
+    # retrieve() 結果快取（KB 寫入經 invalidation bus 作廢）；chunk 內容另存小 LRU
+    retrieval_cache_enabled: bool = True
+    retrieval_cache_ttl: int = 300
+    retrieval_cache_max_entries: int = 2000
+    retrieval_cache_max_chunks: int = 5000
+    # rewrite / HyDE 生成結果快取（L1 LRU + Redis）；key 含 model / bot prompt / hint
+    query_generation_cache_enabled: bool = True
+    query_generation_cache_max_entries: int = 4096
+    query_generation_cache_ttl: int = 86400
+    # >0：raw 向量檢索先跑，rewrite/hyde 超過此 budget（ms）就只用 raw 結果
+    rag_speculative_generation_budget_ms: int = 0
 
     # Document Storage
     storage_backend: str = "local"  # "local" | "gcs"
@@ -1,10 +1,12 @@
 import redis.asyncio as aioredis
 from dependency_injector import containers, providers
 
+from src.application.agent.bot_runtime_snapshot import BotRuntimeSnapshotCache
 from src.application.agent.intent_classifier import IntentClassifier
 from src.application.agent.list_built_in_tools_use_case import (
     ListBuiltInToolsUseCase,
 )
+from src.application.agent.semantic_answer_cache import SemanticAnswerCache
 from src.application.agent.send_message_use_case import SendMessageUseCase
 from src.application.agent.tool_registry import ToolRegistry
 from src.application.agent.update_built_in_tool_scope_use_case import (
@@ -312,7 +314,9 @@ from src.application.platform.test_provider_connection_use_case import (
 from src.application.platform.update_provider_setting_use_case import (
     UpdateProviderSettingUseCase,
 )
+from src.application.rag.query_generation_cache import QueryGenerationCache
 from src.application.rag.query_rag_use_case import QueryRAGUseCase
+from src.application.rag.retrieval_result_cache import RetrievalResultCache
 from src.application.rag.unified_search_use_case import UnifiedSearchUseCase
 from src.application.ratelimit.get_rate_limits_use_case import GetRateLimitsUseCase
 from src.application.ratelimit.seed_defaults_use_case import SeedDefaultsUseCase
@@ -324,6 +328,7 @@ from src.application.security.guard_rules_use_cases import (
     ResetGuardRulesUseCase,
     UpdateGuardRulesUseCase,
 )
+from src.application.security.guard_ruleset import GuardRulesetCache
 from src.application.security.prompt_guard_service import PromptGuardService
 from src.application.tenant.create_tenant_use_case import CreateTenantUseCase
 from src.application.tenant.get_tenant_use_case import GetTenantUseCase
@@ -333,12 +338,19 @@ from src.application.usage.query_bot_usage_use_case import QueryBotUsageUseCase
 from src.application.usage.query_daily_usage_use_case import QueryDailyUsageUseCase
 from src.application.usage.query_monthly_usage_use_case import QueryMonthlyUsageUseCase
 from src.application.usage.query_usage_use_case import QueryUsageUseCase
+from src.application.usage.reconcile_usage_rollups_use_case import (
+    ReconcileUsageRollupsUseCase,
+)
 from src.application.usage.record_usage_use_case import RecordUsageUseCase
 from src.config import Settings
 from src.domain.agent.team_supervisor import TeamSupervisor
 from src.infrastructure.auth.bcrypt_password_service import BcryptPasswordService
 from src.infrastructure.auth.jwt_service import JWTService
+from src.infrastructure.cache.config_invalidation_bus import (
+    RedisConfigInvalidationBus,
+)
 from src.infrastructure.cache.redis_cache_service import RedisCacheService
+from src.infrastructure.cache.two_tier_cache import TwoTierCache
 from src.infrastructure.classification.cluster_classification_service import (
     ClusterClassificationService,
 )
@@ -356,6 +368,7 @@ from src.infrastructure.conversation.llm_summary_service import (
     LLMConversationSummaryService,
 )
 from src.infrastructure.crypto.aes_encryption_service import AESEncryptionService
+from src.infrastructure.db.batch_writer import BatchWriterConfig, get_batch_writer
 from src.infrastructure.db.engine import (
     async_session_factory as _async_session_factory,
 )
@@ -431,6 +444,8 @@ from src.infrastructure.pricing.pricing_repository import (
 from src.infrastructure.pricing.usage_recalc_adapter import (
     SQLAlchemyUsageRecalcAdapter,
 )
+from src.infrastructure.ratelimit.config_loader import RateLimitConfigLoader
+from src.infrastructure.ratelimit.redis_rate_limiter import RedisRateLimiter
 from src.infrastructure.db.repositories.provider_setting_repository import (
     SQLAlchemyProviderSettingRepository,
 )
@@ -465,10 +480,20 @@ from src.infrastructure.db.repositories.worker_config_repository import (
     SQLAlchemyWorkerConfigRepository,
 )
 from src.infrastructure.db.session_middleware import get_tracked_session
+from src.infrastructure.embedding.cached_embedding_service import (
+    CachedEmbeddingService,
+)
+from src.infrastructure.embedding.coalescing_embedding_service import (
+    CoalescingEmbeddingService,
+)
 from src.infrastructure.embedding.dynamic_embedding_factory import (
     DynamicEmbeddingServiceFactory,
     DynamicEmbeddingServiceProxy,
 )
+from src.infrastructure.embedding.embedding_client_registry import (
+    EmbeddingPoolConfig,
+    get_embedding_client_registry,
+)
 from src.infrastructure.embedding.fake_embedding_service import (
     FakeEmbeddingService,
 )
@@ -490,6 +515,11 @@ from src.infrastructure.langgraph.meta_supervisor_service import (
 from src.infrastructure.langgraph.react_agent_service import (
     ReActAgentService,
 )
+from src.infrastructure.langgraph.react_graph_cache import ReActGraphCache
+from src.infrastructure.llm.chat_model_pool import (
+    ChatModelPoolConfig,
+    get_chat_model_pool,
+)
 from src.infrastructure.langgraph.tools import RAGQueryTool
 from src.infrastructure.langgraph.transfer_to_human_tool import (
     TransferToHumanTool,
@@ -510,10 +540,17 @@ from src.infrastructure.llm.dynamic_llm_factory import (
 from src.infrastructure.llm.fake_llm_service import FakeLLMService
 from src.infrastructure.logging.db_error_reporter import DBErrorReporter
 from src.infrastructure.mcp.cached_tool_loader import CachedMCPToolLoader
+from src.infrastructure.mcp.mcp_session_pool import (
+    McpPoolConfig,
+    get_mcp_session_pool,
+)
 from src.infrastructure.memory.llm_memory_extraction_service import (
     LLMMemoryExtractionService,
 )
+from src.infrastructure.milvus.kb_change_notifier import KnowledgeChangeNotifier
 from src.infrastructure.milvus.milvus_vector_store import MilvusVectorStore
+from src.infrastructure.rag.bm25_lexical_search import Bm25LexicalSearchService
+from src.infrastructure.rag.reranker import RerankService
 from src.infrastructure.outbox.handlers import build_vector_handlers
 from src.infrastructure.notification.email_sender import EmailNotificationSender
 from src.infrastructure.notification.redis_throttle import RedisNotificationThrottle
@@ -624,9 +661,49 @@ class Container(containers.DeclarativeContainer):
         redis_client=redis_client,
     )
 
+    config_invalidation_bus = providers.Singleton(
+        RedisConfigInvalidationBus,
+        redis_client=redis_client,
+    )
+
+    bot_runtime_snapshot_cache = providers.Singleton(
+        BotRuntimeSnapshotCache,
+        invalidation_bus=config_invalidation_bus,
+        ttl_seconds=config.provided.bot_config_cache_ttl,
+        max_entries=config.provided.bot_config_cache_max_entries,
+    )
+
+    semantic_answer_cache = providers.Singleton(
+        SemanticAnswerCache,
+        invalidation_bus=config_invalidation_bus,
+        ttl_seconds=config.provided.answer_cache_ttl,
+        max_entries_per_bot=config.provided.answer_cache_max_entries_per_bot,
+    )
+
     db_session = providers.Factory(get_tracked_session)
     trace_session_factory = providers.Object(_async_session_factory)
 
+    batch_writer = providers.Selector(
+        providers.Callable(
+            lambda cfg: "buffered" if cfg.batch_writer_enabled else "direct",
+            config,
+        ),
+        buffered=providers.Callable(
+            get_batch_writer,
+            config=providers.Factory(
+                BatchWriterConfig,
+                max_batch=config.provided.batch_writer_max_batch,
+                flush_interval=config.provided.batch_writer_flush_interval,
+                max_queue=config.provided.batch_writer_max_queue,
+                drain_timeout=config.provided.batch_writer_drain_timeout,
+                retry_attempts=config.provided.batch_writer_retry_attempts,
+                retry_backoff=config.provided.batch_writer_retry_backoff,
+            ),
+            session_factory=trace_session_factory,
+        ),
+        direct=providers.Object(None),
+    )
+
     jwt_service = providers.Singleton(
         JWTService,
         secret_key=providers.Callable(lambda cfg: cfg.jwt_secret_key, config),
@@ -687,6 +764,7 @@ class Container(containers.DeclarativeContainer):
     usage_repository = providers.Factory(
         SQLAlchemyUsageRepository,
         session=db_session,
+        batch_writer=batch_writer,
     )
 
     bot_repository = providers.Factory(
@@ -729,6 +807,18 @@ class Container(containers.DeclarativeContainer):
         session=db_session,
     )
 
+    rate_limiter = providers.Singleton(
+        RedisRateLimiter,
+        redis_client=redis_client,
+    )
+
+    rate_limit_config_loader = providers.Singleton(
+        RateLimitConfigLoader,
+        rate_limit_config_repo_factory=rate_limit_config_repository.provider,
+        invalidation_bus=config_invalidation_bus,
+        cache_ttl=config.provided.rate_limit_config_cache_ttl,
+    )
+
     plan_repository = providers.Factory(
         SQLAlchemyPlanRepository,
         session=db_session,
@@ -888,6 +978,8 @@ class Container(containers.DeclarativeContainer):
     file_parser_service = providers.Singleton(
         OcrFileParserService,
         ocr_engine=_ocr_engine,
+        window=config.provided.ocr_pipeline_window,
+        dpi=config.provided.ocr_render_dpi,
     )
 
     language_detection_service = providers.Singleton(
@@ -951,15 +1043,13 @@ class Container(containers.DeclarativeContainer):
         timeout=providers.Callable(
             lambda cfg: cfg.embedding_timeout, config
         ),
-        batch_delay=providers.Callable(
-            lambda cfg: cfg.embedding_batch_delay, config
-        ),
         retry_after_multiplier=providers.Callable(
             lambda cfg: cfg.embedding_retry_after_multiplier, config
         ),
-        min_batch_size=providers.Callable(
-            lambda cfg: cfg.embedding_min_batch_size, config
-        ),
+        max_batch_tokens=config.provided.embedding_max_batch_tokens,
+        initial_concurrency=config.provided.embedding_initial_concurrency,
+        max_concurrency=config.provided.embedding_max_concurrency,
+        query_concurrency=config.provided.embedding_query_concurrency,
     )
 
     _static_embedding_service = providers.Selector(
@@ -976,6 +1066,20 @@ class Container(containers.DeclarativeContainer):
         google=_real_embedding_service,
     )
 
+    # Process-wide pooled embedding clients（module-level singleton，
+    # worker 每個 job new Container 也共用同一個 pool）
+    embedding_client_registry = providers.Callable(
+        get_embedding_client_registry,
+        config=providers.Factory(
+            EmbeddingPoolConfig,
+            max_connections=config.provided.embedding_pool_max_connections,
+            max_keepalive_connections=config.provided.embedding_pool_max_keepalive,
+            keepalive_expiry=config.provided.embedding_pool_keepalive_expiry,
+            http2=config.provided.embedding_http2,
+            timeout=config.provided.embedding_timeout,
+        ),
+    )
+
     _embedding_factory = providers.Singleton(
         DynamicEmbeddingServiceFactory,
         provider_setting_repo_factory=provider_setting_repository.provider,
@@ -985,18 +1089,126 @@ class Container(containers.DeclarativeContainer):
         cache_ttl=providers.Callable(
             lambda cfg: cfg.cache_provider_config_ttl, config
         ),
+        client_registry=embedding_client_registry,
+        service_kwargs=providers.Dict(
+            batch_size=config.provided.embedding_batch_size,
+            max_retries=config.provided.embedding_max_retries,
+            retry_after_multiplier=config.provided.embedding_retry_after_multiplier,
+            max_batch_tokens=config.provided.embedding_max_batch_tokens,
+            initial_concurrency=config.provided.embedding_initial_concurrency,
+            max_concurrency=config.provided.embedding_max_concurrency,
+            query_concurrency=config.provided.embedding_query_concurrency,
+        ),
     )
 
-    embedding_service = providers.Singleton(
+    _dynamic_embedding_service = providers.Singleton(
         DynamicEmbeddingServiceProxy,
         factory=_embedding_factory,
     )
 
-    vector_store = providers.Singleton(
+    # Micro-batching：數 ms 內的併發 query 合併成一次 /embeddings request
+    query_embedding_coalescer = providers.Singleton(
+        CoalescingEmbeddingService,
+        inner=_dynamic_embedding_service,
+        max_wait_ms=config.provided.embedding_coalesce_max_wait_ms,
+        max_batch_size=config.provided.embedding_coalesce_max_batch_size,
+    )
+
+    _query_embedding_backend = providers.Selector(
+        providers.Callable(
+            lambda cfg: "coalesced" if cfg.embedding_coalesce_enabled else "direct",
+            config,
+        ),
+        coalesced=query_embedding_coalescer,
+        direct=_dynamic_embedding_service,
+    )
+
+    # Query embedding cache：重複問題不再打 embedding API
+    query_embedding_cache = providers.Singleton(
+        TwoTierCache,
+        namespace="qemb",
+        redis_client=redis_client,
+        max_entries=config.provided.query_embedding_cache_max_entries,
+        ttl_seconds=config.provided.query_embedding_cache_ttl,
+    )
+
+    embedding_service = providers.Selector(
+        providers.Callable(
+            lambda cfg: "cached" if cfg.query_embedding_cache_enabled else "direct",
+            config,
+        ),
+        cached=providers.Singleton(
+            CachedEmbeddingService,
+            inner=_query_embedding_backend,
+            cache=query_embedding_cache,
+            model=providers.Callable(
+                lambda cfg: (
+                    f"{cfg.embedding_provider}:{cfg.effective_embedding_model}"
+                ),
+                config,
+            ),
+            dimensions=config.provided.embedding_vector_size,
+        ),
+        direct=_query_embedding_backend,
+    )
+
+    _milvus_vector_store = providers.Singleton(
         MilvusVectorStore,
         uri=config.provided.milvus_uri,
         token=config.provided.milvus_token,
         db_name=config.provided.milvus_db_name,
+        backend=config.provided.milvus_backend,
+        executor_workers=config.provided.milvus_executor_workers,
+        partition_key=config.provided.milvus_partition_key,
+        num_partitions=config.provided.milvus_num_partitions,
+    )
+
+    # 寫入 kb_* collection 後 publish knowledge_base:{kb_id}
+    # （語意回答快取失效 / lexical 索引標 dirty）；同一 KB 的連續寫入合併 publish
+    vector_store = providers.Singleton(
+        KnowledgeChangeNotifier,
+        inner=_milvus_vector_store,
+        invalidation_bus=config_invalidation_bus,
+        debounce_seconds=config.provided.kb_change_notify_debounce_seconds,
+    )
+
+    # hybrid retrieval mode 的 BM25 索引（per KB + tenant，由 vector_store scan 建立）
+    lexical_search_service = providers.Singleton(
+        Bm25LexicalSearchService,
+        vector_store=vector_store,
+        invalidation_bus=config_invalidation_bus,
+        max_indexes=config.provided.lexical_index_max_indexes,
+        ttl_seconds=config.provided.lexical_index_ttl,
+        min_rebuild_interval=config.provided.lexical_index_min_rebuild_interval,
+    )
+
+    # RAG rerank backend（bot rerank_model 選 LLM / local:lexical）+ 分數快取
+    rerank_service = providers.Singleton(
+        RerankService,
+        cache_max_entries=config.provided.rerank_cache_max_entries,
+        cache_ttl_seconds=config.provided.rerank_cache_ttl,
+        llm_batch_size=config.provided.rerank_llm_batch_size,
+    )
+
+    # retrieve() 結果快取；KB version 由 knowledge_base invalidation 推進
+    retrieval_result_cache = providers.Singleton(
+        RetrievalResultCache,
+        invalidation_bus=config_invalidation_bus,
+        ttl_seconds=config.provided.retrieval_cache_ttl,
+        max_entries=config.provided.retrieval_cache_max_entries,
+        max_chunks=config.provided.retrieval_cache_max_chunks,
+    )
+
+    # rewrite / HyDE 生成結果快取：同一句 query 不再重打 LLM
+    query_generation_cache = providers.Singleton(
+        QueryGenerationCache,
+        cache=providers.Singleton(
+            TwoTierCache,
+            namespace="qgen",
+            redis_client=redis_client,
+            max_entries=config.provided.query_generation_cache_max_entries,
+            ttl_seconds=config.provided.query_generation_cache_ttl,
+        ),
     )
 
     # Outbox handler registry — 等 vector_store 定義後組裝
@@ -1064,6 +1276,7 @@ class Container(containers.DeclarativeContainer):
         UpdateTenantUseCase,
         tenant_repository=tenant_repository,
         plan_repository=plan_repository,
+        config_invalidation_bus=config_invalidation_bus,
     )
 
     list_plans_use_case = providers.Factory(
@@ -1270,11 +1483,13 @@ class Container(containers.DeclarativeContainer):
     update_rate_limit_use_case = providers.Factory(
         UpdateRateLimitUseCase,
         rate_limit_config_repository=rate_limit_config_repository,
+        config_invalidation_bus=config_invalidation_bus,
     )
 
     seed_defaults_use_case = providers.Factory(
         SeedDefaultsUseCase,
         rate_limit_config_repository=rate_limit_config_repository,
+        config_invalidation_bus=config_invalidation_bus,
     )
 
     create_knowledge_base_use_case = providers.Factory(
@@ -1441,6 +1656,11 @@ class Container(containers.DeclarativeContainer):
         compute_quota=compute_tenant_quota_use_case,
     )
 
+    reconcile_usage_rollups_use_case = providers.Factory(
+        ReconcileUsageRollupsUseCase,
+        usage_repository=usage_repository,
+    )
+
     record_usage_use_case = providers.Factory(
         RecordUsageUseCase,
         usage_repository=usage_repository,
@@ -1486,6 +1706,11 @@ class Container(containers.DeclarativeContainer):
         record_usage_use_case=record_usage_use_case,
         chunk_context_service=chunk_context_service,
         tenant_repository=tenant_repository,
+        ingest_batch_size=config.provided.ingest_batch_size,
+        ingest_queue_size=config.provided.ingest_queue_size,
+        context_concurrency=config.provided.ingest_context_concurrency,
+        embed_concurrency=config.provided.ingest_embed_concurrency,
+        upsert_concurrency=config.provided.ingest_upsert_concurrency,
     )
 
     split_pdf_use_case = providers.Factory(
@@ -1529,6 +1754,8 @@ class Container(containers.DeclarativeContainer):
             lambda factory: factory.resolve_api_key,
             _llm_factory,
         ),
+        max_cluster_sample=config.provided.classification_max_cluster_sample,
+        process_workers=config.provided.classification_process_workers,
     )
 
     get_category_chunks_use_case = providers.Factory(
@@ -1546,6 +1773,11 @@ class Container(containers.DeclarativeContainer):
         vector_store=vector_store,
         classification_service=classification_service,
         record_usage=record_usage_use_case,
+        max_cluster_sample=config.provided.classification_max_cluster_sample,
+        assign_batch_size=config.provided.classification_assign_batch_size,
+        incremental_max_new_ratio=(
+            config.provided.classification_incremental_max_new_ratio
+        ),
     )
 
     view_document_use_case = providers.Factory(
@@ -1571,6 +1803,26 @@ class Container(containers.DeclarativeContainer):
             _llm_factory,
         ),
         record_usage=record_usage_use_case,
+        lexical_search=lexical_search_service,
+        rrf_k=config.provided.rag_rrf_k,
+        reranker=rerank_service,
+        retrieval_cache=providers.Selector(
+            providers.Callable(
+                lambda cfg: "on" if cfg.retrieval_cache_enabled else "off",
+                config,
+            ),
+            on=retrieval_result_cache,
+            off=providers.Object(None),
+        ),
+        generation_cache=providers.Selector(
+            providers.Callable(
+                lambda cfg: "on" if cfg.query_generation_cache_enabled else "off",
+                config,
+            ),
+            on=query_generation_cache,
+            off=providers.Object(None),
+        ),
+        speculative_budget_ms=config.provided.rag_speculative_generation_budget_ms,
     )
 
     # test_retrieval_use_case：thin wrapper of query_rag_use_case
@@ -1710,7 +1962,45 @@ class Container(containers.DeclarativeContainer):
 
     tool_registry = providers.Singleton(ToolRegistry)
 
-    cached_tool_loader = providers.Singleton(CachedMCPToolLoader)
+    mcp_session_pool = providers.Callable(
+        get_mcp_session_pool,
+        config=providers.Factory(
+            McpPoolConfig,
+            max_sessions_per_server=config.provided.mcp_max_sessions_per_server,
+            idle_ttl_seconds=config.provided.mcp_session_idle_ttl,
+            tool_ttl_seconds=config.provided.mcp_tool_schema_ttl,
+            health_check_interval=config.provided.mcp_health_check_interval,
+        ),
+    )
+
+    cached_tool_loader = providers.Singleton(
+        CachedMCPToolLoader,
+        pool=providers.Selector(
+            providers.Callable(
+                lambda cfg: "pooled" if cfg.mcp_session_pool_enabled else "direct",
+                config,
+            ),
+            pooled=mcp_session_pool,
+            direct=providers.Object(None),
+        ),
+    )
+
+    react_graph_cache = providers.Singleton(
+        ReActGraphCache,
+        max_entries=config.provided.react_graph_cache_max_entries,
+    )
+
+    chat_model_pool = providers.Callable(
+        get_chat_model_pool,
+        config=providers.Factory(
+            ChatModelPoolConfig,
+            max_connections=config.provided.chat_model_pool_max_connections,
+            max_keepalive_connections=config.provided.chat_model_pool_max_keepalive,
+            keepalive_expiry=config.provided.chat_model_pool_keepalive_expiry,
+            http2=config.provided.chat_model_http2,
+            timeout=config.provided.agent_llm_request_timeout,
+        ),
+    )
 
     # --- Agent Service ---
 
@@ -1742,6 +2032,15 @@ class Container(containers.DeclarativeContainer):
             cached_tool_loader=cached_tool_loader,
             dm_image_query_tool=dm_image_query_tool,
             transfer_to_human_tool=transfer_to_human_tool,
+            graph_cache=react_graph_cache,
+            chat_model_pool=providers.Selector(
+                providers.Callable(
+                    lambda cfg: "pooled" if cfg.chat_model_pool_enabled else "direct",
+                    config,
+                ),
+                pooled=chat_model_pool,
+                direct=providers.Object(None),
+            ),
         ),
     )
 
@@ -1790,12 +2089,14 @@ class Container(containers.DeclarativeContainer):
         bot_repository=bot_repository,
         cache_service=cache_service,
         encryption_service=encryption_service,
+        config_invalidation_bus=config_invalidation_bus,
     )
 
     delete_bot_use_case = providers.Factory(
         DeleteBotUseCase,
         bot_repository=bot_repository,
         cache_service=cache_service,
+        config_invalidation_bus=config_invalidation_bus,
     )
 
     upload_bot_icon_use_case = providers.Factory(
@@ -1830,6 +2131,12 @@ class Container(containers.DeclarativeContainer):
 
     # --- Security: Guard Rules ---
 
+    guard_ruleset_cache = providers.Singleton(
+        GuardRulesetCache,
+        invalidation_bus=config_invalidation_bus,
+        ttl_seconds=config.provided.guard_rules_cache_ttl,
+    )
+
     prompt_guard_service = providers.Factory(
         PromptGuardService,
         guard_rules_repo=guard_rules_config_repository,
@@ -1839,6 +2146,7 @@ class Container(containers.DeclarativeContainer):
             lambda factory: factory.resolve_api_key,
             _llm_factory,
         ),
+        ruleset_cache=guard_ruleset_cache,
     )
 
     get_guard_rules_use_case = providers.Factory(
@@ -1849,11 +2157,13 @@ class Container(containers.DeclarativeContainer):
     update_guard_rules_use_case = providers.Factory(
         UpdateGuardRulesUseCase,
         repo=guard_rules_config_repository,
+        config_invalidation_bus=config_invalidation_bus,
     )
 
     reset_guard_rules_use_case = providers.Factory(
         ResetGuardRulesUseCase,
         repo=guard_rules_config_repository,
+        config_invalidation_bus=config_invalidation_bus,
     )
 
     # --- Observability: Log Retention ---
@@ -2113,7 +2423,19 @@ class Container(containers.DeclarativeContainer):
         intent_classifier=intent_classifier,
         worker_config_repo=worker_config_repository,
         prompt_guard=prompt_guard_service,
+        batch_writer=batch_writer,
         tenant_repository=tenant_repository,
+        history_window=config.provided.conversation_history_window,
+        bot_config_cache=providers.Selector(
+            providers.Callable(
+                lambda cfg: "cached" if cfg.bot_config_cache_enabled else "direct",
+                config,
+            ),
+            cached=bot_runtime_snapshot_cache,
+            direct=providers.Object(None),
+        ),
+        answer_cache=semantic_answer_cache,
+        embedding_service=embedding_service,
     )
 
     # --- Platform: Provider Settings ---
@@ -2169,11 +2491,13 @@ class Container(containers.DeclarativeContainer):
     update_mcp_server_use_case = providers.Factory(
         UpdateMcpServerUseCase,
         mcp_server_repository=mcp_server_repository,
+        config_invalidation_bus=config_invalidation_bus,
     )
 
     delete_mcp_server_use_case = providers.Factory(
         DeleteMcpServerUseCase,
         mcp_server_repository=mcp_server_repository,
+        config_invalidation_bus=config_invalidation_bus,
     )
 
     discover_mcp_server_use_case = providers.Factory(
@@ -2207,6 +2531,7 @@ class Container(containers.DeclarativeContainer):
     update_system_prompts_use_case = providers.Factory(
         UpdateSystemPromptsUseCase,
         system_prompt_config_repository=system_prompt_config_repository,
+        config_invalidation_bus=config_invalidation_bus,
     )
 
     # --- LINE Bot ---
@@ -2249,4 +2574,6 @@ class Container(containers.DeclarativeContainer):
         intent_classifier=intent_classifier,
         worker_config_repo=worker_config_repository,
         history_strategy=history_strategy,
+        history_window=config.provided.conversation_history_window,
+        batch_writer=batch_writer,
     )
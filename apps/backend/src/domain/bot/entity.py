@@ -123,6 +123,9 @@ class Bot:
     hyde_enabled: bool = False
     hyde_model: str = ""                    # 空 = 用 haiku
     hyde_extra_hint: str = ""               # 額外提示詞（例：答案應提到分店）
+    # 語意回答快取（opt-in）：首輪提問與已答過的問題 cosine ≥ threshold 直接回快取
+    answer_cache_enabled: bool = False
+    answer_cache_threshold: float = 0.95
     # Per-tool RAG 參數覆蓋（key = tool name，例如 "rag_query" / "query_dm_with_image"）
     # 未設定時走 Bot 全域 rag_top_k / rag_score_threshold / rerank_*
     tool_configs: dict[str, ToolRagConfig] = field(default_factory=dict)
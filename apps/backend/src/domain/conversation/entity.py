@@ -39,6 +39,36 @@ class Conversation:
     summary_message_count: int | None = None
     last_message_at: datetime | None = None
     summary_at: datetime | None = None
+    # 視窗載入（find_window）時，messages 之前還有幾則已存 DB 的訊息；
+    # 0 = messages 是完整歷史
+    history_offset: int = 0
+    # messages 前幾則已存在 DB（repository 載入時設定）；之後 add_message 的
+    # 才是 save 需要 INSERT 的新訊息
+    persisted_message_count: int = field(default=0, repr=False, compare=False)
+
+    @property
+    def total_messages(self) -> int:
+        """含視窗外已存 DB 訊息的總數（寫回 message_count 用）。"""
+        return self.history_offset + len(self.messages)
+
+    def keep_last(self, last_k: int) -> None:
+        """只保留最後 last_k 則訊息，視窗外的數量記到 history_offset。"""
+        if last_k <= 0 or len(self.messages) <= last_k:
+            return
+        dropped = len(self.messages) - last_k
+        self.messages = self.messages[dropped:]
+        self.history_offset += dropped
+        self.persisted_message_count = max(
+            self.persisted_message_count - dropped, 0
+        )
+
+    @property
+    def new_messages(self) -> list[Message]:
+        """尚未寫入 DB 的訊息（append-only save 用）。"""
+        return self.messages[self.persisted_message_count :]
+
+    def mark_persisted(self) -> None:
+        self.persisted_message_count = len(self.messages)
 
     def add_message(
         self,
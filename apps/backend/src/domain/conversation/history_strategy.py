@@ -26,6 +26,15 @@ class HistoryStrategyConfig:
     router_context_limit: int = 3
 
 
+def prepend_stored_summary(respond_context: str, summary: str | None) -> str:
+    """視窗外還有更早的訊息時，把 DB 中的對話摘要接在歷史上下文前面。"""
+    if not summary:
+        return respond_context
+    if not respond_context:
+        return f"[對話摘要] {summary}"
+    return f"[對話摘要] {summary}\n\n{respond_context}"
+
+
 class ConversationHistoryStrategy(ABC):
     """對話歷史處理策略介面"""
 
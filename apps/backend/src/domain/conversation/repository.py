@@ -12,6 +12,18 @@ class ConversationRepository(ABC):
     @abstractmethod
     async def find_by_id(self, conversation_id: str) -> Conversation | None: ...
 
+    async def find_window(
+        self, conversation_id: str, last_k: int
+    ) -> Conversation | None:
+        """Conversation header + 最後 last_k 則訊息（含 summary）。
+
+        預設實作載入完整歷史再裁切；DB 實作應覆寫成只查 tail window。
+        """
+        conversation = await self.find_by_id(conversation_id)
+        if conversation is not None:
+            conversation.keep_last(last_k)
+        return conversation
+
     @abstractmethod
     async def find_by_tenant(
         self,
@@ -34,6 +46,15 @@ class ConversationRepository(ABC):
         """Find the most recent conversation for an external user (e.g. LINE user_id)."""
         ...
 
+    async def find_latest_window_by_visitor(
+        self, visitor_id: str, bot_id: str, last_k: int
+    ) -> Conversation | None:
+        """find_latest_by_visitor 的視窗版本（只帶最後 last_k 則訊息）。"""
+        conversation = await self.find_latest_by_visitor(visitor_id, bot_id)
+        if conversation is not None:
+            conversation.keep_last(last_k)
+        return conversation
+
     @abstractmethod
     async def find_conversation_id_by_message(
         self, message_id: str
@@ -90,6 +90,8 @@ class ChunkCategory:
     updated_at: datetime = field(
         default_factory=lambda: datetime.now(timezone.utc)
     )
+    # 自動分類時的群中心（正規化 embedding 平均）；新 chunk 增量指派用
+    centroid: list[float] | None = field(default=None, repr=False)
 
 
 @dataclass
@@ -100,6 +102,8 @@ class ProcessingTask:
     status: str = "pending"
     progress: int = 0
     error_message: str = ""
+    # ingestion pipeline 各 stage 的吞吐量（stage name → batches/items/ms/items_per_sec）
+    metrics: dict = field(default_factory=dict)
     created_at: datetime = field(
         default_factory=lambda: datetime.now(timezone.utc)
     )
@@ -248,6 +248,9 @@ class ProcessingTaskRepository(ABC):
         error_message: str | None = None,
     ) -> None: ...
 
+    @abstractmethod
+    async def update_metrics(self, task_id: str, metrics: dict) -> None: ...
+
 
 class ChunkCategoryRepository(ABC):
     @abstractmethod
@@ -273,6 +276,16 @@ class ChunkCategoryRepository(ABC):
         """Recalculate chunk_count for all categories in a KB."""
         ...
 
+    @abstractmethod
+    async def find_unclassified_chunk_ids(self, kb_id: str) -> list[str]:
+        """KB 內 category_id 為 NULL 的 chunk（增量分類的對象）。"""
+        ...
+
+    @abstractmethod
+    async def update_centroids(self, centroids: dict[str, list[float]]) -> None:
+        """批次更新 category centroid（增量指派後的 running mean）。"""
+        ...
+
     # --- S-KB-Studio.1 新增：CRUD ---
 
     @abstractmethod
@@ -0,0 +1,27 @@
+"""Reciprocal-rank fusion — 合併多條排序結果（dense / lexical / 多 mode）。
+
+各路檢索的分數尺度不同（cosine vs BM25），直接比大小沒有意義；RRF 只看
+名次：``score(d) = Σ 1 / (k + rank_i(d))``，rank 從 1 起算，``k`` 越大越
+平滑（常用 60）。
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+
+DEFAULT_RRF_K = 60
+
+
+def reciprocal_rank_fusion(
+    ranked_lists: Iterable[Sequence[str]], k: int = DEFAULT_RRF_K
+) -> dict[str, float]:
+    """回傳 {id: fused score}；同一條 list 內重複的 id 只算第一次出現的名次。"""
+    fused: dict[str, float] = {}
+    for ranked in ranked_lists:
+        seen: set[str] = set()
+        for rank, item_id in enumerate(ranked, start=1):
+            if item_id in seen:
+                continue
+            seen.add(item_id)
+            fused[item_id] = fused.get(item_id, 0.0) + 1.0 / (k + rank)
+    return fused
@@ -4,9 +4,12 @@ Bot-level retrieval mode 多選：
 - ``raw``: 直接用使用者原始 query 做向量檢索
 - ``rewrite``: LLM 改寫成更適合向量檢索的 query
 - ``hyde``: LLM 先生成假答案，再用假答案做向量檢索
+- ``hybrid``: 原始 query 另跑一次 BM25 lexical 檢索（SKU / 型號 / 活動名這類
+  向量檢索容易漏的 query），與向量結果以 reciprocal-rank fusion 合併；
+  沒選其他 mode 時搭配 raw 向量檢索
 
 多選會走 multi-query retrieval：N 條 query 並行 embed/search，
-結果 union by chunk_id 後再 rerank 取 top_k。
+結果 union by chunk_id 後再 rerank 取 top_k（含 hybrid 時改以 RRF 排序）。
 
 至少要選 1 個（application layer validate；DB 不擋以保留未來擴充）。
 """
@@ -20,6 +23,7 @@ class RetrievalMode(str, Enum):
     RAW = "raw"
     REWRITE = "rewrite"
     HYDE = "hyde"
+    HYBRID = "hybrid"
 
     @classmethod
     def values(cls) -> list[str]:
@@ -1,8 +1,9 @@
+import asyncio
 from abc import ABC, abstractmethod
 from collections.abc import AsyncIterator
 from typing import Any
 
-from src.domain.rag.value_objects import LLMResult, SearchResult
+from src.domain.rag.value_objects import LLMResult, RerankScores, SearchResult
 
 
 class EmbeddingService(ABC):
@@ -12,6 +13,13 @@ class EmbeddingService(ABC):
     @abstractmethod
     async def embed_query(self, text: str) -> list[float]: ...
 
+    async def embed_queries(self, texts: list[str]) -> list[list[float]]:
+        """一次 embed 多條 query（同一次 retrieve 的 raw / rewrite / hyde）。
+
+        預設逐條 embed_query 並行；支援批次的實作覆寫成單一 request。
+        """
+        return list(await asyncio.gather(*(self.embed_query(t) for t in texts)))
+
 
 class VectorStore(ABC):
     @abstractmethod
@@ -38,6 +46,34 @@ class VectorStore(ABC):
         filters: dict[str, Any] | None = None,
     ) -> list[SearchResult]: ...
 
+    async def search_many(
+        self,
+        collection: str,
+        query_vectors: list[list[float]],
+        limit: int = 5,
+        score_threshold: float = 0.3,
+        filters: dict[str, Any] | None = None,
+    ) -> list[list[SearchResult]]:
+        """同一 collection、同一組 filter 下多條 query vector 的搜尋。
+
+        回傳 list 與 ``query_vectors`` 一一對應。預設逐條 ``search`` 並行；
+        Milvus 實作覆寫成單一 multi-vector RPC。
+        """
+        return list(
+            await asyncio.gather(
+                *(
+                    self.search(
+                        collection=collection,
+                        query_vector=vec,
+                        limit=limit,
+                        score_threshold=score_threshold,
+                        filters=filters,
+                    )
+                    for vec in query_vectors
+                )
+            )
+        )
+
     @abstractmethod
     async def delete(
         self,
@@ -117,6 +153,60 @@ class VectorStore(ABC):
         """回傳符合 filter 的 row 數。Milvus 實作覆寫，預設 0。"""
         return 0
 
+    async def scan(
+        self,
+        collection: str,
+        filters: dict[str, Any],
+        batch_size: int = 1000,
+    ) -> list[SearchResult]:
+        """逐批讀出符合 filter 的所有 row（不含向量，score = 0）。
+
+        lexical index 建索引用；Milvus 實作覆寫，預設空。
+        """
+        return []
+
+
+class LexicalSearchService(ABC):
+    """關鍵字（BM25）檢索；與向量檢索共用 collection / filter / 回傳格式。"""
+
+    @abstractmethod
+    async def search(
+        self,
+        collection: str,
+        query: str,
+        limit: int = 5,
+        filters: dict[str, Any] | None = None,
+    ) -> list[SearchResult]: ...
+
+    def is_stale(self, collection: str, tenant_id: str) -> bool:
+        """該索引是否已知落後於 collection 內容（仍在沿用舊索引）。"""
+        return False
+
+
+class Reranker(ABC):
+    """RAG 召回結果重新評分（``RerankService`` 依 bot 的 rerank_model 選 backend）。"""
+
+    name: str = ""
+
+    @abstractmethod
+    async def score(self, query: str, texts: list[str]) -> RerankScores:
+        """為每個 text 與 query 的相關度評分（越大越相關）；失敗 raise。"""
+
+    def select(
+        self,
+        scores: list[float | None],
+        texts: list[str],
+        prior_scores: list[float],
+        top_k: int,
+    ) -> list[int]:
+        """依分數挑出 top_k 的 index；同分（含無分數）維持召回順序。"""
+        order = sorted(
+            range(len(scores)),
+            key=lambda i: (scores[i] is not None, scores[i] or 0.0),
+            reverse=True,
+        )
+        return order[:top_k]
+
 
 class LLMService(ABC):
     @property
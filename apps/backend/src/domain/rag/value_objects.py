@@ -109,3 +109,16 @@ class RAGResponse:
     tenant_id: str
     knowledge_base_id: str
     usage: TokenUsage | None = None
+
+
+@dataclass(frozen=True)
+class RerankScores:
+    """rerank backend 的評分結果，與輸入 texts 對齊。
+
+    ``None`` = 該筆沒拿到分數（排在最後、不進快取）；``usage`` 只有
+    LLM backend 有（記 token 用量 / trace 成本）。
+    """
+
+    scores: list[float | None]
+    usage: TokenUsage | None = None
+    batches: int = 1
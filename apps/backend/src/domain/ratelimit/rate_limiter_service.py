@@ -7,6 +7,16 @@ class RateLimitResult:
     allowed: bool
     remaining: int
     retry_after: int | None = None  # seconds
+    limit: int | None = None  # 被擋下的那一層的限額
+
+
+@dataclass(frozen=True)
+class RateLimitLayer:
+    key: str
+    limit: int
+    window_seconds: int
+    # 允許的瞬間突發量；None = limit（整個視窗的額度可一次用完）
+    burst: int | None = None
 
 
 class RateLimiterService(ABC):
@@ -14,3 +24,30 @@ class RateLimiterService(ABC):
     async def check_rate_limit(
         self, key: str, limit: int, window_seconds: int
     ) -> RateLimitResult: ...
+
+    async def check_layers(
+        self, layers: list[RateLimitLayer]
+    ) -> RateLimitResult:
+        """多層限流 — 最嚴格的一層決定結果。
+
+        預設逐層呼叫 ``check_rate_limit``；實作可覆寫成單次 round trip 的
+        atomic 版本（任一層超限時其他層也不扣額度）。
+        """
+        remaining: int | None = None
+        for layer in layers:
+            result = await self.check_rate_limit(
+                layer.key, layer.limit, layer.window_seconds
+            )
+            if not result.allowed:
+                return RateLimitResult(
+                    allowed=False,
+                    remaining=0,
+                    retry_after=result.retry_after,
+                    limit=layer.limit,
+                )
+            remaining = (
+                result.remaining
+                if remaining is None
+                else min(remaining, result.remaining)
+            )
+        return RateLimitResult(allowed=True, remaining=remaining or 0)
@@ -0,0 +1,32 @@
+"""ConfigInvalidationBus ABC — 跨 process 的設定變更通知
+
+in-process 快取（bot runtime snapshot 等）在設定被更新時需要失效；多個 API
+replica / worker 各自有一份快取，所以更新端只負責 publish，各 process 自行
+訂閱並清掉自己的 entry。
+"""
+
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+
+# scope 常數；key = 受影響的 entity id，"*" = 整個 scope
+SCOPE_BOT = "bot"
+SCOPE_TENANT = "tenant"
+SCOPE_MCP_REGISTRY = "mcp_registry"
+SCOPE_SYSTEM_PROMPT = "system_prompt"
+SCOPE_RATE_LIMIT = "rate_limit"
+SCOPE_GUARD_RULES = "guard_rules"
+# 知識庫內容（向量）變更；key = kb_id
+SCOPE_KNOWLEDGE_BASE = "knowledge_base"
+ALL_KEYS = "*"
+
+InvalidationHandler = Callable[[str, str], None]
+
+
+class ConfigInvalidationBus(ABC):
+    @abstractmethod
+    async def publish(self, scope: str, key: str = ALL_KEYS) -> None:
+        """通知所有 process（含自己）`scope:key` 已變更。"""
+
+    @abstractmethod
+    def subscribe(self, handler: InvalidationHandler) -> None:
+        """註冊 handler(scope, key)；handler 必須是快速的同步函式。"""
@@ -111,3 +111,10 @@ class UsageRepository(ABC):
         - list → WHERE request_type IN (...)
         """
         ...
+
+    async def reconcile_cycle_rollups(self, cycle_year_month: str) -> int:
+        """以 append-only records 為準修正 per-cycle rollup，回傳修正列數。
+
+        有維護 rollup 的實作才需覆寫；預設沒有 rollup，無事可做。
+        """
+        return 0
@@ -0,0 +1,170 @@
+"""ConfigInvalidationBus 實作 — in-process 與 Redis pub/sub。
+
+``RedisConfigInvalidationBus``：
+- ``publish`` 先在本 process 同步 dispatch（寫入端立即看到新設定），再
+  ``PUBLISH`` 到 channel 通知其他 replica；訊息帶 origin id，listener 收到
+  自己發的訊息會略過
+- listener 在第一次 ``subscribe`` 且有 running loop 時才啟動（arq worker 只
+  publish 不 subscribe，不會每個 job 多一條 listener）
+- 斷線期間的通知會遺失，所以重連成功後對所有 handler 發一次 ``("*", "*")``
+  全清；快取本身的 TTL 是最後一道保險
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import uuid
+from typing import Any
+
+import redis.asyncio as aioredis
+from redis.exceptions import RedisError
+
+from src.domain.shared.config_invalidation import (
+    ALL_KEYS,
+    ConfigInvalidationBus,
+    InvalidationHandler,
+)
+from src.infrastructure.logging import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_CHANNEL = "cfg:invalidate"
+
+
+class InProcessConfigInvalidationBus(ConfigInvalidationBus):
+    """單 process 版本（測試 / 沒有 Redis 的部署）。"""
+
+    def __init__(self) -> None:
+        self._handlers: list[InvalidationHandler] = []
+        self.published_total = 0
+        self.dispatched_total = 0
+
+    async def publish(self, scope: str, key: str = ALL_KEYS) -> None:
+        self.published_total += 1
+        self._dispatch(scope, key)
+
+    def subscribe(self, handler: InvalidationHandler) -> None:
+        self._handlers.append(handler)
+
+    def _dispatch(self, scope: str, key: str) -> None:
+        self.dispatched_total += 1
+        for handler in list(self._handlers):
+            try:
+                handler(scope, key)
+            except Exception:
+                logger.warning(
+                    "config_invalidation.handler_failed",
+                    scope=scope,
+                    key=key,
+                    exc_info=True,
+                )
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "backend": "memory",
+            "subscribers": len(self._handlers),
+            "published_total": self.published_total,
+            "dispatched_total": self.dispatched_total,
+        }
+
+
+class RedisConfigInvalidationBus(InProcessConfigInvalidationBus):
+    def __init__(
+        self,
+        redis_client: aioredis.Redis,
+        channel: str = DEFAULT_CHANNEL,
+        reconnect_delay: float = 1.0,
+    ) -> None:
+        super().__init__()
+        self._redis = redis_client
+        self._channel = channel
+        self._reconnect_delay = reconnect_delay
+        self._origin = uuid.uuid4().hex
+        self._listener: asyncio.Task[None] | None = None
+        self.publish_failures = 0
+        self.reconnects = 0
+
+    async def publish(self, scope: str, key: str = ALL_KEYS) -> None:
+        await super().publish(scope, key)
+        payload = json.dumps(
+            {"scope": scope, "key": key, "origin": self._origin}
+        )
+        try:
+            await self._redis.publish(self._channel, payload)
+        except RedisError:
+            self.publish_failures += 1
+            logger.warning(
+                "config_invalidation.publish_failed", scope=scope, key=key
+            )
+
+    def subscribe(self, handler: InvalidationHandler) -> None:
+        super().subscribe(handler)
+        self._ensure_listener()
+
+    def _ensure_listener(self) -> None:
+        if self._listener is not None and not self._listener.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # 沒有 loop（同步建構），下一次 subscribe 再試
+        self._listener = loop.create_task(self._listen())
+
+    async def _listen(self) -> None:
+        connected_before = False
+        while True:
+            pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self._channel)
+                if connected_before:
+                    # 斷線期間可能漏訊息 → 全清
+                    self.reconnects += 1
+                    self._dispatch(ALL_KEYS, ALL_KEYS)
+                connected_before = True
+                async for message in pubsub.listen():
+                    self._handle_message(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning(
+                    "config_invalidation.listener_disconnected", exc_info=True
+                )
+            finally:
+                with contextlib.suppress(Exception):
+                    await pubsub.aclose()
+            await asyncio.sleep(self._reconnect_delay)
+
+    def _handle_message(self, message: dict[str, Any]) -> None:
+        if message.get("type") != "message":
+            return
+        try:
+            data = json.loads(message["data"])
+        except (TypeError, ValueError):
+            return
+        if data.get("origin") == self._origin:
+            return  # publish 時已在本 process dispatch
+        self._dispatch(
+            str(data.get("scope", ALL_KEYS)), str(data.get("key", ALL_KEYS))
+        )
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            **super().stats(),
+            "backend": "redis",
+            "channel": self._channel,
+            "listening": (
+                self._listener is not None and not self._listener.done()
+            ),
+            "publish_failures": self.publish_failures,
+            "reconnects": self.reconnects,
+        }
+
+    async def aclose(self) -> None:
+        if self._listener is None:
+            return
+        self._listener.cancel()
+        with contextlib.suppress(asyncio.CancelledError, Exception):
+            await self._listener
+        self._listener = None
@@ -0,0 +1,114 @@
+"""TwoTierCache — in-process LRU (L1) + Redis (L2) bytes cache.
+
+Hot-path 快取共用元件：L1 命中不出 process，L2 跨 pod 共享。值一律是 bytes
+（caller 自行序列化，例如 float32 blob），Redis 斷線時靜默降級為只有 L1。
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Any
+
+import redis.asyncio as aioredis
+from redis.exceptions import RedisError
+
+from src.infrastructure.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class TwoTierCache:
+    def __init__(
+        self,
+        namespace: str,
+        redis_client: aioredis.Redis | None = None,
+        max_entries: int = 1024,
+        ttl_seconds: int = 3600,
+    ) -> None:
+        self._namespace = namespace
+        self._redis = redis_client
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        # key -> (value, expires_at monotonic)
+        self._lru: OrderedDict[str, tuple[bytes, float]] = OrderedDict()
+        self.l1_hits = 0
+        self.l2_hits = 0
+        self.misses = 0
+        self.redis_errors = 0
+
+    def _redis_key(self, key: str) -> str:
+        return f"{self._namespace}:{key}"
+
+    async def get(self, key: str) -> bytes | None:
+        entry = self._lru.get(key)
+        if entry is not None:
+            value, expires_at = entry
+            if time.monotonic() <= expires_at:
+                self._lru.move_to_end(key)
+                self.l1_hits += 1
+                return value
+            del self._lru[key]
+
+        if self._redis is not None:
+            try:
+                raw = await self._redis.get(self._redis_key(key))
+            except RedisError:
+                self.redis_errors += 1
+                logger.warning("two_tier_cache.redis_get_failed", ns=self._namespace)
+                raw = None
+            if raw is not None:
+                value = raw if isinstance(raw, bytes) else raw.encode()
+                self._put_l1(key, value)
+                self.l2_hits += 1
+                return value
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: bytes) -> None:
+        if self._ttl <= 0:
+            return  # TTL=0 means "don't cache"
+        self._put_l1(key, value)
+        if self._redis is None:
+            return
+        try:
+            await self._redis.setex(self._redis_key(key), self._ttl, value)
+        except RedisError:
+            self.redis_errors += 1
+            logger.warning("two_tier_cache.redis_set_failed", ns=self._namespace)
+
+    async def delete(self, key: str) -> None:
+        self._lru.pop(key, None)
+        if self._redis is None:
+            return
+        try:
+            await self._redis.delete(self._redis_key(key))
+        except RedisError:
+            self.redis_errors += 1
+            logger.warning("two_tier_cache.redis_delete_failed", ns=self._namespace)
+
+    def clear_local(self) -> None:
+        self._lru.clear()
+
+    def _put_l1(self, key: str, value: bytes) -> None:
+        if self._max_entries <= 0:
+            return
+        self._lru[key] = (value, time.monotonic() + self._ttl)
+        self._lru.move_to_end(key)
+        while len(self._lru) > self._max_entries:
+            self._lru.popitem(last=False)
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.l1_hits + self.l2_hits + self.misses
+        hits = self.l1_hits + self.l2_hits
+        return {
+            "namespace": self._namespace,
+            "l1_entries": len(self._lru),
+            "l1_max_entries": self._max_entries,
+            "l1_hits": self.l1_hits,
+            "l2_hits": self.l2_hits,
+            "misses": self.misses,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "redis_errors": self.redis_errors,
+        }
@@ -6,6 +6,14 @@ Steps:
 3. For each cluster, pick representative chunk samples
 4. LLM names the cluster
 5. Return categories + chunk-to-category mapping
+
+Scalability:
+- AgglomerativeClustering 是 O(n²) 記憶體 / 時間；超過 ``max_cluster_sample``
+  時只對隨機 sample 聚類，其餘以最近 centroid（cosine）分批向量化指派
+- 聚類 / 指派是 CPU-bound，丟到 process pool（``process_workers=0`` 時用
+  thread），不卡 event loop
+- 每個 category 帶 centroid（正規化後的平均向量），之後新上傳的 chunk
+  可直接 ``assign(..., update_centroids=True)`` 增量指派，不必整個 KB 重聚類
 """
 
 from __future__ import annotations
@@ -13,8 +21,10 @@ from __future__ import annotations
 import asyncio
 import random
 import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timezone
-from typing import Awaitable, Callable
+from typing import Any, Awaitable, Callable
 
 import numpy as np
 from sklearn.cluster import AgglomerativeClustering
@@ -42,6 +52,91 @@ DEFAULT_MODEL = "anthropic:claude-sonnet-4-6-20260415"
 SAMPLES_PER_CLUSTER = 5
 MIN_CHUNKS_FOR_CLUSTERING = 5
 MAX_CLUSTERS = 20
+DEFAULT_MAX_CLUSTER_SAMPLE = 2000
+ASSIGN_BATCH_ROWS = 4096
+
+
+def _normalize(X: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(X, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return X / norms
+
+
+def _agglomerative_labels(X: np.ndarray, total: int) -> np.ndarray:
+    # Use distance_threshold with cosine metric.
+    # Cosine distance range: 0 (identical) ~ 2 (opposite).
+    # 0.5 = chunks with cosine similarity > 0.75 grouped together.
+    # Target: ~5-10 categories for typical KB sizes.
+    clustering = AgglomerativeClustering(
+        n_clusters=None,
+        distance_threshold=0.5,
+        metric="cosine",
+        linkage="average",
+    )
+    labels = clustering.fit_predict(X)
+
+    # Guard: too many small clusters → re-cluster with capped n
+    # （上限以整個 KB 的 chunk 數計，sample 聚類時也一樣）
+    max_reasonable = min(MAX_CLUSTERS, max(3, total // 5), len(X))
+    if len(set(labels)) > max_reasonable:
+        clustering = AgglomerativeClustering(n_clusters=max_reasonable)
+        labels = clustering.fit_predict(X)
+    return labels
+
+
+def _centroids(Xn: np.ndarray, labels: np.ndarray) -> np.ndarray:
+    k = int(labels.max()) + 1
+    sums = np.zeros((k, Xn.shape[1]), dtype=Xn.dtype)
+    np.add.at(sums, labels, Xn)
+    return _normalize(sums)
+
+
+def assign_to_centroids(
+    X: np.ndarray, centroids: np.ndarray, batch_rows: int = ASSIGN_BATCH_ROWS
+) -> np.ndarray:
+    """每列指派到 cosine 最近的 centroid；分批 matmul，記憶體 O(batch × k)。"""
+    labels = np.empty(len(X), dtype=np.int64)
+    for start in range(0, len(X), batch_rows):
+        batch = _normalize(X[start : start + batch_rows])
+        labels[start : start + batch_rows] = np.argmax(batch @ centroids.T, axis=1)
+    return labels
+
+
+def cluster_vectors(
+    X: np.ndarray, max_sample: int, seed: int | None = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """回傳 (labels, centroids)；CPU-bound，在 process pool 內執行。"""
+    n = len(X)
+    if max_sample <= 0 or n <= max_sample:
+        labels = _agglomerative_labels(X, n)
+        return labels, _centroids(_normalize(X), labels)
+
+    rng = np.random.default_rng(seed)
+    sample_idx = rng.choice(n, size=max_sample, replace=False)
+    sample_labels = _agglomerative_labels(X[sample_idx], n)
+    centroids = _centroids(_normalize(X[sample_idx]), sample_labels)
+    labels = assign_to_centroids(X, centroids)
+    # sample 內的點保留聚類結果（避免出現空 cluster）
+    labels[sample_idx] = sample_labels
+    return labels, centroids
+
+
+_executor: ProcessPoolExecutor | None = None
+
+
+def _get_executor(max_workers: int) -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=max_workers)
+    return _executor
+
+
+def shutdown_cluster_executor() -> None:
+    """worker shutdown 時呼叫；關掉 process pool。"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
 
 
 class ClusterClassificationService:
@@ -49,8 +144,13 @@ class ClusterClassificationService:
         self,
         api_key: str = "",
         api_key_resolver: Callable[[str], Awaitable[str]] | None = None,
+        max_cluster_sample: int = DEFAULT_MAX_CLUSTER_SAMPLE,
+        process_workers: int = 1,
     ) -> None:
         self._api_key_resolver = api_key_resolver
+        self.max_cluster_sample = max_cluster_sample
+        # 0 = 用 thread 跑（測試 / 不允許 fork 的環境）
+        self._process_workers = process_workers
         # Token-Gov.0: 累計每次 classify 的 LLM token 用量
         self.last_input_tokens: int = 0
         self.last_output_tokens: int = 0
@@ -59,6 +159,48 @@ class ClusterClassificationService:
         self.last_cache_creation_tokens: int = 0
         self.last_model: str = ""
 
+    async def _run_cpu(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self._process_workers <= 0:
+            return await asyncio.to_thread(fn, *args)
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                _get_executor(self._process_workers), fn, *args
+            )
+        except BrokenProcessPool:
+            # child 被 OOM killer 收掉等 → 重建 pool，這次改在 thread 跑
+            logger.warning("classification.process_pool_broken")
+            shutdown_cluster_executor()
+            return await asyncio.to_thread(fn, *args)
+
+    async def assign(
+        self,
+        vectors: list[list[float]],
+        categories: list[ChunkCategory],
+        update_centroids: bool = False,
+    ) -> list[str]:
+        """把 vectors 指派到最近 centroid 的 category，回傳對應 category id。
+
+        ``update_centroids=True``（增量指派）時以 running mean 就地更新
+        categories 的 centroid 與 chunk_count。
+        """
+        candidates = [c for c in categories if c.centroid]
+        if not vectors or not candidates:
+            return []
+        X = np.asarray(vectors, dtype=np.float32)
+        C = np.asarray([c.centroid for c in candidates], dtype=np.float32)
+        labels = await self._run_cpu(assign_to_centroids, X, C)
+        if update_centroids:
+            Xn = _normalize(X)
+            for idx, cat in enumerate(candidates):
+                members = Xn[labels == idx]
+                if not len(members):
+                    continue
+                merged = C[idx] * max(cat.chunk_count, 1) + members.sum(axis=0)
+                cat.centroid = _normalize(merged[None, :])[0].tolist()
+                cat.chunk_count += len(members)
+        return [candidates[int(label)].id for label in labels]
+
     async def classify(
         self,
         chunk_ids: list[str],
@@ -91,26 +233,11 @@ class ClusterClassificationService:
         log = logger.bind(kb_id=kb_id, model=model, chunk_count=len(chunk_ids))
         log.info("classification.start")
 
-        # 1. Cluster — let algorithm decide optimal number
-        X = np.array(vectors)
-        # Use distance_threshold with cosine metric.
-        # Cosine distance range: 0 (identical) ~ 2 (opposite).
-        # 0.5 = chunks with cosine similarity > 0.75 grouped together.
-        # Target: ~5-10 categories for typical KB sizes.
-        clustering = AgglomerativeClustering(
-            n_clusters=None,
-            distance_threshold=0.5,
-            metric="cosine",
-            linkage="average",
+        # 1. Cluster — let algorithm decide optimal number（off-loop）
+        X = np.asarray(vectors, dtype=np.float32)
+        labels, centroids = await self._run_cpu(
+            cluster_vectors, X, self.max_cluster_sample
         )
-        labels = clustering.fit_predict(X)
-
-        # Guard: too many small clusters → re-cluster with capped n
-        unique_labels = set(labels)
-        max_reasonable = min(MAX_CLUSTERS, max(3, len(chunk_ids) // 5))
-        if len(unique_labels) > max_reasonable:
-            clustering = AgglomerativeClustering(n_clusters=max_reasonable)
-            labels = clustering.fit_predict(X)
 
         # 2. Group chunks by cluster
         clusters: dict[int, list[int]] = {}
@@ -175,6 +302,7 @@ class ClusterClassificationService:
                 tenant_id=tenant_id,
                 name=name,
                 chunk_count=len(indices),
+                centroid=centroids[label].tolist(),
                 created_at=now,
                 updated_at=now,
             ))
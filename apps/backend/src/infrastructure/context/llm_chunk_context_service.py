@@ -63,16 +63,16 @@ class LLMChunkContextService(ChunkContextService):
         model: str = "",
     ) -> list[Chunk]:
         if not chunks or not document_content.strip():
+            self.last_input_tokens = self.last_output_tokens = 0
+            self.last_cache_read_tokens = self.last_cache_creation_tokens = 0
             return chunks
 
-        # 重置 token 累計（每次呼叫獨立計算）
-        self.last_input_tokens = 0
-        self.last_output_tokens = 0
-        self.last_cache_read_tokens = 0
-        self.last_cache_creation_tokens = 0
+        # token 累計在 local（每次呼叫獨立計算），結束才寫回 last_*：
+        # ingestion pipeline 會併發呼叫，呼叫端 await 回來後立即讀取即為
+        # 自己這次的用量
+        usage = {"input": 0, "output": 0, "cache_read": 0, "cache_creation": 0}
 
         model = model or DEFAULT_MODEL
-        self.last_model = model
         doc_text = document_content[:MAX_DOC_CHARS]
 
         # 預組固定 prefix block（每個 chunk call 共用，提升 cache 命中）
@@ -113,12 +113,12 @@ class LLMChunkContextService(ChunkContextService):
                         max_tokens=200,
                         api_key_resolver=_fixed_key_resolver,
                     )
-                    # Token-Gov.0: 累計每 chunk 的 token（asyncio.gather 並發安全：
-                    # CPython GIL 保護 int 加法，且 sem 限制並發 ≤5）
-                    self.last_input_tokens += result.input_tokens
-                    self.last_output_tokens += result.output_tokens
-                    self.last_cache_read_tokens += result.cache_read_tokens
-                    self.last_cache_creation_tokens += result.cache_creation_tokens
+                    # Token-Gov.0: 累計每 chunk 的 token（單一 event loop，
+                    # += 之間沒有 await，不會交錯）
+                    usage["input"] += result.input_tokens
+                    usage["output"] += result.output_tokens
+                    usage["cache_read"] += result.cache_read_tokens
+                    usage["cache_creation"] += result.cache_creation_tokens
                     return Chunk(
                         id=chunk.id,
                         document_id=chunk.document_id,
@@ -137,6 +137,11 @@ class LLMChunkContextService(ChunkContextService):
                     return chunk
 
         results = await asyncio.gather(*[_generate_one(c) for c in chunks])
+        self.last_input_tokens = usage["input"]
+        self.last_output_tokens = usage["output"]
+        self.last_cache_read_tokens = usage["cache_read"]
+        self.last_cache_creation_tokens = usage["cache_creation"]
+        self.last_model = model
         success_count = sum(1 for c in results if c.context_text)
         log.info(
             "context.generation.done",
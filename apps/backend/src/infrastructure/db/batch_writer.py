@@ -0,0 +1,416 @@
+"""BatchWriter — process-wide async write-behind buffer（ORM row 批次寫入）。
+
+request log、agent trace、token usage record 原本每筆各開一個 session、
+單筆 commit，部分還在 response path 上 await。BatchWriter 把這些 ORM
+instance 收進 bounded queue，由單一 flusher task 以 size / time 觸發批次
+寫入：同一批一個 session、一次 commit，同類 row 由 SQLAlchemy
+insertmanyvalues 合成 multi-row INSERT。
+
+- ``offer``：不等待；queue 滿時丟棄並計數（log / trace 類可容忍遺失）
+- ``put``：queue 滿時等待空位（backpressure）；用於 usage 等計費資料
+- ``register_hook(model, hook)``：同一 transaction 內對某類 row 做額外寫入
+  （usage record → per-cycle rollup 遞增）
+- 暫時性錯誤（連線中斷 / timeout / OperationalError）整批以 exponential
+  backoff 重試 ``retry_attempts`` 次；其他錯誤逐筆重試，隔離壞 row
+- ``aclose``：停止收件並把 queue 內剩餘資料 flush 完（shutdown drain）；
+  超過 ``drain_timeout`` 時停掉 flusher，``put`` 進來但還沒寫入的 row
+  逐筆直接寫入（與未啟用 BatchWriter 時的單筆寫入相同）
+
+保證：``put`` 的 row 只有在 DB 持續不可用超過重試預算（或 shutdown 時
+直接寫入也失敗）、或 row 本身違反 constraint 時才會放棄；放棄時以 error
+log（``batch_writer.durable_row_lost``）記下完整欄位值供人工補寫，並計入
+``lost_rows_total``。``offer`` 的 row 則是 best-effort。
+
+Process-wide：跟 ``ChatModelClientPool`` 一樣放在 module level
+（``get_batch_writer``）。沒啟用時 ``current_batch_writer()`` 回 None，
+呼叫端維持原本的單筆寫入。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.exc import (
+    DBAPIError,
+    DisconnectionError,
+    InterfaceError,
+    OperationalError,
+)
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.infrastructure.logging import get_logger
+
+logger = get_logger(__name__)
+
+FlushHook = Callable[[AsyncSession, list[Any]], Awaitable[None]]
+
+_STOP = object()
+
+_TRANSIENT_ERRORS = (
+    OperationalError,
+    InterfaceError,
+    DisconnectionError,
+    PoolTimeoutError,
+    ConnectionError,
+    TimeoutError,
+)
+
+
+def _is_transient(exc: BaseException) -> bool:
+    """連線 / timeout 類錯誤：等一下再寫可能就成功。"""
+    if isinstance(exc, _TRANSIENT_ERRORS):
+        return True
+    return isinstance(exc, DBAPIError) and exc.connection_invalidated
+
+
+def _row_values(row: Any) -> dict[str, Any]:
+    try:
+        mapper = sa_inspect(row).mapper
+    except Exception:
+        return {"repr": repr(row)}
+    return {
+        attr.key: (
+            v if isinstance(v, (str, int, float, bool, type(None))) else str(v)
+        )
+        for attr in mapper.column_attrs
+        for v in (getattr(row, attr.key, None),)
+    }
+
+
+@dataclass(frozen=True)
+class BatchWriterConfig:
+    max_batch: int = 500
+    flush_interval: float = 0.5
+    max_queue: int = 10000
+    drain_timeout: float = 10.0
+    retry_attempts: int = 5
+    retry_backoff: float = 0.5
+    retry_backoff_max: float = 10.0
+
+
+@dataclass(frozen=True)
+class _Item:
+    row: Any
+    durable: bool  # put() 進來的 row：不能靜默丟棄
+
+
+class BatchWriter:
+    def __init__(
+        self,
+        session_factory: Callable[[], Any],
+        config: BatchWriterConfig | None = None,
+    ) -> None:
+        self._session_factory = session_factory
+        self._config = config or BatchWriterConfig()
+        self._queue: asyncio.Queue[Any] = asyncio.Queue(
+            maxsize=self._config.max_queue
+        )
+        self._hooks: dict[type, FlushHook] = {}
+        self._task: asyncio.Task[None] | None = None
+        self._closed = False
+        # flusher 手上還沒寫入的 row（drain timeout cancel 時接手）
+        self._inflight: list[_Item] = []
+        self.enqueued_total = 0
+        self.dropped_total = 0
+        self.flushed_rows_total = 0
+        self.flush_batches_total = 0
+        self.failed_rows_total = 0
+        self.lost_rows_total = 0
+        self.retried_batches_total = 0
+        self.transient_retries_total = 0
+        self.flush_ms_total = 0.0
+        self.flush_ms_max = 0.0
+        self.last_flush_ms = 0.0
+        self._flushed_by_model: Counter[str] = Counter()
+
+    @property
+    def accepting(self) -> bool:
+        return not self._closed
+
+    def register_hook(self, model: type, hook: FlushHook) -> None:
+        """hook(session, rows) 在 rows INSERT 後、commit 前執行（同一 transaction）。"""
+        self._hooks[model] = hook
+
+    def offer(self, row: Any) -> bool:
+        """不等待；queue 滿或已關閉時丟棄，回傳 False。"""
+        if self._closed or not self._ensure_started():
+            self.dropped_total += 1
+            return False
+        try:
+            self._queue.put_nowait(_Item(row, durable=False))
+        except asyncio.QueueFull:
+            self.dropped_total += 1
+            logger.warning(
+                "batch_writer.dropped", model=type(row).__name__
+            )
+            return False
+        self.enqueued_total += 1
+        return True
+
+    async def put(self, row: Any) -> None:
+        """queue 滿時等待空位（backpressure）；已關閉時直接同步寫入。"""
+        if self._closed or not self._ensure_started():
+            await self._flush([_Item(row, durable=True)])
+            return
+        await self._queue.put(_Item(row, durable=True))
+        self.enqueued_total += 1
+
+    def _ensure_started(self) -> bool:
+        if self._task is not None and not self._task.done():
+            return True
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        self._task = loop.create_task(self._run())
+        return True
+
+    async def _run(self) -> None:
+        cfg = self._config
+        stopping = False
+        while not stopping:
+            first = await self._queue.get()
+            if first is _STOP:
+                break
+            batch, stopping = await self._collect_batch(first)
+            await self._flush(batch)
+
+        # drain：_STOP 之後 queue 內剩下的（put 等待中的 producer）
+        leftover = self._take_queued()
+        for i in range(0, len(leftover), cfg.max_batch):
+            await self._flush(leftover[i : i + cfg.max_batch])
+
+    async def _collect_batch(self, first: _Item) -> tuple[list[_Item], bool]:
+        """從 ``first`` 開始湊一批（size / time 觸發）；回傳 (batch, 是否收到 stop)。"""
+        cfg = self._config
+        loop = asyncio.get_running_loop()
+        batch = [first]
+        deadline = loop.time() + cfg.flush_interval
+        while len(batch) < cfg.max_batch:
+            try:
+                item = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), remaining)
+                except TimeoutError:
+                    break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _take_queued(self) -> list[_Item]:
+        items = []
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is not _STOP:
+                items.append(item)
+        return items
+
+    async def _flush(self, items: list[_Item]) -> None:
+        t0 = time.perf_counter()
+        self._inflight = list(items)
+        exc = await self._write_with_backoff([item.row for item in items])
+        if exc is None:
+            ok = len(items)
+        elif _is_transient(exc):
+            # 重試預算用完：DB 仍不可用，逐筆再試也只是拖時間
+            ok = 0
+            for item in items:
+                self._give_up(item, exc)
+        else:
+            ok = await self._isolate_rows(items)
+        self._inflight = []
+        flush_ms = (time.perf_counter() - t0) * 1000
+        self.flush_batches_total += 1
+        self.flushed_rows_total += ok
+        self.flush_ms_total += flush_ms
+        self.flush_ms_max = max(self.flush_ms_max, flush_ms)
+        self.last_flush_ms = flush_ms
+
+    async def _write_with_backoff(self, rows: list[Any]) -> Exception | None:
+        """整批寫入；暫時性錯誤以 exponential backoff 重試，回傳最後的例外。"""
+        cfg = self._config
+        delay = cfg.retry_backoff
+        attempt = 1
+        while True:
+            try:
+                await self._write(rows)
+                return None
+            except Exception as exc:
+                if not _is_transient(exc) or attempt >= cfg.retry_attempts:
+                    logger.warning(
+                        "batch_writer.batch_failed", rows=len(rows), error=str(exc)
+                    )
+                    return exc
+                self.transient_retries_total += 1
+                logger.warning(
+                    "batch_writer.batch_retry",
+                    rows=len(rows),
+                    attempt=attempt,
+                    wait_seconds=delay,
+                    error=str(exc),
+                )
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, cfg.retry_backoff_max)
+            attempt += 1
+
+    async def _isolate_rows(self, items: list[_Item]) -> int:
+        """非暫時性錯誤（constraint 等）：逐筆重試，隔離壞 row；回傳成功筆數。"""
+        self.retried_batches_total += 1
+        ok = 0
+        for item in items:
+            try:
+                await self._write([item.row])
+                ok += 1
+            except Exception as exc:
+                self._give_up(item, exc)
+            self._inflight.remove(item)
+        return ok
+
+    def _give_up(self, item: _Item, exc: BaseException | None) -> None:
+        self.failed_rows_total += 1
+        if not item.durable:
+            logger.warning(
+                "batch_writer.row_failed",
+                model=type(item.row).__name__,
+                error=str(exc),
+            )
+            return
+        self.lost_rows_total += 1
+        logger.error(
+            "batch_writer.durable_row_lost",
+            model=type(item.row).__name__,
+            row=_row_values(item.row),
+            error=str(exc),
+        )
+
+    async def _write_directly(self, items: list[_Item]) -> None:
+        """drain timeout 後：durable row 逐筆直接寫入，其餘計入 dropped。"""
+        durable = [item for item in items if item.durable]
+        self.dropped_total += len(items) - len(durable)
+        remaining = list(durable)
+        try:
+            async with asyncio.timeout(self._config.drain_timeout):
+                while remaining:
+                    item = remaining[0]
+                    try:
+                        await self._write([item.row])
+                        self.flushed_rows_total += 1
+                    except Exception as exc:
+                        self._give_up(item, exc)
+                    remaining.pop(0)
+        except TimeoutError:
+            for item in remaining:
+                self._give_up(item, TimeoutError("drain timeout"))
+
+    async def _write(self, rows: list[Any]) -> None:
+        by_model: dict[type, list[Any]] = {}
+        for row in rows:
+            by_model.setdefault(type(row), []).append(row)
+        async with self._session_factory() as session:
+            session.add_all(rows)
+            await session.flush()
+            for model, model_rows in by_model.items():
+                hook = self._hooks.get(model)
+                if hook is not None:
+                    await hook(session, model_rows)
+            await session.commit()
+        for model, model_rows in by_model.items():
+            self._flushed_by_model[model.__name__] += len(model_rows)
+
+    def stats(self) -> dict[str, Any]:
+        batches = self.flush_batches_total
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "accepting": self.accepting,
+            "queue_depth": self._queue.qsize(),
+            "max_queue": self._config.max_queue,
+            "max_batch": self._config.max_batch,
+            "flush_interval": self._config.flush_interval,
+            "enqueued_total": self.enqueued_total,
+            "dropped_total": self.dropped_total,
+            "flushed_rows_total": self.flushed_rows_total,
+            "flush_batches_total": batches,
+            "failed_rows_total": self.failed_rows_total,
+            "lost_rows_total": self.lost_rows_total,
+            "retried_batches_total": self.retried_batches_total,
+            "transient_retries_total": self.transient_retries_total,
+            "avg_batch_rows": (
+                round(self.flushed_rows_total / batches, 2) if batches else 0.0
+            ),
+            "avg_flush_ms": (
+                round(self.flush_ms_total / batches, 3) if batches else 0.0
+            ),
+            "max_flush_ms": round(self.flush_ms_max, 3),
+            "last_flush_ms": round(self.last_flush_ms, 3),
+            "flushed_by_model": dict(self._flushed_by_model),
+        }
+
+    async def aclose(self) -> None:
+        """停止收件並 flush 剩餘資料（最多等 drain_timeout 秒）。"""
+        if self._closed:
+            return
+        self._closed = True
+        task = self._task
+        if task is None or task.done():
+            return
+        await self._queue.put(_STOP)
+        try:
+            await asyncio.wait_for(
+                asyncio.shield(task), self._config.drain_timeout
+            )
+        except TimeoutError:
+            logger.warning(
+                "batch_writer.drain_timeout",
+                queue_depth=self._queue.qsize(),
+            )
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+            # flusher 手上與 queue 裡還沒寫入的 row：durable 的逐筆直接寫
+            leftover = self._inflight + self._take_queued()
+            self._inflight = []
+            if leftover:
+                await self._write_directly(leftover)
+            return
+        # close 前已在 put() 等待空位的 producer 可能在 flusher 結束後才入列
+        leftover = self._take_queued()
+        if leftover:
+            await self._flush(leftover)
+
+
+_writer: BatchWriter | None = None
+
+
+def get_batch_writer(
+    config: BatchWriterConfig | None = None,
+    session_factory: Callable[[], Any] | None = None,
+) -> BatchWriter:
+    """Process-wide singleton；第一次呼叫時建立（預設用 engine 的 session factory）。"""
+    global _writer
+    if _writer is None:
+        if session_factory is None:
+            from src.infrastructure.db.engine import async_session_factory
+
+            session_factory = async_session_factory
+        _writer = BatchWriter(session_factory, config)
+    return _writer
+
+
+def current_batch_writer() -> BatchWriter | None:
+    """已啟用（``get_batch_writer`` 被呼叫過）且仍在收件時回傳 writer。"""
+    if _writer is not None and _writer.accepting:
+        return _writer
+    return None
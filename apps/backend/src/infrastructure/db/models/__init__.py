@@ -22,6 +22,9 @@ from src.infrastructure.db.models.system_prompt_config_model import (
     SystemPromptConfigModel,
 )
 from src.infrastructure.db.models.tenant_model import TenantModel
+from src.infrastructure.db.models.usage_cycle_rollup_model import (
+    UsageCycleRollupModel,
+)
 from src.infrastructure.db.models.usage_record_model import UsageRecordModel
 from src.infrastructure.db.models.user_model import UserModel
 from src.infrastructure.db.models.visitor_identity_model import VisitorIdentityModel
@@ -72,6 +75,7 @@ __all__ = [
     "ChunkModel",
     "ProcessingTaskModel",
     "UsageRecordModel",
+    "UsageCycleRollupModel",
     "ConversationModel",
     "DiagnosticRulesConfigModel",
     "LogRetentionPolicyModel",
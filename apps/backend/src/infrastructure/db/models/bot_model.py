@@ -129,6 +129,12 @@ class BotModel(Base):
     hyde_extra_hint: Mapped[str] = mapped_column(
         Text, nullable=False, default="", server_default=""
     )
+    answer_cache_enabled: Mapped[bool] = mapped_column(
+        Boolean, nullable=False, default=False, server_default="false"
+    )
+    answer_cache_threshold: Mapped[float] = mapped_column(
+        Float, nullable=False, default=0.95, server_default="0.95"
+    )
     # Per-tool RAG 參數覆蓋：{tool_name: {rag_top_k, rag_score_threshold, rerank_*}}
     # 任何欄位為 None / missing 代表繼承 Bot 全域預設
     tool_configs: Mapped[dict] = mapped_column(
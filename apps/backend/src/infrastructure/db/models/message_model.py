@@ -28,5 +28,8 @@ class MessageModel(Base):
     )
 
     __table_args__ = (
-        Index("ix_messages_conversation_id", "conversation_id"),
+        # 視窗載入（最後 K 則）走 (conversation_id, created_at) 反向掃描
+        Index(
+            "ix_messages_conversation_created", "conversation_id", "created_at"
+        ),
     )
@@ -0,0 +1,30 @@
+"""Token Usage Cycle Rollup ORM Model
+
+(tenant_id, cycle_year_month, request_type) 的 token 累計；與
+token_usage_records 在同一個 transaction 內遞增，quota 檢查讀這張表，
+不再 SUM 整個月的 records。reconcile job 以 records 為準修正差異。
+"""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import BigInteger, DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.infrastructure.db.base import Base
+
+TZDateTime = DateTime(timezone=True)
+
+
+class UsageCycleRollupModel(Base):
+    __tablename__ = "token_usage_cycle_rollups"
+
+    tenant_id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    cycle_year_month: Mapped[str] = mapped_column(String(7), primary_key=True)
+    request_type: Mapped[str] = mapped_column(String(20), primary_key=True)
+    # input + output + cache_read + cache_creation（同 _TOTAL_TOKENS_EXPR）
+    tokens: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        TZDateTime,
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+    )
@@ -163,6 +163,12 @@ class SQLAlchemyBotRepository(BotRepository):
             ),
             hyde_model=model.hyde_model or "",
             hyde_extra_hint=model.hyde_extra_hint or "",
+            answer_cache_enabled=bool(model.answer_cache_enabled),
+            answer_cache_threshold=(
+                model.answer_cache_threshold
+                if model.answer_cache_threshold is not None
+                else 0.95
+            ),
             tool_configs=_dict_to_tool_configs(model.tool_configs),
             customer_service_url=model.customer_service_url or "",
             intent_routes=[
@@ -275,6 +281,8 @@ class SQLAlchemyBotRepository(BotRepository):
                 existing.hyde_enabled = bot.hyde_enabled
                 existing.hyde_model = bot.hyde_model
                 existing.hyde_extra_hint = bot.hyde_extra_hint
+                existing.answer_cache_enabled = bot.answer_cache_enabled
+                existing.answer_cache_threshold = bot.answer_cache_threshold
                 existing.tool_configs = _tool_configs_to_dict(bot.tool_configs)
                 existing.customer_service_url = bot.customer_service_url
                 existing.intent_routes = [
@@ -357,6 +365,8 @@ class SQLAlchemyBotRepository(BotRepository):
                     hyde_enabled=bot.hyde_enabled,
                     hyde_model=bot.hyde_model,
                     hyde_extra_hint=bot.hyde_extra_hint,
+                    answer_cache_enabled=bot.answer_cache_enabled,
+                    answer_cache_threshold=bot.answer_cache_threshold,
                     tool_configs=_tool_configs_to_dict(bot.tool_configs),
                     customer_service_url=bot.customer_service_url,
                     intent_routes=[
@@ -6,6 +6,7 @@ from src.domain.knowledge.repository import ChunkCategoryRepository
 from src.infrastructure.db.atomic import atomic
 from src.infrastructure.db.models.chunk_category_model import ChunkCategoryModel
 from src.infrastructure.db.models.chunk_model import ChunkModel
+from src.infrastructure.db.models.document_model import DocumentModel
 
 
 class SQLAlchemyChunkCategoryRepository(ChunkCategoryRepository):
@@ -22,6 +23,7 @@ class SQLAlchemyChunkCategoryRepository(ChunkCategoryRepository):
             description=model.description,
             chunk_count=model.chunk_count,
             created_at=model.created_at,
+            centroid=model.centroid,
             updated_at=model.updated_at,
         )
 
@@ -47,6 +49,7 @@ class SQLAlchemyChunkCategoryRepository(ChunkCategoryRepository):
                     name=c.name,
                     description=c.description,
                     chunk_count=c.chunk_count,
+                    centroid=c.centroid,
                 )
                 for c in categories
             ]
@@ -114,6 +117,29 @@ class SQLAlchemyChunkCategoryRepository(ChunkCategoryRepository):
                     .values(chunk_count=cnt)
                 )
 
+    async def find_unclassified_chunk_ids(self, kb_id: str) -> list[str]:
+        stmt = (
+            select(ChunkModel.id)
+            .join(DocumentModel, ChunkModel.document_id == DocumentModel.id)
+            .where(
+                DocumentModel.kb_id == kb_id,
+                ChunkModel.category_id.is_(None),
+            )
+        )
+        result = await self._session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def update_centroids(self, centroids: dict[str, list[float]]) -> None:
+        if not centroids:
+            return
+        async with atomic(self._session):
+            for category_id, centroid in centroids.items():
+                await self._session.execute(
+                    update(ChunkCategoryModel)
+                    .where(ChunkCategoryModel.id == category_id)
+                    .values(centroid=centroid)
+                )
+
     # --- S-KB-Studio.1 新增實作 ---
 
     async def delete_by_id(self, category_id: str) -> None:
@@ -1,93 +1,156 @@
 """SQLAlchemy Conversation Repository 實作"""
 
 import json
+from collections.abc import Callable
 from datetime import datetime, timedelta, timezone
+from typing import Any
 
-from sqlalchemy import func, or_, select
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.domain.conversation.entity import Conversation, Message
 from src.domain.conversation.repository import ConversationRepository
 from src.domain.conversation.value_objects import ConversationId, MessageId
 from src.infrastructure.db.atomic import atomic
+from src.infrastructure.db.base import Base
 from src.infrastructure.db.models.conversation_model import ConversationModel
 from src.infrastructure.db.models.message_model import MessageModel
 
+_RAW_JSON = "_raw_json"
+
+
+class _LazyJsonField:
+    """Message 的 heavy JSON 欄位：第一次存取才 json.loads。"""
+
+    def __init__(self, default_factory: Callable[[], Any] = lambda: None) -> None:
+        self._default_factory = default_factory
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self._name = name
+
+    def __get__(self, obj: Any, objtype: type | None = None) -> Any:
+        if obj is None:
+            return self
+        values = obj.__dict__
+        if self._name not in values:
+            raw = values[_RAW_JSON].pop(self._name, None)
+            values[self._name] = (
+                json.loads(raw) if raw is not None else self._default_factory()
+            )
+        return values[self._name]
+
+    def __set__(self, obj: Any, value: Any) -> None:
+        obj.__dict__[self._name] = value
+
+
+class _LazyMessage(Message):
+    """視窗載入用的 Message：history strategy 只讀 role / content，
+    tool_calls / retrieved_chunks / structured_content 延遲到真的被讀才解碼。"""
+
+    tool_calls = _LazyJsonField(list)  # type: ignore[assignment]
+    retrieved_chunks = _LazyJsonField()  # type: ignore[assignment]
+    structured_content = _LazyJsonField()  # type: ignore[assignment]
+
+    @classmethod
+    def from_row(cls, r: MessageModel) -> "_LazyMessage":
+        msg = cls.__new__(cls)
+        msg.__dict__.update(
+            id=MessageId(value=r.id),
+            conversation_id=r.conversation_id,
+            role=r.role,
+            content=r.content,
+            latency_ms=r.latency_ms,
+            created_at=r.created_at,
+        )
+        msg.__dict__[_RAW_JSON] = {
+            "tool_calls": r.tool_calls_json,
+            "retrieved_chunks": r.retrieved_chunks,
+            "structured_content": r.structured_content,
+        }
+        return msg
+
+
+def _message_row(msg: Message) -> dict[str, Any]:
+    return {
+        "id": msg.id.value,
+        "conversation_id": msg.conversation_id,
+        "role": msg.role,
+        "content": msg.content,
+        "tool_calls_json": json.dumps(msg.tool_calls, ensure_ascii=False),
+        "latency_ms": msg.latency_ms,
+        "retrieved_chunks": (
+            json.dumps(msg.retrieved_chunks, ensure_ascii=False)
+            if msg.retrieved_chunks is not None
+            else None
+        ),
+        "structured_content": (
+            json.dumps(msg.structured_content, ensure_ascii=False)
+            if msg.structured_content is not None
+            else None
+        ),
+        "created_at": msg.created_at,
+    }
+
 
 class SQLAlchemyConversationRepository(ConversationRepository):
     def __init__(self, session: AsyncSession) -> None:
         self._session = session
 
     async def save(self, conversation: Conversation) -> None:
+        """Append-only：一次 header UPDATE + 新訊息一次 multi-row INSERT。
+
+        只寫 ``conversation.new_messages``，成本與對話長度無關；INSERT 帶
+        ON CONFLICT DO NOTHING，重複 save 同一則訊息不會出錯。
+        """
         async with atomic(self._session):
-            existing = await self._session.get(
-                ConversationModel, conversation.id.value
-            )
-            if existing is None:
-                model = ConversationModel(
-                    id=conversation.id.value,
-                    tenant_id=conversation.tenant_id,
-                    bot_id=conversation.bot_id,
-                    visitor_id=conversation.visitor_id,
-                    created_at=conversation.created_at,
-                    # S-Gov.6b: 5 個 summary 欄位
-                    summary=conversation.summary,
-                    message_count=conversation.message_count,
-                    summary_message_count=conversation.summary_message_count,
-                    last_message_at=conversation.last_message_at,
-                    summary_at=conversation.summary_at,
-                )
-                self._session.add(model)
-            else:
-                if conversation.visitor_id and not existing.visitor_id:
-                    existing.visitor_id = conversation.visitor_id
+            header = {
                 # S-Gov.6b: summary 5 欄位允許 update（generate_summary_use_case 會寫）
                 # message_count + last_message_at 由 SendMessageUseCase hook 寫
-                existing.summary = conversation.summary
-                existing.message_count = conversation.message_count
-                existing.summary_message_count = (
-                    conversation.summary_message_count
+                "summary": conversation.summary,
+                "message_count": conversation.message_count,
+                "summary_message_count": conversation.summary_message_count,
+                "last_message_at": conversation.last_message_at,
+                "summary_at": conversation.summary_at,
+            }
+            values = dict(header)
+            if conversation.visitor_id:
+                # 只補空的 visitor_id，不覆寫既有值
+                values["visitor_id"] = func.coalesce(
+                    func.nullif(ConversationModel.visitor_id, ""),
+                    conversation.visitor_id,
                 )
-                existing.last_message_at = conversation.last_message_at
-                existing.summary_at = conversation.summary_at
-
-            if conversation.messages:
-                # Bulk check: fetch all existing message IDs in one query
-                msg_ids = [msg.id.value for msg in conversation.messages]
-                stmt = select(MessageModel.id).where(
-                    MessageModel.id.in_(msg_ids)
+            result = await self._session.execute(
+                update(ConversationModel)
+                .where(ConversationModel.id == conversation.id.value)
+                .values(**values)
+                .execution_options(synchronize_session="fetch")
+            )
+            if result.rowcount == 0:
+                await self._session.execute(
+                    self._insert_ignore(ConversationModel).values(
+                        id=conversation.id.value,
+                        tenant_id=conversation.tenant_id,
+                        bot_id=conversation.bot_id,
+                        visitor_id=conversation.visitor_id,
+                        created_at=conversation.created_at,
+                        **header,
+                    )
+                )
+
+            rows = [_message_row(msg) for msg in conversation.new_messages]
+            if rows:
+                await self._session.execute(
+                    self._insert_ignore(MessageModel).values(rows)
                 )
-                result = await self._session.execute(stmt)
-                existing_ids = set(result.scalars().all())
-
-                for msg in conversation.messages:
-                    if msg.id.value not in existing_ids:
-                        msg_model = MessageModel(
-                            id=msg.id.value,
-                            conversation_id=msg.conversation_id,
-                            role=msg.role,
-                            content=msg.content,
-                            tool_calls_json=json.dumps(
-                                msg.tool_calls, ensure_ascii=False
-                            ),
-                            latency_ms=msg.latency_ms,
-                            retrieved_chunks=(
-                                json.dumps(
-                                    msg.retrieved_chunks, ensure_ascii=False
-                                )
-                                if msg.retrieved_chunks is not None
-                                else None
-                            ),
-                            structured_content=(
-                                json.dumps(
-                                    msg.structured_content, ensure_ascii=False
-                                )
-                                if msg.structured_content is not None
-                                else None
-                            ),
-                            created_at=msg.created_at,
-                        )
-                        self._session.add(msg_model)
+        conversation.mark_persisted()
+
+    def _insert_ignore(self, model: type[Base]) -> Any:
+        """INSERT ... ON CONFLICT DO NOTHING（PostgreSQL；sqlite 供測試）。"""
+        dialect = self._session.get_bind().dialect.name
+        insert = sqlite_insert if dialect == "sqlite" else pg_insert
+        return insert(model).on_conflict_do_nothing()
 
     async def find_by_id(
         self, conversation_id: str
@@ -139,6 +202,64 @@ class SQLAlchemyConversationRepository(ConversationRepository):
             summary_message_count=model.summary_message_count,
             last_message_at=model.last_message_at,
             summary_at=model.summary_at,
+            persisted_message_count=len(messages),
+        )
+
+    async def find_window(
+        self, conversation_id: str, last_k: int
+    ) -> Conversation | None:
+        model = await self._session.get(ConversationModel, conversation_id)
+        if model is None:
+            return None
+        return await self._load_window(model, last_k)
+
+    async def find_latest_window_by_visitor(
+        self, visitor_id: str, bot_id: str, last_k: int
+    ) -> Conversation | None:
+        model = await self._find_latest_model_by_visitor(visitor_id, bot_id)
+        if model is None:
+            return None
+        return await self._load_window(model, last_k)
+
+    async def _load_window(
+        self, model: ConversationModel, last_k: int
+    ) -> Conversation:
+        """Header + 最後 last_k 則訊息（走 ix_messages_conversation_created）。"""
+        stmt = (
+            select(MessageModel)
+            .where(MessageModel.conversation_id == model.id)
+            .order_by(MessageModel.created_at.desc())
+        )
+        if last_k > 0:
+            stmt = stmt.limit(last_k)
+        result = await self._session.execute(stmt)
+        rows = list(reversed(result.scalars().all()))
+
+        offset = 0
+        if 0 < last_k <= len(rows):
+            # 可能有更早的訊息 → 只數 index，不載 row
+            count_stmt = (
+                select(func.count())
+                .select_from(MessageModel)
+                .where(MessageModel.conversation_id == model.id)
+            )
+            total = (await self._session.execute(count_stmt)).scalar_one()
+            offset = max(total - len(rows), 0)
+
+        return Conversation(
+            id=ConversationId(value=model.id),
+            tenant_id=model.tenant_id,
+            bot_id=model.bot_id,
+            visitor_id=model.visitor_id,
+            messages=[_LazyMessage.from_row(r) for r in rows],
+            created_at=model.created_at,
+            summary=model.summary,
+            message_count=model.message_count,
+            summary_message_count=model.summary_message_count,
+            last_message_at=model.last_message_at,
+            summary_at=model.summary_at,
+            history_offset=offset,
+            persisted_message_count=len(rows),
         )
 
     async def find_by_tenant(
@@ -196,17 +317,7 @@ class SQLAlchemyConversationRepository(ConversationRepository):
         self, visitor_id: str, bot_id: str
     ) -> Conversation | None:
         """Find the most recent conversation for a visitor + bot pair."""
-        stmt = (
-            select(ConversationModel)
-            .where(
-                ConversationModel.visitor_id == visitor_id,
-                ConversationModel.bot_id == bot_id,
-            )
-            .order_by(ConversationModel.created_at.desc())
-            .limit(1)
-        )
-        result = await self._session.execute(stmt)
-        model = result.scalar_one_or_none()
+        model = await self._find_latest_model_by_visitor(visitor_id, bot_id)
         if model is None:
             return None
 
@@ -254,8 +365,24 @@ class SQLAlchemyConversationRepository(ConversationRepository):
             summary_message_count=model.summary_message_count,
             last_message_at=model.last_message_at,
             summary_at=model.summary_at,
+            persisted_message_count=len(messages),
         )
 
+    async def _find_latest_model_by_visitor(
+        self, visitor_id: str, bot_id: str
+    ) -> ConversationModel | None:
+        stmt = (
+            select(ConversationModel)
+            .where(
+                ConversationModel.visitor_id == visitor_id,
+                ConversationModel.bot_id == bot_id,
+            )
+            .order_by(ConversationModel.created_at.desc())
+            .limit(1)
+        )
+        result = await self._session.execute(stmt)
+        return result.scalar_one_or_none()
+
     async def find_conversation_id_by_message(
         self, message_id: str
     ) -> str | None:
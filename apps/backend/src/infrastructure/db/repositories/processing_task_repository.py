@@ -24,6 +24,7 @@ class SQLAlchemyProcessingTaskRepository(ProcessingTaskRepository):
             status=model.status,
             progress=model.progress,
             error_message=model.error_message,
+            metrics=model.metrics or {},
             created_at=model.created_at,
             updated_at=model.updated_at,
         )
@@ -37,6 +38,7 @@ class SQLAlchemyProcessingTaskRepository(ProcessingTaskRepository):
                 status=task.status,
                 progress=task.progress,
                 error_message=task.error_message,
+                metrics=task.metrics or None,
                 created_at=task.created_at,
                 updated_at=task.updated_at,
             )
@@ -74,3 +76,12 @@ class SQLAlchemyProcessingTaskRepository(ProcessingTaskRepository):
                 .values(**values)
             )
             await self._session.execute(stmt)
+
+    async def update_metrics(self, task_id: str, metrics: dict) -> None:
+        async with atomic(self._session):
+            stmt = (
+                update(ProcessingTaskModel)
+                .where(ProcessingTaskModel.id == task_id)
+                .values(metrics=metrics)
+            )
+            await self._session.execute(stmt)
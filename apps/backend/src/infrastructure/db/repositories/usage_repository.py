@@ -1,8 +1,10 @@
 """SQLAlchemy Usage Repository 實作"""
 
-from datetime import datetime
+from datetime import datetime, timezone
 
-from sqlalchemy import func, select
+from sqlalchemy import func, literal, select, union_all
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.domain.usage.entity import UsageRecord
@@ -15,7 +17,11 @@ from src.domain.usage.value_objects import (
     UsageSummary,
 )
 from src.infrastructure.db.atomic import atomic
+from src.infrastructure.db.batch_writer import BatchWriter
 from src.infrastructure.db.models.message_model import MessageModel
+from src.infrastructure.db.models.usage_cycle_rollup_model import (
+    UsageCycleRollupModel,
+)
 from src.infrastructure.db.models.usage_record_model import UsageRecordModel
 
 # Token-Gov.6: total_tokens 欄位已從 DB 刪除；由 4 個 raw 欄位動態加總
@@ -28,29 +34,119 @@ _TOTAL_TOKENS_EXPR = (
 )
 
 
+def _cycle_range(cycle_year_month: str) -> tuple[datetime, datetime]:
+    year, month = cycle_year_month.split("-")
+    start = datetime(int(year), int(month), 1, tzinfo=timezone.utc)
+    if int(month) == 12:
+        end = datetime(int(year) + 1, 1, 1, tzinfo=timezone.utc)
+    else:
+        end = datetime(int(year), int(month) + 1, 1, tzinfo=timezone.utc)
+    return start, end
+
+
+def _cycle_of(created_at: datetime) -> str:
+    if created_at.tzinfo is not None:
+        created_at = created_at.astimezone(timezone.utc)
+    return created_at.strftime("%Y-%m")
+
+
+async def _increment_rollups(
+    session: AsyncSession, deltas: list[tuple[str, str, str, int]]
+) -> None:
+    """UPSERT ``tokens = tokens + delta``（相對更新，與並發寫入可交換）。"""
+    totals: dict[tuple[str, str, str], int] = {}
+    for tenant_id, cycle, request_type, tokens in deltas:
+        key = (tenant_id, cycle, request_type)
+        totals[key] = totals.get(key, 0) + tokens
+    totals = {k: v for k, v in totals.items() if v != 0}
+    if not totals:
+        return
+    now = datetime.now(timezone.utc)
+    dialect = session.get_bind().dialect.name
+    insert = sqlite_insert if dialect == "sqlite" else pg_insert
+    stmt = insert(UsageCycleRollupModel).values(
+        [
+            {
+                "tenant_id": tenant_id,
+                "cycle_year_month": cycle,
+                "request_type": request_type,
+                "tokens": tokens,
+                "updated_at": now,
+            }
+            for (tenant_id, cycle, request_type), tokens in totals.items()
+        ]
+    )
+    await session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[
+                UsageCycleRollupModel.tenant_id,
+                UsageCycleRollupModel.cycle_year_month,
+                UsageCycleRollupModel.request_type,
+            ],
+            set_={
+                "tokens": UsageCycleRollupModel.tokens + stmt.excluded.tokens,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+    )
+
+
+def _rollup_delta(model: UsageRecordModel) -> tuple[str, str, str, int]:
+    return (
+        model.tenant_id,
+        _cycle_of(model.created_at),
+        model.request_type,
+        model.input_tokens
+        + model.output_tokens
+        + model.cache_read_tokens
+        + model.cache_creation_tokens,
+    )
+
+
+async def _increment_rollups_for_records(
+    session: AsyncSession, models: list[UsageRecordModel]
+) -> None:
+    """BatchWriter hook：一批 usage records 的 rollup 合併成一次 UPSERT。"""
+    await _increment_rollups(session, [_rollup_delta(m) for m in models])
+
+
 class SQLAlchemyUsageRepository(UsageRepository):
-    def __init__(self, session: AsyncSession) -> None:
+    def __init__(
+        self, session: AsyncSession, batch_writer: BatchWriter | None = None
+    ) -> None:
         self._session = session
+        # write-behind：record + rollup 由 BatchWriter 批次寫入（同一 transaction）
+        self._batch_writer = batch_writer
+        if batch_writer is not None:
+            batch_writer.register_hook(
+                UsageRecordModel, _increment_rollups_for_records
+            )
 
     async def save(self, record: UsageRecord) -> None:
+        model = UsageRecordModel(
+            id=record.id,
+            tenant_id=record.tenant_id,
+            request_type=record.request_type,
+            model=record.model,
+            input_tokens=record.input_tokens,
+            output_tokens=record.output_tokens,
+            # Token-Gov.6: total_tokens 欄位已刪，不寫入
+            estimated_cost=record.estimated_cost,
+            cache_read_tokens=record.cache_read_tokens,
+            cache_creation_tokens=record.cache_creation_tokens,
+            message_id=record.message_id,
+            bot_id=record.bot_id,
+            kb_id=record.kb_id,
+            created_at=record.created_at,
+        )
+        if self._batch_writer is not None and self._batch_writer.accepting:
+            # 計費資料不丟：queue 滿時等待（backpressure）
+            await self._batch_writer.put(model)
+            return
         async with atomic(self._session):
-            model = UsageRecordModel(
-                id=record.id,
-                tenant_id=record.tenant_id,
-                request_type=record.request_type,
-                model=record.model,
-                input_tokens=record.input_tokens,
-                output_tokens=record.output_tokens,
-                # Token-Gov.6: total_tokens 欄位已刪，不寫入
-                estimated_cost=record.estimated_cost,
-                cache_read_tokens=record.cache_read_tokens,
-                cache_creation_tokens=record.cache_creation_tokens,
-                message_id=record.message_id,
-                bot_id=record.bot_id,
-                kb_id=record.kb_id,
-                created_at=record.created_at,
-            )
             self._session.add(model)
+            # 同一個 transaction 遞增 rollup：record 與 rollup 同時 commit
+            await _increment_rollups(self._session, [_rollup_delta(model)])
 
     async def find_by_tenant(
         self,
@@ -312,6 +408,58 @@ class SQLAlchemyUsageRepository(UsageRepository):
         value = result.scalar_one()
         return int(value) if value is not None else 0
 
+    async def sum_tokens_in_cycle(
+        self, tenant_id: str, cycle_year_month: str
+    ) -> int:
+        """審計總量 — 讀 rollup（quota hot path），不 SUM 整個月的 records。
+
+        與 ``sum_tokens_in_range`` 的一致性由 ``reconcile_cycle_rollups`` 保證。
+        """
+        return await self.sum_billable_tokens_in_cycle(
+            tenant_id, cycle_year_month, None
+        )
+
+    async def reconcile_cycle_rollups(self, cycle_year_month: str) -> int:
+        """以 records 為準修正 rollup，回傳修正的列數。
+
+        差異在單一 SELECT 內算出（同一個 snapshot 同時看到 records 與 rollup；
+        兩者由 ``save`` 在同一 transaction 寫入），再以相對更新
+        ``tokens + diff`` 套回 — 與並發的 ``save`` 可交換，不會蓋掉新寫入。
+        """
+        start, end = _cycle_range(cycle_year_month)
+        records = select(
+            UsageRecordModel.tenant_id.label("tenant_id"),
+            UsageRecordModel.request_type.label("request_type"),
+            _TOTAL_TOKENS_EXPR.label("tokens"),
+        ).where(
+            UsageRecordModel.created_at >= start,
+            UsageRecordModel.created_at < end,
+        )
+        rollups = select(
+            UsageCycleRollupModel.tenant_id,
+            UsageCycleRollupModel.request_type,
+            (literal(0) - UsageCycleRollupModel.tokens).label("tokens"),
+        ).where(UsageCycleRollupModel.cycle_year_month == cycle_year_month)
+        combined = union_all(records, rollups).subquery()
+        diff = func.sum(combined.c.tokens)
+        stmt = (
+            select(combined.c.tenant_id, combined.c.request_type, diff)
+            .group_by(combined.c.tenant_id, combined.c.request_type)
+            .having(diff != 0)
+        )
+        rows = (await self._session.execute(stmt)).all()
+        if not rows:
+            return 0
+        async with atomic(self._session):
+            await _increment_rollups(
+                self._session,
+                [
+                    (tenant_id, cycle_year_month, request_type, int(delta))
+                    for tenant_id, request_type, delta in rows
+                ]
+            )
+        return len(rows)
+
     async def sum_billable_tokens_in_cycle(
         self,
         tenant_id: str,
@@ -326,30 +474,22 @@ class SQLAlchemyUsageRepository(UsageRepository):
         - list → WHERE request_type IN (...)
 
         Retroactive：filter 用「當前 tenant.included_categories」套在歷史 records 上，
-        改規則會追溯生效。
+        改規則會追溯生效（rollup 保留 category 粒度，所以仍成立）。
+
+        讀 token_usage_cycle_rollups（每個 category 一列），不掃整個月的 records。
         """
         if included_categories == []:
             return 0
 
-        from datetime import timezone
-
-        year, month = cycle_year_month.split("-")
-        start = datetime(int(year), int(month), 1, tzinfo=timezone.utc)
-        if int(month) == 12:
-            end = datetime(int(year) + 1, 1, 1, tzinfo=timezone.utc)
-        else:
-            end = datetime(int(year), int(month) + 1, 1, tzinfo=timezone.utc)
-
         stmt = select(
-            func.coalesce(func.sum(_TOTAL_TOKENS_EXPR), 0)
+            func.coalesce(func.sum(UsageCycleRollupModel.tokens), 0)
         ).where(
-            UsageRecordModel.tenant_id == tenant_id,
-            UsageRecordModel.created_at >= start,
-            UsageRecordModel.created_at < end,
+            UsageCycleRollupModel.tenant_id == tenant_id,
+            UsageCycleRollupModel.cycle_year_month == cycle_year_month,
         )
         if included_categories is not None:
             stmt = stmt.where(
-                UsageRecordModel.request_type.in_(included_categories)
+                UsageCycleRollupModel.request_type.in_(included_categories)
             )
         result = await self._session.execute(stmt)
         value = result.scalar_one()
@@ -0,0 +1,132 @@
+"""CachedEmbeddingService — query embedding 的 LRU + Redis 兩層快取。
+
+客服問題大量重複（「怎麼退貨」），``QueryRAGUseCase.retrieve`` 每次都打一次
+``embed_query``（100-300 ms 網路往返 + token 費用）。這層包在
+``EmbeddingService`` 外面，只快取 ``embed_query``：
+
+- key = sha256(model, dimensions, normalized text)；normalize 只做 NFKC +
+  空白收斂（不改大小寫，避免不同語意共用向量）
+- value = little-endian float32 blob（3072 維 = 12 KB，比 JSON float list 小 ~4x）
+- 同 key 的並發 miss 共用同一個 in-flight call（single-flight）
+
+``embed_texts``（ingest 路徑）不經快取，直接委派。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import re
+import unicodedata
+from typing import Any
+
+import numpy as np
+
+from src.domain.rag.services import EmbeddingService
+from src.infrastructure.cache.two_tier_cache import TwoTierCache
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_query_text(text: str) -> str:
+    return _WHITESPACE_RE.sub(" ", unicodedata.normalize("NFKC", text)).strip()
+
+
+def encode_vector(vector: list[float]) -> bytes:
+    return np.asarray(vector, dtype="<f4").tobytes()
+
+
+def decode_vector(blob: bytes) -> list[float]:
+    return np.frombuffer(blob, dtype="<f4").tolist()
+
+
+class CachedEmbeddingService(EmbeddingService):
+    def __init__(
+        self,
+        inner: EmbeddingService,
+        cache: TwoTierCache,
+        model: str,
+        dimensions: int | None = None,
+    ) -> None:
+        self._inner = inner
+        self._cache = cache
+        self._model = model
+        self._dimensions = dimensions or 0
+        self._inflight: dict[str, asyncio.Future[list[float]]] = {}
+
+    def cache_key(self, text: str) -> str:
+        normalized = normalize_query_text(text)
+        raw = f"{self._model}|{self._dimensions}|{normalized}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    async def embed_texts(self, texts: list[str]) -> list[list[float]]:
+        return await self._inner.embed_texts(texts)
+
+    async def embed_query(self, text: str) -> list[float]:
+        return (await self.embed_queries([text]))[0]
+
+    async def embed_queries(self, texts: list[str]) -> list[list[float]]:
+        keys = [self.cache_key(t) for t in texts]
+        vectors: dict[str, list[float]] = {}
+        waiting: dict[str, tuple[str, asyncio.Future[list[float]]]] = {}
+        to_fetch: dict[str, str] = {}
+        for text, key in zip(texts, keys, strict=True):
+            if key in vectors or key in waiting or key in to_fetch:
+                continue
+            blob = await self._cache.get(key)
+            if blob is not None:
+                vectors[key] = decode_vector(blob)
+                continue
+            pending = self._inflight.get(key)
+            if pending is not None:
+                waiting[key] = (text, pending)
+            else:
+                to_fetch[key] = text
+
+        if to_fetch:
+            vectors.update(await self._fetch(to_fetch))
+        for key, (text, pending) in waiting.items():
+            try:
+                vectors[key] = list(await asyncio.shield(pending))
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise  # 自己被 cancel
+                # leader 被 cancel → 自己重打一次
+                vectors.update(await self._fetch({key: text}))
+        return [vectors[k] for k in keys]
+
+    async def _fetch(self, to_fetch: dict[str, str]) -> dict[str, list[float]]:
+        """Cache miss：一次送 inner，並登記 in-flight 讓並發相同 query 共用。"""
+        loop = asyncio.get_running_loop()
+        futures = {key: loop.create_future() for key in to_fetch}
+        self._inflight.update(futures)
+        try:
+            fetched = await self._inner.embed_queries(list(to_fetch.values()))
+            result = dict(zip(to_fetch, fetched, strict=True))
+            await asyncio.gather(
+                *(self._cache.set(k, encode_vector(v)) for k, v in result.items())
+            )
+            for key, vector in result.items():
+                futures[key].set_result(vector)
+            return result
+        except asyncio.CancelledError:
+            for future in futures.values():
+                future.cancel()
+            raise
+        except Exception as exc:
+            for future in futures.values():
+                future.set_exception(exc)
+                # 沒有其他 waiter 時避免 "exception never retrieved" warning
+                future.exception()
+            raise
+        finally:
+            for key, future in futures.items():
+                if self._inflight.get(key) is future:
+                    del self._inflight[key]
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            **self._cache.stats(),
+            "model": self._model,
+            "inflight": len(self._inflight),
+        }
@@ -0,0 +1,142 @@
+"""CoalescingEmbeddingService — 併發 query embedding 的 micro-batching。
+
+多個 chat session 同時 ``embed_query`` 時，每條各自一個單筆 ``/embeddings``
+request。這層把 ``max_wait_ms`` 內抵達的 query 收成一批，交給
+``inner.embed_queries`` 一次送出，再把向量分回各個 caller。
+
+- 批次滿 ``max_batch_size`` 立即送出，不等 timer
+- ``embed_queries`` 送進來的一組 query（同一次 retrieve 的 raw / rewrite /
+  hyde）視為不可拆的 group，一定落在同一批（group 本身超過上限時獨佔一批）
+- 同批內相同文字只送一次
+- ``embed_texts``（ingest bulk 路徑）不經 coalescer，直接委派
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import Any
+
+from src.domain.rag.services import EmbeddingService
+from src.infrastructure.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class _PendingGroup:
+    texts: list[str]
+    future: asyncio.Future[list[list[float]]]
+
+
+class CoalescingEmbeddingService(EmbeddingService):
+    def __init__(
+        self,
+        inner: EmbeddingService,
+        max_wait_ms: float = 5.0,
+        max_batch_size: int = 32,
+    ) -> None:
+        self._inner = inner
+        self._max_wait = max(max_wait_ms, 0.0) / 1000
+        self._max_batch_size = max(max_batch_size, 1)
+        self._pending: list[_PendingGroup] = []
+        self._pending_count = 0
+        self._timer: asyncio.TimerHandle | None = None
+        self._dispatch_tasks: set[asyncio.Task[None]] = set()
+        self.batches_total = 0
+        self.queries_total = 0
+        self.max_observed_batch = 0
+
+    async def embed_texts(self, texts: list[str]) -> list[list[float]]:
+        return await self._inner.embed_texts(texts)
+
+    async def embed_query(self, text: str) -> list[float]:
+        return (await self.embed_queries([text]))[0]
+
+    async def embed_queries(self, texts: list[str]) -> list[list[float]]:
+        if not texts:
+            return []
+        loop = asyncio.get_running_loop()
+        group = _PendingGroup(texts=list(texts), future=loop.create_future())
+        self._pending.append(group)
+        self._pending_count += len(group.texts)
+
+        if self._pending_count >= self._max_batch_size or self._max_wait == 0:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._max_wait, self._flush)
+        return await group.future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._pending:
+            batch: list[_PendingGroup] = []
+            size = 0
+            while self._pending:
+                group = self._pending[0]
+                if batch and size + len(group.texts) > self._max_batch_size:
+                    break
+                batch.append(self._pending.pop(0))
+                size += len(group.texts)
+            self._pending_count -= size
+            task = asyncio.get_running_loop().create_task(self._dispatch(batch))
+            self._dispatch_tasks.add(task)
+            task.add_done_callback(self._dispatch_tasks.discard)
+
+    async def _dispatch(self, batch: list[_PendingGroup]) -> None:
+        # 同批相同文字只送一次
+        unique: dict[str, int] = {}
+        for group in batch:
+            for text in group.texts:
+                unique.setdefault(text, len(unique))
+        self.batches_total += 1
+        self.queries_total += sum(len(g.texts) for g in batch)
+        self.max_observed_batch = max(self.max_observed_batch, len(unique))
+
+        try:
+            vectors = await self._inner.embed_queries(list(unique))
+            if len(vectors) != len(unique):
+                raise ValueError(
+                    f"embed_queries returned {len(vectors)} vectors "
+                    f"for {len(unique)} texts"
+                )
+            for group in batch:
+                if group.future.done():  # caller 已 cancel
+                    continue
+                group.future.set_result(
+                    [list(vectors[unique[text]]) for text in group.texts]
+                )
+        except BaseException as exc:
+            # 任何結束方式（含 shutdown cancel）都不能留下 pending 的 future
+            logger.warning(
+                "embedding.coalesce.batch_failed",
+                groups=len(batch),
+                batch_size=len(unique),
+                error=repr(exc),
+            )
+            for group in batch:
+                if group.future.done():
+                    continue
+                if isinstance(exc, asyncio.CancelledError):
+                    group.future.cancel()
+                else:
+                    group.future.set_exception(exc)
+            if not isinstance(exc, Exception):
+                raise
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "max_wait_ms": round(self._max_wait * 1000, 3),
+            "max_batch_size": self._max_batch_size,
+            "pending": self._pending_count,
+            "batches_total": self.batches_total,
+            "queries_total": self.queries_total,
+            "avg_batch_size": (
+                round(self.queries_total / self.batches_total, 2)
+                if self.batches_total
+                else 0.0
+            ),
+            "max_observed_batch": self.max_observed_batch,
+        }
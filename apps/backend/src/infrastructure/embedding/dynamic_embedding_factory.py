@@ -1,6 +1,8 @@
 """Dynamic Embedding — resolves model/base_url/key from config + DB.
 
 API key resolution: DB (matching provider) → .env fallback.
+Resolved service 由 process-wide EmbeddingClientRegistry 提供（共用 connection
+pool），同一組 (key, model, base_url) 不會每次重建 httpx client。
 """
 
 import json
@@ -10,6 +12,10 @@ from src.domain.platform.services import EncryptionService
 from src.domain.platform.value_objects import ProviderName, ProviderType
 from src.domain.rag.services import EmbeddingService
 from src.domain.shared.cache_service import CacheService
+from src.infrastructure.embedding.embedding_client_registry import (
+    EmbeddingClientRegistry,
+    get_embedding_client_registry,
+)
 from src.infrastructure.logging import get_logger
 
 logger = get_logger(__name__)
@@ -20,22 +26,6 @@ _PROVIDER_TO_NAME = {
 }
 
 
-def _build_embedding_service(
-    api_key: str,
-    model: str,
-    base_url: str,
-) -> EmbeddingService:
-    from src.infrastructure.embedding.openai_embedding_service import (
-        OpenAIEmbeddingService,
-    )
-
-    return OpenAIEmbeddingService(
-        api_key=api_key,
-        model=model,
-        base_url=base_url,
-    )
-
-
 class DynamicEmbeddingServiceFactory:
     """Resolves Embedding service: API key from DB or .env."""
 
@@ -46,12 +36,17 @@ class DynamicEmbeddingServiceFactory:
         fallback_service: EmbeddingService,
         cache_service: CacheService | None = None,
         cache_ttl: int = 300,
+        client_registry: EmbeddingClientRegistry | None = None,
+        service_kwargs: dict | None = None,
     ) -> None:
         self._repo_factory = provider_setting_repo_factory
         self._encryption = encryption_service
         self._fallback = fallback_service
         self._cache_service = cache_service
         self._cache_ttl = cache_ttl
+        self._registry = client_registry or get_embedding_client_registry()
+        # batch / scheduler 設定：只在 registry 新建 service 時套用
+        self._service_kwargs = dict(service_kwargs or {})
 
     async def get_service(self) -> EmbeddingService:
         cfg = Settings()
@@ -63,10 +58,11 @@ class DynamicEmbeddingServiceFactory:
             if cached is not None:
                 try:
                     config = json.loads(self._encryption.decrypt(cached))
-                    return _build_embedding_service(
+                    return self._registry.get_service(
                         api_key=config["api_key"],
                         model=cfg.effective_embedding_model,
                         base_url=cfg.effective_embedding_base_url,
+                        **self._service_kwargs,
                     )
                 except Exception:
                     logger.warning("dynamic_embedding.cache_decrypt_failed")
@@ -89,10 +85,11 @@ class DynamicEmbeddingServiceFactory:
                     cache_key, encrypted, ttl_seconds=self._cache_ttl
                 )
 
-            return _build_embedding_service(
+            return self._registry.get_service(
                 api_key=api_key,
                 model=cfg.effective_embedding_model,
                 base_url=cfg.effective_embedding_base_url,
+                **self._service_kwargs,
             )
         except Exception:
             logger.exception("dynamic_embedding.error")
@@ -135,3 +132,7 @@ class DynamicEmbeddingServiceProxy(EmbeddingService):
     async def embed_query(self, text: str) -> list[float]:
         service = await self._factory.get_service()
         return await service.embed_query(text)
+
+    async def embed_queries(self, texts: list[str]) -> list[list[float]]:
+        service = await self._factory.get_service()
+        return await service.embed_queries(texts)
@@ -0,0 +1,285 @@
+"""EmbeddingClientRegistry — process-wide pooled embedding clients.
+
+過去 ``DynamicEmbeddingServiceFactory.get_service()`` 每次解析都 new 一個
+``OpenAIEmbeddingService``（連帶 new 一個 ``httpx.AsyncClient``），chat hot path
+每次 ``embed_query`` 都重新 TCP + TLS handshake，舊 client 也沒人 close。
+
+Registry 以 (api_key fingerprint, model, base_url) 為 key 保存 service，底下共用
+一個調校過的 connection pool（keep-alive / HTTP/2）。同一個 (model, base_url)
+slot 換了 key（admin 改 provider 設定）才重建 client，舊 client 在 timeout 後
+關閉，避免打斷 in-flight request。
+
+Process-wide：API 與 arq worker 每個 job 都會 new Container，所以 registry
+放在 module level（``get_embedding_client_registry``），不跟 Container 生命週期。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+
+from src.infrastructure.embedding.openai_embedding_service import (
+    OpenAIEmbeddingService,
+)
+from src.infrastructure.logging import get_logger
+
+logger = get_logger(__name__)
+
+# handshakes/sec 的觀測視窗（秒）
+_RATE_WINDOW_SECONDS = 60.0
+
+
+def api_key_fingerprint(api_key: str) -> str:
+    """API key 不進 registry key / log，只存 sha256 前 12 碼。"""
+    if not api_key:
+        return "none"
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:12]
+
+
+def http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+@dataclass(frozen=True)
+class EmbeddingPoolConfig:
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 60.0
+    http2: bool = True
+    timeout: float = 120.0
+
+
+class InstrumentedTransport(httpx.AsyncHTTPTransport):
+    """AsyncHTTPTransport + httpcore trace hook：統計新建連線 / TLS handshake。"""
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.connects_total = 0
+        self.tls_handshakes_total = 0
+        self.requests_total = 0
+        self._handshake_times: deque[float] = deque()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.requests_total += 1
+        request.extensions = {**request.extensions, "trace": self._trace}
+        return await super().handle_async_request(request)
+
+    async def _trace(self, event_name: str, info: dict[str, Any]) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            self.connects_total += 1
+            self._handshake_times.append(time.monotonic())
+        elif event_name == "connection.start_tls.complete":
+            self.tls_handshakes_total += 1
+
+    def handshakes_per_sec(self) -> float:
+        cutoff = time.monotonic() - _RATE_WINDOW_SECONDS
+        while self._handshake_times and self._handshake_times[0] < cutoff:
+            self._handshake_times.popleft()
+        return round(len(self._handshake_times) / _RATE_WINDOW_SECONDS, 3)
+
+    def pool_counts(self) -> tuple[int, int]:
+        """回傳 (in_use, idle)；httpcore pool 不可得時回 (0, 0)。"""
+        pool = getattr(self, "_pool", None)
+        connections = getattr(pool, "connections", None) or []
+        idle = sum(1 for c in connections if c.is_idle())
+        return len(connections) - idle, idle
+
+
+class _PooledEntry:
+    def __init__(
+        self,
+        service: OpenAIEmbeddingService,
+        client: httpx.AsyncClient,
+        transport: InstrumentedTransport,
+        model: str,
+        base_url: str,
+        fingerprint: str,
+    ) -> None:
+        self.service = service
+        self.client = client
+        self.transport = transport
+        self.model = model
+        self.base_url = base_url
+        self.fingerprint = fingerprint
+        self.created_at = time.time()
+
+    def stats(self) -> dict[str, Any]:
+        in_use, idle = self.transport.pool_counts()
+        return {
+            "model": self.model,
+            "base_url": self.base_url,
+            "api_key_fingerprint": self.fingerprint,
+            "in_use": in_use,
+            "idle": idle,
+            "requests_total": self.transport.requests_total,
+            "connects_total": self.transport.connects_total,
+            "tls_handshakes_total": self.transport.tls_handshakes_total,
+            "handshakes_per_sec": self.transport.handshakes_per_sec(),
+            "created_at": self.created_at,
+            "scheduler": self.service.scheduler_stats(),
+        }
+
+
+class EmbeddingClientRegistry:
+    """(api_key fingerprint, model, base_url) → pooled OpenAIEmbeddingService。"""
+
+    def __init__(self, config: EmbeddingPoolConfig | None = None) -> None:
+        self._config = config or EmbeddingPoolConfig()
+        self._entries: dict[tuple[str, str, str], _PooledEntry] = {}
+        self._http2 = self._config.http2 and http2_available()
+        if self._config.http2 and not self._http2:
+            logger.info("embedding_pool.http2_unavailable", fallback="http/1.1")
+        self.rebuilds_total = 0
+        # 延後 close 的 task 要留 reference，否則可能在完成前被 GC
+        self._close_tasks: set[asyncio.Task[None]] = set()
+
+    def configure(self, config: EmbeddingPoolConfig) -> None:
+        """更新 pool 參數；只影響之後新建的 client。"""
+        self._config = config
+        self._http2 = config.http2 and http2_available()
+
+    def get_service(
+        self,
+        api_key: str,
+        model: str,
+        base_url: str,
+        **service_kwargs: Any,
+    ) -> OpenAIEmbeddingService:
+        fingerprint = api_key_fingerprint(api_key)
+        key = (fingerprint, model, base_url)
+        entry = self._entries.get(key)
+        if entry is not None:
+            return entry.service
+
+        # 同一 (model, base_url) slot 換了 key → 退役舊 client
+        for stale_key in [
+            k for k in self._entries if k[1:] == (model, base_url)
+        ]:
+            self._retire(self._entries.pop(stale_key))
+
+        entry = self._build_entry(
+            api_key, model, base_url, fingerprint, service_kwargs
+        )
+        self._entries[key] = entry
+        self.rebuilds_total += 1
+        logger.info(
+            "embedding_pool.client_built",
+            model=model,
+            base_url=base_url,
+            api_key_fingerprint=fingerprint,
+            http2=self._http2,
+        )
+        return entry.service
+
+    def _build_entry(
+        self,
+        api_key: str,
+        model: str,
+        base_url: str,
+        fingerprint: str,
+        service_kwargs: dict[str, Any],
+    ) -> _PooledEntry:
+        cfg = self._config
+        transport = InstrumentedTransport(
+            http2=self._http2,
+            limits=httpx.Limits(
+                max_connections=cfg.max_connections,
+                max_keepalive_connections=cfg.max_keepalive_connections,
+                keepalive_expiry=cfg.keepalive_expiry,
+            ),
+        )
+        service_kwargs = dict(service_kwargs)
+        timeout = service_kwargs.pop("timeout", cfg.timeout)
+        client = httpx.AsyncClient(transport=transport, timeout=timeout)
+        service = OpenAIEmbeddingService(
+            api_key=api_key,
+            model=model,
+            base_url=base_url,
+            timeout=timeout,
+            client=client,
+            **service_kwargs,
+        )
+        return _PooledEntry(service, client, transport, model, base_url, fingerprint)
+
+    def _retire(self, entry: _PooledEntry) -> None:
+        """延後到 request timeout 後才 close，in-flight request 不被打斷。"""
+        logger.info(
+            "embedding_pool.client_retired",
+            model=entry.model,
+            base_url=entry.base_url,
+            api_key_fingerprint=entry.fingerprint,
+        )
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        loop.call_later(self._config.timeout, self._schedule_close, loop, entry)
+
+    def _schedule_close(
+        self, loop: asyncio.AbstractEventLoop, entry: _PooledEntry
+    ) -> None:
+        task = loop.create_task(entry.client.aclose())
+        self._close_tasks.add(task)
+        task.add_done_callback(self._on_close_done)
+
+    def _on_close_done(self, task: asyncio.Task[None]) -> None:
+        self._close_tasks.discard(task)
+        if task.cancelled():
+            return
+        exc = task.exception()
+        if exc is not None:
+            logger.warning(
+                "embedding_pool.close_failed",
+                error=str(exc),
+                exc_info=(type(exc), exc, exc.__traceback__),
+            )
+
+    def stats(self) -> dict[str, Any]:
+        clients = [e.stats() for e in self._entries.values()]
+        return {
+            "http2": self._http2,
+            "max_connections": self._config.max_connections,
+            "max_keepalive_connections": self._config.max_keepalive_connections,
+            "keepalive_expiry": self._config.keepalive_expiry,
+            "rebuilds_total": self.rebuilds_total,
+            "in_use": sum(c["in_use"] for c in clients),
+            "idle": sum(c["idle"] for c in clients),
+            "handshakes_per_sec": round(
+                sum(c["handshakes_per_sec"] for c in clients), 3
+            ),
+            "clients": clients,
+        }
+
+    async def aclose(self) -> None:
+        entries = list(self._entries.values())
+        self._entries.clear()
+        for entry in entries:
+            try:
+                await entry.client.aclose()
+            except Exception:
+                logger.warning("embedding_pool.close_failed", exc_info=True)
+
+
+_registry: EmbeddingClientRegistry | None = None
+
+
+def get_embedding_client_registry(
+    config: EmbeddingPoolConfig | None = None,
+) -> EmbeddingClientRegistry:
+    """Process-wide singleton；帶 config 時更新 pool 參數（只影響之後新建的 client）。"""
+    global _registry
+    if _registry is None:
+        _registry = EmbeddingClientRegistry(config)
+    elif config is not None:
+        _registry.configure(config)
+    return _registry
@@ -0,0 +1,157 @@
+"""Embedding batch scheduler — token-aware 分批 + AIMD 併發控制。
+
+``OpenAIEmbeddingService.embed_texts`` 原本一批一批序列送、批次之間固定
+``batch_delay`` sleep、只用筆數切批，429 時把 batch size 砍半且不再長回來，
+大量 ingest 的吞吐量被設計本身卡住。
+
+- ``pack_batches``：依估算 token 數把連續的 texts 裝箱，單批不超過
+  ``max_tokens`` 也不超過 ``max_items``（provider 的單一 request 上限）
+- ``AimdConcurrencyLimiter``：同時在途的 request 數由 AIMD 控制 —
+  每成功 ``limit`` 次加 1（additive increase），收到 429 減半
+  （multiplicative decrease），``Retry-After`` 期間所有 request 暫停
+
+limiter 掛在 ``OpenAIEmbeddingService`` 上，而 service 由 process-wide
+``EmbeddingClientRegistry`` 依 (api key, model, base_url) 共用，所以 worker 內
+同時處理的多份文件共用同一個併發上限 —— 用滿 provider quota 但不超過。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Any
+
+
+def estimate_tokens(text: str) -> int:
+    """粗估 token 數（偏保守）：ASCII 約 4 字元 1 token，其餘（CJK 等）1 字 1 token。"""
+    ascii_chars = sum(1 for ch in text if ch < "\x80")
+    return math.ceil(ascii_chars / 4) + (len(text) - ascii_chars) + 1
+
+
+def pack_batches(
+    texts: list[str], max_items: int, max_tokens: int
+) -> list[tuple[int, int]]:
+    """把 texts 依序裝箱，回傳 [(start, end), ...]（半開區間，保持原順序）。
+
+    單一 text 就超過 ``max_tokens`` 時自成一批（交給 provider 截斷 / 報錯）。
+    """
+    max_items = max(1, max_items)
+    batches: list[tuple[int, int]] = []
+    start = 0
+    tokens = 0
+    for i, text in enumerate(texts):
+        cost = estimate_tokens(text)
+        if i > start and (i - start >= max_items or tokens + cost > max_tokens):
+            batches.append((start, i))
+            start, tokens = i, 0
+        tokens += cost
+    if start < len(texts):
+        batches.append((start, len(texts)))
+    return batches
+
+
+class AimdConcurrencyLimiter:
+    """AIMD 併發上限；``acquire`` 回傳 ticket，``release`` 時帶回。
+
+    同一波 429（同時在途的 request 一起被拒）只減半一次：只有在最近一次
+    減半之後才 acquire 的 request 被 throttle，才會再減半。
+    """
+
+    def __init__(
+        self, initial: int = 2, min_limit: int = 1, max_limit: int = 8
+    ) -> None:
+        self._min = max(1, min_limit)
+        self._max = max(self._min, max_limit)
+        self.limit = min(max(initial, self._min), self._max)
+        self.in_flight = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._paused_until = 0.0
+        self._successes = 0
+        self._epoch = 0
+        self.peak_in_flight = 0
+        self.requests_total = 0
+        self.throttled_total = 0
+        self.increases_total = 0
+        self.decreases_total = 0
+
+    async def acquire(self) -> int:
+        # 每次被喚醒都重新檢查 pause：release(throttled, pause=...) 會立刻
+        # _wake()，排隊中的 request 不能趁 Retry-After 期間送出
+        while True:
+            pause = self._paused_until - time.monotonic()
+            if pause > 0:
+                await asyncio.sleep(pause)
+                continue
+            if self.in_flight < self.limit:
+                break
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                elif waiter.done() and not waiter.cancelled():
+                    self._wake()  # 被喚醒後才取消 → 名額讓給下一個
+                raise
+        self.in_flight += 1
+        self.requests_total += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        return self._epoch
+
+    def release(
+        self,
+        ticket: int,
+        *,
+        success: bool,
+        throttled: bool = False,
+        pause: float = 0.0,
+    ) -> None:
+        self.in_flight -= 1
+        if throttled:
+            self.throttled_total += 1
+            if pause > 0:
+                self._paused_until = max(
+                    self._paused_until, time.monotonic() + pause
+                )
+            if ticket == self._epoch:
+                self._epoch += 1
+                self._successes = 0
+                if self.limit > self._min:
+                    self.limit = max(self._min, self.limit // 2)
+                    self.decreases_total += 1
+        elif success:
+            self._successes += 1
+            if self._successes >= self.limit:
+                self._successes = 0
+                if self.limit < self._max:
+                    self.limit += 1
+                    self.increases_total += 1
+        self._wake()
+
+    def _wake(self) -> None:
+        free = self.limit - self.in_flight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "min_limit": self._min,
+            "max_limit": self._max,
+            "in_flight": self.in_flight,
+            "waiting": len(self._waiters),
+            "peak_in_flight": self.peak_in_flight,
+            "paused_seconds": round(
+                max(0.0, self._paused_until - time.monotonic()), 3
+            ),
+            "requests_total": self.requests_total,
+            "throttled_total": self.throttled_total,
+            "increases_total": self.increases_total,
+            "decreases_total": self.decreases_total,
+        }
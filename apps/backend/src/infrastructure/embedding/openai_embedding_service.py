@@ -1,9 +1,14 @@
 import asyncio
 import time
+from typing import Any
 
 import httpx
 
 from src.domain.rag.services import EmbeddingService
+from src.infrastructure.embedding.embedding_scheduler import (
+    AimdConcurrencyLimiter,
+    pack_batches,
+)
 from src.infrastructure.logging import get_logger
 
 logger = get_logger(__name__)
@@ -19,9 +24,12 @@ class OpenAIEmbeddingService(EmbeddingService):
         batch_size: int = 50,
         max_retries: int = 5,
         timeout: float = 120.0,
-        batch_delay: float = 1.0,
         retry_after_multiplier: float = 1.0,
-        min_batch_size: int = 10,
+        max_batch_tokens: int = 100_000,
+        initial_concurrency: int = 2,
+        max_concurrency: int = 8,
+        query_concurrency: int = 4,
+        client: httpx.AsyncClient | None = None,
     ) -> None:
         self._api_key = api_key
         self._model = model
@@ -30,62 +38,80 @@ class OpenAIEmbeddingService(EmbeddingService):
         self._batch_size = batch_size
         self._max_retries = max_retries
         self._timeout = timeout
-        self._batch_delay = batch_delay
         self._retry_after_multiplier = retry_after_multiplier
-        self._min_batch_size = min_batch_size
-        self._client = httpx.AsyncClient(timeout=self._timeout)
+        self._max_batch_tokens = max_batch_tokens
+        # 同一個 service（registry 依 key/model/base_url 共用）的所有 bulk
+        # 呼叫端（ingest / reprocess / re-embed）共用這個併發上限
+        self._limiter = AimdConcurrencyLimiter(
+            initial=initial_concurrency, max_limit=max_concurrency
+        )
+        # chat query 另走一條 lane：不排在 ingest 批次後面，bulk 的 429
+        # 暫停也不會讓 chat request 一起等 Retry-After
+        self._query_limiter = AimdConcurrencyLimiter(
+            initial=query_concurrency, max_limit=query_concurrency
+        )
+        # 由 EmbeddingClientRegistry 注入共用 pool；未注入時自建（fallback / 測試）
+        self._client = client or httpx.AsyncClient(timeout=self._timeout)
         self.last_total_tokens: int = 0
 
     async def embed_texts(self, texts: list[str]) -> list[list[float]]:
-        self.last_total_tokens = 0
+        return await self._embed(texts, self._limiter)
+
+    async def _embed(
+        self, texts: list[str], limiter: AimdConcurrencyLimiter
+    ) -> list[list[float]]:
         if not texts:
+            self.last_total_tokens = 0
             return []
-        all_embeddings: list[list[float]] = []
-        effective_batch_size = self._batch_size
-        i = 0
-        batch_num = 0
-        while i < len(texts):
-            batch_num += 1
-            if i > 0:
-                await asyncio.sleep(self._batch_delay)
-            batch = texts[i : i + effective_batch_size]
-            logger.info(
-                "embedding.batch",
-                batch=batch_num,
-                chunk_count=len(batch),
-                batch_size=effective_batch_size,
+        # 本次呼叫的 token 在 local 累計、結束才寫回 last_total_tokens：
+        # 同一個 service 可能被多個 coroutine 併發呼叫（ingestion pipeline），
+        # 呼叫端在 await 回來後立即讀取即為自己這次的用量
+        ranges = pack_batches(texts, self._batch_size, self._max_batch_tokens)
+        tasks = [
+            asyncio.ensure_future(
+                self._embed_batch_with_retry(texts[start:end], limiter, batch_num)
             )
-            embeddings, was_rate_limited = await self._embed_batch_with_retry(batch)
+            for batch_num, (start, end) in enumerate(ranges, start=1)
+        ]
+        try:
+            results = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        all_embeddings: list[list[float]] = []
+        total_tokens = 0
+        for embeddings, tokens in results:
             all_embeddings.extend(embeddings)
-            if was_rate_limited and effective_batch_size > self._min_batch_size:
-                new_size = max(effective_batch_size // 2, self._min_batch_size)
-                logger.warning(
-                    "embedding.batch_size_reduced",
-                    old=effective_batch_size,
-                    new=new_size,
-                )
-                effective_batch_size = new_size
-            i += len(batch)
+            total_tokens += tokens
+        self.last_total_tokens = total_tokens
         return all_embeddings
 
     async def _embed_batch_with_retry(
-        self, texts: list[str]
-    ) -> tuple[list[list[float]], bool]:
+        self,
+        texts: list[str],
+        limiter: AimdConcurrencyLimiter,
+        batch_num: int = 1,
+    ) -> tuple[list[list[float]], int]:
         log = logger.bind(
             model=self._model,
             base_url=self._base_url,
             chunk_count=len(texts),
+            batch=batch_num,
         )
-        was_rate_limited = False
         for attempt in range(self._max_retries):
+            ticket = await limiter.acquire()
+            success = throttled = False
+            wait = 0.0
             try:
-                result = await self._call_api(texts, log)
-                return result, was_rate_limited
+                log.info("embedding.batch", concurrency=limiter.limit)
+                result, tokens = await self._call_api(texts, log)
+                success = True
+                return result, tokens
             except httpx.HTTPStatusError as e:
-                if attempt == self._max_retries - 1:
-                    raise
                 if e.response.status_code == 429:
-                    was_rate_limited = True
+                    throttled = True
                     retry_after = e.response.headers.get("Retry-After")
                     if retry_after:
                         wait = float(retry_after) * self._retry_after_multiplier
@@ -93,21 +119,38 @@ class OpenAIEmbeddingService(EmbeddingService):
                         wait = 5 * (attempt + 1)
                 else:
                     wait = 2**attempt
+                if attempt == self._max_retries - 1:
+                    raise
                 log.warning(
                     "embedding.retry",
                     attempt=attempt + 1,
                     wait_seconds=wait,
                     status=e.response.status_code,
                 )
-                await asyncio.sleep(wait)
             except Exception:
                 if attempt == self._max_retries - 1:
                     raise
                 wait = 2**attempt
                 log.warning("embedding.retry", attempt=attempt + 1, wait_seconds=wait)
-                await asyncio.sleep(wait)
+            finally:
+                # 429 → 該 lane 的 limiter 減半並讓 lane 內所有 request 暫停 Retry-After
+                limiter.release(
+                    ticket,
+                    success=success,
+                    throttled=throttled,
+                    pause=wait if throttled else 0.0,
+                )
+            await asyncio.sleep(wait)
         raise RuntimeError("unreachable")  # pragma: no cover
 
+    def scheduler_stats(self) -> dict[str, Any]:
+        return {
+            "max_batch_items": self._batch_size,
+            "max_batch_tokens": self._max_batch_tokens,
+            **self._limiter.stats(),
+            "query_lane": self._query_limiter.stats(),
+        }
+
     async def _call_api(self, texts: list[str], log):  # type: ignore[no-untyped-def]
         key_prefix = self._api_key[:8] if self._api_key else "EMPTY"
         log.info(
@@ -131,18 +174,21 @@ class OpenAIEmbeddingService(EmbeddingService):
             elapsed_ms = round((time.perf_counter() - start) * 1000, 1)
             usage = data.get("usage", {})
             total_tokens = usage.get("total_tokens", 0)
-            self.last_total_tokens += total_tokens
             log.info(
                 "embedding.done",
                 latency_ms=elapsed_ms,
                 total_tokens=total_tokens,
             )
-            return [item["embedding"] for item in data["data"]]
+            return [item["embedding"] for item in data["data"]], total_tokens
         except Exception:
             elapsed_ms = round((time.perf_counter() - start) * 1000, 1)
             log.exception("embedding.failed", latency_ms=elapsed_ms)
             raise
 
     async def embed_query(self, text: str) -> list[float]:
-        results = await self.embed_texts([text])
+        results = await self.embed_queries([text])
         return results[0]
+
+    async def embed_queries(self, texts: list[str]) -> list[list[float]]:
+        # 少量 query 通常一批就裝得下 → 單一 /embeddings request（query lane）
+        return await self._embed(texts, self._query_limiter)
@@ -1,4 +1,11 @@
-"""OCR-based file parser that routes PDF through OCR engines."""
+"""OCR-based file parser that routes PDF through OCR engines.
+
+PDF OCR 是 streaming pipeline：``PdfPageRenderer`` 在 worker thread 逐頁
+render，最多 ``window`` 頁同時在 OCR（render 完才送、OCR 完就釋放 PNG），
+所以 PNG 佔用的記憶體是 O(window) 而不是 O(頁數)。每頁完成就呼叫
+``on_page`` / ``on_progress``（完成順序，不一定是頁碼順序）；回傳的全文仍依
+頁碼以換頁符串接。
+"""
 
 from __future__ import annotations
 
@@ -13,20 +20,28 @@ from src.infrastructure.file_parser.ocr_engines.claude_vision_ocr import (
     ClaudeVisionOcrEngine,
     OCR_PROMPTS,
 )
-from src.infrastructure.file_parser.pdf_page_extractor import (
-    extract_pages_as_images,
-)
+from src.infrastructure.file_parser.pdf_page_extractor import PdfPageRenderer
 
 # Callback type: (completed_pages, total_pages) -> Awaitable
 ProgressCallback = Callable[[int, int], Awaitable[None]]
+# Callback type: (page_number (1-based), page_text) -> Awaitable
+PageCallback = Callable[[int, str], Awaitable[None]]
 
 
 class OcrFileParserService(FileParserService):
     """FileParserService that routes PDF to OCR, delegates others to default."""
 
-    def __init__(self, ocr_engine: ClaudeVisionOcrEngine) -> None:
+    def __init__(
+        self,
+        ocr_engine: ClaudeVisionOcrEngine,
+        window: int = 5,
+        dpi: int = 200,
+    ) -> None:
         self._ocr = ocr_engine
         self._default = DefaultFileParserService()
+        # 同時在 OCR 的頁數上限（= 同時留在記憶體的 PNG 數）
+        self._window = max(1, window)
+        self._dpi = dpi
         # Expose last parse usage for callers to record
         self.last_input_tokens: int = 0
         self.last_output_tokens: int = 0
@@ -49,18 +64,14 @@ class OcrFileParserService(FileParserService):
             return self._default.parse(raw_bytes, content_type)
 
         # catalog/ocr mode: use Claude Vision OCR
-        page_images = extract_pages_as_images(raw_bytes)
-        if not page_images:
-            return ""
-
         prompt = OCR_PROMPTS.get(ocr_mode, OCR_PROMPTS["general"])
         self._ocr.last_input_tokens = 0
         self._ocr.last_output_tokens = 0
-        result = asyncio.run(self._ocr_all_pages(page_images, prompt))
+        page_texts = asyncio.run(self._ocr_pages(raw_bytes, prompt))
         self.last_input_tokens = self._ocr.last_input_tokens
         self.last_output_tokens = self._ocr.last_output_tokens
         self.last_model = getattr(self._ocr, "_model", "unknown")
-        return result
+        return "\f".join(page_texts)
 
     async def parse_pdf_async(
         self,
@@ -68,8 +79,12 @@ class OcrFileParserService(FileParserService):
         ocr_mode: str = "general",
         on_progress: ProgressCallback | None = None,
         max_pages: int | None = None,
+        on_page: PageCallback | None = None,
     ) -> str:
-        """Async PDF parsing with per-page progress callback."""
+        """Async PDF parsing with per-page progress callback.
+
+        ``on_page(page_number, text)`` 在每頁 OCR 完成時呼叫（完成順序）。
+        """
         self.last_input_tokens = 0
         self.last_output_tokens = 0
 
@@ -83,36 +98,74 @@ class OcrFileParserService(FileParserService):
             return content
 
         # catalog/ocr mode: use Claude Vision OCR
-        page_images = extract_pages_as_images(raw_bytes)
-        if not page_images:
-            return ""
-
-        if max_pages:
-            page_images = page_images[:max_pages]
-
-        total = len(page_images)
         prompt = OCR_PROMPTS.get(ocr_mode, OCR_PROMPTS["general"])
         self._ocr.last_input_tokens = 0
         self._ocr.last_output_tokens = 0
 
-        page_texts: list[str] = []
-        # Process in batches of concurrent size (semaphore handles concurrency)
-        batch_size = 5
-        for i in range(0, total, batch_size):
-            batch = page_images[i : i + batch_size]
-            texts = await asyncio.gather(
-                *[self._ocr.ocr_page(img, prompt) for img in batch]
-            )
-            page_texts.extend(texts)
-            if on_progress:
-                await on_progress(len(page_texts), total)
+        page_texts = await self._ocr_pages(
+            raw_bytes,
+            prompt,
+            max_pages=max_pages,
+            on_progress=on_progress,
+            on_page=on_page,
+        )
 
         self.last_input_tokens = self._ocr.last_input_tokens
         self.last_output_tokens = self._ocr.last_output_tokens
         self.last_model = getattr(self._ocr, "_model", "unknown")
         return "\f".join(page_texts)
 
-    async def _ocr_all_pages(self, page_images: list[bytes], prompt: str) -> str:
-        tasks = [self._ocr.ocr_page(img, prompt) for img in page_images]
-        page_texts = await asyncio.gather(*tasks)
-        return "\f".join(page_texts)
+    async def _ocr_pages(
+        self,
+        raw_bytes: bytes,
+        prompt: str,
+        max_pages: int | None = None,
+        on_progress: ProgressCallback | None = None,
+        on_page: PageCallback | None = None,
+    ) -> list[str]:
+        """Render → OCR pipeline；最多 ``window`` 頁在途，回傳依頁碼排序的文字。"""
+        async with PdfPageRenderer(raw_bytes, dpi=self._dpi) as renderer:
+            total = renderer.page_count
+            if max_pages:
+                total = min(total, max_pages)
+            if total == 0:
+                return []
+
+            page_texts: list[str] = [""] * total
+            in_flight: set[asyncio.Task[tuple[int, str]]] = set()
+            next_page = 0
+            done = 0
+            try:
+                while next_page < total or in_flight:
+                    while next_page < total and len(in_flight) < self._window:
+                        png = await renderer.render(next_page)
+                        in_flight.add(
+                            asyncio.create_task(
+                                self._ocr_one(next_page, png, prompt)
+                            )
+                        )
+                        del png  # task 持有唯一參照，OCR 完即釋放
+                        next_page += 1
+                    finished, in_flight = await asyncio.wait(
+                        in_flight, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for task in finished:
+                        index, text = task.result()
+                        page_texts[index] = text
+                        done += 1
+                        if on_page:
+                            await on_page(index + 1, text)
+                        if on_progress:
+                            await on_progress(done, total)
+            finally:
+                # 任一頁失敗（或被取消）→ 其餘在途的 OCR 一併取消
+                for task in in_flight:
+                    task.cancel()
+                if in_flight:
+                    await asyncio.gather(*in_flight, return_exceptions=True)
+            return page_texts
+
+    async def _ocr_one(
+        self, index: int, png: bytes, prompt: str
+    ) -> tuple[int, str]:
+        return index, await self._ocr.ocr_page(png, prompt)
@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
+import asyncio
 from collections.abc import Generator
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
 
 
 def extract_pages_as_images(raw_bytes: bytes, dpi: int = 200) -> list[bytes]:
@@ -34,3 +37,71 @@ def count_pages(raw_bytes: bytes) -> int:
     count = len(doc)
     doc.close()
     return count
+
+
+class PdfPageRenderer:
+    """在專屬 worker thread 逐頁 render PNG（不佔 event loop）。
+
+    MuPDF document 不保證 thread-safe，所以 open / render / close 都在同一條
+    thread 上執行；一次只 render 呼叫端要的那一頁，記憶體不隨頁數成長。
+
+        async with PdfPageRenderer(raw_bytes) as renderer:
+            for i in range(renderer.page_count):
+                png = await renderer.render(i)
+    """
+
+    def __init__(self, raw_bytes: bytes, dpi: int = 200) -> None:
+        self._raw_bytes = raw_bytes
+        self._dpi = dpi
+        self._executor: ThreadPoolExecutor | None = None
+        self._doc: Any = None
+        self.page_count = 0
+
+    async def __aenter__(self) -> PdfPageRenderer:
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="pdf-render"
+        )
+        try:
+            self.page_count = await self._call(self._open)
+        except BaseException:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+            raise
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        if self._executor is None:
+            return
+        try:
+            await self._call(self._close)
+        finally:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def render(self, index: int) -> bytes:
+        return await self._call(self._render, index)
+
+    async def _call(self, fn: Any, *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
+
+    def _open(self) -> int:
+        import fitz
+
+        self._doc = fitz.open(stream=self._raw_bytes, filetype="pdf")
+        return len(self._doc)
+
+    def _render(self, index: int) -> bytes:
+        import fitz
+
+        mat = fitz.Matrix(self._dpi / 72, self._dpi / 72)
+        pix = self._doc[index].get_pixmap(matrix=mat)
+        try:
+            return pix.tobytes("png")
+        finally:
+            pix = None  # Free pixmap memory immediately
+
+    def _close(self) -> None:
+        if self._doc is not None:
+            self._doc.close()
+            self._doc = None
@@ -17,6 +17,7 @@ from langchain_core.messages import (
     SystemMessage,
     ToolMessage,
 )
+from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import BaseTool, tool
 from langgraph.graph import END, START, MessagesState, StateGraph
 from langgraph.prebuilt import ToolNode
@@ -31,6 +32,11 @@ from src.infrastructure.langgraph.tools import RAGQueryTool
 from src.infrastructure.langgraph.dm_image_query_tool import (
     DmImageQueryTool,
 )
+from src.infrastructure.langgraph.react_graph_cache import (
+    ReActGraphCache,
+    ReActRunContext,
+    graph_cache_key,
+)
 from src.infrastructure.langgraph.transfer_to_human_tool import (
     TransferToHumanTool,
 )
@@ -38,6 +44,7 @@ from src.infrastructure.langgraph.usage import (
     build_usage_event,
     extract_usage_from_langchain_messages,
 )
+from src.infrastructure.llm.chat_model_pool import ChatModelClientPool
 from src.infrastructure.llm.dynamic_llm_factory import DynamicLLMServiceProxy
 from src.application.agent.tool_label_resolver import resolve_tool_label
 from src.infrastructure.observability.agent_trace_collector import (
@@ -86,6 +93,8 @@ class ReActAgentService(AgentService):
         cached_tool_loader: Any | None = None,
         dm_image_query_tool: DmImageQueryTool | None = None,
         transfer_to_human_tool: TransferToHumanTool | None = None,
+        graph_cache: ReActGraphCache | None = None,
+        chat_model_pool: ChatModelClientPool | None = None,
     ) -> None:
         self._llm_service = llm_service
         self._rag_tool = rag_tool
@@ -93,6 +102,10 @@ class ReActAgentService(AgentService):
         self._cached_tool_loader = cached_tool_loader
         self._dm_image_query_tool = dm_image_query_tool
         self._transfer_to_human_tool = transfer_to_human_tool
+        # Container 注入 process-wide cache；未注入時退化為 per-instance
+        self._graph_cache = graph_cache or ReActGraphCache()
+        # 未注入時每則訊息 new ChatModel（含新的 HTTP client）
+        self._chat_model_pool = chat_model_pool
 
     def _build_rag_lc_tool(
         self,
@@ -351,6 +364,11 @@ class ReActAgentService(AgentService):
             )
         return tools
 
+    @staticmethod
+    def _model_key(llm_params: dict[str, Any] | None) -> str:
+        params = llm_params or {}
+        return f"{params.get('provider_name', '')}:{params.get('model', '')}"
+
     async def _resolve_llm_model(
         self, llm_params: dict[str, Any] | None
     ) -> Any:
@@ -368,6 +386,12 @@ class ReActAgentService(AgentService):
             )
             # Try to get a LangChain ChatModel from the service
             if hasattr(service, "get_chat_model"):
+                if self._chat_model_pool is not None:
+                    return service.get_chat_model(
+                        temperature=temperature,
+                        max_tokens=max_tokens,
+                        pool=self._chat_model_pool,
+                    )
                 return service.get_chat_model(
                     temperature=temperature, max_tokens=max_tokens,
                 )
@@ -378,6 +402,7 @@ class ReActAgentService(AgentService):
             model=model,
             temperature=temperature,
             max_tokens=max_tokens,
+            pool=self._chat_model_pool,
         )
 
     @staticmethod
@@ -386,8 +411,33 @@ class ReActAgentService(AgentService):
         model: str,
         temperature: float = 0.7,
         max_tokens: int = 1024,
+        pool: ChatModelClientPool | None = None,
     ) -> Any:
         """Create a LangChain ChatModel from provider and model name."""
+        import os
+
+        if pool is not None:
+            # api_key 空字串 → SDK 自行讀 OPENAI_API_KEY / ANTHROPIC_API_KEY
+            anthropic = provider in ("anthropic", "claude")
+            return pool.get_chat_model(
+                provider=provider,
+                model=model,
+                api_key=(
+                    os.getenv("ANTHROPIC_API_KEY", "")
+                    if anthropic
+                    else os.getenv("OPENAI_API_KEY", "")
+                ),
+                base_url=(
+                    ""
+                    if anthropic
+                    else os.getenv("OPENAI_API_BASE")
+                    or os.getenv("OPENAI_BASE_URL")
+                    or ""
+                ),
+                temperature=temperature,
+                max_tokens=max_tokens,
+            )
+
         if provider in ("anthropic", "claude"):
             from langchain_anthropic import ChatAnthropic
             return ChatAnthropic(
@@ -397,8 +447,6 @@ class ReActAgentService(AgentService):
             )
 
         # Default to OpenAI-compatible
-        import os
-
         from langchain_openai import ChatOpenAI
 
         from src.config import settings
@@ -424,24 +472,49 @@ class ReActAgentService(AgentService):
 
         return ChatOpenAI(**kwargs)
 
-    def _build_react_graph(
+    def _prepare_react_graph(
         self,
         tools: list[BaseTool],
         system_prompt: str | None,
         llm: Any,
         max_tool_calls: int,
-    ) -> Any:
-        """Build a ReAct StateGraph with agent ↔ tools loop."""
-        import time
+        *,
+        bot_id: str = "",
+        model_key: str = "",
+    ) -> tuple[Any, dict[str, Any]]:
+        """取得（或編譯）ReAct graph template，回傳 (graph, run config)。
 
-        model_with_tools = llm.bind_tools(tools)
-        call_count = 0
-        # Track last agent_llm node_id for parent linking
-        last_agent_node_id: str = ""
+        graph 由 ``ReActGraphCache`` 依 (bot_id, tool signature, model,
+        max_tool_calls) 共用；本次 request 的 tools / llm / prompt 放在回傳的
+        config 裡，呼叫端需原樣傳給 ``ainvoke`` / ``astream``。
+        """
+        template = self._graph_cache.get_or_build(
+            graph_cache_key(bot_id, tools, model_key, max_tool_calls),
+            self._build_react_graph,
+        )
+        run = ReActRunContext(
+            model_with_tools=template.bind_tools(llm, tools),
+            tool_node=ToolNode(tools, handle_tool_errors=True),
+            system_prompt=system_prompt,
+            max_tool_calls=max_tool_calls,
+        )
+        return template.graph, {"configurable": {"react_run": run}}
 
-        async def agent_node(state: MessagesState) -> dict:
-            nonlocal call_count, last_agent_node_id
-            call_count += 1
+    @staticmethod
+    def _build_react_graph() -> Any:
+        """Build a ReAct StateGraph with agent ↔ tools loop.
+
+        Node 不 closure 捕捉任何 per-request state，一律從
+        ``config["configurable"]["react_run"]`` 讀 ``ReActRunContext``。
+        """
+        import time
+
+        async def agent_node(
+            state: MessagesState, config: RunnableConfig
+        ) -> dict:
+            run: ReActRunContext = config["configurable"]["react_run"]
+            run.call_count += 1
+            call_count = run.call_count
             t0 = time.monotonic()
             trace_start_ms = AgentTraceCollector.offset_ms()
 
@@ -461,9 +534,9 @@ class ReActAgentService(AgentService):
                 message_count=len(messages),
             )
 
-            if system_prompt:
-                messages = [SystemMessage(content=system_prompt)] + messages
-            response = await model_with_tools.ainvoke(messages)
+            if run.system_prompt:
+                messages = [SystemMessage(content=run.system_prompt)] + messages
+            response = await run.model_with_tools.ainvoke(messages)
 
             elapsed_ms = round((time.monotonic() - t0) * 1000, 1)
             trace_end_ms = AgentTraceCollector.offset_ms()
@@ -512,7 +585,7 @@ class ReActAgentService(AgentService):
                     elapsed_ms=elapsed_ms,
                     tool_calls=tc_summary,
                 )
-                last_agent_node_id = AgentTraceCollector.add_node(
+                run.last_agent_node_id = AgentTraceCollector.add_node(
                     node_type="agent_llm",
                     label=f"ReAct 迭代 {call_count}",
                     parent_id=None,
@@ -539,7 +612,7 @@ class ReActAgentService(AgentService):
                     elapsed_ms=elapsed_ms,
                     answer_preview=content_preview,
                 )
-                last_agent_node_id = AgentTraceCollector.add_node(
+                run.last_agent_node_id = AgentTraceCollector.add_node(
                     node_type="agent_llm",
                     label=f"ReAct 迭代 {call_count} (回覆)",
                     parent_id=None,
@@ -555,12 +628,11 @@ class ReActAgentService(AgentService):
 
             return {"messages": [response]}
 
-        _tool_node = ToolNode(tools, handle_tool_errors=True)
-
-        async def tools_node(state: MessagesState) -> dict:
+        async def tools_node(
+            state: MessagesState, config: RunnableConfig
+        ) -> dict:
             """Wraps ToolNode with logging."""
-            import time
-
+            run: ReActRunContext = config["configurable"]["react_run"]
             t0 = time.monotonic()
             trace_start_ms = AgentTraceCollector.offset_ms()
             last_msg = state["messages"][-1]
@@ -588,7 +660,7 @@ class ReActAgentService(AgentService):
                 # Set as parent so inner nodes (RAG search, rerank) become children
                 AgentTraceCollector.set_tool_parent(nid)
 
-            result = await _tool_node.ainvoke(state)
+            result = await run.tool_node.ainvoke(state)
 
             elapsed_ms = round((time.monotonic() - t0) * 1000, 1)
             trace_end_ms = AgentTraceCollector.offset_ms()
@@ -629,15 +701,17 @@ class ReActAgentService(AgentService):
 
             return result
 
-        def should_continue(state: MessagesState) -> str:
-            nonlocal call_count
+        def should_continue(
+            state: MessagesState, config: RunnableConfig
+        ) -> str:
+            run: ReActRunContext = config["configurable"]["react_run"]
             last = state["messages"][-1]
             if not isinstance(last, AIMessage) or not last.tool_calls:
                 return END
-            if call_count >= max_tool_calls:
+            if run.call_count >= run.max_tool_calls:
                 logger.warning(
                     "react.max_tool_calls_reached",
-                    max_tool_calls=max_tool_calls,
+                    max_tool_calls=run.max_tool_calls,
                 )
                 return END
             return "tools"
@@ -744,8 +818,13 @@ class ReActAgentService(AgentService):
 
             # 4. Build and execute ReAct graph
             assembled_prompt = system_prompt or assemble_prompt("", "react")
-            graph = self._build_react_graph(
-                tools, assembled_prompt, llm, max_tool_calls
+            graph, run_config = self._prepare_react_graph(
+                tools,
+                assembled_prompt,
+                llm,
+                max_tool_calls,
+                bot_id=bot_id,
+                model_key=self._model_key(llm_params),
             )
 
             # Build input messages
@@ -764,7 +843,9 @@ class ReActAgentService(AgentService):
                 mcp_server_count=len(mcp_servers or []),
             )
 
-            result = await graph.ainvoke({"messages": input_messages})
+            result = await graph.ainvoke(
+                {"messages": input_messages}, config=run_config
+            )
 
             # Trace: final_response node
             end_ms = AgentTraceCollector.offset_ms()
@@ -892,8 +973,13 @@ class ReActAgentService(AgentService):
 
             llm = await self._resolve_llm_model(llm_params)
             assembled_prompt = system_prompt or assemble_prompt("", "react")
-            graph = self._build_react_graph(
-                tools, assembled_prompt, llm, max_tool_calls
+            graph, run_config = self._prepare_react_graph(
+                tools,
+                assembled_prompt,
+                llm,
+                max_tool_calls,
+                bot_id=bot_id,
+                model_key=self._model_key(llm_params),
             )
 
             input_messages: list = []
@@ -988,6 +1074,7 @@ class ReActAgentService(AgentService):
                 async with asyncio.timeout(_settings.agent_stream_timeout):
                     async for event in graph.astream(
                         {"messages": input_messages},
+                        config=run_config,
                         stream_mode=["messages", "updates"],
                     ):
                         mode, data = event
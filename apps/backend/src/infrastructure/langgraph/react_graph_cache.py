@@ -0,0 +1,147 @@
+"""ReActGraphCache — 已編譯 ReAct graph template 的 bounded LRU。
+
+``StateGraph`` 建構 + ``compile()`` 每則訊息約數 ms CPU，但 graph 結構對同一個
+bot 永遠一樣。template 的 node 不再 closure 捕捉 tools / llm / system prompt /
+call_count，改由每次 ``ainvoke`` / ``astream`` 的
+``config["configurable"]["react_run"]``（``ReActRunContext``）帶入，所以編譯
+結果可跨 request 共用。
+
+Key = (bot_id, tool signature, provider:model, max_tool_calls)。tool signature
+含 name + description hash：MCP server 改了 tool 說明就換 key。template 另外
+保存 ``llm.bind_tools`` 產生的 binding kwargs（tool schema 轉換結果），同 key
+的下一則訊息直接 ``llm.bind(**kwargs)``，不再重轉 schema。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from langchain_core.runnables import RunnableBinding
+from langchain_core.tools import BaseTool
+
+GraphKey = tuple[str, tuple[tuple[str, str], ...], str, int]
+
+
+@dataclass
+class ReActRunContext:
+    """單次 ReAct 執行的 per-request state（經 graph config 傳入 node）。"""
+
+    model_with_tools: Any
+    tool_node: Any
+    system_prompt: str | None
+    max_tool_calls: int
+    call_count: int = 0
+    last_agent_node_id: str = ""
+
+
+@dataclass
+class ReActGraphTemplate:
+    graph: Any
+    # llm.bind_tools(...) 的 kwargs（依 llm 類別）；非標準 RunnableBinding
+    # （例如 test fake）不快取，每次 request 自行 bind_tools
+    tool_bind_kwargs: dict[type, dict[str, Any]] = field(default_factory=dict)
+    created_at: float = field(default_factory=time.time)
+
+    def bind_tools(self, llm: Any, tools: list[BaseTool]) -> Any:
+        kwargs = self.tool_bind_kwargs.get(type(llm))
+        if kwargs is not None:
+            return llm.bind(**kwargs)
+        bound = llm.bind_tools(tools)
+        if (
+            isinstance(bound, RunnableBinding)
+            and bound.bound is llm
+            and not bound.config
+        ):
+            self.tool_bind_kwargs[type(llm)] = dict(bound.kwargs)
+        return bound
+
+
+def tool_signature(tools: list[BaseTool]) -> tuple[tuple[str, str], ...]:
+    return tuple(
+        (
+            t.name,
+            hashlib.sha1(
+                (t.description or "").encode("utf-8"), usedforsecurity=False
+            ).hexdigest()[:12],
+        )
+        for t in tools
+    )
+
+
+def graph_cache_key(
+    bot_id: str,
+    tools: list[BaseTool],
+    model: str,
+    max_tool_calls: int,
+) -> GraphKey:
+    return (bot_id, tool_signature(tools), model, max_tool_calls)
+
+
+class ReActGraphCache:
+    def __init__(self, max_entries: int = 256) -> None:
+        self._max_entries = max_entries
+        self._templates: OrderedDict[GraphKey, ReActGraphTemplate] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.build_ms_total = 0.0
+
+    def get_or_build(
+        self, key: GraphKey, build: Callable[[], Any]
+    ) -> ReActGraphTemplate:
+        with self._lock:
+            template = self._templates.get(key)
+            if template is not None:
+                self._templates.move_to_end(key)
+                self.hits += 1
+                return template
+            self.misses += 1
+
+        t0 = time.perf_counter()
+        template = ReActGraphTemplate(graph=build())
+        build_ms = (time.perf_counter() - t0) * 1000
+
+        with self._lock:
+            self.build_ms_total += build_ms
+            if self._max_entries <= 0:
+                return template
+            # 並發 miss 時以先放進去的為準
+            existing = self._templates.get(key)
+            if existing is not None:
+                return existing
+            self._templates[key] = template
+            while len(self._templates) > self._max_entries:
+                self._templates.popitem(last=False)
+                self.evictions += 1
+        return template
+
+    def invalidate_bot(self, bot_id: str) -> int:
+        with self._lock:
+            stale = [k for k in self._templates if k[0] == bot_id]
+            for k in stale:
+                del self._templates[k]
+        return len(stale)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._templates),
+                "max_entries": self._max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "avg_build_ms": (
+                    round(self.build_ms_total / self.misses, 3)
+                    if self.misses
+                    else 0.0
+                ),
+            }
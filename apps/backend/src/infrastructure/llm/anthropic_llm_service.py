@@ -2,6 +2,7 @@
 
 import time
 from collections.abc import AsyncIterator
+from typing import TYPE_CHECKING
 
 import httpx
 
@@ -10,6 +11,9 @@ from src.domain.rag.services import LLMService
 from src.domain.rag.value_objects import LLMResult
 from src.infrastructure.logging import get_logger
 
+if TYPE_CHECKING:
+    from src.infrastructure.llm.chat_model_pool import ChatModelClientPool
+
 logger = get_logger(__name__)
 
 
@@ -36,8 +40,21 @@ class AnthropicLLMService(LLMService):
         self,
         temperature: float = 0.7,
         max_tokens: int = 1024,
+        pool: "ChatModelClientPool | None" = None,
     ):
-        """Return a LangChain ChatModel using the same API key."""
+        """Return a LangChain ChatModel using the same API key.
+
+        帶 pool 時共用 pooled SDK client，只套 per-request 參數。
+        """
+        if pool is not None:
+            return pool.get_chat_model(
+                provider="anthropic",
+                model=self._model,
+                api_key=self._api_key,
+                temperature=temperature,
+                max_tokens=max_tokens,
+            )
+
         from langchain_anthropic import ChatAnthropic
 
         return ChatAnthropic(
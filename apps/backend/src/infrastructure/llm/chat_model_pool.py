@@ -0,0 +1,335 @@
+"""ChatModelClientPool — process-wide pooled LangChain chat model clients.
+
+ReAct 每則訊息都 new 一個 ``ChatOpenAI`` / ``ChatAnthropic``，各自帶一個新的
+httpx client；打 LiteLLM proxy 時每則訊息都重新 TCP + TLS handshake。
+
+Pool 以 (provider family, base_url, api_key fingerprint) 為 key，同 key 下
+每個 model 只建一個 base chat model。OpenAI-compatible（含 LiteLLM）共用一個
+instrumented ``httpx.AsyncClient``，可觀測 connection reuse；anthropic SDK
+不接受外部 httpx client，改為共用 base model 的 SDK client。
+
+per-request 的 temperature / max_tokens 用 ``model_copy(update=...)`` 套上：
+淺拷貝共用 base model 的 SDK client（連帶共用 connection pool），不建新
+client。``model_copy`` 不跑 validator，所以 temperature 另外經過 model class
+自己的 ``validate_temperature``（gpt-5 / o-series 不接受非預設 temperature，
+直接建構時會被拿掉），pooled 與直接建構送出的 payload 一致。
+
+不用 ``.bind(temperature=...)``：回傳的 ``RunnableBinding`` 再
+``bind_tools`` 會丟掉先前 bind 的參數，也會讓 ReAct graph cache 以
+``type(llm)`` 快取 tool binding kwargs 的機制失效。
+
+Process-wide：跟 ``EmbeddingClientRegistry`` 一樣放在 module level
+（``get_chat_model_pool``），不跟 Container 生命週期。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+
+from src.infrastructure.embedding.embedding_client_registry import (
+    InstrumentedTransport,
+    api_key_fingerprint,
+    http2_available,
+)
+from src.infrastructure.logging import get_logger
+
+logger = get_logger(__name__)
+
+_ANTHROPIC_PROVIDERS = ("anthropic", "claude")
+
+PoolKey = tuple[str, str, str]
+
+
+def provider_family(provider: str) -> str:
+    return "anthropic" if provider in _ANTHROPIC_PROVIDERS else "openai"
+
+
+@dataclass(frozen=True)
+class ChatModelPoolConfig:
+    max_connections: int = 50
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 60.0
+    http2: bool = True
+    timeout: float = 120.0
+    max_retries: int = 3
+
+
+def _request_params(base: Any, temperature: float, max_tokens: int) -> dict[str, Any]:
+    """per-request 參數，temperature 跑過 model class 的正規化。"""
+    params: dict[str, Any] = {"temperature": temperature, "max_tokens": max_tokens}
+    normalise = getattr(type(base), "validate_temperature", None)
+    if normalise is None:
+        return params
+    values = normalise(
+        {
+            "model": getattr(base, "model_name", ""),
+            "reasoning_effort": getattr(base, "reasoning_effort", None),
+            "reasoning": getattr(base, "reasoning", None),
+            "temperature": temperature,
+        }
+    )
+    params["temperature"] = values.get("temperature")
+    return params
+
+
+class _PooledClient:
+    def __init__(
+        self,
+        family: str,
+        base_url: str,
+        fingerprint: str,
+        client: httpx.AsyncClient | None,
+        transport: InstrumentedTransport | None,
+    ) -> None:
+        self.family = family
+        self.base_url = base_url
+        self.fingerprint = fingerprint
+        self.client = client
+        self.transport = transport
+        self.models: dict[str, Any] = {}
+        self.created_at = time.time()
+
+    def stats(self) -> dict[str, Any]:
+        stats: dict[str, Any] = {
+            "provider": self.family,
+            "base_url": self.base_url,
+            "api_key_fingerprint": self.fingerprint,
+            "models": sorted(self.models),
+            "instrumented": self.transport is not None,
+            "created_at": self.created_at,
+        }
+        if self.transport is None:
+            return stats
+        in_use, idle = self.transport.pool_counts()
+        requests = self.transport.requests_total
+        connects = self.transport.connects_total
+        stats.update(
+            in_use=in_use,
+            idle=idle,
+            requests_total=requests,
+            connects_total=connects,
+            tls_handshakes_total=self.transport.tls_handshakes_total,
+            connection_reuse_ratio=(
+                round(1 - connects / requests, 4) if requests else 0.0
+            ),
+        )
+        return stats
+
+
+class ChatModelClientPool:
+    """(provider family, base_url, api_key fingerprint) → pooled chat models。"""
+
+    def __init__(self, config: ChatModelPoolConfig | None = None) -> None:
+        self._config = config or ChatModelPoolConfig()
+        self._http2 = self._config.http2 and http2_available()
+        self._entries: dict[PoolKey, _PooledClient] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.rebuilds_total = 0
+        # 退役中的 client：id(client) → (close timer, client)
+        self._retiring: dict[int, tuple[asyncio.TimerHandle, httpx.AsyncClient]] = {}
+        self._close_tasks: set[asyncio.Task[None]] = set()
+
+    def configure(self, config: ChatModelPoolConfig) -> None:
+        """更新 pool 參數；只影響之後新建的 client。"""
+        self._config = config
+        self._http2 = config.http2 and http2_available()
+
+    def get_chat_model(
+        self,
+        provider: str,
+        model: str,
+        api_key: str = "",
+        base_url: str = "",
+        temperature: float = 0.7,
+        max_tokens: int = 1024,
+    ) -> Any:
+        family = provider_family(provider)
+        with self._lock:
+            entry = self._get_entry(family, base_url, api_key)
+            base = entry.models.get(model)
+            if base is None:
+                self.misses += 1
+                base = self._build_model(entry, model, api_key)
+                entry.models[model] = base
+            else:
+                self.hits += 1
+        return base.model_copy(
+            update=_request_params(base, temperature, max_tokens)
+        )
+
+    def _get_entry(self, family: str, base_url: str, api_key: str) -> _PooledClient:
+        fingerprint = api_key_fingerprint(api_key)
+        key = (family, base_url, fingerprint)
+        entry = self._entries.get(key)
+        if entry is not None:
+            return entry
+
+        # 同一 (family, base_url) slot 換了 key（admin 改 provider 設定）→ 退役舊 client
+        for stale_key in [k for k in self._entries if k[:2] == (family, base_url)]:
+            self._retire(self._entries.pop(stale_key))
+
+        cfg = self._config
+        client: httpx.AsyncClient | None = None
+        transport: InstrumentedTransport | None = None
+        if family == "openai":
+            transport = InstrumentedTransport(
+                http2=self._http2,
+                limits=httpx.Limits(
+                    max_connections=cfg.max_connections,
+                    max_keepalive_connections=cfg.max_keepalive_connections,
+                    keepalive_expiry=cfg.keepalive_expiry,
+                ),
+            )
+            client = httpx.AsyncClient(transport=transport, timeout=cfg.timeout)
+        entry = _PooledClient(family, base_url, fingerprint, client, transport)
+        self._entries[key] = entry
+        self.rebuilds_total += 1
+        logger.info(
+            "chat_model_pool.client_built",
+            provider=family,
+            base_url=base_url,
+            api_key_fingerprint=fingerprint,
+            http2=self._http2,
+        )
+        return entry
+
+    def _build_model(self, entry: _PooledClient, model: str, api_key: str) -> Any:
+        cfg = self._config
+        if entry.family == "anthropic":
+            from langchain_anthropic import ChatAnthropic
+
+            kwargs: dict[str, Any] = {
+                "model": model or "claude-sonnet-4-20250514",
+                "max_retries": cfg.max_retries,
+                "default_request_timeout": cfg.timeout,
+            }
+            if api_key:
+                kwargs["api_key"] = api_key
+            if entry.base_url:
+                kwargs["base_url"] = entry.base_url
+            chat = ChatAnthropic(**kwargs)
+            # anthropic SDK 不接受外部 httpx client（無法 instrument）；先觸發
+            # ``_async_client`` cached_property，model_copy 會連同 __dict__
+            # 帶過去，所有 copy 共用同一個 SDK client / connection pool
+            _ = chat._async_client
+            return chat
+
+        from langchain_openai import ChatOpenAI
+
+        kwargs = {
+            "model": model or "gpt-4o-mini",
+            "request_timeout": cfg.timeout,
+            # 對 LiteLLM connection / DNS flake 做重試，避免 webhook timeout
+            "max_retries": cfg.max_retries,
+            # streaming 時最後一個 chunk 帶 usage（token_usage_records 需要）
+            "stream_usage": True,
+            "http_async_client": entry.client,
+        }
+        if api_key:
+            kwargs["api_key"] = api_key
+        if entry.base_url:
+            kwargs["base_url"] = entry.base_url
+        return ChatOpenAI(**kwargs)
+
+    def _retire(self, entry: _PooledClient) -> None:
+        """延後到 request timeout 後才 close，in-flight request 不被打斷。"""
+        logger.info(
+            "chat_model_pool.client_retired",
+            provider=entry.family,
+            base_url=entry.base_url,
+            api_key_fingerprint=entry.fingerprint,
+        )
+        client = entry.client
+        if client is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        handle = loop.call_later(
+            self._config.timeout, self._schedule_close, loop, client
+        )
+        self._retiring[id(client)] = (handle, client)
+
+    def _schedule_close(
+        self, loop: asyncio.AbstractEventLoop, client: httpx.AsyncClient
+    ) -> None:
+        self._retiring.pop(id(client), None)
+        task = loop.create_task(client.aclose())
+        self._close_tasks.add(task)
+        task.add_done_callback(self._on_close_done)
+
+    def _on_close_done(self, task: asyncio.Task[None]) -> None:
+        self._close_tasks.discard(task)
+        if task.cancelled():
+            return
+        exc = task.exception()
+        if exc is not None:
+            logger.warning(
+                "chat_model_pool.close_failed",
+                error=str(exc),
+                exc_info=(type(exc), exc, exc.__traceback__),
+            )
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            clients = [e.stats() for e in self._entries.values()]
+            hits, misses = self.hits, self.misses
+        requests = sum(c.get("requests_total", 0) for c in clients)
+        connects = sum(c.get("connects_total", 0) for c in clients)
+        return {
+            "http2": self._http2,
+            "max_connections": self._config.max_connections,
+            "max_keepalive_connections": self._config.max_keepalive_connections,
+            "keepalive_expiry": self._config.keepalive_expiry,
+            "model_hits": hits,
+            "model_misses": misses,
+            "rebuilds_total": self.rebuilds_total,
+            "requests_total": requests,
+            "connects_total": connects,
+            "connection_reuse_ratio": (
+                round(1 - connects / requests, 4) if requests else 0.0
+            ),
+            "clients": clients,
+        }
+
+    async def aclose(self) -> None:
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        clients = [e.client for e in entries if e.client is not None]
+        # 還在等 timeout 的退役 client 不再等，直接一起 close
+        for handle, client in self._retiring.values():
+            handle.cancel()
+            clients.append(client)
+        self._retiring.clear()
+        for client in clients:
+            try:
+                await client.aclose()
+            except Exception:
+                logger.warning("chat_model_pool.close_failed", exc_info=True)
+        if self._close_tasks:
+            await asyncio.gather(*self._close_tasks, return_exceptions=True)
+
+
+_pool: ChatModelClientPool | None = None
+
+
+def get_chat_model_pool(
+    config: ChatModelPoolConfig | None = None,
+) -> ChatModelClientPool:
+    """Process-wide singleton；帶 config 時更新 pool 參數（只影響之後新建的 client）。"""
+    global _pool
+    if _pool is None:
+        _pool = ChatModelClientPool(config)
+    elif config is not None:
+        _pool.configure(config)
+    return _pool
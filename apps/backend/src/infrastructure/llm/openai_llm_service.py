@@ -2,6 +2,7 @@
 
 import time
 from collections.abc import AsyncIterator
+from typing import TYPE_CHECKING
 
 import httpx
 
@@ -10,6 +11,9 @@ from src.domain.rag.services import LLMService
 from src.domain.rag.value_objects import LLMResult
 from src.infrastructure.logging import get_logger
 
+if TYPE_CHECKING:
+    from src.infrastructure.llm.chat_model_pool import ChatModelClientPool
+
 logger = get_logger(__name__)
 
 
@@ -45,8 +49,26 @@ class OpenAILLMService(LLMService):
         self,
         temperature: float = 0.7,
         max_tokens: int = 1024,
+        pool: "ChatModelClientPool | None" = None,
     ):
-        """Return a LangChain ChatModel using the same API key and base_url."""
+        """Return a LangChain ChatModel using the same API key and base_url.
+
+        帶 pool 時共用 pooled HTTP client，只套 per-request 參數。
+        """
+        if pool is not None:
+            return pool.get_chat_model(
+                provider="openai",
+                model=self._model,
+                api_key=self._api_key,
+                base_url=(
+                    self._base_url
+                    if self._base_url != "https://api.openai.com/v1"
+                    else ""
+                ),
+                temperature=temperature,
+                max_tokens=max_tokens,
+            )
+
         from langchain_openai import ChatOpenAI
 
         from src.config import settings
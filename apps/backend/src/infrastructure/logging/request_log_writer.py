@@ -4,6 +4,7 @@ import uuid
 
 import structlog
 
+from src.infrastructure.db.batch_writer import current_batch_writer
 from src.infrastructure.db.engine import async_session_factory
 from src.infrastructure.db.models.request_log_model import RequestLogModel
 
@@ -20,20 +21,27 @@ async def write_request_log(
     tenant_id: str | None = None,
     error_detail: str | None = None,
 ) -> None:
-    """Persist a single request log entry. Swallows all errors."""
+    """Persist a single request log entry. Swallows all errors.
+
+    BatchWriter 啟用時只入列（批次寫入，queue 滿時丟棄並計數）。
+    """
     try:
+        row = RequestLogModel(
+            id=uuid.uuid4().hex,
+            request_id=request_id,
+            method=method,
+            path=path,
+            status_code=status_code,
+            elapsed_ms=round(elapsed_ms, 1),
+            trace_steps=trace_steps,
+            tenant_id=tenant_id,
+            error_detail=error_detail,
+        )
+        writer = current_batch_writer()
+        if writer is not None:
+            writer.offer(row)
+            return
         async with async_session_factory() as session:
-            row = RequestLogModel(
-                id=uuid.uuid4().hex,
-                request_id=request_id,
-                method=method,
-                path=path,
-                status_code=status_code,
-                elapsed_ms=round(elapsed_ms, 1),
-                trace_steps=trace_steps,
-                tenant_id=tenant_id,
-                error_detail=error_detail,
-            )
             session.add(row)
             await session.commit()
     except Exception:
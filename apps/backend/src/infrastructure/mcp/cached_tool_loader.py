@@ -1,7 +1,8 @@
 """MCP Tool Loader — 載入 MCP Server 工具
 
-每次 ReAct 呼叫時建立新的 MCP session，
-session 生命週期由呼叫端的 AsyncExitStack 管理。
+注入 ``McpSessionPool`` 時，從 pool 借用長連線 session（tool schema 亦有快取），
+lease 在呼叫端的 AsyncExitStack 結束時歸還；未注入時維持舊行為：每次 ReAct
+呼叫建立新的 MCP session，生命週期由 AsyncExitStack 管理。
 支援 HTTP (streamable) 和 stdio 兩種 transport。
 """
 
@@ -10,12 +11,17 @@ from contextlib import AsyncExitStack
 import structlog
 from langchain_core.tools import BaseTool
 
+from src.infrastructure.mcp.mcp_session_pool import McpSessionPool
+
 logger = structlog.get_logger(__name__)
 
 
 class CachedMCPToolLoader:
     """MCP 工具載入器（保留類名以相容 DI Container）"""
 
+    def __init__(self, pool: McpSessionPool | None = None) -> None:
+        self._pool = pool
+
     async def load_tools(
         self,
         stack: AsyncExitStack,
@@ -36,8 +42,39 @@ class CachedMCPToolLoader:
         if isinstance(server_config, str):
             server_config = {"url": server_config, "transport": "http"}
 
+        if self._pool is not None:
+            return await self._lease_from_pool(
+                stack, server_config, enabled_tools
+            )
         return await self._connect_and_load(stack, server_config, enabled_tools)
 
+    async def _lease_from_pool(
+        self,
+        stack: AsyncExitStack,
+        server_config: dict,
+        enabled_tools: list[str] | None = None,
+    ) -> list[BaseTool]:
+        """向 pool 借 session；stack 結束時歸還（不關閉連線）。"""
+        assert self._pool is not None
+        try:
+            all_tools = await stack.enter_async_context(
+                self._pool.lease(server_config)
+            )
+        except Exception as exc:
+            logger.warning(
+                "mcp_loader.connect_failed",
+                transport=server_config.get("transport", "http"),
+                server_config={
+                    k: v for k, v in server_config.items() if k != "env"
+                },
+                error=str(exc),
+                pooled=True,
+            )
+            return []
+        if enabled_tools:
+            return [t for t in all_tools if t.name in enabled_tools]
+        return list(all_tools)
+
     @staticmethod
     async def _connect_and_load(
         stack: AsyncExitStack,
@@ -103,5 +140,10 @@ class CachedMCPToolLoader:
             )
             return []
 
-    def invalidate(self, server_url: str | None = None) -> None:
-        """No-op — kept for API compatibility."""
+    async def invalidate(self, server_url: str | None = None) -> None:
+        """關閉 pool 中該 server 的閒置 session 並清 tool schema 快取。"""
+        if self._pool is not None:
+            await self._pool.invalidate(server_url)
+
+    def stats(self) -> dict:
+        return self._pool.stats() if self._pool is not None else {"pooled": False}
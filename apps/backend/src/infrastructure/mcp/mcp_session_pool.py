@@ -0,0 +1,397 @@
+"""McpSessionPool — process-wide 長連線 MCP ClientSession pool。
+
+過去每則 ReAct 訊息都重新 connect → ``session.initialize()`` →
+``load_mcp_tools``（stdio server 等於每則訊息 spawn 一個 subprocess）。
+Pool 以 server config（transport / url / command / args / env hash）為 key：
+
+- 每個 server 最多 ``max_sessions_per_server`` 條 session；優先給閒置的，
+  全忙且已達上限時與最不忙的共用（MCP JSON-RPC 本身可多工）
+- tool schema（``list_tools`` 結果）以 server 為 key 快取 ``tool_ttl_seconds``；
+  每條 session 只在 schema 版本變動時重新轉成 LangChain tool
+- lease 時若 session 閒置超過 ``health_check_interval``，先 ``send_ping``；
+  失敗或背景 task 已結束就關掉重連
+- 閒置超過 ``idle_ttl_seconds`` 的 session 在下次 acquire / release 時回收
+
+transport / ClientSession 是 anyio context manager，必須在同一個 task 進出，
+所以每條 session 跑在自己的背景 task，關閉時由該 task 自行退出。
+
+Process-wide：arq worker 每個 job 都 new Container，pool 放在 module level
+（``get_mcp_session_pool``）。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections.abc import AsyncIterator
+from contextlib import AsyncExitStack, asynccontextmanager
+from dataclasses import dataclass
+from typing import Any
+
+import structlog
+from langchain_core.tools import BaseTool
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class McpPoolConfig:
+    max_sessions_per_server: int = 4
+    idle_ttl_seconds: float = 300.0
+    tool_ttl_seconds: float = 300.0
+    health_check_interval: float = 30.0
+    connect_timeout: float = 15.0
+
+
+def server_key(server_config: dict[str, Any]) -> str:
+    """Pool key；env 可能含 secret，只進 hash 不進 log。"""
+    identity = {
+        "transport": server_config.get("transport", "http"),
+        "url": server_config.get("url", ""),
+        "command": server_config.get("command", ""),
+        "args": list(server_config.get("args") or []),
+        "env": dict(sorted((server_config.get("env") or {}).items())),
+    }
+    raw = json.dumps(identity, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def _describe(server_config: dict[str, Any]) -> dict[str, Any]:
+    return {k: v for k, v in server_config.items() if k != "env"}
+
+
+async def _open_transport(
+    stack: AsyncExitStack, server_config: dict[str, Any]
+) -> tuple[Any, Any]:
+    if server_config.get("transport", "http") == "stdio":
+        from mcp.client.stdio import StdioServerParameters, stdio_client
+
+        read, write = await stack.enter_async_context(
+            stdio_client(
+                StdioServerParameters(
+                    command=server_config["command"],
+                    args=server_config.get("args", []),
+                    env={**os.environ, **server_config.get("env", {})},
+                )
+            )
+        )
+        return read, write
+
+    from mcp.client.streamable_http import streamablehttp_client
+
+    read, write, _ = await stack.enter_async_context(
+        streamablehttp_client(server_config.get("url", ""))
+    )
+    return read, write
+
+
+async def _list_all_tools(session: Any) -> list[Any]:
+    tools: list[Any] = []
+    cursor: str | None = None
+    while True:
+        page = await session.list_tools(cursor=cursor)
+        tools.extend(page.tools)
+        cursor = getattr(page, "nextCursor", None)
+        if not cursor:
+            return tools
+
+
+class _PooledMcpSession:
+    """一條 MCP session，生命週期由自己的背景 task 持有。"""
+
+    def __init__(self, key: str, server_config: dict[str, Any]) -> None:
+        self.key = key
+        self.server_config = server_config
+        self.session: Any = None
+        self.in_use = 0
+        self.leases_total = 0
+        self.last_used = time.monotonic()
+        self.last_checked = time.monotonic()
+        self.tools: list[BaseTool] = []
+        self.tools_version = -1
+        self._loop = asyncio.get_running_loop()
+        self._ready: asyncio.Future[None] = self._loop.create_future()
+        self._closing = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def alive(self) -> bool:
+        return (
+            self._task is not None
+            and not self._task.done()
+            and not self._closing.is_set()
+            and self._loop is asyncio.get_running_loop()
+        )
+
+    async def start(self, timeout: float) -> None:
+        self._task = asyncio.create_task(self._run())
+        try:
+            await asyncio.wait_for(asyncio.shield(self._ready), timeout)
+        except BaseException:
+            await self.close()
+            raise
+
+    async def _run(self) -> None:
+        from mcp import ClientSession
+
+        try:
+            async with AsyncExitStack() as stack:
+                read, write = await _open_transport(stack, self.server_config)
+                session = await stack.enter_async_context(
+                    ClientSession(read, write)
+                )
+                await session.initialize()
+                self.session = session
+                self._ready.set_result(None)
+                await self._closing.wait()
+        except asyncio.CancelledError:
+            if not self._ready.done():
+                self._ready.cancel()
+            raise
+        except Exception as exc:
+            if not self._ready.done():
+                self._ready.set_exception(exc)
+                # start() 端會 await；這裡先標記避免 "exception never retrieved"
+                self._ready.exception()
+            else:
+                logger.warning(
+                    "mcp_pool.session_closed_by_error",
+                    server=_describe(self.server_config),
+                    error=str(exc),
+                )
+        finally:
+            self._closing.set()
+
+    async def ping(self, timeout: float) -> bool:
+        try:
+            await asyncio.wait_for(self.session.send_ping(), timeout)
+        except Exception:
+            return False
+        self.last_checked = time.monotonic()
+        return True
+
+    async def close(self) -> None:
+        self._closing.set()
+        task = self._task
+        if task is None or task.done():
+            return
+        if task.get_loop() is not asyncio.get_running_loop():
+            return  # 舊 event loop 留下的 session，無法在此 await
+        try:
+            await asyncio.wait_for(task, 5.0)
+        except (asyncio.TimeoutError, Exception):
+            task.cancel()
+
+
+class _ToolSchemaEntry:
+    def __init__(self, tools: list[Any], version: int) -> None:
+        self.tools = tools
+        self.version = version
+        self.loaded_at = time.monotonic()
+
+
+class McpSessionPool:
+    def __init__(self, config: McpPoolConfig | None = None) -> None:
+        self._config = config or McpPoolConfig()
+        self._sessions: dict[str, list[_PooledMcpSession]] = {}
+        self._schemas: dict[str, _ToolSchemaEntry] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._schema_version = 0
+        self.connects_total = 0
+        self.connect_failures = 0
+        self.leases_total = 0
+        self.reused_total = 0
+        self.health_check_failures = 0
+        self.evictions_total = 0
+        self.schema_loads_total = 0
+
+    def configure(self, config: McpPoolConfig) -> None:
+        self._config = config
+
+    @asynccontextmanager
+    async def lease(
+        self, server_config: dict[str, Any]
+    ) -> AsyncIterator[list[BaseTool]]:
+        """借一條 session，yield 綁定該 session 的 LangChain tools。"""
+        pooled = await self._acquire(server_config)
+        try:
+            tools = await self._tools_for(pooled)
+        except Exception:
+            pooled.in_use -= 1
+            await self._discard(pooled)
+            raise
+        try:
+            yield tools
+        finally:
+            pooled.in_use -= 1
+            pooled.last_used = time.monotonic()
+            await self._evict_idle()
+
+    async def _acquire(self, server_config: dict[str, Any]) -> _PooledMcpSession:
+        key = server_key(server_config)
+        await self._evict_idle()
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            sessions = self._sessions.setdefault(key, [])
+            for pooled in [s for s in sessions if not s.alive]:
+                sessions.remove(pooled)
+                await pooled.close()
+
+            pooled = min(
+                (s for s in sessions if s.in_use == 0),
+                key=lambda s: s.last_used,
+                default=None,
+            )
+            if pooled is not None and not await self._healthy(pooled):
+                sessions.remove(pooled)
+                await pooled.close()
+                pooled = None
+            if pooled is None and sessions and (
+                len(sessions) >= self._config.max_sessions_per_server
+            ):
+                pooled = min(sessions, key=lambda s: s.in_use)
+            if pooled is None:
+                pooled = await self._connect(key, server_config)
+                sessions.append(pooled)
+            else:
+                self.reused_total += 1
+
+            pooled.in_use += 1
+            pooled.leases_total += 1
+            self.leases_total += 1
+            return pooled
+
+    async def _healthy(self, pooled: _PooledMcpSession) -> bool:
+        idle_for = time.monotonic() - pooled.last_checked
+        if idle_for < self._config.health_check_interval:
+            return True
+        if await pooled.ping(self._config.health_check_interval):
+            return True
+        self.health_check_failures += 1
+        logger.warning(
+            "mcp_pool.health_check_failed",
+            server=_describe(pooled.server_config),
+        )
+        return False
+
+    async def _connect(
+        self, key: str, server_config: dict[str, Any]
+    ) -> _PooledMcpSession:
+        pooled = _PooledMcpSession(key, server_config)
+        t0 = time.perf_counter()
+        try:
+            await pooled.start(self._config.connect_timeout)
+        except Exception:
+            self.connect_failures += 1
+            raise
+        self.connects_total += 1
+        logger.info(
+            "mcp_pool.session_opened",
+            server=_describe(server_config),
+            latency_ms=int((time.perf_counter() - t0) * 1000),
+        )
+        return pooled
+
+    async def _tools_for(self, pooled: _PooledMcpSession) -> list[BaseTool]:
+        from langchain_mcp_adapters.tools import convert_mcp_tool_to_langchain_tool
+
+        entry = self._schemas.get(pooled.key)
+        if (
+            entry is None
+            or time.monotonic() - entry.loaded_at > self._config.tool_ttl_seconds
+        ):
+            self._schema_version += 1
+            entry = _ToolSchemaEntry(
+                await _list_all_tools(pooled.session), self._schema_version
+            )
+            self._schemas[pooled.key] = entry
+            self.schema_loads_total += 1
+        if pooled.tools_version != entry.version:
+            pooled.tools = [
+                convert_mcp_tool_to_langchain_tool(pooled.session, t)
+                for t in entry.tools
+            ]
+            pooled.tools_version = entry.version
+        return pooled.tools
+
+    async def _discard(self, pooled: _PooledMcpSession) -> None:
+        sessions = self._sessions.get(pooled.key, [])
+        if pooled in sessions:
+            sessions.remove(pooled)
+        self._schemas.pop(pooled.key, None)
+        await pooled.close()
+
+    def _drop_if_empty(self, key: str) -> None:
+        # acquire 持鎖連線中時 list 可能暫時為空，不能刪（會被 append 到孤兒 list）
+        lock = self._locks.get(key)
+        if not self._sessions.get(key) and not (lock and lock.locked()):
+            self._sessions.pop(key, None)
+
+    async def _evict_idle(self) -> None:
+        cutoff = time.monotonic() - self._config.idle_ttl_seconds
+        for key, sessions in list(self._sessions.items()):
+            for pooled in [
+                s for s in sessions if s.in_use == 0 and s.last_used < cutoff
+            ]:
+                sessions.remove(pooled)
+                self.evictions_total += 1
+                await pooled.close()
+            self._drop_if_empty(key)
+
+    async def invalidate(self, server_url: str | None = None) -> None:
+        """關閉符合 url 的閒置 session 並清 schema 快取；None = 全部。"""
+        for key, sessions in list(self._sessions.items()):
+            matched = [
+                s
+                for s in sessions
+                if server_url is None or s.server_config.get("url") == server_url
+            ]
+            if matched:
+                self._schemas.pop(key, None)
+            for pooled in matched:
+                if pooled.in_use == 0:
+                    sessions.remove(pooled)
+                    await pooled.close()
+                else:
+                    pooled.last_checked = 0.0  # 下次 lease 前強制 ping
+            self._drop_if_empty(key)
+
+    def stats(self) -> dict[str, Any]:
+        sessions = [s for group in self._sessions.values() for s in group]
+        return {
+            "servers": len(self._sessions),
+            "sessions": len(sessions),
+            "in_use": sum(s.in_use for s in sessions),
+            "max_sessions_per_server": self._config.max_sessions_per_server,
+            "leases_total": self.leases_total,
+            "reused_total": self.reused_total,
+            "connects_total": self.connects_total,
+            "connect_failures": self.connect_failures,
+            "health_check_failures": self.health_check_failures,
+            "evictions_total": self.evictions_total,
+            "schema_loads_total": self.schema_loads_total,
+        }
+
+    async def aclose(self) -> None:
+        groups = list(self._sessions.values())
+        self._sessions.clear()
+        self._schemas.clear()
+        for sessions in groups:
+            for pooled in sessions:
+                await pooled.close()
+
+
+_pool: McpSessionPool | None = None
+
+
+def get_mcp_session_pool(config: McpPoolConfig | None = None) -> McpSessionPool:
+    """Process-wide singleton；帶 config 時更新 pool 參數。"""
+    global _pool
+    if _pool is None:
+        _pool = McpSessionPool(config)
+    elif config is not None:
+        _pool.configure(config)
+    return _pool
@@ -0,0 +1,215 @@
+"""KnowledgeChangeNotifier — 向量寫入後通知「知識庫內容已變更」。
+
+會改動 ``kb_{kb_id}`` collection 的路徑很多（上傳 / 重新處理 / 刪文件 /
+單 chunk re-embed / 刪 KB / outbox handler），與其每個 use case 各自記得
+publish，不如包在 ``VectorStore`` 外層：寫入成功後 publish
+``knowledge_base:{kb_id}``，由 bus 分送給依 KB 內容快取結果的 consumer
+（semantic answer cache 等）。
+
+- 只有 ``kb_`` 開頭的 collection 會通知（conv summaries 等不算知識庫內容）
+- 寫入失敗（例外往外拋）不通知；publish 失敗只 log，不影響寫入結果
+- per kb_id 合併（``debounce_seconds`` > 0）：pipelined ingest 每批 upsert
+  都會寫一次，逐批 publish 會讓每個 replica 反覆清快取 / 標 dirty。窗口內
+  第一次寫入立即 publish，其後的寫入只記 pending，窗口結束時補一次
+  trailing publish；``flush()`` 在 job 結束 / shutdown 前把 pending 送出
+- VectorStore 以外的 Milvus 專屬方法（runtime_stats / aclose /
+  conv summary ...）經 ``__getattr__`` 轉給 inner
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from src.domain.rag.services import VectorStore
+from src.domain.rag.value_objects import SearchResult
+from src.domain.shared.config_invalidation import (
+    SCOPE_KNOWLEDGE_BASE,
+    ConfigInvalidationBus,
+)
+from src.infrastructure.logging import get_logger
+
+logger = get_logger(__name__)
+
+_KB_PREFIX = "kb_"
+
+
+class KnowledgeChangeNotifier(VectorStore):
+    def __init__(
+        self,
+        inner: VectorStore,
+        invalidation_bus: ConfigInvalidationBus,
+        debounce_seconds: float = 0.0,
+    ) -> None:
+        self._inner = inner
+        self._bus = invalidation_bus
+        self._debounce = debounce_seconds
+        # kb_id → 合併窗口結束的 timer；窗口內有寫入的 kb_id 記在 _pending
+        self._windows: dict[str, asyncio.TimerHandle] = {}
+        self._pending: set[str] = set()
+        self._publish_tasks: set[asyncio.Task[None]] = set()
+        self.notifications = 0
+        self.coalesced = 0
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._inner, name)
+
+    async def _notify(self, collection: str) -> None:
+        if not collection.startswith(_KB_PREFIX):
+            return
+        kb_id = collection[len(_KB_PREFIX):]
+        if self._debounce <= 0:
+            await self._publish(kb_id)
+            return
+        if kb_id in self._windows:
+            self._pending.add(kb_id)
+            self.coalesced += 1
+            return
+        self._open_window(kb_id)
+        await self._publish(kb_id)
+
+    def _open_window(self, kb_id: str) -> None:
+        self._windows[kb_id] = asyncio.get_running_loop().call_later(
+            self._debounce, self._close_window, kb_id
+        )
+
+    def _close_window(self, kb_id: str) -> None:
+        self._windows.pop(kb_id, None)
+        if kb_id not in self._pending:
+            return
+        self._pending.discard(kb_id)
+        # 持續寫入時每個窗口最多 publish 一次
+        self._open_window(kb_id)
+        task = asyncio.get_running_loop().create_task(self._publish(kb_id))
+        self._publish_tasks.add(task)
+        task.add_done_callback(self._publish_tasks.discard)
+
+    async def _publish(self, kb_id: str) -> None:
+        try:
+            await self._bus.publish(SCOPE_KNOWLEDGE_BASE, kb_id)
+            self.notifications += 1
+        except Exception:
+            logger.warning(
+                "vector_store.kb_change_notify_failed",
+                collection=f"{_KB_PREFIX}{kb_id}",
+                exc_info=True,
+            )
+
+    async def flush(self) -> None:
+        """立即送出窗口內待發的 publish（job 結束 / shutdown 前呼叫）。"""
+        for handle in self._windows.values():
+            handle.cancel()
+        self._windows.clear()
+        pending, self._pending = self._pending, set()
+        for kb_id in sorted(pending):
+            await self._publish(kb_id)
+        if self._publish_tasks:
+            await asyncio.gather(*self._publish_tasks, return_exceptions=True)
+
+    # --- 寫入：成功後通知 ---
+
+    async def upsert(
+        self,
+        collection: str,
+        ids: list[str],
+        vectors: list[list[float]],
+        payloads: list[dict[str, Any]],
+    ) -> None:
+        await self._inner.upsert(collection, ids, vectors, payloads)
+        await self._notify(collection)
+
+    async def delete(
+        self,
+        collection: str,
+        filters: dict[str, Any],
+        *,
+        raise_on_error: bool = False,
+    ) -> None:
+        await self._inner.delete(
+            collection, filters, raise_on_error=raise_on_error
+        )
+        await self._notify(collection)
+
+    async def drop_collection(self, collection: str) -> None:
+        await self._inner.drop_collection(collection)
+        await self._notify(collection)
+
+    async def upsert_single(
+        self,
+        collection: str,
+        id: str,
+        vector: list[float],
+        payload: dict[str, Any],
+    ) -> None:
+        await self._inner.upsert_single(collection, id, vector, payload)
+        await self._notify(collection)
+
+    async def update_payload(
+        self,
+        collection: str,
+        id: str,
+        payload_diff: dict[str, Any],
+    ) -> None:
+        await self._inner.update_payload(collection, id, payload_diff)
+        await self._notify(collection)
+
+    # --- 讀取 / 管理：直接轉給 inner ---
+
+    async def ensure_collection(self, collection: str, vector_size: int) -> None:
+        await self._inner.ensure_collection(collection, vector_size)
+
+    async def search(
+        self,
+        collection: str,
+        query_vector: list[float],
+        limit: int = 5,
+        score_threshold: float = 0.3,
+        filters: dict[str, Any] | None = None,
+    ) -> list[SearchResult]:
+        return await self._inner.search(
+            collection=collection,
+            query_vector=query_vector,
+            limit=limit,
+            score_threshold=score_threshold,
+            filters=filters,
+        )
+
+    async def search_many(
+        self,
+        collection: str,
+        query_vectors: list[list[float]],
+        limit: int = 5,
+        score_threshold: float = 0.3,
+        filters: dict[str, Any] | None = None,
+    ) -> list[list[SearchResult]]:
+        return await self._inner.search_many(
+            collection=collection,
+            query_vectors=query_vectors,
+            limit=limit,
+            score_threshold=score_threshold,
+            filters=filters,
+        )
+
+    async def fetch_vectors(
+        self, collection: str, ids: list[str]
+    ) -> list[tuple[str, list[float], dict[str, Any]]]:
+        return await self._inner.fetch_vectors(collection, ids)
+
+    async def list_collections(self) -> list[dict[str, Any]]:
+        return await self._inner.list_collections()
+
+    async def get_collection_stats(self, collection: str) -> dict[str, Any]:
+        return await self._inner.get_collection_stats(collection)
+
+    async def count_by_filter(
+        self, collection: str, filters: dict[str, Any]
+    ) -> int:
+        return await self._inner.count_by_filter(collection, filters)
+
+    async def scan(
+        self,
+        collection: str,
+        filters: dict[str, Any],
+        batch_size: int = 1000,
+    ) -> list[SearchResult]:
+        return await self._inner.scan(collection, filters, batch_size)
@@ -0,0 +1,116 @@
+"""Dedicated, sized executor for the synchronous MilvusClient.
+
+``asyncio.to_thread`` 走 loop 的 default executor（min(32, cpu+4) threads），
+跟其他所有 to_thread 使用者共用；高併發 search 會把它塞滿，排隊完全看不到。
+這裡給 Milvus 一個獨立、可設定大小的 ThreadPoolExecutor，並記錄 queue depth /
+等待時間，讓排隊變得可觀測。
+
+Process-wide：arq worker 每個 job 都 new Container（連帶 new
+MilvusVectorStore），executor 若跟著 instance 建立，每個 job 都會留下一組
+閒置 thread。因此以 max_workers 為 key 放在 module level 共用。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+class InstrumentedExecutor:
+    """ThreadPoolExecutor + queue-depth / wait-time metrics."""
+
+    def __init__(self, max_workers: int, name: str = "milvus") -> None:
+        self._max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=name
+        )
+        self._lock = threading.Lock()
+        self._submitted = 0
+        self._running = 0
+        self.calls_total = 0
+        self.max_queue_depth = 0
+        self.queue_wait_ms_total = 0.0
+        self.queue_wait_ms_max = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        """已送出但還沒有 thread 接手的 call 數。"""
+        with self._lock:
+            return self._submitted - self._running
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        enqueued_at = time.perf_counter()
+        with self._lock:
+            self._submitted += 1
+            self.max_queue_depth = max(
+                self.max_queue_depth, self._submitted - self._running
+            )
+
+        # 排隊中被 cancel 的 call 不會有 thread 執行，需自行扣回 queue 計數
+        state = {"started": False, "abandoned": False}
+
+        def _invoke() -> T | None:
+            wait_ms = (time.perf_counter() - enqueued_at) * 1000
+            with self._lock:
+                if state["abandoned"]:
+                    return None
+                state["started"] = True
+                self._running += 1
+                self.calls_total += 1
+                self.queue_wait_ms_total += wait_ms
+                self.queue_wait_ms_max = max(self.queue_wait_ms_max, wait_ms)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._submitted -= 1
+
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._executor, _invoke)  # type: ignore[return-value]
+        except asyncio.CancelledError:
+            with self._lock:
+                if not state["started"]:
+                    state["abandoned"] = True
+                    self._submitted -= 1
+            raise
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            in_flight = self._submitted
+            running = self._running
+            calls = self.calls_total
+            wait_total = self.queue_wait_ms_total
+            wait_max = self.queue_wait_ms_max
+            max_depth = self.max_queue_depth
+        return {
+            "max_workers": self._max_workers,
+            "running": running,
+            "queue_depth": in_flight - running,
+            "max_queue_depth": max_depth,
+            "calls_total": calls,
+            "avg_queue_wait_ms": round(wait_total / calls, 3) if calls else 0.0,
+            "max_queue_wait_ms": round(wait_max, 3),
+        }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_executors: dict[int, InstrumentedExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def get_milvus_executor(max_workers: int) -> InstrumentedExecutor:
+    with _executors_lock:
+        executor = _executors.get(max_workers)
+        if executor is None:
+            executor = InstrumentedExecutor(max_workers=max_workers)
+            _executors[max_workers] = executor
+        return executor
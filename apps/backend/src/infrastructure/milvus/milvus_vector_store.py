@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import asyncio
 import re
 import time
 from typing import Any
@@ -17,6 +16,7 @@ from pymilvus import (
 from src.domain.rag.services import VectorStore
 from src.domain.rag.value_objects import SearchResult
 from src.infrastructure.logging import get_logger
+from src.infrastructure.milvus.milvus_executor import get_milvus_executor
 
 logger = get_logger(__name__)
 
@@ -32,6 +32,9 @@ _KNOWN_FIELDS = frozenset({
 
 _SAFE_VALUE_RE = re.compile(r'^[a-zA-Z0-9\-_.:/ ]+$')
 
+# Fields that may serve as the collection partition key ("" = no partition key)
+PARTITION_KEY_FIELDS = ("tenant_id", "document_id")
+
 
 def _sanitize_filter_value(value: Any) -> str:
     """Validate and quote a filter value to prevent expression injection."""
@@ -60,13 +63,36 @@ def _build_filter_expr(filters: dict[str, Any]) -> str:
     return " and ".join(parts)
 
 
-def _build_schema(vector_size: int) -> CollectionSchema:
-    """Build Milvus collection schema with fixed fields + JSON overflow."""
+def _build_schema(
+    vector_size: int, partition_key: str = ""
+) -> CollectionSchema:
+    """Build Milvus collection schema with fixed fields + JSON overflow.
+
+    ``partition_key`` (``tenant_id`` / ``document_id``) 讓 Milvus 依該欄位 hash
+    到多個 partition；search / delete 的 ``field == "x"`` filter 會直接
+    prune 到單一 partition，而不是在所有 segment 上 post-filter。
+    """
+    if partition_key and partition_key not in PARTITION_KEY_FIELDS:
+        raise ValueError(f"Unsupported partition key: {partition_key!r}")
+
+    def _pk(name: str) -> dict[str, Any]:
+        return {"is_partition_key": True} if name == partition_key else {}
+
     fields = [
         FieldSchema(name="id", dtype=DataType.VARCHAR, max_length=128, is_primary=True),
         FieldSchema(name="vector", dtype=DataType.FLOAT_VECTOR, dim=vector_size),
-        FieldSchema(name="tenant_id", dtype=DataType.VARCHAR, max_length=64),
-        FieldSchema(name="document_id", dtype=DataType.VARCHAR, max_length=64),
+        FieldSchema(
+            name="tenant_id",
+            dtype=DataType.VARCHAR,
+            max_length=64,
+            **_pk("tenant_id"),
+        ),
+        FieldSchema(
+            name="document_id",
+            dtype=DataType.VARCHAR,
+            max_length=64,
+            **_pk("document_id"),
+        ),
         FieldSchema(name="content", dtype=DataType.VARCHAR, max_length=65535),
         FieldSchema(name="chunk_index", dtype=DataType.INT64),
         FieldSchema(name="content_type", dtype=DataType.VARCHAR, max_length=64),
@@ -88,7 +114,52 @@ def _build_schema(vector_size: int) -> CollectionSchema:
         ),
         FieldSchema(name="extra", dtype=DataType.JSON),
     ]
-    return CollectionSchema(fields=fields, enable_dynamic_field=False)
+    return CollectionSchema(
+        fields=fields,
+        enable_dynamic_field=False,
+        partition_key_field=partition_key or None,
+    )
+
+
+def _hits_to_results(
+    hits: list[dict[str, Any]], score_threshold: float
+) -> list[SearchResult]:
+    """Convert one query's Milvus hits to SearchResult (score-threshold filtered).
+
+    pymilvus MilvusClient.search returns 'distance' which for COSINE is
+    already the similarity score (1 - cosine_distance) in [0, 1].
+    """
+    search_results: list[SearchResult] = []
+    for hit in hits:
+        score = float(hit.get("distance", 0))
+        if score < score_threshold:
+            continue
+
+        search_results.append(
+            SearchResult(
+                id=str(hit.get("id", "")),
+                score=score,
+                payload=_entity_to_payload(hit.get("entity", {})),
+            )
+        )
+    return search_results
+
+
+def _entity_to_payload(entity: dict[str, Any]) -> dict[str, Any]:
+    payload: dict[str, Any] = {
+        "tenant_id": entity.get("tenant_id", ""),
+        "document_id": entity.get("document_id", ""),
+        "content": entity.get("content", ""),
+        "chunk_index": entity.get("chunk_index", 0),
+        "content_type": entity.get("content_type", ""),
+        "language": entity.get("language", ""),
+        "source": entity.get("source", ""),
+        "source_id": entity.get("source_id", ""),
+    }
+    extra = entity.get("extra", {})
+    if extra:
+        payload.update(extra)
+    return payload
 
 
 def _safe_collection_name(name: str) -> str:
@@ -97,21 +168,84 @@ def _safe_collection_name(name: str) -> str:
 
 
 class MilvusVectorStore(VectorStore):
-    """VectorStore implementation backed by Milvus."""
+    """VectorStore implementation backed by Milvus.
+
+    ``backend`` 決定 RPC 怎麼跑：
+
+    - ``"executor"``（預設）：sync ``MilvusClient`` 跑在專屬、可設定大小的
+      executor（不佔 loop default executor），附 queue-depth 指標
+    - ``"async"``：pymilvus ``AsyncMilvusClient``（grpc.aio，不佔 thread）；
+      async client 沒有的方法仍走 executor
+
+    ``partition_key`` 只影響新建的 collection；既有 collection 透過
+    ``migrate_partition_key``（admin rebuild-index API）搬移。
+    """
 
     def __init__(
         self,
         uri: str = "http://localhost:19530",
         token: str = "",
         db_name: str = "default",
+        backend: str = "executor",
+        executor_workers: int = 16,
+        partition_key: str = "",
+        num_partitions: int = 16,
     ) -> None:
+        if backend not in ("executor", "async"):
+            raise ValueError(f"Unknown Milvus backend: {backend!r}")
+        if partition_key and partition_key not in PARTITION_KEY_FIELDS:
+            raise ValueError(f"Unsupported partition key: {partition_key!r}")
+        self._partition_key = partition_key
+        self._num_partitions = num_partitions
         self._client = MilvusClient(uri=uri, token=token or None, db_name=db_name)
+        self._backend = backend
+        self._executor = get_milvus_executor(executor_workers)
+        self._async_client_kwargs = {
+            "uri": uri,
+            "token": token or None,
+            "db_name": db_name,
+        }
+        # AsyncMilvusClient 的 grpc.aio channel 綁定建立時的 event loop，
+        # 所以延後到第一次在 loop 內呼叫時才建立
+        self._async_client: Any = None
         # Cache: collection_name -> set of field names actually present.
         # Filled lazily on first upsert/search per collection. Lets us strip
         # entity keys that the (possibly older / pre-Issue#44) collection
         # schema does not have, instead of crashing the whole upsert batch.
         self._schema_field_cache: dict[str, set[str]] = {}
-        logger.info("milvus.init", uri=uri, db_name=db_name)
+        logger.info(
+            "milvus.init",
+            uri=uri,
+            db_name=db_name,
+            backend=backend,
+            partition_key=partition_key or None,
+        )
+
+    async def _call(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        """執行一個 MilvusClient RPC（依 backend 走 async client 或專屬 executor）。"""
+        if self._backend == "async":
+            client = self._get_async_client()
+            fn = getattr(client, method, None)
+            if fn is not None:
+                return await fn(*args, **kwargs)
+        return await self._executor.run(
+            getattr(self._client, method), *args, **kwargs
+        )
+
+    def _get_async_client(self) -> Any:
+        if self._async_client is None:
+            from pymilvus import AsyncMilvusClient
+
+            self._async_client = AsyncMilvusClient(**self._async_client_kwargs)
+        return self._async_client
+
+    def runtime_stats(self) -> dict[str, Any]:
+        return {"backend": self._backend, "executor": self._executor.stats()}
+
+    async def aclose(self) -> None:
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
 
     async def _collection_field_names(self, collection: str) -> set[str]:
         """Return the set of field names defined on the given collection.
@@ -123,8 +257,8 @@ class MilvusVectorStore(VectorStore):
         if cached is not None:
             return cached
         try:
-            desc = await asyncio.to_thread(
-                self._client.describe_collection, collection_name=collection
+            desc = await self._call(
+                "describe_collection", collection_name=collection
             )
             fields = desc.get("fields", []) if isinstance(desc, dict) else []
             names = {
@@ -145,50 +279,62 @@ class MilvusVectorStore(VectorStore):
         self, collection: str, vector_size: int
     ) -> None:
         collection = _safe_collection_name(collection)
-        has = await asyncio.to_thread(self._client.has_collection, collection)
+        has = await self._call("has_collection", collection)
         if not has:
-            schema = _build_schema(vector_size)
-            index_params = self._client.prepare_index_params()
-            index_params.add_index(
-                field_name="vector",
-                index_type="AUTOINDEX",
-                metric_type="COSINE",
-            )
-            # S-KB-Studio.0 hotfix: 原本 index_type="" 等於沒建 scalar index，
-            # tenant_id filter 每次走 full scan，隨資料量成長會雪崩。
-            # INVERTED 適用字串欄位（Milvus 2.4+）。
-            index_params.add_index(
-                field_name="tenant_id", index_type="INVERTED"
-            )
-            index_params.add_index(
-                field_name="document_id", index_type="INVERTED"
-            )
-            # External producer integration: source / source_id are high-frequency
-            # filter targets (dedup on re-ingest, DELETE /by-source, search
-            # filter). INVERTED index keeps them O(log n) instead of full scan.
-            index_params.add_index(
-                field_name="source", index_type="INVERTED"
-            )
-            index_params.add_index(
-                field_name="source_id", index_type="INVERTED"
-            )
-
-            await asyncio.to_thread(
-                self._client.create_collection,
-                collection_name=collection,
-                schema=schema,
-                index_params=index_params,
-            )
-            logger.info(
-                "milvus.collection.created",
-                collection=collection,
-                vector_size=vector_size,
+            await self._create_collection(
+                collection, vector_size, self._partition_key
             )
         else:
             # Ensure collection is loaded (required after Milvus restart)
-            await asyncio.to_thread(self._client.load_collection, collection)
+            await self._call("load_collection", collection)
             logger.debug("milvus.collection.loaded", collection=collection)
 
+    async def _create_collection(
+        self, collection: str, vector_size: int, partition_key: str
+    ) -> None:
+        schema = _build_schema(vector_size, partition_key)
+        index_params = self._client.prepare_index_params()
+        index_params.add_index(
+            field_name="vector",
+            index_type="AUTOINDEX",
+            metric_type="COSINE",
+        )
+        # S-KB-Studio.0 hotfix: 原本 index_type="" 等於沒建 scalar index，
+        # tenant_id filter 每次走 full scan，隨資料量成長會雪崩。
+        # INVERTED 適用字串欄位（Milvus 2.4+）。
+        index_params.add_index(
+            field_name="tenant_id", index_type="INVERTED"
+        )
+        index_params.add_index(
+            field_name="document_id", index_type="INVERTED"
+        )
+        # External producer integration: source / source_id are high-frequency
+        # filter targets (dedup on re-ingest, DELETE /by-source, search
+        # filter). INVERTED index keeps them O(log n) instead of full scan.
+        index_params.add_index(
+            field_name="source", index_type="INVERTED"
+        )
+        index_params.add_index(
+            field_name="source_id", index_type="INVERTED"
+        )
+
+        extra: dict[str, Any] = {}
+        if partition_key:
+            extra["num_partitions"] = self._num_partitions
+        await self._call(
+            "create_collection",
+            collection_name=collection,
+            schema=schema,
+            index_params=index_params,
+            **extra,
+        )
+        logger.info(
+            "milvus.collection.created",
+            collection=collection,
+            vector_size=vector_size,
+            partition_key=partition_key or None,
+        )
+
     async def upsert(
         self,
         collection: str,
@@ -225,8 +371,8 @@ class MilvusVectorStore(VectorStore):
                 }
             entities.append(entity)
 
-        await asyncio.to_thread(
-            self._client.upsert,
+        await self._call(
+            "upsert",
             collection_name=collection,
             data=entities,
         )
@@ -249,8 +395,8 @@ class MilvusVectorStore(VectorStore):
         collection = _safe_collection_name(collection)
         try:
             expr = _build_filter_expr(filters)
-            await asyncio.to_thread(
-                self._client.delete,
+            await self._call(
+                "delete",
                 collection_name=collection,
                 filter=expr,
             )
@@ -274,8 +420,8 @@ class MilvusVectorStore(VectorStore):
         """
         collection = _safe_collection_name(collection)
         try:
-            has_collection = await asyncio.to_thread(
-                self._client.has_collection, collection_name=collection
+            has_collection = await self._call(
+                "has_collection", collection_name=collection
             )
             if not has_collection:
                 logger.info(
@@ -283,8 +429,8 @@ class MilvusVectorStore(VectorStore):
                     collection=collection,
                 )
                 return
-            await asyncio.to_thread(
-                self._client.drop_collection, collection_name=collection
+            await self._call(
+                "drop_collection", collection_name=collection
             )
             logger.info("milvus.drop_collection", collection=collection)
         except Exception:
@@ -305,8 +451,8 @@ class MilvusVectorStore(VectorStore):
         if not ids:
             return []
         try:
-            results = await asyncio.to_thread(
-                self._client.get,
+            results = await self._call(
+                "get",
                 collection_name=collection,
                 ids=ids,
                 output_fields=["vector", "content", "tenant_id", "document_id"],
@@ -330,6 +476,30 @@ class MilvusVectorStore(VectorStore):
         score_threshold: float = 0.3,
         filters: dict[str, Any] | None = None,
     ) -> list[SearchResult]:
+        results = await self.search_many(
+            collection=collection,
+            query_vectors=[query_vector],
+            limit=limit,
+            score_threshold=score_threshold,
+            filters=filters,
+        )
+        return results[0]
+
+    async def search_many(
+        self,
+        collection: str,
+        query_vectors: list[list[float]],
+        limit: int = 5,
+        score_threshold: float = 0.3,
+        filters: dict[str, Any] | None = None,
+    ) -> list[list[SearchResult]]:
+        """多條 query vector 一次 Milvus search RPC（一次 thread hop）。
+
+        Milvus 對 ``data=[v1, v2, ...]`` 回傳 list of list（每條 vector 一組
+        hits），這裡依序 demux 回 caller。
+        """
+        if not query_vectors:
+            return []
         collection = _safe_collection_name(collection)
         filter_expr = _build_filter_expr(filters) if filters else ""
 
@@ -345,10 +515,10 @@ class MilvusVectorStore(VectorStore):
         else:
             output_fields = all_output
 
-        results = await asyncio.to_thread(
-            self._client.search,
+        results = await self._call(
+            "search",
             collection_name=collection,
-            data=[query_vector],
+            data=query_vectors,
             limit=limit,
             output_fields=output_fields,
             filter=filter_expr or None,
@@ -356,48 +526,22 @@ class MilvusVectorStore(VectorStore):
         elapsed_ms = int((time.perf_counter() - t0) * 1000)
 
         # Milvus returns list of list (one per query vector)
-        hits = results[0] if results else []
-
-        # Convert Milvus distance to similarity score
-        # Milvus COSINE: distance in [0, 2], similarity = 1 - distance/2
-        # But pymilvus MilvusClient.search returns 'distance' which for COSINE
-        # is already the similarity score (1 - cosine_distance) in [0, 1]
-        search_results: list[SearchResult] = []
-        for hit in hits:
-            score = float(hit.get("distance", 0))
-            if score < score_threshold:
-                continue
-
-            entity = hit.get("entity", {})
-            payload: dict[str, Any] = {
-                "tenant_id": entity.get("tenant_id", ""),
-                "document_id": entity.get("document_id", ""),
-                "content": entity.get("content", ""),
-                "chunk_index": entity.get("chunk_index", 0),
-                "content_type": entity.get("content_type", ""),
-                "language": entity.get("language", ""),
-                "source": entity.get("source", ""),
-                "source_id": entity.get("source_id", ""),
-            }
-            extra = entity.get("extra", {})
-            if extra:
-                payload.update(extra)
-
-            search_results.append(
-                SearchResult(
-                    id=str(hit.get("id", "")),
-                    score=score,
-                    payload=payload,
-                )
+        per_query = [
+            _hits_to_results(
+                results[i] if results and i < len(results) else [],
+                score_threshold,
             )
+            for i in range(len(query_vectors))
+        ]
 
         logger.info(
             "milvus.search",
             collection=collection,
-            result_count=len(search_results),
+            nq=len(query_vectors),
+            result_count=sum(len(r) for r in per_query),
             latency_ms=elapsed_ms,
         )
-        return search_results
+        return per_query
 
     # ──────────────────────────────────────────────────────────────────
     # S-Gov.6b: Conversation Summary collection methods
@@ -479,12 +623,12 @@ class MilvusVectorStore(VectorStore):
 
     async def list_collections(self) -> list[dict[str, Any]]:
         """列出所有 collection + row count。"""
-        names = await asyncio.to_thread(self._client.list_collections)
+        names = await self._call("list_collections")
         out: list[dict[str, Any]] = []
         for name in names:
             try:
-                stats = await asyncio.to_thread(
-                    self._client.get_collection_stats, collection_name=name
+                stats = await self._call(
+                    "get_collection_stats", collection_name=name
                 )
                 row_count = int(stats.get("row_count", 0))
             except Exception:
@@ -498,8 +642,8 @@ class MilvusVectorStore(VectorStore):
         """回傳 collection 詳細：row_count, loaded, indexes, vector_dim。"""
         collection = _safe_collection_name(collection)
         try:
-            stats = await asyncio.to_thread(
-                self._client.get_collection_stats, collection_name=collection
+            stats = await self._call(
+                "get_collection_stats", collection_name=collection
             )
             row_count = int(stats.get("row_count", 0))
         except Exception as e:
@@ -510,8 +654,8 @@ class MilvusVectorStore(VectorStore):
 
         # loaded 判斷：嘗試 describe collection load state
         try:
-            load_state = await asyncio.to_thread(
-                self._client.get_load_state, collection_name=collection
+            load_state = await self._call(
+                "get_load_state", collection_name=collection
             )
             loaded = bool(load_state) and str(load_state).lower().find("loaded") != -1
         except Exception:
@@ -521,8 +665,8 @@ class MilvusVectorStore(VectorStore):
         indexes: list[dict[str, Any]] = []
         for field in ("tenant_id", "document_id", "vector"):
             try:
-                info = await asyncio.to_thread(
-                    self._client.describe_index,
+                info = await self._call(
+                    "describe_index",
                     collection_name=collection,
                     index_name=field,
                 )
@@ -561,8 +705,8 @@ class MilvusVectorStore(VectorStore):
             )
         collection = _safe_collection_name(collection)
         data = [{"id": id, "vector": vector, **payload}]
-        await asyncio.to_thread(
-            self._client.upsert, collection_name=collection, data=data
+        await self._call(
+            "upsert", collection_name=collection, data=data
         )
 
     async def update_payload(
@@ -595,8 +739,8 @@ class MilvusVectorStore(VectorStore):
         collection = _safe_collection_name(collection)
         expr = _build_filter_expr(filters)
         try:
-            res = await asyncio.to_thread(
-                self._client.query,
+            res = await self._call(
+                "query",
                 collection_name=collection,
                 filter=expr,
                 output_fields=["id"],
@@ -610,6 +754,43 @@ class MilvusVectorStore(VectorStore):
             )
             return 0
 
+    async def scan(
+        self,
+        collection: str,
+        filters: dict[str, Any],
+        batch_size: int = 1000,
+    ) -> list[SearchResult]:
+        """query_iterator 逐批讀出符合 filter 的 row（不含 vector）。"""
+        collection = _safe_collection_name(collection)
+        field_names = await self._collection_field_names(collection)
+        output_fields = [
+            f for f in field_names if f not in ("id", "vector")
+        ] or ["*"]
+        iterator = await self._executor.run(
+            self._client.query_iterator,
+            collection_name=collection,
+            batch_size=batch_size,
+            filter=_build_filter_expr(filters),
+            output_fields=output_fields,
+        )
+        rows: list[SearchResult] = []
+        try:
+            while True:
+                batch = await self._executor.run(iterator.next)
+                if not batch:
+                    break
+                rows.extend(
+                    SearchResult(
+                        id=str(row.get("id", "")),
+                        score=0.0,
+                        payload=_entity_to_payload(row),
+                    )
+                    for row in batch
+                )
+        finally:
+            await self._executor.run(iterator.close)
+        return rows
+
     async def rebuild_scalar_indexes(
         self, collection: str
     ) -> dict[str, Any]:
@@ -617,16 +798,16 @@ class MilvusVectorStore(VectorStore):
         collection = _safe_collection_name(collection)
         result: dict[str, Any] = {"fields": {}}
         try:
-            await asyncio.to_thread(
-                self._client.release_collection, collection_name=collection
+            await self._call(
+                "release_collection", collection_name=collection
             )
         except Exception:
             pass
 
         for field in ("tenant_id", "document_id"):
             try:
-                await asyncio.to_thread(
-                    self._client.drop_index,
+                await self._call(
+                    "drop_index",
                     collection_name=collection,
                     index_name=field,
                 )
@@ -635,8 +816,8 @@ class MilvusVectorStore(VectorStore):
             params = self._client.prepare_index_params()
             params.add_index(field_name=field, index_type="INVERTED")
             try:
-                await asyncio.to_thread(
-                    self._client.create_index,
+                await self._call(
+                    "create_index",
                     collection_name=collection,
                     index_params=params,
                 )
@@ -645,10 +826,114 @@ class MilvusVectorStore(VectorStore):
                 result["fields"][field] = f"failed: {e}"
 
         try:
-            await asyncio.to_thread(
-                self._client.load_collection, collection_name=collection
+            await self._call(
+                "load_collection", collection_name=collection
             )
             result["loaded"] = True
         except Exception as e:
             result["loaded"] = f"failed: {e}"
         return result
+
+    async def migrate_partition_key(
+        self,
+        collection: str,
+        partition_key: str,
+        batch_size: int = 1000,
+    ) -> dict[str, Any]:
+        """把既有 collection 搬到新的 partition-key layout。
+
+        Milvus 不能對既有 collection 改 partition key，只能重建：
+        建 ``{collection}__pk_migration`` → query_iterator 逐批複製（含 vector）
+        → 筆數核對 → drop 舊 collection → rename 回原名 → load。
+
+        ``partition_key=""`` 代表搬回無 partition key 的 layout。搬移期間寫入
+        舊 collection 的資料不會被複製，建議 off-peak 執行；核對失敗時保留
+        舊 collection、只刪暫存 collection。
+        """
+        if partition_key and partition_key not in PARTITION_KEY_FIELDS:
+            raise ValueError(f"Unsupported partition key: {partition_key!r}")
+        collection = _safe_collection_name(collection)
+        desc = await self._call("describe_collection", collection_name=collection)
+        fields = desc.get("fields", []) if isinstance(desc, dict) else []
+        current = next(
+            (f.get("name") for f in fields if f.get("is_partition_key")), ""
+        )
+        if current == partition_key:
+            return {"partition_key": partition_key or None, "migrated": False}
+
+        vector_field = next(
+            (f for f in fields if f.get("name") == "vector"), {}
+        )
+        dim = int((vector_field.get("params") or {}).get("dim", 0))
+        if not dim:
+            raise ValueError(f"Cannot determine vector dim of {collection!r}")
+        field_names = [f["name"] for f in fields if f.get("name")]
+
+        tmp = f"{collection}__pk_migration"
+        # 上次失敗留下的暫存 collection 直接丟掉重來
+        if await self._call("has_collection", collection_name=tmp):
+            await self._call("drop_collection", collection_name=tmp)
+        await self._create_collection(tmp, dim, partition_key)
+        await self._call("load_collection", collection_name=collection)
+
+        t0 = time.perf_counter()
+        copied = 0
+        iterator = await self._executor.run(
+            self._client.query_iterator,
+            collection_name=collection,
+            batch_size=batch_size,
+            output_fields=field_names,
+        )
+        try:
+            while True:
+                rows = await self._executor.run(iterator.next)
+                if not rows:
+                    break
+                await self._call("insert", collection_name=tmp, data=list(rows))
+                copied += len(rows)
+        finally:
+            await self._executor.run(iterator.close)
+
+        source_count = await self._row_count(collection)
+        if copied != source_count:
+            await self._call("drop_collection", collection_name=tmp)
+            logger.warning(
+                "milvus.partition_key_migration.count_mismatch",
+                collection=collection,
+                copied=copied,
+                source_count=source_count,
+            )
+            raise RuntimeError(
+                f"Partition-key migration of {collection!r} copied {copied} "
+                f"of {source_count} rows; original collection kept"
+            )
+
+        await self._call("drop_collection", collection_name=collection)
+        await self._call("rename_collection", old_name=tmp, new_name=collection)
+        await self._call("load_collection", collection_name=collection)
+        self._schema_field_cache.pop(collection, None)
+
+        elapsed_ms = int((time.perf_counter() - t0) * 1000)
+        logger.info(
+            "milvus.partition_key_migration.done",
+            collection=collection,
+            from_key=current or None,
+            to_key=partition_key or None,
+            rows=copied,
+            latency_ms=elapsed_ms,
+        )
+        return {
+            "partition_key": partition_key or None,
+            "previous_partition_key": current or None,
+            "migrated": True,
+            "rows": copied,
+        }
+
+    async def _row_count(self, collection: str) -> int:
+        res = await self._call(
+            "query",
+            collection_name=collection,
+            filter="",
+            output_fields=["count(*)"],
+        )
+        return int(res[0]["count(*)"]) if res else 0
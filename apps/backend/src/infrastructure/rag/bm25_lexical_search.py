@@ -0,0 +1,278 @@
+"""Bm25LexicalSearchService — per-KB in-process BM25 索引（hybrid retrieval 用）。
+
+SKU、型號、活動名稱這類 query 在向量空間裡跟一般描述句很近，dense 檢索常常
+撈不到或分數落在 ``score_threshold`` 以下；BM25 對字面完全比對最敏感，
+兩路以 RRF 合併（見 ``QueryRAGUseCase``）。
+
+- 資料來源：``VectorStore.scan`` 讀出 ``kb_{id}`` collection 內該 tenant 的
+  所有 chunk —— 索引內容與向量檢索看到的一致（上傳 / 重新處理 / 刪除 /
+  re-embed 寫進 Milvus 的就是索引的內容），不另存一份 sparse 資料
+- tokenizer：NFKC + lower；英數字串整段保留（``ab-1234``），另拆出各段與
+  去分隔符版本（``ab`` / ``1234`` / ``ab1234``）；CJK 取字元 bigram
+- 失效：寫入 ``kb_*`` collection 時 ``KnowledgeChangeNotifier`` publish
+  ``knowledge_base:{kb_id}`` → 標記 dirty。ingest 期間每批 upsert 都會
+  publish，所以距上次 build 未滿 ``min_rebuild_interval`` 時先沿用舊索引，
+  避免每個 query 都重建；另有 TTL 當保險
+- build 在 thread 內做（tokenize 是 CPU-bound），同一索引 single-flight；
+  每個 collection 有一個失效 generation，scan 前記下，build 完若已變動
+  （build 期間收到失效）新索引直接標 dirty
+- 以 (collection, tenant_id) 為單位，LRU 保留 ``max_indexes`` 份
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+from src.domain.rag.services import LexicalSearchService, VectorStore
+from src.domain.rag.value_objects import SearchResult
+from src.domain.shared.config_invalidation import (
+    ALL_KEYS,
+    SCOPE_KNOWLEDGE_BASE,
+    ConfigInvalidationBus,
+)
+from src.infrastructure.logging import get_logger
+
+logger = get_logger(__name__)
+
+_CJK = "぀-ヿ㐀-䶿一-鿿豈-﫿"
+_TOKEN_RE = re.compile(rf"[0-9a-z]+(?:[-_./][0-9a-z]+)*|[{_CJK}]+")
+_CJK_RE = re.compile(rf"[{_CJK}]")
+_SEPARATORS_RE = re.compile(r"[-_./]")
+
+
+def tokenize(text: str) -> list[str]:
+    tokens: list[str] = []
+    for match in _TOKEN_RE.finditer(unicodedata.normalize("NFKC", text).lower()):
+        token = match.group()
+        if _CJK_RE.match(token):
+            if len(token) == 1:
+                tokens.append(token)
+            else:
+                tokens.extend(token[i : i + 2] for i in range(len(token) - 1))
+            continue
+        tokens.append(token)
+        parts = [p for p in _SEPARATORS_RE.split(token) if p]
+        if len(parts) > 1:
+            tokens.extend(parts)
+            tokens.append("".join(parts))
+    return tokens
+
+
+def _matches(payload: dict[str, Any], filters: dict[str, Any]) -> bool:
+    for key, expected in filters.items():
+        value = payload.get(key)
+        if isinstance(expected, list):
+            if value not in expected:
+                return False
+        elif value != expected:
+            return False
+    return True
+
+
+class Bm25Index:
+    def __init__(
+        self, rows: list[SearchResult], k1: float = 1.2, b: float = 0.75
+    ) -> None:
+        self._rows = rows
+        self._k1 = k1
+        self._b = b
+        self._postings: dict[str, list[tuple[int, int]]] = {}
+        self._lengths: list[int] = []
+        for doc, row in enumerate(rows):
+            counts: dict[str, int] = {}
+            tokens = tokenize(row.payload.get("content") or "")
+            for token in tokens:
+                counts[token] = counts.get(token, 0) + 1
+            for token, tf in counts.items():
+                self._postings.setdefault(token, []).append((doc, tf))
+            self._lengths.append(len(tokens))
+        self._avgdl = (sum(self._lengths) / len(rows)) if rows else 0.0
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def search(
+        self,
+        query: str,
+        limit: int,
+        filters: dict[str, Any] | None = None,
+    ) -> list[SearchResult]:
+        n_docs = len(self._rows)
+        if not n_docs:
+            return []
+        scores: dict[int, float] = {}
+        for token in set(tokenize(query)):
+            postings = self._postings.get(token)
+            if not postings:
+                continue
+            df = len(postings)
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            for doc, tf in postings:
+                norm = self._k1 * (
+                    1 - self._b + self._b * self._lengths[doc] / self._avgdl
+                )
+                scores[doc] = scores.get(doc, 0.0) + idf * tf * (self._k1 + 1) / (
+                    tf + norm
+                )
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        results: list[SearchResult] = []
+        for doc, score in ranked:
+            row = self._rows[doc]
+            if filters and not _matches(row.payload, filters):
+                continue
+            results.append(
+                SearchResult(id=row.id, score=score, payload=row.payload)
+            )
+            if len(results) >= limit:
+                break
+        return results
+
+
+IndexKey = tuple[str, str]  # (collection, tenant_id)
+
+
+@dataclass
+class _Entry:
+    index: Bm25Index
+    built_at: float
+    dirty: bool = False
+
+
+class Bm25LexicalSearchService(LexicalSearchService):
+    def __init__(
+        self,
+        vector_store: VectorStore,
+        invalidation_bus: ConfigInvalidationBus | None = None,
+        max_indexes: int = 64,
+        ttl_seconds: float = 600.0,
+        min_rebuild_interval: float = 30.0,
+    ) -> None:
+        self._vector_store = vector_store
+        self._max_indexes = max(1, max_indexes)
+        self._ttl = ttl_seconds
+        self._min_rebuild_interval = min_rebuild_interval
+        self._entries: OrderedDict[IndexKey, _Entry] = OrderedDict()
+        self._locks: dict[IndexKey, asyncio.Lock] = {}
+        # collection → 收到的失效次數；ALL_KEYS 失效推進 global generation
+        self._generations: dict[str, int] = {}
+        self._global_generation = 0
+        self.builds = 0
+        self.build_failures = 0
+        self.stale_serves = 0
+        self.last_build_ms = 0
+        if invalidation_bus is not None:
+            invalidation_bus.subscribe(self.invalidate)
+
+    async def search(
+        self,
+        collection: str,
+        query: str,
+        limit: int = 5,
+        filters: dict[str, Any] | None = None,
+    ) -> list[SearchResult]:
+        filters = dict(filters or {})
+        tenant_id = str(filters.pop("tenant_id", ""))
+        index = await self._get_index((collection, tenant_id))
+        if index is None:
+            return []
+        return index.search(query, limit, filters)
+
+    def is_stale(self, collection: str, tenant_id: str) -> bool:
+        entry = self._entries.get((collection, tenant_id))
+        return entry is not None and entry.dirty
+
+    def _usable(self, entry: _Entry | None) -> bool:
+        if entry is None:
+            return False
+        age = time.monotonic() - entry.built_at
+        if age >= self._ttl:
+            return False
+        if entry.dirty:
+            if age < self._min_rebuild_interval:
+                self.stale_serves += 1
+                return True
+            return False
+        return True
+
+    async def _get_index(self, key: IndexKey) -> Bm25Index | None:
+        entry = self._entries.get(key)
+        if self._usable(entry):
+            self._entries.move_to_end(key)
+            return entry.index  # type: ignore[union-attr]
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            entry = self._entries.get(key)
+            if entry is not None and not entry.dirty and (
+                time.monotonic() - entry.built_at < self._ttl
+            ):
+                return entry.index  # 等鎖期間別人已重建
+            return await self._build(key, entry)
+
+    def _generation(self, collection: str) -> tuple[int, int]:
+        return self._global_generation, self._generations.get(collection, 0)
+
+    async def _build(self, key: IndexKey, previous: _Entry | None) -> Bm25Index | None:
+        collection, tenant_id = key
+        generation = self._generation(collection)
+        t0 = time.perf_counter()
+        try:
+            rows = await self._vector_store.scan(
+                collection, {"tenant_id": tenant_id} if tenant_id else {}
+            )
+            index = await asyncio.to_thread(Bm25Index, rows)
+        except Exception:
+            self.build_failures += 1
+            logger.warning(
+                "lexical_index.build_failed", collection=collection, exc_info=True
+            )
+            return previous.index if previous is not None else None
+        self.builds += 1
+        self.last_build_ms = int((time.perf_counter() - t0) * 1000)
+        # build 期間收到的失效：scan 讀到的可能是舊資料，新索引照樣標 dirty
+        dirty = self._generation(collection) != generation
+        self._entries[key] = _Entry(
+            index=index, built_at=time.monotonic(), dirty=dirty
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_indexes:
+            evicted, _ = self._entries.popitem(last=False)
+            self._locks.pop(evicted, None)
+        logger.info(
+            "lexical_index.built",
+            collection=collection,
+            docs=len(index),
+            latency_ms=self.last_build_ms,
+        )
+        return index
+
+    def invalidate(self, scope: str, key: str = ALL_KEYS) -> None:
+        if scope == SCOPE_KNOWLEDGE_BASE and key != ALL_KEYS:
+            collection = f"kb_{key}"
+            self._generations[collection] = self._generations.get(collection, 0) + 1
+            for (coll, _), entry in self._entries.items():
+                if coll == collection:
+                    entry.dirty = True
+        elif scope in (SCOPE_KNOWLEDGE_BASE, ALL_KEYS):
+            self._global_generation += 1
+            for entry in self._entries.values():
+                entry.dirty = True
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "indexes": len(self._entries),
+            "docs": sum(len(e.index) for e in self._entries.values()),
+            "dirty": sum(1 for e in self._entries.values() if e.dirty),
+            "builds": self.builds,
+            "build_failures": self.build_failures,
+            "stale_serves": self.stale_serves,
+            "last_build_ms": self.last_build_ms,
+            "ttl_seconds": self._ttl,
+            "min_rebuild_interval": self._min_rebuild_interval,
+        }
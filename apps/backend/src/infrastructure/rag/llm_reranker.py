@@ -2,18 +2,26 @@
 
 一次 API call 批量排序，不逐筆送。
 支援任何 LangChain ChatModel（Haiku / GPT-4o-mini 等）。
+
+``llm_score`` 只負責評分（``RerankService`` 的 LLM backend 也用它），
+``llm_rerank`` 在其上排序、取 top_k、寫 trace。
 """
 
 import json
+from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
 import structlog
 
+from src.domain.rag.value_objects import TokenUsage
+
 if TYPE_CHECKING:
     from src.application.usage.record_usage_use_case import RecordUsageUseCase
 
 logger = structlog.get_logger(__name__)
 
+DEFAULT_RERANK_MODEL = "claude-haiku-4-5-20251001"
+
 _RERANK_SYSTEM_PROMPT = """\
 你是搜尋結果排序專家。根據使用者的查詢，為每個搜尋結果評分。
 
@@ -28,10 +36,119 @@ _RERANK_SYSTEM_PROMPT = """\
 不要加任何其他文字。"""
 
 
+@dataclass(frozen=True)
+class LlmScoreResult:
+    """一次 rerank LLM call 的結果：index → 分數（0-10）+ token 用量。"""
+
+    scores: dict[int, float]
+    usage: TokenUsage
+    raw: str
+    user_prompt: str
+
+
+class RerankParseError(ValueError):
+    """LLM 回覆不是預期的 JSON 分數陣列。"""
+
+
+def _build_user_prompt(query: str, contents: list[str]) -> str:
+    chunk_texts = []
+    for i, content in enumerate(contents):
+        # Truncate long chunks to save tokens
+        if len(content) > 500:
+            content = content[:500] + "..."
+        chunk_texts.append(f"[{i}] {content}")
+    return (
+        f"查詢：{query}\n\n"
+        f"搜尋結果（共 {len(contents)} 筆）：\n\n"
+        + "\n\n".join(chunk_texts)
+    )
+
+
+async def llm_score(
+    query: str,
+    contents: list[str],
+    model: str = DEFAULT_RERANK_MODEL,
+    api_key: str = "",
+    record_usage: "RecordUsageUseCase | None" = None,
+    tenant_id: str = "",
+    bot_id: str | None = None,
+) -> LlmScoreResult:
+    """一次 API call 為所有 contents 評分（``llm_rerank`` 與 rerank backend 共用）。
+
+    API 失敗 / 回覆無法解析 → raise（caller 決定 fallback）。
+    token 用量在拿到 response 後就記（解析失敗也已經花掉了）。
+    """
+    import anthropic
+
+    user_prompt = _build_user_prompt(query, contents)
+    client_kwargs = {}
+    if api_key:
+        client_kwargs["api_key"] = api_key
+    client = anthropic.AsyncAnthropic(**client_kwargs)
+    response = await client.messages.create(
+        model=model,
+        max_tokens=500,
+        temperature=0,
+        system=_RERANK_SYSTEM_PROMPT,
+        messages=[{"role": "user", "content": user_prompt}],
+    )
+
+    # Token-Gov.0: 補 cache token（Anthropic SDK response.usage 提供）
+    usage = TokenUsage(
+        model=model,
+        input_tokens=response.usage.input_tokens,
+        output_tokens=response.usage.output_tokens,
+        cache_read_tokens=getattr(response.usage, "cache_read_input_tokens", 0)
+        or 0,
+        cache_creation_tokens=(
+            getattr(response.usage, "cache_creation_input_tokens", 0) or 0
+        ),
+    )
+    # Token-Gov.0: 寫進 token_usage_records（與其他 LLM 路徑一致）
+    if record_usage and (usage.input_tokens + usage.output_tokens) > 0:
+        from src.domain.usage.category import UsageCategory
+
+        await record_usage.execute(
+            tenant_id=tenant_id,
+            request_type=UsageCategory.RERANK.value,
+            usage=usage,
+            bot_id=bot_id,
+        )
+
+    if not response.content:
+        logger.warning("rerank.empty_response")
+        raise RerankParseError("empty response")
+    raw = response.content[0].text.strip()
+    logger.info("rerank.raw_response", raw_preview=raw[:500])
+
+    # Strip markdown code fences if present
+    if raw.startswith("```"):
+        lines = raw.split("\n")
+        # Remove first line (```json or ```) and last line (```)
+        lines = [l for l in lines if not l.strip().startswith("```")]
+        raw = "\n".join(lines).strip()
+
+    # Parse JSON scores
+    items = json.loads(raw)
+    if not isinstance(items, list):
+        logger.warning("rerank.invalid_format", raw=raw[:200])
+        raise RerankParseError("scores is not a list")
+
+    scores: dict[int, float] = {}
+    for item in items:
+        idx = item.get("index", -1)
+        score = item.get("score", 0)
+        if 0 <= idx < len(contents):
+            scores[idx] = score
+    return LlmScoreResult(
+        scores=scores, usage=usage, raw=raw, user_prompt=user_prompt
+    )
+
+
 async def llm_rerank(
     query: str,
     chunks: list[dict],
-    model: str = "claude-haiku-4-5-20251001",
+    model: str = DEFAULT_RERANK_MODEL,
     top_k: int = 5,
     api_key: str = "",
     record_usage: "RecordUsageUseCase | None" = None,
@@ -57,69 +174,26 @@ async def llm_rerank(
     if not chunks or len(chunks) <= top_k:
         return chunks
 
-    # Build the prompt with numbered chunks
-    chunk_texts = []
-    for i, chunk in enumerate(chunks):
-        content = chunk.get("content", chunk.get("content_snippet", ""))
-        # Truncate long chunks to save tokens
-        if len(content) > 500:
-            content = content[:500] + "..."
-        chunk_texts.append(f"[{i}] {content}")
-
-    user_prompt = (
-        f"查詢：{query}\n\n"
-        f"搜尋結果（共 {len(chunks)} 筆）：\n\n"
-        + "\n\n".join(chunk_texts)
-    )
-
     try:
-        import anthropic
-
         from src.infrastructure.observability.agent_trace_collector import (
             AgentTraceCollector,
         )
 
         t0_ms = AgentTraceCollector.offset_ms()
-        client_kwargs = {}
-        if api_key:
-            client_kwargs["api_key"] = api_key
-        client = anthropic.AsyncAnthropic(**client_kwargs)
-        response = await client.messages.create(
+        result_scores = await llm_score(
+            query,
+            [c.get("content", c.get("content_snippet", "")) for c in chunks],
             model=model,
-            max_tokens=500,
-            temperature=0,
-            system=_RERANK_SYSTEM_PROMPT,
-            messages=[{"role": "user", "content": user_prompt}],
+            api_key=api_key,
+            record_usage=record_usage,
+            tenant_id=tenant_id,
+            bot_id=bot_id,
         )
 
-        if not response.content:
-            logger.warning("rerank.empty_response")
-            return chunks[:top_k]
-        raw = response.content[0].text.strip()
-        logger.info("rerank.raw_response", raw_preview=raw[:500])
-
-        # Strip markdown code fences if present
-        if raw.startswith("```"):
-            lines = raw.split("\n")
-            # Remove first line (```json or ```) and last line (```)
-            lines = [l for l in lines if not l.strip().startswith("```")]
-            raw = "\n".join(lines).strip()
-
-        # Parse JSON scores
-        scores = json.loads(raw)
-        if not isinstance(scores, list):
-            logger.warning("rerank.invalid_format", raw=raw[:200])
-            return chunks[:top_k]
-
         # Sort by score descending
-        scored = []
-        for item in scores:
-            idx = item.get("index", -1)
-            score = item.get("score", 0)
-            if 0 <= idx < len(chunks):
-                scored.append((idx, score))
-
-        scored.sort(key=lambda x: x[1], reverse=True)
+        scored = sorted(
+            result_scores.scores.items(), key=lambda x: x[1], reverse=True
+        )
 
         # Return top_k chunks in reranked order
         result = []
@@ -127,12 +201,7 @@ async def llm_rerank(
             chunk = {**chunks[idx], "_rerank_score": score}
             result.append(chunk)
 
-        # Token-Gov.0: 補 cache token（Anthropic SDK response.usage 提供）
-        cache_read = getattr(response.usage, "cache_read_input_tokens", 0) or 0
-        cache_creation = (
-            getattr(response.usage, "cache_creation_input_tokens", 0) or 0
-        )
-
+        usage = result_scores.usage
         end_ms = AgentTraceCollector.offset_ms()
         AgentTraceCollector.add_node(
             node_type="tool_call",
@@ -142,52 +211,35 @@ async def llm_rerank(
             end_ms=end_ms,
             token_usage={
                 "model": model,
-                "input_tokens": response.usage.input_tokens,
-                "output_tokens": response.usage.output_tokens,
-                "cache_read_tokens": cache_read,
-                "cache_creation_tokens": cache_creation,
+                "input_tokens": usage.input_tokens,
+                "output_tokens": usage.output_tokens,
+                "cache_read_tokens": usage.cache_read_tokens,
+                "cache_creation_tokens": usage.cache_creation_tokens,
             },
             input_chunks=len(chunks),
             output_chunks=len(result),
             top_score=scored[0][1] if scored else 0,
-            llm_input=f"[System] {_RERANK_SYSTEM_PROMPT}\n\n[User] {user_prompt}",
-            llm_output=raw,
+            llm_input=(
+                f"[System] {_RERANK_SYSTEM_PROMPT}\n\n"
+                f"[User] {result_scores.user_prompt}"
+            ),
+            llm_output=result_scores.raw,
         )
 
-        # Token-Gov.0: 寫進 token_usage_records（與其他 LLM 路徑一致）
-        if record_usage and (
-            response.usage.input_tokens + response.usage.output_tokens
-        ) > 0:
-            from src.domain.rag.value_objects import TokenUsage
-            from src.domain.usage.category import UsageCategory
-
-            await record_usage.execute(
-                tenant_id=tenant_id,
-                request_type=UsageCategory.RERANK.value,
-                usage=TokenUsage(
-                    model=model,
-                    input_tokens=response.usage.input_tokens,
-                    output_tokens=response.usage.output_tokens,
-                    cache_read_tokens=cache_read,
-                    cache_creation_tokens=cache_creation,
-                ),
-                bot_id=bot_id,
-            )
-
         logger.info(
             "rerank.done",
             model=model,
             input_chunks=len(chunks),
             output_chunks=len(result),
             top_score=scored[0][1] if scored else 0,
-            input_tokens=response.usage.input_tokens,
-            output_tokens=response.usage.output_tokens,
-            cache_read=cache_read,
-            cache_creation=cache_creation,
+            input_tokens=usage.input_tokens,
+            output_tokens=usage.output_tokens,
+            cache_read=usage.cache_read_tokens,
+            cache_creation=usage.cache_creation_tokens,
         )
         return result
 
-    except (json.JSONDecodeError, KeyError, IndexError) as e:
+    except (json.JSONDecodeError, KeyError, IndexError, RerankParseError) as e:
         logger.warning("rerank.parse_error", error=str(e))
         return chunks[:top_k]
     except Exception:
@@ -0,0 +1,343 @@
+"""RerankService — 可插拔的 RAG reranker（LLM / 本地 lexical + MMR）。
+
+``llm_rerank`` 在每次 rag_query 的 critical path 上多一趟 Haiku round trip
+（含最多 ``rerank_top_n`` × 500 字的 input token）。本地 backend 在 CPU 上
+幾毫秒完成、不花 token。bot 以 ``rerank_model`` 選 backend：
+
+- ``local:lexical``：query 詞覆蓋率（tokenizer 與 BM25 索引相同，含數字的
+  詞加權）與召回分數各半混合，再以 MMR 壓掉內容高度重複的 chunk
+- 其他值（空字串 / Claude model id）：LLM backend（``llm_score``），
+  超過 ``llm_batch_size`` 筆時切批並行
+
+- 分數快取 key = (backend, query hash, chunk_id)，另存 content hash，
+  chunk 內容改過就視為 miss；只把沒命中的 chunk 送去評分
+- 每次 rerank 寫一個 trace node：backend、latency、快取命中數、批次數、
+  token 用量（LLM）；LLM token 照樣記進 token_usage_records
+- backend 失敗 → 維持召回順序取 top_k（與 ``llm_rerank`` 相同的 fallback）
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any
+
+from src.domain.rag.services import Reranker
+from src.domain.rag.value_objects import RerankScores, SearchResult, TokenUsage
+from src.infrastructure.logging import get_logger
+from src.infrastructure.observability.agent_trace_collector import AgentTraceCollector
+from src.infrastructure.rag.bm25_lexical_search import tokenize
+from src.infrastructure.rag.llm_reranker import DEFAULT_RERANK_MODEL, llm_score
+
+logger = get_logger(__name__)
+
+LOCAL_LEXICAL = "local:lexical"
+
+
+class LlmReranker(Reranker):
+    def __init__(self, model: str, batch_size: int = 20) -> None:
+        self.name = model
+        self._batch_size = max(1, batch_size)
+
+    async def score(self, query: str, texts: list[str]) -> RerankScores:
+        batches = [
+            texts[i : i + self._batch_size]
+            for i in range(0, len(texts), self._batch_size)
+        ]
+        results = await asyncio.gather(
+            *(llm_score(query, batch, model=self.name) for batch in batches)
+        )
+        scores: list[float | None] = []
+        for batch, result in zip(batches, results, strict=True):
+            scores.extend(result.scores.get(i) for i in range(len(batch)))
+        return RerankScores(
+            scores=scores,
+            usage=TokenUsage(
+                model=self.name,
+                input_tokens=sum(r.usage.input_tokens for r in results),
+                output_tokens=sum(r.usage.output_tokens for r in results),
+                cache_read_tokens=sum(r.usage.cache_read_tokens for r in results),
+                cache_creation_tokens=sum(
+                    r.usage.cache_creation_tokens for r in results
+                ),
+            ),
+            batches=len(batches),
+        )
+
+
+def _jaccard(a: set[str], b: set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class LexicalMmrReranker(Reranker):
+    name = LOCAL_LEXICAL
+
+    def __init__(
+        self, relevance_weight: float = 0.5, mmr_lambda: float = 0.7
+    ) -> None:
+        self._relevance_weight = relevance_weight
+        self._mmr_lambda = mmr_lambda
+
+    async def score(self, query: str, texts: list[str]) -> RerankScores:
+        # 含數字的詞（SKU / 型號 / 金額）比一般 bigram 有鑑別力
+        weights = {
+            t: 2.0 if any(ch.isdigit() for ch in t) else 1.0
+            for t in set(tokenize(query))
+        }
+        total = sum(weights.values())
+        scores: list[float | None] = []
+        for text in texts:
+            tokens = set(tokenize(text))
+            covered = sum(w for t, w in weights.items() if t in tokens)
+            scores.append(covered / total if total else 0.0)
+        return RerankScores(scores=scores)
+
+    def select(
+        self,
+        scores: list[float | None],
+        texts: list[str],
+        prior_scores: list[float],
+        top_k: int,
+    ) -> list[int]:
+        top_prior = max(prior_scores, default=0.0) or 1.0
+        w = self._relevance_weight
+        relevance = [
+            w * (s or 0.0) + (1 - w) * (p / top_prior)
+            for s, p in zip(scores, prior_scores, strict=True)
+        ]
+        token_sets = [set(tokenize(t)) for t in texts]
+        selected: list[int] = []
+        remaining = list(range(len(texts)))
+        while remaining and len(selected) < top_k:
+            best = max(
+                remaining,
+                key=lambda i: self._mmr_lambda * relevance[i]
+                - (1 - self._mmr_lambda)
+                * max(
+                    (_jaccard(token_sets[i], token_sets[j]) for j in selected),
+                    default=0.0,
+                ),
+            )
+            selected.append(best)
+            remaining.remove(best)
+        return selected
+
+
+def _backend_label(name: str) -> str:
+    # claude-haiku-4-5-... → haiku（與 llm_rerank 的 trace label 一致）
+    return name.split("-")[1] if name.startswith("claude-") else name
+
+
+class RerankService:
+    def __init__(
+        self,
+        cache_max_entries: int = 20000,
+        cache_ttl_seconds: float = 3600.0,
+        llm_batch_size: int = 20,
+    ) -> None:
+        self._cache_max_entries = max(1, cache_max_entries)
+        self._cache_ttl = cache_ttl_seconds
+        self._llm_batch_size = llm_batch_size
+        self._lexical = LexicalMmrReranker()
+        self._llm: dict[str, LlmReranker] = {}
+        # (backend, query hash, chunk_id) → (content hash, score, stored_at)
+        self._cache: OrderedDict[tuple[str, str, str], tuple[str, float, float]] = (
+            OrderedDict()
+        )
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.failures = 0
+        self._per_backend: dict[str, dict[str, Any]] = {}
+
+    def backend_for(self, model: str) -> Reranker:
+        if model == LOCAL_LEXICAL:
+            return self._lexical
+        # Playground 傳 "anthropic:<model_id>" spec；LLM backend 直接打 Anthropic SDK
+        model = model.removeprefix("anthropic:") or DEFAULT_RERANK_MODEL
+        backend = self._llm.get(model)
+        if backend is None:
+            backend = LlmReranker(model, batch_size=self._llm_batch_size)
+            self._llm[model] = backend
+        return backend
+
+    def _cache_get(
+        self, key: tuple[str, str, str], content_hash: str
+    ) -> float | None:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        stored_hash, score, stored_at = entry
+        if stored_hash != content_hash or (
+            time.monotonic() - stored_at >= self._cache_ttl
+        ):
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return score
+
+    def _cache_put(
+        self, key: tuple[str, str, str], content_hash: str, score: float
+    ) -> None:
+        self._cache[key] = (content_hash, score, time.monotonic())
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._cache_max_entries:
+            self._cache.popitem(last=False)
+
+    async def rerank(
+        self,
+        query: str,
+        results: list[SearchResult],
+        top_k: int,
+        model: str = "",
+        *,
+        tenant_id: str = "",
+        record_usage=None,
+    ) -> list[SearchResult]:
+        """依 ``model`` 選 backend 重排 ``results``，回傳前 top_k 筆。"""
+        backend = self.backend_for(model)
+        t0 = time.perf_counter()
+        t0_ms = AgentTraceCollector.offset_ms()
+        query_hash = hashlib.sha1(query.strip().encode("utf-8")).hexdigest()
+        texts = [r.payload.get("content") or "" for r in results]
+        content_hashes = [
+            hashlib.sha1(t.encode("utf-8")).hexdigest() for t in texts
+        ]
+
+        scores: list[float | None] = [None] * len(results)
+        misses: list[int] = []
+        for i, r in enumerate(results):
+            cached = self._cache_get(
+                (backend.name, query_hash, r.id), content_hashes[i]
+            )
+            if cached is None:
+                misses.append(i)
+            else:
+                scores[i] = cached
+        hits = len(results) - len(misses)
+        self.cache_hits += hits
+        self.cache_misses += len(misses)
+
+        usage: TokenUsage | None = None
+        batches = 0
+        failed = False
+        if misses:
+            try:
+                scored = await backend.score(query, [texts[i] for i in misses])
+            except Exception:
+                failed = True
+                self.failures += 1
+                logger.warning(
+                    "rerank.backend_failed", backend=backend.name, exc_info=True
+                )
+            else:
+                usage = scored.usage
+                batches = scored.batches
+                for i, score in zip(misses, scored.scores, strict=True):
+                    scores[i] = score
+                    if score is not None:
+                        self._cache_put(
+                            (backend.name, query_hash, results[i].id),
+                            content_hashes[i],
+                            score,
+                        )
+
+        if failed:
+            order = list(range(min(top_k, len(results))))
+        else:
+            order = backend.select(
+                scores, texts, [r.score for r in results], top_k
+            )
+        latency_ms = int((time.perf_counter() - t0) * 1000)
+
+        if usage is not None and record_usage and (
+            usage.input_tokens + usage.output_tokens
+        ) > 0:
+            from src.domain.usage.category import UsageCategory
+
+            try:
+                await record_usage.execute(
+                    tenant_id=tenant_id,
+                    request_type=UsageCategory.RERANK.value,
+                    usage=usage,
+                )
+            except Exception:
+                logger.warning("rerank.record_usage_failed", exc_info=True)
+
+        stats = self._per_backend.setdefault(
+            backend.name,
+            {"requests": 0, "failures": 0, "latency_ms_total": 0, "tokens": 0},
+        )
+        stats["requests"] += 1
+        stats["failures"] += int(failed)
+        stats["latency_ms_total"] += latency_ms
+        stats["tokens"] += usage.total_tokens if usage else 0
+
+        top_score = scores[order[0]] if order and not failed else None
+        AgentTraceCollector.add_node(
+            node_type="tool_call",
+            label=f"rerank ({_backend_label(backend.name)})",
+            parent_id=AgentTraceCollector.tool_parent(),
+            start_ms=t0_ms,
+            end_ms=AgentTraceCollector.offset_ms(),
+            token_usage=(
+                {
+                    "model": usage.model,
+                    "input_tokens": usage.input_tokens,
+                    "output_tokens": usage.output_tokens,
+                    "cache_read_tokens": usage.cache_read_tokens,
+                    "cache_creation_tokens": usage.cache_creation_tokens,
+                }
+                if usage is not None
+                else None
+            ),
+            outcome="failed" if failed else "success",
+            backend=backend.name,
+            latency_ms=latency_ms,
+            input_chunks=len(results),
+            output_chunks=len(order),
+            cache_hits=hits,
+            scored_chunks=len(misses),
+            batches=batches,
+            top_score=round(top_score, 4) if top_score is not None else 0,
+        )
+        logger.info(
+            "rerank.done",
+            backend=backend.name,
+            latency_ms=latency_ms,
+            input_chunks=len(results),
+            output_chunks=len(order),
+            cache_hits=hits,
+            batches=batches,
+            tokens=usage.total_tokens if usage else 0,
+            failed=failed,
+        )
+        return [results[i] for i in order]
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            "cache_entries": len(self._cache),
+            "cache_max_entries": self._cache_max_entries,
+            "cache_ttl_seconds": self._cache_ttl,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "cache_hit_ratio": round(self.cache_hits / lookups, 4)
+            if lookups
+            else 0.0,
+            "failures": self.failures,
+            "per_backend": {
+                name: {
+                    **s,
+                    "avg_latency_ms": round(
+                        s["latency_ms_total"] / s["requests"], 1
+                    )
+                    if s["requests"]
+                    else 0.0,
+                }
+                for name, s in self._per_backend.items()
+            },
+        }
@@ -1,12 +1,32 @@
-import json
+"""Rate limit 設定 loader — in-process 快取 + ConfigInvalidationBus 失效。
+
+每個 request 都要 resolve (tenant, endpoint_group) 的限額；舊版每次多一個
+Redis GET。設定幾乎不變，所以改存在 process 記憶體：
+- 命中時零 I/O；TTL 是保險，主要靠 ``SCOPE_RATE_LIMIT`` 通知失效
+  （key = tenant_id；預設設定（tenant_id=None）變更時 key = "*" 全清）
+- 同一個 key 的並發 miss 共用一次 DB 查詢（TTL 到期時不會瞬間打爆 DB）
+- generation：DB 查詢期間發生失效時，查到的舊值不放進快取
+"""
+
+import asyncio
 import logging
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
+from typing import Any
 
-from redis.asyncio import Redis
-from redis.exceptions import ConnectionError as RedisConnectionError
+from src.domain.shared.config_invalidation import (
+    ALL_KEYS,
+    SCOPE_RATE_LIMIT,
+    ConfigInvalidationBus,
+)
 
 logger = logging.getLogger(__name__)
 
+_DEFAULT_TENANT = "default"
+
+ConfigKey = tuple[str, str]
+
 
 @dataclass(frozen=True)
 class ResolvedRateLimitConfig:
@@ -27,28 +47,71 @@ class RateLimitConfigLoader:
     def __init__(
         self,
         rate_limit_config_repo_factory,  # Callable — creates a fresh repo each call
-        redis_client: Redis,
+        invalidation_bus: ConfigInvalidationBus | None = None,
         cache_ttl: int = 60,
+        max_entries: int = 4096,
     ) -> None:
         self._repo_factory = rate_limit_config_repo_factory
-        self._redis = redis_client
+        self._invalidation_bus = invalidation_bus
+        self._subscribed = False
         self._cache_ttl = cache_ttl
+        self._max_entries = max_entries
+        self._entries: OrderedDict[
+            ConfigKey, tuple[ResolvedRateLimitConfig, float]
+        ] = OrderedDict()
+        self._inflight: dict[ConfigKey, asyncio.Future] = {}
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
 
     async def get_config(
         self, tenant_id: str | None, endpoint_group: str
     ) -> ResolvedRateLimitConfig:
-        """Load rate limit config with Redis cache → DB → fallback."""
-        cache_key = f"rl_cfg:{tenant_id or 'default'}:{endpoint_group}"
+        """Load rate limit config with in-process cache → DB → fallback."""
+        self._ensure_subscribed()
+        key = (tenant_id or _DEFAULT_TENANT, endpoint_group)
+
+        cached = self._entries.get(key)
+        if cached is not None and cached[1] > time.monotonic():
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return cached[0]
+        self.misses += 1
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+                # 負責查詢的 request 被取消（client 斷線）→ 自己查
+                return await self._load(tenant_id, endpoint_group)
 
-        # Try cache
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        generation = self._generation
         try:
-            cached = await self._redis.get(cache_key)
-            if cached:
-                data = json.loads(cached)
-                return ResolvedRateLimitConfig(**data)
-        except (RedisConnectionError, OSError):
-            pass
+            resolved = await self._load(tenant_id, endpoint_group)
+        except Exception as exc:
+            future.set_exception(exc)
+            # 沒有其他 waiter 時避免 "exception was never retrieved"
+            future.exception()
+            raise
+        else:
+            future.set_result(resolved)
+            if generation == self._generation and self._cache_ttl > 0:
+                self._store(key, resolved)
+            return resolved
+        finally:
+            if not future.done():
+                future.cancel()
+            self._inflight.pop(key, None)
 
+    async def _load(
+        self, tenant_id: str | None, endpoint_group: str
+    ) -> ResolvedRateLimitConfig:
         # Try DB: tenant-specific first, then default
         repo = self._repo_factory()
         config = None
@@ -64,26 +127,44 @@ class RateLimitConfigLoader:
         if config is None:
             return _FALLBACK
 
-        resolved = ResolvedRateLimitConfig(
+        return ResolvedRateLimitConfig(
             requests_per_minute=config.requests_per_minute,
             burst_size=config.burst_size,
             per_user_requests_per_minute=config.per_user_requests_per_minute,
         )
 
-        # Cache result
-        try:
-            await self._redis.setex(
-                cache_key,
-                self._cache_ttl,
-                json.dumps({
-                    "requests_per_minute": resolved.requests_per_minute,
-                    "burst_size": resolved.burst_size,
-                    "per_user_requests_per_minute": (
-                        resolved.per_user_requests_per_minute
-                    ),
-                }),
-            )
-        except (RedisConnectionError, OSError):
-            pass
+    def _store(self, key: ConfigKey, resolved: ResolvedRateLimitConfig) -> None:
+        self._entries[key] = (resolved, time.monotonic() + self._cache_ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def _ensure_subscribed(self) -> None:
+        # 第一次 request 時才訂閱：middleware 在 create_app（沒有 running
+        # loop）建立，bus 的 listener 要在 loop 內才能啟動
+        if self._subscribed or self._invalidation_bus is None:
+            return
+        self._subscribed = True
+        self._invalidation_bus.subscribe(self.invalidate)
+
+    def invalidate(self, scope: str, key: str = ALL_KEYS) -> None:
+        if scope not in (SCOPE_RATE_LIMIT, ALL_KEYS):
+            return
+        self._generation += 1
+        self.invalidations += 1
+        if key == ALL_KEYS:
+            self._entries.clear()
+            return
+        for stale in [k for k in self._entries if k[0] == key]:
+            del self._entries[stale]
 
-        return resolved
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "ttl_seconds": self._cache_ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+        }
@@ -1,6 +1,23 @@
+"""Redis 多層限流 — GCRA（Generic Cell Rate Algorithm）Lua script。
+
+每個 key 只存一個數字（TAT，theoretical arrival time，ms），記憶體與流量
+無關；舊版 sliding-window ZSET 每個 request 一個 member。
+
+所有層（global → tenant/IP → user）在同一個 script 內判斷：
+- 一次 round trip（``EVALSHA``，NOSCRIPT 時 redis-py 自動退回 ``EVAL``）
+- atomic：任一層超限時所有層都不扣額度，不會出現 global 已扣、tenant 被擋
+- 時間取 Redis ``TIME``，多個 replica 之間沒有時鐘誤差
+
+GCRA：emission interval T = window / limit，容量 = T × burst。請求到達時
+new_tat = max(tat, now) + T；若 new_tat - 容量 > now 則超限，retry_after =
+兩者差值。burst = limit 時行為等同「視窗內最多 limit 次」，burst > limit
+允許短暫突發、長期速率仍為 limit / window。
+
+多 key script 需要所有 key 在同一個 Redis node（非 cluster 部署）。
+"""
+
 import logging
-import time
-from uuid import uuid4
+import math
 
 from redis.asyncio import Redis
 from redis.exceptions import ConnectionError as RedisConnectionError
@@ -8,58 +25,93 @@ from redis.exceptions import TimeoutError as RedisTimeoutError
 
 from src.domain.ratelimit.rate_limiter_service import (
     RateLimiterService,
+    RateLimitLayer,
     RateLimitResult,
 )
 
 logger = logging.getLogger(__name__)
 
+# KEYS[i] = 第 i 層 key；ARGV = 每層 (limit, window_ms, burst)
+# 回傳 {allowed, 被擋的層 (1-based，放行時 0), remaining, retry_after_ms}
+GCRA_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local new_tats = {}
+local remaining = -1
+for i = 1, #KEYS do
+  local limit = tonumber(ARGV[i * 3 - 2])
+  local window_ms = tonumber(ARGV[i * 3 - 1])
+  local burst = tonumber(ARGV[i * 3])
+  local interval = window_ms / limit
+  local tat = tonumber(redis.call('GET', KEYS[i])) or now
+  if tat < now then
+    tat = now
+  end
+  local new_tat = tat + interval
+  local allow_at = new_tat - interval * burst
+  if allow_at > now then
+    return {0, i, 0, math.ceil(allow_at - now)}
+  end
+  new_tats[i] = new_tat
+  local left = math.floor((now - allow_at) / interval)
+  if remaining < 0 or left < remaining then
+    remaining = left
+  end
+end
+for i = 1, #KEYS do
+  redis.call('SET', KEYS[i], string.format('%.3f', new_tats[i]),
+    'PX', math.ceil(new_tats[i] - now))
+end
+return {1, 0, remaining, 0}
+"""
+
 
 class RedisRateLimiter(RateLimiterService):
     def __init__(self, redis_client: Redis) -> None:
         self._redis = redis_client
+        self._script = redis_client.register_script(GCRA_LUA)
 
     async def check_rate_limit(
         self, key: str, limit: int, window_seconds: int
     ) -> RateLimitResult:
+        return await self.check_layers(
+            [RateLimitLayer(key=key, limit=limit, window_seconds=window_seconds)]
+        )
+
+    async def check_layers(
+        self, layers: list[RateLimitLayer]
+    ) -> RateLimitResult:
+        if not layers:
+            return RateLimitResult(allowed=True, remaining=0)
         try:
-            return await self._check(key, limit, window_seconds)
+            return await self._check(layers)
         except (RedisConnectionError, RedisTimeoutError, OSError):
             logger.warning(
                 "redis_unavailable_graceful_degradation",
-                extra={"key": key},
+                extra={"key": layers[0].key},
+            )
+            return RateLimitResult(
+                allowed=True, remaining=min(layer.limit for layer in layers)
             )
-            return RateLimitResult(allowed=True, remaining=limit)
-
-    async def _check(
-        self, key: str, limit: int, window_seconds: int
-    ) -> RateLimitResult:
-        now = time.time()
-        window_start = now - window_seconds
-        member = f"{now}-{uuid4().hex[:8]}"
-
-        pipe = self._redis.pipeline()
-        pipe.zremrangebyscore(key, 0, window_start)
-        pipe.zadd(key, {member: now})
-        pipe.zcard(key)
-        pipe.expire(key, window_seconds)
-        results = await pipe.execute()
-
-        count = results[2]
 
-        if count > limit:
-            # Remove the request we just added since it's over limit
-            await self._redis.zrem(key, member)
-            # Calculate retry_after from oldest entry in window
-            oldest = await self._redis.zrange(key, 0, 0, withscores=True)
-            retry_after = 1
-            if oldest:
-                oldest_time = oldest[0][1]
-                retry_after = max(1, int(window_seconds - (now - oldest_time)) + 1)
+    async def _check(self, layers: list[RateLimitLayer]) -> RateLimitResult:
+        args: list[int] = []
+        for layer in layers:
+            args.extend(
+                (
+                    max(layer.limit, 1),
+                    layer.window_seconds * 1000,
+                    max(layer.burst or layer.limit, 1),
+                )
+            )
+        allowed, denied_index, remaining, retry_after_ms = await self._script(
+            keys=[layer.key for layer in layers], args=args
+        )
+        if not allowed:
             return RateLimitResult(
                 allowed=False,
                 remaining=0,
-                retry_after=retry_after,
+                retry_after=max(1, math.ceil(int(retry_after_ms) / 1000)),
+                limit=layers[int(denied_index) - 1].limit,
             )
-
-        remaining = max(0, limit - count)
-        return RateLimitResult(allowed=True, remaining=remaining)
+        return RateLimitResult(allowed=True, remaining=int(remaining))
@@ -9,7 +9,7 @@ from __future__ import annotations
 import logging
 
 from dependency_injector.wiring import Provide, inject
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel
 
 from src.application.milvus.get_collection_stats_use_case import (
@@ -108,6 +108,11 @@ async def get_collection_stats(
 @inject
 async def rebuild_index(
     name: str,
+    partition_key: str | None = Query(
+        default=None,
+        pattern="^(tenant_id|document_id|none)$",
+        description="遷移 partition-key layout；none = 移除 partition key",
+    ),
     admin: CurrentTenant = Depends(require_role("system_admin")),
     use_case: RebuildIndexUseCase = Depends(
         Provide[Container.rebuild_index_use_case]
@@ -118,8 +123,15 @@ async def rebuild_index(
             RebuildIndexCommand(
                 collection_name=name,
                 actor=admin.user_id or admin.tenant_id or "",
+                partition_key=(
+                    "" if partition_key == "none" else partition_key
+                ),
             )
         )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        ) from e
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
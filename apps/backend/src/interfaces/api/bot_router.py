@@ -150,6 +150,8 @@ class CreateBotRequest(BaseModel):
     hyde_enabled: bool = False
     hyde_model: str = ""
     hyde_extra_hint: str = ""
+    answer_cache_enabled: bool = False
+    answer_cache_threshold: float = Field(default=0.95, ge=0.5, le=1)
     tool_configs: dict[str, ToolRagConfigSchema] = Field(default_factory=dict)
     customer_service_url: str = ""
     intent_routes: list[IntentRouteSchema] = []
@@ -205,6 +207,8 @@ class UpdateBotRequest(BaseModel):
     hyde_enabled: bool | None = None
     hyde_model: str | None = None
     hyde_extra_hint: str | None = None
+    answer_cache_enabled: bool | None = None
+    answer_cache_threshold: float | None = Field(default=None, ge=0.5, le=1)
     tool_configs: dict[str, ToolRagConfigSchema] | None = None
     customer_service_url: str | None = None
     intent_routes: list[IntentRouteSchema] | None = None
@@ -264,6 +268,8 @@ class BotResponse(BaseModel):
     hyde_enabled: bool
     hyde_model: str
     hyde_extra_hint: str
+    answer_cache_enabled: bool
+    answer_cache_threshold: float
     tool_configs: dict[str, dict[str, Any]]
     customer_service_url: str
     intent_routes: list[dict[str, Any]]
@@ -343,6 +349,8 @@ def _to_response(bot) -> BotResponse:
         hyde_enabled=bot.hyde_enabled,
         hyde_model=bot.hyde_model,
         hyde_extra_hint=bot.hyde_extra_hint,
+        answer_cache_enabled=bot.answer_cache_enabled,
+        answer_cache_threshold=bot.answer_cache_threshold,
         tool_configs={
             name: {
                 k: v
@@ -455,6 +463,8 @@ async def create_bot(
             hyde_enabled=body.hyde_enabled,
             hyde_model=body.hyde_model,
             hyde_extra_hint=body.hyde_extra_hint,
+            answer_cache_enabled=body.answer_cache_enabled,
+            answer_cache_threshold=body.answer_cache_threshold,
             tool_configs={
                 name: cfg.model_dump(exclude_none=True)
                 for name, cfg in body.tool_configs.items()
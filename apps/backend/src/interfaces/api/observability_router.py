@@ -504,3 +504,63 @@ async def execute_log_cleanup(
 ):
     deleted = await use_case.execute()
     return {"deleted_count": deleted}
+
+
+# -----------------------------------------------------------------------
+# Runtime Stats — process 內 pool / cache 指標（單 pod 視角）
+# -----------------------------------------------------------------------
+
+
+@router.get("/runtime-stats")
+@inject
+async def get_runtime_stats(
+    _: object = Depends(require_role("system_admin")),
+    embedding_client_registry=Depends(
+        Provide[Container.embedding_client_registry]
+    ),
+    query_embedding_cache=Depends(Provide[Container.query_embedding_cache]),
+    query_embedding_coalescer=Depends(
+        Provide[Container.query_embedding_coalescer]
+    ),
+    vector_store=Depends(Provide[Container.vector_store]),
+    react_graph_cache=Depends(Provide[Container.react_graph_cache]),
+    chat_model_pool=Depends(Provide[Container.chat_model_pool]),
+    cached_tool_loader=Depends(Provide[Container.cached_tool_loader]),
+    bot_runtime_snapshot_cache=Depends(
+        Provide[Container.bot_runtime_snapshot_cache]
+    ),
+    config_invalidation_bus=Depends(
+        Provide[Container.config_invalidation_bus]
+    ),
+    rate_limit_config_loader=Depends(
+        Provide[Container.rate_limit_config_loader]
+    ),
+    batch_writer=Depends(Provide[Container.batch_writer]),
+    guard_ruleset_cache=Depends(Provide[Container.guard_ruleset_cache]),
+    semantic_answer_cache=Depends(Provide[Container.semantic_answer_cache]),
+    lexical_search_service=Depends(Provide[Container.lexical_search_service]),
+    rerank_service=Depends(Provide[Container.rerank_service]),
+    retrieval_result_cache=Depends(Provide[Container.retrieval_result_cache]),
+    query_generation_cache=Depends(Provide[Container.query_generation_cache]),
+):
+    return {
+        "embedding_pool": embedding_client_registry.stats(),
+        "query_embedding_cache": query_embedding_cache.stats(),
+        "query_embedding_coalescer": query_embedding_coalescer.stats(),
+        "milvus": getattr(vector_store, "runtime_stats", dict)(),
+        "react_graph_cache": react_graph_cache.stats(),
+        "chat_model_pool": chat_model_pool.stats(),
+        "mcp_session_pool": cached_tool_loader.stats(),
+        "bot_runtime_snapshot_cache": bot_runtime_snapshot_cache.stats(),
+        "config_invalidation_bus": config_invalidation_bus.stats(),
+        "rate_limit_config_cache": rate_limit_config_loader.stats(),
+        "guard_ruleset_cache": guard_ruleset_cache.stats(),
+        "semantic_answer_cache": semantic_answer_cache.stats(),
+        "lexical_index": lexical_search_service.stats(),
+        "reranker": rerank_service.stats(),
+        "retrieval_cache": retrieval_result_cache.stats(),
+        "query_generation_cache": query_generation_cache.stats(),
+        "batch_writer": (
+            batch_writer.stats() if batch_writer is not None else {"enabled": False}
+        ),
+    }
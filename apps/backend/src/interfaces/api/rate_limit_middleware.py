@@ -10,7 +10,10 @@ import logging
 from jose import JWTError, jwt
 from starlette.types import ASGIApp, Receive, Scope, Send
 
-from src.domain.ratelimit.rate_limiter_service import RateLimiterService
+from src.domain.ratelimit.rate_limiter_service import (
+    RateLimiterService,
+    RateLimitLayer,
+)
 from src.infrastructure.logging.trace import trace_step
 from src.infrastructure.ratelimit.config_loader import RateLimitConfigLoader
 
@@ -84,51 +87,49 @@ class RateLimitMiddleware:
             config = await self._config_loader.get_config(tenant_id, endpoint_group)
 
         # Multi-layer checks: global → tenant/IP → user
-        checks: list[tuple[str, int]] = []
-
-        # Layer 1: Global
-        global_key = f"rl:global:{endpoint_group}:{WINDOW_SECONDS}"
-        checks.append((global_key, self._global_rpm))
-
-        # Layer 2: Tenant or IP
-        if tenant_id:
-            tenant_key = f"rl:{tenant_id}:{endpoint_group}:{WINDOW_SECONDS}"
-            checks.append((tenant_key, config.requests_per_minute))
-        else:
-            ip_key = f"rl:ip:{client_ip}:{endpoint_group}:{WINDOW_SECONDS}"
-            checks.append((ip_key, config.requests_per_minute))
-
-        # Layer 3: Per-user
+        # tenant/IP 層套用 burst_size，其餘層 burst = limit
+        layers = [
+            RateLimitLayer(
+                key=f"rl:gcra:global:{endpoint_group}:{WINDOW_SECONDS}",
+                limit=self._global_rpm,
+                window_seconds=WINDOW_SECONDS,
+            )
+        ]
+        scope_key = tenant_id if tenant_id else f"ip:{client_ip}"
+        layers.append(
+            RateLimitLayer(
+                key=f"rl:gcra:{scope_key}:{endpoint_group}:{WINDOW_SECONDS}",
+                limit=config.requests_per_minute,
+                window_seconds=WINDOW_SECONDS,
+                burst=max(config.burst_size, config.requests_per_minute),
+            )
+        )
         if user_id and tenant_id and config.per_user_requests_per_minute:
-            user_key = (
-                f"rl:{tenant_id}:{user_id}:{endpoint_group}:{WINDOW_SECONDS}"
+            layers.append(
+                RateLimitLayer(
+                    key=(
+                        f"rl:gcra:{tenant_id}:{user_id}:{endpoint_group}:"
+                        f"{WINDOW_SECONDS}"
+                    ),
+                    limit=config.per_user_requests_per_minute,
+                    window_seconds=WINDOW_SECONDS,
+                )
             )
-            checks.append((user_key, config.per_user_requests_per_minute))
 
-        # Execute checks — strictest wins
-        min_remaining = float("inf")
+        # 所有層一次判斷（Redis 實作為單次 round trip）— strictest wins
         with trace_step("rate_limit_redis"):
-            for key, limit in checks:
-                result = await self._rate_limiter.check_rate_limit(
-                    key, limit, WINDOW_SECONDS
-                )
-                if not result.allowed:
-                    retry_after = result.retry_after or 1
-                    await self._send_429(
-                        send, retry_after, limit,
-                    )
-                    return
-                min_remaining = min(min_remaining, result.remaining)
+            result = await self._rate_limiter.check_layers(layers)
+        if not result.allowed:
+            await self._send_429(
+                send, result.retry_after or 1, result.limit or layers[0].limit,
+            )
+            return
 
         # Inject X-RateLimit-Remaining header into response
-        remaining_str = (
-            str(int(min_remaining))
-            if min_remaining != float("inf")
-            else None
-        )
+        remaining_str = str(result.remaining)
 
         async def send_wrapper(message: dict) -> None:
-            if message["type"] == "http.response.start" and remaining_str:
+            if message["type"] == "http.response.start":
                 raw_headers = list(message.get("headers", []))
                 raw_headers.append(
                     (b"x-ratelimit-remaining", remaining_str.encode())
@@ -19,6 +19,7 @@ class TaskResponse(BaseModel):
     status: str
     progress: int
     error_message: str
+    metrics: dict = {}
     created_at: str
     updated_at: str
 
@@ -53,6 +54,7 @@ async def get_task(
         status=task.status,
         progress=task.progress,
         error_message=task.error_message,
+        metrics=task.metrics,
         created_at=task.created_at.isoformat(),
         updated_at=task.updated_at.isoformat(),
     )
@@ -41,6 +41,7 @@ try:
         RequestLogModel,
         SystemPromptConfigModel,
         TenantModel,
+        UsageCycleRollupModel,
         UsageRecordModel,
         UserModel,
     )
@@ -120,6 +121,13 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     except Exception:
         logger.warning("pricing_cache.startup_refresh_failed", exc_info=True)
 
+    # 啟用 write-behind batch writer（request log middleware 透過
+    # current_batch_writer() 取得；未啟用時維持單筆寫入）
+    try:
+        app.container.batch_writer()  # type: ignore[attr-defined]
+    except Exception:
+        logger.warning("batch_writer.init_failed", exc_info=True)
+
     # Start background log cleanup
     cleanup_task = asyncio.create_task(
         _log_cleanup_loop(app.container)  # type: ignore[attr-defined]
@@ -135,6 +143,23 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         pass
 
     logger.info("app.shutdown")
+    # Drain buffered log / trace / usage rows (before closing DB engine)
+    try:
+        batch_writer = app.container.batch_writer()  # type: ignore[attr-defined]
+        if batch_writer is not None:
+            await batch_writer.aclose()
+    except Exception:
+        logger.warning("batch_writer.drain_failed", exc_info=True)
+    # Publish coalesced KB change notifications (before closing the bus)
+    try:
+        await app.container.vector_store().flush()  # type: ignore[attr-defined]
+    except Exception:
+        logger.warning("vector_store.kb_change_flush_failed", exc_info=True)
+    # Stop config invalidation listener (before closing Redis)
+    try:
+        await app.container.config_invalidation_bus().aclose()  # type: ignore[attr-defined]
+    except Exception:
+        pass
     # Close Redis connection
     try:
         container = app.container  # type: ignore[attr-defined]
@@ -142,6 +167,28 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         await redis_client.aclose()
     except Exception:
         pass
+    # Close pooled embedding HTTP clients
+    try:
+        await app.container.embedding_client_registry().aclose()  # type: ignore[attr-defined]
+    except Exception:
+        pass
+    # Close pooled chat model HTTP clients
+    try:
+        await app.container.chat_model_pool().aclose()  # type: ignore[attr-defined]
+    except Exception:
+        pass
+    # Close pooled MCP sessions (stdio subprocess / HTTP streams)
+    if settings.mcp_session_pool_enabled:
+        try:
+            await app.container.mcp_session_pool().aclose()  # type: ignore[attr-defined]
+        except Exception:
+            pass
+    # Close Milvus AsyncMilvusClient (grpc.aio channel)
+    if settings.milvus_backend == "async":
+        try:
+            await app.container.vector_store().aclose()  # type: ignore[attr-defined]
+        except Exception:
+            pass
     await engine.dispose()
 
 
@@ -175,20 +222,12 @@ def create_app(*, skip_rate_limit: bool = False) -> FastAPI:
 
     # Rate Limit Middleware (innermost, runs just before route handlers)
     if not skip_rate_limit and settings.rate_limit_enabled:
-        from src.infrastructure.ratelimit.config_loader import RateLimitConfigLoader
-        from src.infrastructure.ratelimit.redis_rate_limiter import RedisRateLimiter
         from src.interfaces.api.rate_limit_middleware import RateLimitMiddleware
 
-        rate_limiter = RedisRateLimiter(redis_client=container.redis_client())
-        config_loader = RateLimitConfigLoader(
-            rate_limit_config_repo_factory=container.rate_limit_config_repository,
-            redis_client=container.redis_client(),
-            cache_ttl=settings.rate_limit_config_cache_ttl,
-        )
         application.add_middleware(
             RateLimitMiddleware,
-            rate_limiter=rate_limiter,
-            config_loader=config_loader,
+            rate_limiter=container.rate_limiter(),
+            config_loader=container.rate_limit_config_loader(),
             jwt_secret_key=settings.jwt_secret_key,
             jwt_algorithm=settings.jwt_algorithm,
             global_rpm=settings.rate_limit_global_rpm,
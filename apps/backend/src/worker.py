@@ -32,6 +32,18 @@ def _new_container():
 
 async def shutdown(ctx: dict) -> None:
     logger.info("[worker] shutting down")
+    # job 內寫入的 usage record 可能還在 batch writer queue 裡
+    from src.infrastructure.db.batch_writer import current_batch_writer
+
+    batch_writer = current_batch_writer()
+    if batch_writer is not None:
+        await batch_writer.aclose()
+
+    from src.infrastructure.classification.cluster_classification_service import (
+        shutdown_cluster_executor,
+    )
+
+    shutdown_cluster_executor()
 
 
 # --- Task: split_pdf ---
@@ -52,7 +64,11 @@ async def process_document_task(ctx: dict, document_id: str, task_id: str) -> No
     logger.info(f"[process_document] start doc={document_id} task={task_id}")
     container = _new_container()
     use_case = container.process_document_use_case()
-    await use_case.execute(document_id, task_id)
+    try:
+        await use_case.execute(document_id, task_id)
+    finally:
+        # 合併中的 knowledge_base:{kb_id} 通知在 job 結束前送出
+        await container.vector_store().flush()
     logger.info(f"[process_document] done doc={document_id}")
 
 
@@ -86,12 +102,14 @@ async def extract_memory_task(
 
 # --- Task: classify_kb ---
 
-async def classify_kb_task(ctx: dict, kb_id: str, tenant_id: str) -> None:
-    """知識庫自動分類：向量聚類 + LLM 命名。"""
-    logger.info(f"[classify_kb] start kb={kb_id}")
+async def classify_kb_task(
+    ctx: dict, kb_id: str, tenant_id: str, incremental: bool = False
+) -> None:
+    """知識庫自動分類：向量聚類 + LLM 命名（incremental = 只指派新 chunk）。"""
+    logger.info(f"[classify_kb] start kb={kb_id} incremental={incremental}")
     container = _new_container()
     use_case = container.classify_kb_use_case()
-    await use_case.execute(kb_id, tenant_id)
+    await use_case.execute(kb_id, tenant_id, incremental=incremental)
     logger.info(f"[classify_kb] done kb={kb_id}")
 
 
@@ -174,6 +192,21 @@ async def quota_alerts_task(ctx: dict) -> None:
     )
 
 
+# --- Cron Task: reconcile_usage_rollups ---
+
+async def reconcile_usage_rollups_task(ctx: dict) -> None:
+    """每 15 分鐘以 token_usage_records 為準修正本月 / 上月 rollup。
+
+    quota 檢查讀 rollup；records 仍是 truth，這個 job 讓兩者不會長期 drift。
+    相對更新，與線上寫入並行安全。
+    """
+    container = _new_container()
+    use_case = container.reconcile_usage_rollups_use_case()
+    corrected = await use_case.execute()
+    if any(corrected.values()):
+        logger.info(f"[reconcile_usage_rollups] corrected={corrected}")
+
+
 # --- Cron Task: quota_email_dispatch (S-Token-Gov.3.5) ---
 
 async def quota_email_dispatch_task(ctx: dict) -> None:
@@ -275,12 +308,14 @@ class WorkerSettings:
     # S-Token-Gov.3.5: 警示 email 寄送（每天 01:30 UTC = 09:30 Asia/Taipei）
     # S-Gov.6b: 對話摘要掃 pending（每分鐘 — 5min 閒置即生）
     # Outbox: 每分鐘 drain（events 為 DELETE 類，少量；batch_size=50 撐得起）
+    # Usage rollup reconcile: 每 15 分鐘（quota 讀 rollup，records 為 truth）
     cron_jobs = [
         cron(monthly_reset_task, hour={0}, minute={5}, day={1}),
         cron(quota_alerts_task, hour={1}, minute={0}),
         cron(quota_email_dispatch_task, hour={1}, minute={30}),
         cron(conversation_summary_scan_task, minute=set(range(60))),
         cron(drain_outbox_task, minute=set(range(60))),
+        cron(reconcile_usage_rollups_task, minute={7, 22, 37, 52}),
     ]
     on_startup = startup
     on_shutdown = shutdown
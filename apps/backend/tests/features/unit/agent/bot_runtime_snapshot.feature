@@ -0,0 +1,34 @@
+Feature: Bot Runtime Snapshot 快取
+  _load_bot_config 的結果快取為不可變 snapshot，設定更新時經 invalidation bus 失效
+
+  Scenario: 第二則訊息直接命中 snapshot 不再查 DB
+    Given 一個綁定 Registry MCP Server 的 Bot 與 snapshot 快取
+    When 連續載入 Bot 配置 2 次
+    Then Bot 與 Registry 各只查詢 1 次
+    And 兩次載入的 mcp_servers 相同
+
+  Scenario: 更新 Bot 後 snapshot 失效
+    Given 一個綁定 Registry MCP Server 的 Bot 與 snapshot 快取
+    When 載入 Bot 配置後更新 Bot 再載入
+    Then snapshot 重新 build
+    And 第二次載入反映新的 bot_prompt
+
+  Scenario: 更新 MCP Registry 後 snapshot 全部失效
+    Given 一個綁定 Registry MCP Server 的 Bot 與 snapshot 快取
+    When 載入 Bot 配置後更新 Registry 再載入
+    Then snapshot 重新 build
+
+  Scenario: snapshot 不跨 tenant 共用
+    Given 一個綁定 Registry MCP Server 的 Bot 與 snapshot 快取
+    When 載入 Bot 配置後以其他 tenant 載入同一 Bot
+    Then 應拋出不屬於該 tenant 的錯誤
+
+  Scenario: 快取的 prompt 每次載入重新注入動態變數
+    Given 一個 system prompt 含 {today} 的 Bot 與 snapshot 快取
+    When 連續載入 Bot 配置 2 次
+    Then 兩次載入的 system_prompt 都已替換 {today}
+
+  Scenario: build 期間發生失效時不寫入快取
+    Given 一個綁定 Registry MCP Server 的 Bot 與 snapshot 快取
+    When build 期間收到 bot 失效通知
+    Then 快取中沒有該 Bot 的 snapshot
@@ -0,0 +1,34 @@
+Feature: MCP Session Pool
+  作為系統，我需要重用長連線 MCP session 與 tool schema，避免每則訊息重新 connect / initialize
+
+  Scenario: 暖 bot 連續兩則訊息共用同一條 session
+    Given 一個 MCP session pool
+    When 依序載入同一個 MCP Server 的工具 2 次並呼叫 "echo"
+    Then 應只建立 1 條連線
+    And tool schema 應只載入 1 次
+    And 工具呼叫應回傳 "echo:hi"
+    And 所有 lease 歸還後 in_use 應為 0
+
+  Scenario: 閒置超過 TTL 的 session 被回收
+    Given 一個 MCP session pool 閒置 TTL 為 0 秒
+    When 依序載入同一個 MCP Server 的工具 2 次並呼叫 "echo"
+    Then 應建立 2 條連線
+    And 每次歸還都回收閒置 session
+
+  Scenario: 健康檢查失敗時重新連線
+    Given 一個 MCP session pool 每次 lease 都做健康檢查
+    And session ping 會失敗
+    When 依序載入同一個 MCP Server 的工具 2 次並呼叫 "echo"
+    Then 應建立 2 條連線
+    And 健康檢查失敗次數應為 1
+
+  Scenario: 同一 server 的 session 數不超過上限
+    Given 一個 MCP session pool 每個 server 最多 1 條 session
+    When 同時載入同一個 MCP Server 的工具 3 次
+    Then 應只建立 1 條連線
+
+  Scenario: 透過 pool 載入時仍依 enabled_tools 篩選
+    Given 一個 MCP session pool
+    When 透過 CachedMCPToolLoader 以 ["echo"] 篩選載入
+    Then 應只回傳 1 個 pooled 工具
+    And 所有 lease 歸還後 in_use 應為 0
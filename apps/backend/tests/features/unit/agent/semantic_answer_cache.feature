@@ -0,0 +1,41 @@
+Feature: 語意回答快取
+  Bot 開啟 answer_cache 後，首輪提問與已答過的問題夠像就直接回快取的答案與來源，
+  bot 設定或知識庫內容變更時失效
+
+  Scenario: 換句話說的首輪提問命中快取不再呼叫 agent
+    Given 一個開啟語意回答快取的 Bot
+    When 依序以新對話提問 "週六有營業嗎" 與 "週六有開嗎"
+    Then agent 只被呼叫 1 次
+    And 第 2 則回覆與第 1 則相同且帶相同來源
+    And 快取統計 hits 為 1 且 saved_tokens 為 120
+
+  Scenario: 相似度低於門檻時不命中
+    Given 一個開啟語意回答快取的 Bot
+    When 依序以新對話提問 "週六有營業嗎" 與 "怎麼退貨"
+    Then agent 被呼叫 2 次
+
+  Scenario: 有歷史的對話不查快取
+    Given 一個開啟語意回答快取的 Bot
+    When 以新對話提問 "週六有營業嗎" 後在既有對話中提問 "週六有開嗎"
+    Then agent 被呼叫 2 次
+
+  Scenario: 知識庫向量寫入後快取失效
+    Given 一個開啟語意回答快取的 Bot
+    When 以新對話提問 "週六有營業嗎" 後知識庫 "kb-1" 寫入新向量再提問 "週六有開嗎"
+    Then agent 被呼叫 2 次
+
+  Scenario: 更新 Bot 後快取失效
+    Given 一個開啟語意回答快取的 Bot
+    When 以新對話提問 "週六有營業嗎" 後發布 bot 失效再提問 "週六有開嗎"
+    Then agent 被呼叫 2 次
+
+  Scenario: 用到非 RAG 工具的回答不寫入快取
+    Given 一個開啟語意回答快取的 Bot 且 agent 呼叫了 MCP 工具
+    When 依序以新對話提問 "週六有營業嗎" 與 "週六有開嗎"
+    Then agent 被呼叫 2 次
+
+  Scenario: 串流路徑命中快取時送出快取的答案
+    Given 一個開啟語意回答快取的 Bot
+    When 以新對話提問 "週六有營業嗎" 後以串流提問 "週六有開嗎"
+    Then agent 只被呼叫 1 次
+    And 串流事件包含快取的答案與來源
@@ -25,3 +25,20 @@ Feature: Dynamic Embedding Factory
     Given DB 中沒有任何供應商設定且 .env 無 OpenAI key
     When Proxy 呼叫 embed_query
     Then 應透過 fallback 服務執行 embed_query
+
+  Scenario: 連續解析 Embedding 服務重用同一個 pooled client
+    Given DB 中有 OpenAI LLM 供應商設定含 API key
+    When 工廠連續兩次解析 Embedding 服務
+    Then 兩次應回傳同一個 Embedding 服務實例
+    And Client registry 應只建立過 1 個 client
+
+  Scenario: API key 變更時重建 pooled client
+    Given DB 中有 OpenAI LLM 供應商設定含 API key
+    When 工廠解析 Embedding 服務後 API key 變更再解析一次
+    Then 兩次應回傳不同的 Embedding 服務實例
+    And Client registry 應只保留 1 個 client
+
+  Scenario: 淘汰的 client 延後 close 失敗時記錄且不殘留 task
+    Given Client registry 的 request timeout 為 0 秒
+    When 淘汰一個 close 會失敗的 pooled client 並等待 close 執行
+    Then 延後 close 的 task 應已清除
@@ -0,0 +1,33 @@
+Feature: Query Embedding Micro-batching (Embedding Coalescer)
+  併發的 embed_query 在短時間窗口內合併成一次批次 request
+
+  Scenario: 併發 query 合併成單一批次
+    Given 一個 max_wait 20ms、max_batch 32 的 embedding coalescer
+    When 併發送出 10 條不同的 embed_query
+    Then 底層只收到 1 次批次請求且含 10 條 query
+    And 每個 caller 拿到自己 query 的向量
+
+  Scenario: 超過 max_batch 時拆成多批
+    Given 一個 max_wait 20ms、max_batch 4 的 embedding coalescer
+    When 併發送出 10 條不同的 embed_query
+    Then 底層共收到 3 次批次請求
+
+  Scenario: 同一次 retrieve 的多 mode query 不被拆開
+    Given 一個 max_wait 20ms、max_batch 4 的 embedding coalescer
+    When 併發送出 3 條單一 query 與 1 組 3 條的 mode query
+    Then 該組 mode query 落在同一批次
+
+  Scenario: 批次失敗時所有 caller 都收到例外
+    Given 一個 max_wait 20ms、max_batch 32 的 embedding coalescer 且底層會失敗
+    When 併發送出 3 條不同的 embed_query
+    Then 3 個 caller 都收到例外
+
+  Scenario: 底層回傳的向量數量不足時所有 caller 都收到例外
+    Given 一個 max_wait 20ms、max_batch 32 的 embedding coalescer 且底層少回向量
+    When 併發送出 3 條不同的 embed_query
+    Then 3 個 caller 都收到 ValueError
+
+  Scenario: 批次 task 被 cancel 時 caller 不會永遠等待
+    Given 一個 max_wait 20ms、max_batch 32 的 embedding coalescer 且底層不會回應
+    When 併發送出 3 條 embed_query 後 cancel 批次 task
+    Then 3 個 caller 都被 cancel
@@ -0,0 +1,42 @@
+Feature: Embedding Batch Scheduler（token-aware 分批 + AIMD 併發）
+  embed_texts 依估算 token 裝箱、多批同時送，併發上限由 429 驅動的 AIMD 控制，
+  同一 process 內共用同一組 key/model 的文件共用這個上限
+
+  Scenario: 依估算 token 數裝箱且保持順序
+    Given 每批最多 100 筆、估算 token 上限 60
+    When 對 10 段各約 20 token 的文字與 1 段超長文字分批
+    Then 每批估算 token 不超過上限（超長文字自成一批）
+    And 分批依原順序涵蓋全部文字
+
+  Scenario: 成功累積後逐步提高併發上限
+    Given 一個初始併發 2、上限 4 的 AIMD limiter
+    When 連續成功完成 20 個 request
+    Then 併發上限成長到 4
+
+  Scenario: 同一波 429 只減半一次並暫停 Retry-After
+    Given 一個初始併發 8、上限 8 的 AIMD limiter
+    When 8 個同時在途的 request 都收到 429 且 Retry-After 2 秒
+    Then 併發上限變為 4
+    And limiter 暫停約 2 秒
+
+  Scenario: 排隊中的 request 不在 Retry-After 期間送出
+    Given 一個初始併發 1、上限 1 的 AIMD limiter
+    When 排隊中有 1 個 request 時在途 request 收到 429 且 Retry-After 300 ms
+    Then 排隊的 request 在 300 ms 暫停結束後才取得名額
+
+  Scenario: 多份文件併發 embed 共用同一個併發上限
+    Given 一個初始併發 2、上限 3 的 OpenAI embedding service（每批 10 筆）
+    When 3 份文件各 40 個 chunk 同時 embed
+    Then 每份文件拿到依序對應的 40 個向量
+    And 同時在途的 embedding request 不超過 3
+
+  Scenario: chat query 不排在 ingest 批次後面
+    Given 一個 bulk 併發 1 的 OpenAI embedding service，每個 bulk request 需要 200 ms
+    When bulk embed 5 批的同時送出 1 條 chat query
+    Then chat query 應在第一個 bulk request 完成前拿到向量
+
+  Scenario: bulk 收到 429 時 chat query 不必等 Retry-After
+    Given 一個 bulk 併發 1 的 OpenAI embedding service，bulk request 會收到 429 且 Retry-After 5 秒
+    When bulk embed 5 批的同時送出 1 條 chat query
+    Then chat query 應在 1 秒內拿到向量
+    And query lane 不應被暫停
@@ -0,0 +1,82 @@
+Feature: Hybrid lexical + vector retrieval
+  retrieval_modes 含 hybrid 時，原始 query 另跑 BM25 關鍵字檢索，
+  與向量結果以 reciprocal-rank fusion 合併；BM25 索引由 vector store scan 建立，
+  KB 內容變更（knowledge_base invalidation）後重建
+
+  Scenario: 向量檢索漏掉的 SKU 由 BM25 補回
+    Given KB "kb-1" 向量檢索只回傳一般說明 chunks
+    And KB "kb-1" 另有一筆含型號 "AB-1234" 的 chunk
+    When 我以 retrieval_modes=["raw","hybrid"] 查詢 "AB-1234 保固多久"
+    Then 結果應包含型號 chunk
+    And 型號 chunk 的命中 mode 應包含 hybrid
+
+  Scenario: 同時被向量與 BM25 命中的 chunk 排第一
+    Given KB "kb-1" 向量檢索只回傳一般說明 chunks
+    And KB "kb-1" 另有一筆含型號 "AB-1234" 的 chunk
+    And 向量檢索的第二名也含型號 "AB-1234"
+    When 我以 retrieval_modes=["raw","hybrid"] 查詢 "AB-1234"
+    Then 第一筆結果應為向量第二名的 chunk 且分數為 1.0
+
+  Scenario: 只選 hybrid 時向量端以 raw query 檢索
+    Given KB "kb-1" 向量檢索只回傳一般說明 chunks
+    And KB "kb-1" 另有一筆含型號 "AB-1234" 的 chunk
+    When 我以 retrieval_modes=["hybrid"] 查詢 "AB-1234"
+    Then mode_queries 應為 raw 與 hybrid 且皆為原始 query
+    And embedding 應只送出 1 條 query
+
+  Scenario: 未選 hybrid 時不跑 BM25
+    Given KB "kb-1" 向量檢索只回傳一般說明 chunks
+    And KB "kb-1" 另有一筆含型號 "AB-1234" 的 chunk
+    When 我以 retrieval_modes=["raw"] 查詢 "AB-1234"
+    Then 結果不應包含型號 chunk
+    And vector store 不應被 scan
+
+  Scenario: 型號去掉分隔符或全形也能命中
+    Given BM25 索引含 "AB-1234 防水藍牙耳機" 與 "一般退貨說明" 兩筆 chunk
+    When 以 "ＡＢ１２３４" 查詢 BM25 索引
+    Then 第一筆命中應為 "AB-1234 防水藍牙耳機"
+
+  Scenario: 中文以 bigram 比對
+    Given BM25 索引含 "AB-1234 防水藍牙耳機" 與 "一般退貨說明" 兩筆 chunk
+    When 以 "退貨要怎麼辦" 查詢 BM25 索引
+    Then 第一筆命中應為 "一般退貨說明"
+
+  Scenario: 索引只含該租戶的 chunks
+    Given lexical 檢索服務的 vector store 含租戶 "T001" 與 "T002" 各一筆 "AB-1234" chunk
+    When 以租戶 "T001" 做 lexical 檢索 "AB-1234"
+    Then 只應命中租戶 "T001" 的 chunk
+
+  Scenario: KB 變更後重建索引
+    Given lexical 檢索服務的 vector store 含租戶 "T001" 與 "T002" 各一筆 "AB-1234" chunk
+    And 已以租戶 "T001" 做過 lexical 檢索
+    When vector store 新增一筆租戶 "T001" 的 "CD-5678" chunk 並發布 KB 變更
+    And 以租戶 "T001" 做 lexical 檢索 "CD-5678"
+    Then 應命中新增的 chunk
+    And 索引應已重建 2 次
+
+  Scenario: 重建間隔內沿用舊索引
+    Given lexical 檢索服務的 vector store 含租戶 "T001" 與 "T002" 各一筆 "AB-1234" chunk
+    And 索引最短重建間隔為 60 秒
+    And 已以租戶 "T001" 做過 lexical 檢索
+    When vector store 新增一筆租戶 "T001" 的 "CD-5678" chunk 並發布 KB 變更
+    And 以租戶 "T001" 做 lexical 檢索 "CD-5678"
+    Then 不應命中任何 chunk
+    And 租戶 "T001" 的索引應回報為過期
+    And 索引應已重建 1 次
+
+  Scenario: 第一次建索引期間收到 KB 變更時新索引視為過期
+    Given lexical 檢索服務的 vector store 含租戶 "T001" 與 "T002" 各一筆 "AB-1234" chunk
+    And 下一次 scan 期間 vector store 新增租戶 "T001" 的 "CD-5678" chunk 並發布 KB 變更
+    When 以租戶 "T001" 做 lexical 檢索 "AB-1234"
+    And 以租戶 "T001" 做 lexical 檢索 "CD-5678"
+    Then 應命中新增的 chunk
+    And 索引應已重建 2 次
+
+  Scenario: 重建索引期間收到 KB 變更時新索引視為過期
+    Given lexical 檢索服務的 vector store 含租戶 "T001" 與 "T002" 各一筆 "AB-1234" chunk
+    And 已以租戶 "T001" 做過 lexical 檢索
+    When vector store 的 KB 變更發布後，下一次 scan 期間又新增租戶 "T001" 的 "CD-5678" chunk 並發布 KB 變更
+    And 以租戶 "T001" 做 lexical 檢索 "AB-1234"
+    And 以租戶 "T001" 做 lexical 檢索 "CD-5678"
+    Then 應命中新增的 chunk
+    And 索引應已重建 3 次
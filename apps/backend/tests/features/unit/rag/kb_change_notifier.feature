@@ -0,0 +1,33 @@
+Feature: KB 變更通知合併
+  KnowledgeChangeNotifier 在 kb_* 寫入後 publish knowledge_base:{kb_id}；
+  pipelined ingest 的連續寫入在合併窗口內只 publish 開頭與結尾各一次
+
+  Scenario: 未設定合併窗口時每次寫入都 publish
+    Given 合併窗口為 0 秒的 KB 變更通知器
+    When 對 KB "kb-1" 連續寫入 5 批
+    Then KB "kb-1" 應收到 5 次變更通知
+
+  Scenario: 窗口內的連續寫入合併成開頭與結尾兩次
+    Given 合併窗口為 0.05 秒的 KB 變更通知器
+    When 對 KB "kb-1" 連續寫入 5 批
+    Then KB "kb-1" 應收到 1 次變更通知
+    When 等待合併窗口結束
+    Then KB "kb-1" 應收到 2 次變更通知
+
+  Scenario: 不同 KB 各自通知
+    Given 合併窗口為 0.05 秒的 KB 變更通知器
+    When 對 KB "kb-1" 連續寫入 3 批
+    And 對 KB "kb-2" 連續寫入 1 批
+    Then KB "kb-1" 應收到 1 次變更通知
+    And KB "kb-2" 應收到 1 次變更通知
+
+  Scenario: flush 立即送出待發的通知
+    Given 合併窗口為 60 秒的 KB 變更通知器
+    When 對 KB "kb-1" 連續寫入 3 批
+    And flush 變更通知器
+    Then KB "kb-1" 應收到 2 次變更通知
+
+  Scenario: 非 kb_ collection 的寫入不通知
+    Given 合併窗口為 0 秒的 KB 變更通知器
+    When 對 collection "conv_summaries" 寫入 1 批
+    Then 不應收到任何變更通知
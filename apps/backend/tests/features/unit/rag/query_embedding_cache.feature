@@ -0,0 +1,29 @@
+Feature: Query Embedding 兩層快取 (Query Embedding Cache)
+  重複的客服問題不應重複呼叫 embedding API
+
+  Scenario: 相同問題第二次查詢命中 L1 快取
+    Given 一個包了兩層快取的 Embedding 服務
+    When 連續兩次 embed_query "怎麼退貨"
+    Then 底層 embedding 服務只被呼叫 1 次
+    And 快取統計 L1 命中 1 次且 miss 1 次
+
+  Scenario: 空白差異的問題共用同一個快取 key
+    Given 一個包了兩層快取的 Embedding 服務
+    When 依序 embed_query "怎麼  退貨 " 與 "怎麼 退貨"
+    Then 底層 embedding 服務只被呼叫 1 次
+
+  Scenario: 其他 pod 寫入的 Redis 快取以 float32 blob 還原
+    Given 一個包了兩層快取的 Embedding 服務
+    And Redis 已有 "怎麼退貨" 的 float32 向量
+    When 連續兩次 embed_query "怎麼退貨"
+    Then 底層 embedding 服務只被呼叫 0 次
+    And 快取統計 L2 命中 1 次
+
+  Scenario: 並發相同問題只打一次 API
+    Given 一個包了兩層快取的 Embedding 服務
+    When 並發 5 次 embed_query "運費多少"
+    Then 底層 embedding 服務只被呼叫 1 次
+
+  Scenario: 不同 model 不共用快取
+    Given 一個包了兩層快取的 Embedding 服務
+    Then "怎麼退貨" 在不同 model 下的快取 key 不同
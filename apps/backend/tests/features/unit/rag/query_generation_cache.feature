@@ -0,0 +1,43 @@
+Feature: rewrite / HyDE 生成結果快取與 speculative retrieval
+  rewrite / hyde 的 LLM 生成以 (model, bot prompt hash, extra hint, 正規化 query)
+  存進 TwoTierCache；speculative 模式先跑 raw 向量檢索，生成超過 latency budget 就不等
+
+  Scenario: 相同問題第二次不再呼叫 rewrite LLM
+    Given KB "kb-1" 已有 chunks 並啟用生成快取
+    When 以 modes "raw,rewrite" 檢索 "退貨 政策"
+    And 以 modes "raw,rewrite" 檢索 "  退貨   政策 "
+    Then rewrite LLM 應只呼叫 1 次
+    And 兩次的 rewrite query 應相同
+
+  Scenario: extra hint 不同不共用快取
+    Given KB "kb-1" 已有 chunks 並啟用生成快取
+    When 以 modes "raw,rewrite" 與 hint "提到分店" 檢索 "退貨政策"
+    And 以 modes "raw,rewrite" 與 hint "提到運費" 檢索 "退貨政策"
+    Then rewrite LLM 應呼叫 2 次
+
+  Scenario: 生成失敗 fallback 原 query 時不寫入快取
+    Given KB "kb-1" 已有 chunks 並啟用生成快取
+    And hyde LLM 會失敗
+    When 以 modes "raw,hyde" 檢索 "退貨政策"
+    And 以 modes "raw,hyde" 檢索 "退貨政策"
+    Then hyde LLM 應呼叫 2 次
+    And 生成快取的 hyde fallback 次數應為 2
+
+  Scenario: 併發的相同 miss 只呼叫一次 LLM
+    Given KB "kb-1" 已有 chunks 並啟用生成快取
+    When 同時以 modes "raw,hyde" 檢索 "退貨政策" 3 次
+    Then hyde LLM 應只呼叫 1 次
+
+  Scenario: speculative 模式在 budget 內併入 rewrite 結果
+    Given KB "kb-1" 已有 chunks、啟用生成快取且 speculative budget 500 ms
+    When 以 modes "raw,rewrite" 檢索 "退貨政策"
+    Then 檢索結果的 modes 應為 "raw,rewrite"
+
+  Scenario: speculative 模式超過 budget 只用 raw，生成仍寫入快取
+    Given KB "kb-1" 已有 chunks、啟用生成快取且 speculative budget 20 ms
+    And rewrite LLM 需要 200 ms
+    When 以 modes "raw,rewrite" 檢索 "退貨政策"，等待 300 ms 後再檢索一次
+    Then 第 1 次檢索結果的 modes 應為 "raw"
+    And 第 2 次檢索結果的 modes 應為 "raw,rewrite"
+    And rewrite LLM 應只呼叫 1 次
+    And 向量搜尋 trace 應記錄被丟棄的 mode "rewrite"
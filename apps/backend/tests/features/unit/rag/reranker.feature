@@ -0,0 +1,39 @@
+Feature: 可插拔 RAG reranker
+  RerankService 依 bot 的 rerank_model 選 backend（LLM / local:lexical），
+  分數以 (backend, query hash, chunk_id) 快取，每次 rerank 寫 trace node
+
+  Scenario: local:lexical 把含 SKU 的 chunk 排到前面且不呼叫 LLM
+    Given 召回結果依序為 "退貨需在七天內申請" "運費由買方負擔" "AB-1234 保固一年"
+    When 以 rerank_model "local:lexical" 重排 "AB-1234 保固多久" 取 top 2
+    Then 第一筆應為 "AB-1234 保固一年"
+    And 不應呼叫 LLM
+    And trace 應有 backend 為 "local:lexical" 的 rerank 節點且無 token 用量
+
+  Scenario: local:lexical 以 MMR 壓下重複內容
+    Given 召回結果依序為 "退貨需在七天內申請 請附發票" "退貨需在七天內申請 請附發票！" "退貨運費由買方負擔"
+    When 以 rerank_model "local:lexical" 重排 "退貨" 取 top 2
+    Then 結果應為 "退貨需在七天內申請 請附發票" "退貨運費由買方負擔"
+
+  Scenario: LLM backend 超過批次上限時切批並合計 token
+    Given 召回結果有 45 筆 chunk
+    And LLM 評分每批回傳 input 100 output 20 token
+    When 以 rerank_model "" 重排 "退貨" 取 top 5
+    Then LLM 應被呼叫 3 次
+    And token 用量應記錄 1 次且 input 為 300
+    And trace 應有 3 個批次的 rerank 節點且 input token 為 300
+
+  Scenario: 同 query 第二次 rerank 走分數快取
+    Given 召回結果有 10 筆 chunk
+    And LLM 評分每批回傳 input 100 output 20 token
+    And 已以 rerank_model "" 重排過 "退貨" 取 top 5
+    When 第 3 筆 chunk 內容被修改後再以 rerank_model "" 重排 "退貨" 取 top 5
+    Then LLM 應被呼叫 2 次
+    And 第二次 LLM 呼叫只應評分 1 筆 chunk
+    And 快取命中應為 9 筆
+
+  Scenario: LLM backend 失敗時維持召回順序
+    Given 召回結果有 10 筆 chunk
+    And LLM 評分會失敗
+    When 以 rerank_model "claude-haiku-4-5-20251001" 重排 "退貨" 取 top 3
+    Then 結果應為召回的前 3 筆
+    And trace 的 rerank 節點 outcome 應為 "failed"
@@ -0,0 +1,58 @@
+Feature: Retrieval 結果快取
+  QueryRAGUseCase.retrieve 以 (正規化 query, modes, top_k, filters, KB version ...)
+  快取最終排序；KB 寫入經 invalidation bus 推進 version，chunk 內容由 chunk cache hydrate
+
+  Scenario: 相同問題第二次直接命中快取
+    Given 租戶 "T001" 的 KB "kb-1" 已有 3 筆 chunks 並啟用檢索快取
+    When 租戶 "T001" 檢索 "退貨 政策" top_k 3
+    And 租戶 "T001" 檢索 "  退貨   政策 " top_k 3
+    Then 向量搜尋應只執行 1 次
+    And 兩次檢索結果應相同
+
+  Scenario: top_k 不同不共用快取
+    Given 租戶 "T001" 的 KB "kb-1" 已有 3 筆 chunks 並啟用檢索快取
+    When 租戶 "T001" 檢索 "退貨政策" top_k 3
+    And 租戶 "T001" 檢索 "退貨政策" top_k 2
+    Then 向量搜尋應執行 2 次
+
+  Scenario: KB 內容寫入後快取作廢
+    Given 租戶 "T001" 的 KB "kb-1" 已有 3 筆 chunks 並啟用檢索快取
+    When 租戶 "T001" 檢索 "退貨政策" top_k 3
+    And KB "kb-1" 經 vector store 寫入新的 chunk
+    And 租戶 "T001" 檢索 "退貨政策" top_k 3
+    Then 向量搜尋應執行 2 次
+
+  Scenario: 檢索期間 KB 變更則不寫入快取
+    Given 租戶 "T001" 的 KB "kb-1" 已有 3 筆 chunks 並啟用檢索快取
+    And 向量搜尋期間 KB "kb-1" 會被更新
+    When 租戶 "T001" 檢索 "退貨政策" top_k 3
+    Then 快取應記錄 1 次過期寫入且沒有 entry
+
+  Scenario: BM25 沿用失效前的舊索引時不寫入快取
+    Given 租戶 "T001" 的 KB "kb-1" 已有 3 筆 chunks 並啟用檢索快取
+    And BM25 索引仍在沿用失效前的舊索引
+    When 租戶 "T001" 以 hybrid 檢索 "退貨政策" top_k 3
+    And 租戶 "T001" 以 hybrid 檢索 "退貨政策" top_k 3
+    Then 向量搜尋應執行 2 次
+
+  Scenario: BM25 索引是最新的時 hybrid 結果照常快取
+    Given 租戶 "T001" 的 KB "kb-1" 已有 3 筆 chunks 並啟用檢索快取
+    And BM25 索引是最新的
+    When 租戶 "T001" 以 hybrid 檢索 "退貨政策" top_k 3
+    And 租戶 "T001" 以 hybrid 檢索 "退貨政策" top_k 3
+    Then 向量搜尋應只執行 1 次
+
+  Scenario: chunk 內容被擠出 chunk cache 時重新檢索
+    Given 租戶 "T001" 的 KB "kb-1" 已有 3 筆 chunks 並啟用檢索快取且 chunk cache 上限 2
+    When 租戶 "T001" 檢索 "退貨政策" top_k 3
+    And 租戶 "T001" 檢索 "退貨政策" top_k 3
+    Then 向量搜尋應執行 2 次
+
+  Scenario: hit ratio 依租戶統計
+    Given 租戶 "T001" 的 KB "kb-1" 已有 3 筆 chunks 並啟用檢索快取
+    And 租戶 "T002" 的 KB "kb-2" 已有 3 筆 chunks
+    When 租戶 "T001" 檢索 "退貨政策" top_k 3
+    And 租戶 "T001" 檢索 "退貨政策" top_k 3
+    And 租戶 "T002" 檢索 "退貨政策" top_k 3
+    Then 租戶 "T001" 的 hit ratio 應為 0.5
+    And 租戶 "T002" 的 hit ratio 應為 0.0
@@ -32,8 +32,8 @@ Feature: Vectorization
     Then 產生 3 個向量且 API 呼叫次數為 2
     And 等待時間應至少為 2 秒
 
-  Scenario: 連續 429 自動縮減 batch size 後成功
+  Scenario: 429 時 AIMD 併發上限減半而非縮小 batch
     Given 80 個文字 chunks 使用 OpenAI embedding 且首批回傳 429
     When 執行 OpenAI 向量化
     Then 所有 80 個 chunks 向量化成功
-    And 後續 batch 的 chunk 數應小於初始 batch size
+    And 429 後併發上限減半且 batch 大小不變
@@ -0,0 +1,32 @@
+Feature: GCRA 多層限流器 (Redis Lua Script)
+    身為系統
+    我想要在單次 Redis round trip 內 atomic 判斷所有限流層
+    以便降低 middleware 延遲並讓限流狀態的記憶體與流量無關
+
+    Scenario: 限制內請求允許通過
+        Given 限流設定為每分鐘 10 次
+        And script 回傳放行且剩餘 4 次
+        When 檢查限流
+        Then 請求應被允許
+        And 剩餘次數應為 4
+
+    Scenario: 超過限制的請求被拒絕
+        Given 限流設定為每分鐘 10 次
+        And script 回傳第 1 層超限且 1500 ms 後可重試
+        When 檢查限流
+        Then 請求應被拒絕
+        And retry_after 應為 2 秒
+
+    Scenario: 多層限流只呼叫一次 script
+        Given 三層限流設定 global 1000 次、tenant 100 次 burst 120、user 50 次
+        And script 回傳第 3 層超限且 800 ms 後可重試
+        When 檢查多層限流
+        Then script 應只被呼叫 1 次且帶 3 個 key
+        And 每層參數應為 limit、window ms、burst
+        And 被擋下的限額應為 50
+
+    Scenario: Redis 斷線時降級放行
+        Given 限流設定為每分鐘 10 次
+        And Redis 連線已斷開
+        When 檢查限流
+        Then 請求應被允許
@@ -0,0 +1,27 @@
+Feature: 限流設定 in-process 快取 (Rate Limit Config Cache)
+    身為系統
+    我想要把限流設定快取在 process 記憶體並以 pub/sub 失效
+    以便每個 request 不再多一次 Redis GET
+
+    Scenario: 第二次查詢命中快取不查 DB
+        Given 租戶 "t-1" 的 "rag" 限流設定為每分鐘 100 次
+        When 連續查詢租戶 "t-1" 的 "rag" 設定 3 次
+        Then DB 應只被查詢 1 次
+        And 取得的限額應為 100
+
+    Scenario: 更新限流設定後快取失效
+        Given 租戶 "t-1" 的 "rag" 限流設定為每分鐘 100 次
+        And 已查詢過租戶 "t-1" 的 "rag" 設定
+        When system_admin 將租戶 "t-1" 的 "rag" 限流改為每分鐘 300 次
+        And 查詢租戶 "t-1" 的 "rag" 設定
+        Then 取得的限額應為 300
+
+    Scenario: 並發 miss 只查一次 DB
+        Given 租戶 "t-1" 的 "rag" 限流設定為每分鐘 100 次
+        When 同時查詢租戶 "t-1" 的 "rag" 設定 20 次
+        Then DB 應只被查詢 1 次
+
+    Scenario: 限流設定失效不影響 bot runtime 快取
+        Given bot runtime 快取已有一筆 snapshot
+        When 收到限流設定失效通知
+        Then bot runtime 快取仍保有該 snapshot
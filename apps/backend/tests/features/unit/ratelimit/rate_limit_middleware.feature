@@ -10,6 +10,13 @@ Feature: 限流中介層 (Rate Limit Middleware)
         Then 回應狀態碼應為 429
         And 回應應包含 Retry-After header
 
+    Scenario: 多層限流一次交給 check_layers 判斷
+        Given 限流中介層已設定
+        And 租戶 "tenant-001" 的 "rag" 端點群組未超過限額
+        When 使用者 "user-001" 租戶 "tenant-001" 請求 "/api/v1/rag/query"
+        Then 回應狀態碼應為 200
+        And 所有限流層在單次 check_layers 內判斷
+
     Scenario: 公開端點 per-IP 限流觸發 429
         Given 限流中介層已設定
         And IP "192.168.1.1" 的 "general" 端點群組已超過限額
@@ -0,0 +1,208 @@
+"""Bot Runtime Snapshot 快取 BDD Step Definitions"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock
+
+import pytest
+from pytest_bdd import given, scenarios, then, when
+
+from src.application.agent.bot_runtime_snapshot import BotRuntimeSnapshotCache
+from src.application.agent.send_message_use_case import (
+    SendMessageCommand,
+    SendMessageUseCase,
+)
+from src.application.bot.update_bot_use_case import (
+    UpdateBotCommand,
+    UpdateBotUseCase,
+)
+from src.application.platform.mcp.update_mcp_server_use_case import (
+    UpdateMcpServerCommand,
+    UpdateMcpServerUseCase,
+)
+from src.domain.bot.entity import Bot, BotMcpBinding
+from src.domain.bot.value_objects import BotId
+from src.domain.platform.entity import McpServerRegistration, SystemPromptConfig
+from src.domain.platform.value_objects import McpRegistryId
+from src.domain.shared.config_invalidation import SCOPE_BOT
+from src.domain.shared.exceptions import DomainException
+from src.infrastructure.cache.config_invalidation_bus import (
+    InProcessConfigInvalidationBus,
+)
+
+scenarios("unit/agent/bot_runtime_snapshot.feature")
+
+
+def _run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+@pytest.fixture
+def context():
+    return {}
+
+
+def _setup(context, system_prompt="你是客服"):
+    bot = Bot(
+        id=BotId(value="bot-1"),
+        tenant_id="t-1",
+        name="test-bot",
+        bot_prompt="請用中文回答",
+        mcp_bindings=[
+            BotMcpBinding(registry_id="reg-1", env_values={"TOKEN": "abc"}),
+        ],
+    )
+    registry = McpServerRegistration(
+        id=McpRegistryId(value="reg-1"),
+        name="product-api",
+        transport="http",
+        url="http://localhost:3000/mcp?token={TOKEN}",
+        is_enabled=True,
+    )
+    bot_repo = AsyncMock()
+    bot_repo.find_by_id = AsyncMock(return_value=bot)
+    registry_repo = AsyncMock()
+    registry_repo.find_by_id = AsyncMock(return_value=registry)
+    sys_prompt_repo = AsyncMock()
+    sys_prompt_repo.get = AsyncMock(
+        return_value=SystemPromptConfig(system_prompt=system_prompt)
+    )
+    bus = InProcessConfigInvalidationBus()
+    cache = BotRuntimeSnapshotCache(invalidation_bus=bus)
+    context.update(
+        bot=bot,
+        registry=registry,
+        bot_repo=bot_repo,
+        registry_repo=registry_repo,
+        bus=bus,
+        cache=cache,
+        use_case=SendMessageUseCase(
+            agent_service=AsyncMock(),
+            conversation_repository=AsyncMock(),
+            bot_repository=bot_repo,
+            system_prompt_config_repository=sys_prompt_repo,
+            mcp_registry_repo=registry_repo,
+            bot_config_cache=cache,
+        ),
+    )
+
+
+def _load(context, tenant_id="t-1"):
+    command = SendMessageCommand(
+        tenant_id=tenant_id, bot_id="bot-1", message="hi",
+    )
+    return _run(context["use_case"]._load_bot_config(command))
+
+
+@given("一個綁定 Registry MCP Server 的 Bot 與 snapshot 快取")
+def bot_with_cache(context):
+    _setup(context)
+
+
+@given("一個 system prompt 含 {today} 的 Bot 與 snapshot 快取")
+def bot_with_runtime_var_prompt(context):
+    _setup(context, system_prompt="今天是 {today}")
+
+
+@when("連續載入 Bot 配置 2 次")
+def load_twice(context):
+    context["cfgs"] = [_load(context), _load(context)]
+
+
+@when("載入 Bot 配置後更新 Bot 再載入")
+def load_update_bot_load(context):
+    first = _load(context)
+    update = UpdateBotUseCase(
+        bot_repository=context["bot_repo"],
+        config_invalidation_bus=context["bus"],
+    )
+    _run(update.execute(UpdateBotCommand(bot_id="bot-1", bot_prompt="新指令")))
+    context["cfgs"] = [first, _load(context)]
+
+
+@when("載入 Bot 配置後更新 Registry 再載入")
+def load_update_registry_load(context):
+    first = _load(context)
+    update = UpdateMcpServerUseCase(
+        mcp_server_repository=context["registry_repo"],
+        config_invalidation_bus=context["bus"],
+    )
+    _run(update.execute(UpdateMcpServerCommand(server_id="reg-1", name="v2")))
+    context["cfgs"] = [first, _load(context)]
+
+
+@when("載入 Bot 配置後以其他 tenant 載入同一 Bot")
+def load_other_tenant(context):
+    _load(context)
+    try:
+        _load(context, tenant_id="t-2")
+    except DomainException as exc:
+        context["error"] = exc
+
+
+@when("build 期間收到 bot 失效通知")
+def invalidate_during_build(context):
+    bot = context["bot"]
+    bus = context["bus"]
+
+    async def _find_then_invalidate(bot_id):
+        await bus.publish(SCOPE_BOT, bot_id)
+        return bot
+
+    context["bot_repo"].find_by_id = AsyncMock(
+        side_effect=_find_then_invalidate
+    )
+    context["cfgs"] = [_load(context)]
+
+
+@then("Bot 與 Registry 各只查詢 1 次")
+def queried_once(context):
+    assert context["bot_repo"].find_by_id.await_count == 1
+    assert context["registry_repo"].find_by_id.await_count == 1
+    assert context["cache"].stats()["hits"] == 1
+
+
+@then("兩次載入的 mcp_servers 相同")
+def same_mcp_servers(context):
+    first, second = context["cfgs"]
+    assert first["mcp_servers"] == second["mcp_servers"]
+    assert second["mcp_servers"][0]["url"] == (
+        "http://localhost:3000/mcp?token=abc"
+    )
+    assert first is not second
+
+
+@then("snapshot 重新 build")
+def rebuilt(context):
+    stats = context["cache"].stats()
+    assert stats["misses"] == 2
+    assert stats["hits"] == 0
+
+
+@then("第二次載入反映新的 bot_prompt")
+def second_reflects_update(context):
+    assert "新指令" in context["cfgs"][1]["system_prompt"]
+    assert "新指令" not in context["cfgs"][0]["system_prompt"]
+
+
+@then("應拋出不屬於該 tenant 的錯誤")
+def tenant_error(context):
+    assert "does not belong" in str(context["error"])
+
+
+@then("兩次載入的 system_prompt 都已替換 {today}")
+def runtime_vars_injected(context):
+    today = datetime.now(timezone(timedelta(hours=8))).strftime("%Y-%m-%d")
+    for cfg in context["cfgs"]:
+        assert "{today}" not in cfg["system_prompt"]
+        assert today in cfg["system_prompt"]
+
+
+@then("快取中沒有該 Bot 的 snapshot")
+def not_cached(context):
+    assert context["cache"].get("t-1", "bot-1") is None
+    assert context["cache"].stats()["stale_builds"] == 1
@@ -0,0 +1,186 @@
+"""ChatModelClientPool — pooled chat model clients reused across ReAct requests."""
+from __future__ import annotations
+
+import asyncio
+import json
+
+from langchain_core.messages import HumanMessage
+
+from src.infrastructure.langgraph.react_agent_service import ReActAgentService
+from src.infrastructure.llm.chat_model_pool import (
+    ChatModelClientPool,
+    ChatModelPoolConfig,
+)
+
+_COMPLETION = {
+    "id": "chatcmpl-1",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "gpt-4o-mini",
+    "choices": [
+        {
+            "index": 0,
+            "message": {"role": "assistant", "content": "ok"},
+            "finish_reason": "stop",
+        }
+    ],
+    "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+}
+
+
+def _run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+async def _serve_keepalive(received: list[dict]):
+    """最小 HTTP/1.1 keep-alive server：回固定 chat completion。"""
+
+    async def handle(reader, writer):
+        while True:
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.decode().split("\r\n"):
+                if line.lower().startswith("content-length:"):
+                    length = int(line.split(":", 1)[1])
+            received.append(json.loads(await reader.readexactly(length)))
+            body = json.dumps(_COMPLETION).encode()
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                + f"Content-Length: {len(body)}\r\n\r\n".encode()
+                + body
+            )
+            await writer.drain()
+
+    async def guarded(reader, writer):
+        try:
+            await handle(reader, writer)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+    return await asyncio.start_server(guarded, "127.0.0.1", 0)
+
+
+def test_same_key_shares_client_and_applies_per_request_params():
+    pool = ChatModelClientPool(ChatModelPoolConfig(http2=False))
+    a = pool.get_chat_model(
+        "litellm", "gpt-4o-mini", api_key="sk-1",
+        base_url="http://litellm:4000", temperature=0.1, max_tokens=10,
+    )
+    b = pool.get_chat_model(
+        "openai", "gpt-4o-mini", api_key="sk-1",
+        base_url="http://litellm:4000", temperature=0.9, max_tokens=99,
+    )
+
+    assert a is not b
+    assert a.root_async_client is b.root_async_client
+    assert a._get_request_payload([HumanMessage("hi")])["temperature"] == 0.1
+    assert b._get_request_payload([HumanMessage("hi")])["temperature"] == 0.9
+    stats = pool.stats()
+    assert (stats["model_misses"], stats["model_hits"]) == (1, 1)
+    assert len(stats["clients"]) == 1
+
+
+def test_rotated_api_key_rebuilds_slot():
+    pool = ChatModelClientPool(ChatModelPoolConfig(http2=False))
+    old = pool.get_chat_model("openai", "m", api_key="sk-old", base_url="http://x")
+    new = pool.get_chat_model("openai", "m", api_key="sk-new", base_url="http://x")
+
+    assert old.root_async_client is not new.root_async_client
+    stats = pool.stats()
+    assert stats["rebuilds_total"] == 2
+    assert len(stats["clients"]) == 1
+
+
+def test_requests_reuse_keepalive_connection():
+    received: list[dict] = []
+
+    async def scenario():
+        server = await _serve_keepalive(received)
+        port = server.sockets[0].getsockname()[1]
+        pool = ChatModelClientPool(ChatModelPoolConfig(http2=False))
+        try:
+            for temperature in (0.1, 0.5, 0.9):
+                llm = pool.get_chat_model(
+                    "litellm", "gpt-4o-mini", api_key="sk-1",
+                    base_url=f"http://127.0.0.1:{port}/v1",
+                    temperature=temperature, max_tokens=8,
+                )
+                await llm.ainvoke("hi")
+            return pool.stats()
+        finally:
+            await pool.aclose()
+            server.close()
+            await server.wait_closed()
+
+    stats = _run(scenario())
+
+    assert [r["temperature"] for r in received] == [0.1, 0.5, 0.9]
+    assert stats["requests_total"] == 3
+    assert stats["connects_total"] == 1
+    assert stats["connection_reuse_ratio"] == round(1 - 1 / 3, 4)
+
+
+def test_react_fallback_model_comes_from_pool(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-env")
+    monkeypatch.delenv("OPENAI_API_BASE", raising=False)
+    monkeypatch.delenv("OPENAI_BASE_URL", raising=False)
+    pool = ChatModelClientPool(ChatModelPoolConfig(http2=False))
+
+    first = ReActAgentService._create_chat_model(
+        provider="", model="gpt-4o-mini", temperature=0.2, pool=pool,
+    )
+    second = ReActAgentService._create_chat_model(
+        provider="", model="gpt-4o-mini", temperature=0.3, pool=pool,
+    )
+
+    assert first.root_async_client is second.root_async_client
+    assert (first.temperature, second.temperature) == (0.2, 0.3)
+    assert pool.stats()["model_hits"] == 1
+
+
+def test_pooled_payload_matches_direct_construction_for_gpt5():
+    from langchain_openai import ChatOpenAI
+
+    pool = ChatModelClientPool(ChatModelPoolConfig(http2=False))
+    messages = [HumanMessage("hi")]
+    for model in ("gpt-5-mini", "gpt-4o-mini"):
+        pooled = pool.get_chat_model(
+            "openai", model, api_key="sk-1", base_url="http://x",
+            temperature=0.7, max_tokens=64,
+        )
+        direct = ChatOpenAI(
+            model=model, api_key="sk-1", base_url="http://x",
+            temperature=0.7, max_tokens=64, stream_usage=True,
+        )
+
+        assert pooled._get_request_payload(messages) == (
+            direct._get_request_payload(messages)
+        )
+    gpt5 = pool.get_chat_model(
+        "openai", "gpt-5-mini", api_key="sk-1", base_url="http://x",
+        temperature=0.7,
+    )
+    assert "temperature" not in gpt5._get_request_payload(messages)
+
+
+def test_aclose_closes_retired_clients_without_waiting_for_timeout():
+    async def scenario():
+        pool = ChatModelClientPool(ChatModelPoolConfig(http2=False, timeout=60))
+        old = pool.get_chat_model(
+            "openai", "m", api_key="sk-old", base_url="http://x"
+        )
+        pool.get_chat_model("openai", "m", api_key="sk-new", base_url="http://x")
+        retired = old.root_async_client._client
+        pending = len(pool._retiring)
+        await pool.aclose()
+        return pending, retired.is_closed, pool._retiring, pool._close_tasks
+
+    pending, closed, retiring, tasks = _run(scenario())
+
+    assert pending == 1
+    assert closed
+    assert not retiring and not tasks
@@ -0,0 +1,211 @@
+"""BDD steps for McpSessionPool（in-memory FastMCP server，不開 subprocess）."""
+import asyncio
+from contextlib import AsyncExitStack
+from unittest.mock import AsyncMock, patch
+
+import anyio
+import pytest
+from mcp.server.fastmcp import FastMCP
+from mcp.shared.memory import create_client_server_memory_streams
+from pytest_bdd import given, parsers, scenarios, then, when
+
+from src.infrastructure.mcp.cached_tool_loader import CachedMCPToolLoader
+from src.infrastructure.mcp.mcp_session_pool import (
+    McpPoolConfig,
+    McpSessionPool,
+    _PooledMcpSession,
+)
+
+scenarios("unit/agent/mcp_session_pool.feature")
+
+SERVER = {"transport": "http", "url": "http://mcp.example.com/mcp"}
+
+
+def _run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def _make_server() -> FastMCP:
+    server = FastMCP("pool-test")
+
+    @server.tool()
+    def echo(text: str) -> str:
+        """Echo text back."""
+        return f"echo:{text}"
+
+    @server.tool()
+    def other(text: str) -> str:
+        """Another tool."""
+        return text
+
+    return server
+
+
+async def _memory_transport(stack: AsyncExitStack, server_config):
+    """取代真實 HTTP / stdio transport：同 process 內跑 FastMCP server。"""
+    low_level = _make_server()._mcp_server
+    client_streams, server_streams = await stack.enter_async_context(
+        create_client_server_memory_streams()
+    )
+    tg = await stack.enter_async_context(anyio.create_task_group())
+    tg.start_soon(
+        lambda: low_level.run(
+            server_streams[0],
+            server_streams[1],
+            low_level.create_initialization_options(),
+        )
+    )
+    stack.callback(tg.cancel_scope.cancel)
+    return client_streams
+
+
+@pytest.fixture(autouse=True)
+def _patch_transport():
+    with patch(
+        "src.infrastructure.mcp.mcp_session_pool._open_transport",
+        side_effect=_memory_transport,
+    ):
+        yield
+
+
+@pytest.fixture()
+def context():
+    return {"config": {}}
+
+
+# ---------------------------------------------------------------------------
+# Given steps
+# ---------------------------------------------------------------------------
+
+
+@given("一個 MCP session pool")
+def setup_pool(context):
+    pass
+
+
+@given("一個 MCP session pool 閒置 TTL 為 0 秒")
+def setup_pool_zero_idle(context):
+    context["config"]["idle_ttl_seconds"] = 0.0
+
+
+@given("一個 MCP session pool 每次 lease 都做健康檢查")
+def setup_pool_health_check(context):
+    context["config"]["health_check_interval"] = 0.0
+
+
+@given("session ping 會失敗")
+def setup_ping_fails(context):
+    context["ping_fails"] = True
+
+
+@given(parsers.parse("一個 MCP session pool 每個 server 最多 {n:d} 條 session"))
+def setup_pool_max_sessions(context, n):
+    context["config"]["max_sessions_per_server"] = n
+
+
+# ---------------------------------------------------------------------------
+# When steps
+# ---------------------------------------------------------------------------
+
+
+@when(
+    parsers.parse('依序載入同一個 MCP Server 的工具 {n:d} 次並呼叫 "{tool_name}"')
+)
+def load_sequentially(context, n, tool_name):
+    pool = McpSessionPool(McpPoolConfig(**context["config"]))
+    context["pool"] = pool
+
+    async def _do():
+        outputs = []
+        for _ in range(n):
+            async with pool.lease(SERVER) as tools:
+                tool = next(t for t in tools if t.name == tool_name)
+                outputs.append(await tool.ainvoke({"text": "hi"}))
+        context["stats"] = pool.stats()
+        await pool.aclose()
+        return outputs
+
+    if context.get("ping_fails"):
+        with patch.object(
+            _PooledMcpSession, "ping", new=AsyncMock(return_value=False)
+        ):
+            context["outputs"] = _run(_do())
+    else:
+        context["outputs"] = _run(_do())
+
+
+@when(parsers.parse("同時載入同一個 MCP Server 的工具 {n:d} 次"))
+def load_concurrently(context, n):
+    pool = McpSessionPool(McpPoolConfig(**context["config"]))
+
+    async def _one():
+        async with pool.lease(SERVER):
+            await asyncio.sleep(0.01)
+
+    async def _do():
+        await asyncio.gather(*(_one() for _ in range(n)))
+        context["stats"] = pool.stats()
+        await pool.aclose()
+
+    _run(_do())
+
+
+@when(parsers.parse('透過 CachedMCPToolLoader 以 ["{tool_name}"] 篩選載入'))
+def load_via_loader(context, tool_name):
+    pool = McpSessionPool()
+    loader = CachedMCPToolLoader(pool=pool)
+
+    async def _do():
+        async with AsyncExitStack() as stack:
+            context["result"] = await loader.load_tools(
+                stack, SERVER, enabled_tools=[tool_name]
+            )
+        context["stats"] = pool.stats()
+        await pool.aclose()
+
+    _run(_do())
+
+
+# ---------------------------------------------------------------------------
+# Then steps
+# ---------------------------------------------------------------------------
+
+
+@then(parsers.parse("應只建立 {n:d} 條連線"))
+@then(parsers.parse("應建立 {n:d} 條連線"))
+def check_connects(context, n):
+    assert context["stats"]["connects_total"] == n
+
+
+@then(parsers.parse("tool schema 應只載入 {n:d} 次"))
+def check_schema_loads(context, n):
+    assert context["stats"]["schema_loads_total"] == n
+
+
+@then(parsers.parse('工具呼叫應回傳 "{text}"'))
+def check_outputs(context, text):
+    assert all(text in str(out) for out in context["outputs"])
+
+
+@then("所有 lease 歸還後 in_use 應為 0")
+def check_released(context):
+    assert context["stats"]["in_use"] == 0
+
+
+@then("每次歸還都回收閒置 session")
+def check_evictions(context):
+    assert context["stats"]["evictions_total"] == context["stats"]["leases_total"]
+
+
+@then(parsers.parse("健康檢查失敗次數應為 {n:d}"))
+def check_health_failures(context, n):
+    assert context["stats"]["health_check_failures"] == n
+
+
+@then(parsers.parse("應只回傳 {n:d} 個 pooled 工具"))
+def check_pooled_tools(context, n):
+    assert len(context["result"]) == n
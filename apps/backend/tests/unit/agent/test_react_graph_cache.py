@@ -0,0 +1,126 @@
+"""ReActGraphCache — compiled graph template reuse across messages."""
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from langchain_core.messages import AIMessage
+from langchain_core.tools import tool
+
+from src.infrastructure.langgraph.react_agent_service import ReActAgentService
+from src.infrastructure.langgraph.react_graph_cache import (
+    ReActGraphCache,
+    graph_cache_key,
+)
+
+
+def _run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def _make_rag_tool(return_value: str, description: str = "查詢知識庫。"):
+    @tool
+    async def rag_query(query: str) -> str:
+        """查詢知識庫。"""
+        return return_value
+
+    rag_query.description = description
+    return rag_query
+
+
+def _make_mock_llm(side_effects: list[AIMessage]):
+    mock_llm = MagicMock()
+    mock_llm.bind_tools.return_value = mock_llm
+    mock_llm.ainvoke = AsyncMock(side_effect=side_effects)
+    return mock_llm
+
+
+def _tool_call(call_id: str) -> AIMessage:
+    return AIMessage(
+        content="",
+        tool_calls=[{"name": "rag_query", "args": {"query": "q"}, "id": call_id}],
+    )
+
+
+def _ask(service, rag_return: str, llm_responses, max_tool_calls=5, bot_id="bot-1"):
+    mock_llm = _make_mock_llm(llm_responses)
+    with (
+        patch.object(
+            service, "_resolve_llm_model", new=AsyncMock(return_value=mock_llm)
+        ),
+        patch.object(
+            service, "_build_rag_lc_tool", return_value=_make_rag_tool(rag_return)
+        ),
+    ):
+        result = _run(
+            service.process_message(
+                tenant_id="tenant-1",
+                kb_id="kb-1",
+                user_message="退貨政策？",
+                llm_params={"provider_name": "openai", "model": "gpt-4o-mini"},
+                max_tool_calls=max_tool_calls,
+                bot_id=bot_id,
+            )
+        )
+    return result, mock_llm
+
+
+def _service(cache: ReActGraphCache) -> ReActAgentService:
+    return ReActAgentService(
+        llm_service=AsyncMock(),
+        rag_tool=AsyncMock(),
+        graph_cache=cache,
+    )
+
+
+def test_same_bot_reuses_compiled_graph_with_request_state():
+    cache = ReActGraphCache()
+
+    first, _ = _ask(
+        _service(cache), "七天內可退", [_tool_call("c1"), AIMessage(content="A1")]
+    )
+    second, _ = _ask(
+        _service(cache), "三十天內可退", [_tool_call("c2"), AIMessage(content="A2")]
+    )
+
+    assert first.answer == "A1"
+    assert second.answer == "A2"
+    # 第二則訊息的 tool 結果來自自己的 request，不是 template 建立時的 closure
+    assert second.tool_calls[0]["tool_output"] == "三十天內可退"
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_call_count_is_per_request_on_shared_graph():
+    cache = ReActGraphCache()
+    responses = [_tool_call("c1"), _tool_call("c2"), AIMessage(content="done")]
+
+    _, llm_a = _ask(_service(cache), "x", list(responses), max_tool_calls=2)
+    _, llm_b = _ask(_service(cache), "x", list(responses), max_tool_calls=2)
+
+    # 兩次都在第 2 次 agent 迭代停下（計數沒有跨 request 累加）
+    assert llm_a.ainvoke.await_count == 2
+    assert llm_b.ainvoke.await_count == 2
+    assert cache.stats()["hits"] == 1
+
+
+def test_key_changes_with_tool_signature_and_model():
+    a = graph_cache_key("bot-1", [_make_rag_tool("", "v1")], "openai:gpt-4o", 5)
+    b = graph_cache_key("bot-1", [_make_rag_tool("", "v2")], "openai:gpt-4o", 5)
+    c = graph_cache_key("bot-1", [_make_rag_tool("", "v1")], "openai:gpt-4.1", 5)
+    assert len({a, b, c}) == 3
+
+
+def test_lru_eviction_and_bot_invalidation():
+    cache = ReActGraphCache(max_entries=2)
+    for bot in ("b1", "b2", "b3"):
+        cache.get_or_build((bot, (), "m", 5), object)
+
+    assert cache.stats()["entries"] == 2
+    assert cache.stats()["evictions"] == 1
+    assert cache.invalidate_bot("b3") == 1
+    assert cache.stats()["entries"] == 1
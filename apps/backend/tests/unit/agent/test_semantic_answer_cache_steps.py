@@ -0,0 +1,233 @@
+"""語意回答快取 BDD Step Definitions"""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+from pytest_bdd import given, parsers, scenarios, then, when
+
+from src.application.agent.semantic_answer_cache import SemanticAnswerCache
+from src.application.agent.send_message_use_case import (
+    SendMessageCommand,
+    SendMessageUseCase,
+)
+from src.domain.agent.entity import AgentResponse
+from src.domain.bot.entity import Bot
+from src.domain.bot.value_objects import BotId
+from src.domain.conversation.entity import Conversation
+from src.domain.platform.entity import SystemPromptConfig
+from src.domain.rag.value_objects import Source, TokenUsage
+from src.domain.shared.config_invalidation import SCOPE_BOT
+from src.infrastructure.cache.config_invalidation_bus import (
+    InProcessConfigInvalidationBus,
+)
+from src.infrastructure.milvus.kb_change_notifier import KnowledgeChangeNotifier
+
+scenarios("unit/agent/semantic_answer_cache.feature")
+
+# 兩個「週六」問題的 cosine ≈ 0.995，退貨問題與它們正交
+_VECTORS = {
+    "週六有營業嗎": [1.0, 0.0, 0.0],
+    "週六有開嗎": [0.995, 0.0998, 0.0],
+    "怎麼退貨": [0.0, 0.0, 1.0],
+}
+
+
+def _run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+@pytest.fixture
+def context():
+    return {}
+
+
+def _setup(context, tool_name="rag_query"):
+    bot = Bot(
+        id=BotId(value="bot-1"),
+        tenant_id="t-1",
+        name="faq-bot",
+        knowledge_base_ids=["kb-1"],
+        answer_cache_enabled=True,
+        answer_cache_threshold=0.95,
+    )
+    bot_repo = AsyncMock()
+    bot_repo.find_by_id = AsyncMock(return_value=bot)
+    sys_prompt_repo = AsyncMock()
+    sys_prompt_repo.get = AsyncMock(
+        return_value=SystemPromptConfig(system_prompt="你是客服")
+    )
+    embedding = AsyncMock()
+    embedding.embed_query = AsyncMock(side_effect=lambda text: _VECTORS[text])
+
+    agent = AsyncMock()
+
+    async def process_message(**kwargs):
+        return AgentResponse(
+            answer="週六 10:00-22:00 營業",
+            tool_calls=[{"tool_name": tool_name}],
+            sources=[
+                Source(
+                    document_name="營業時間.pdf",
+                    content_snippet="週六 10:00-22:00",
+                    score=0.91,
+                    chunk_id="c-1",
+                    kb_id="kb-1",
+                )
+            ],
+            usage=TokenUsage(model="m", input_tokens=100, output_tokens=20),
+        )
+
+    agent.process_message = AsyncMock(side_effect=process_message)
+
+    async def process_message_stream(**kwargs):
+        yield {"type": "token", "content": "串流回答"}
+        yield {"type": "done"}
+
+    agent.process_message_stream = process_message_stream
+
+    conversations: dict[str, Conversation] = {}
+    conv_repo = AsyncMock()
+
+    async def save(conv):
+        conversations[conv.id.value] = conv
+
+    conv_repo.save = AsyncMock(side_effect=save)
+    conv_repo.find_by_id = AsyncMock(side_effect=lambda cid: conversations.get(cid))
+
+    bus = InProcessConfigInvalidationBus()
+    cache = SemanticAnswerCache(invalidation_bus=bus)
+    context.update(
+        agent=agent,
+        bus=bus,
+        cache=cache,
+        vector_store=KnowledgeChangeNotifier(AsyncMock(), bus),
+        use_case=SendMessageUseCase(
+            agent_service=agent,
+            conversation_repository=conv_repo,
+            bot_repository=bot_repo,
+            system_prompt_config_repository=sys_prompt_repo,
+            answer_cache=cache,
+            embedding_service=embedding,
+        ),
+    )
+
+
+def _ask(context, message, conversation_id=None):
+    return _run(
+        context["use_case"].execute(
+            SendMessageCommand(
+                tenant_id="t-1",
+                bot_id="bot-1",
+                message=message,
+                conversation_id=conversation_id,
+            )
+        )
+    )
+
+
+@given("一個開啟語意回答快取的 Bot")
+def bot_with_answer_cache(context):
+    _setup(context)
+
+
+@given("一個開啟語意回答快取的 Bot 且 agent 呼叫了 MCP 工具")
+def bot_with_mcp_tool(context):
+    _setup(context, tool_name="get_order_status")
+
+
+@when(parsers.parse('依序以新對話提問 "{first}" 與 "{second}"'))
+def ask_two_new_conversations(context, first, second):
+    context["responses"] = [_ask(context, first), _ask(context, second)]
+
+
+@when(parsers.parse('以新對話提問 "{first}" 後在既有對話中提問 "{second}"'))
+def ask_in_existing_conversation(context, first, second):
+    first_resp = _ask(context, first)
+    context["responses"] = [
+        first_resp,
+        _ask(context, second, conversation_id=first_resp.conversation_id),
+    ]
+
+
+@when(
+    parsers.parse(
+        '以新對話提問 "{first}" 後知識庫 "{kb_id}" 寫入新向量再提問 "{second}"'
+    )
+)
+def ask_after_kb_upsert(context, first, kb_id, second):
+    _ask(context, first)
+    _run(
+        context["vector_store"].upsert(
+            collection=f"kb_{kb_id}",
+            ids=["c-2"],
+            vectors=[[0.1, 0.2, 0.3]],
+            payloads=[{"tenant_id": "t-1"}],
+        )
+    )
+    _ask(context, second)
+
+
+@when(parsers.parse('以新對話提問 "{first}" 後發布 bot 失效再提問 "{second}"'))
+def ask_after_bot_invalidation(context, first, second):
+    _ask(context, first)
+    _run(context["bus"].publish(SCOPE_BOT, "bot-1"))
+    _ask(context, second)
+
+
+@when(parsers.parse('以新對話提問 "{first}" 後以串流提問 "{second}"'))
+def ask_then_stream(context, first, second):
+    _ask(context, first)
+
+    async def collect():
+        return [
+            event
+            async for event in context["use_case"].execute_stream(
+                SendMessageCommand(tenant_id="t-1", bot_id="bot-1", message=second)
+            )
+        ]
+
+    context["events"] = _run(collect())
+
+
+@then("agent 只被呼叫 1 次")
+def agent_called_once(context):
+    assert context["agent"].process_message.await_count == 1
+
+
+@then(parsers.parse("agent 被呼叫 {count:d} 次"))
+def agent_called_n_times(context, count):
+    assert context["agent"].process_message.await_count == count
+
+
+@then("第 2 則回覆與第 1 則相同且帶相同來源")
+def second_reply_from_cache(context):
+    first, second = context["responses"]
+    assert second.answer == first.answer
+    assert [s.to_dict() for s in second.sources] == [
+        s.to_dict() for s in first.sources
+    ]
+    assert second.usage is None
+    assert second.message_id
+
+
+@then(parsers.parse("快取統計 hits 為 {hits:d} 且 saved_tokens 為 {tokens:d}"))
+def cache_stats(context, hits, tokens):
+    stats = context["cache"].stats()
+    assert stats["hits"] == hits
+    assert stats["saved_tokens"] == tokens
+    assert stats["per_bot"]["bot-1"]["hits"] == hits
+
+
+@then("串流事件包含快取的答案與來源")
+def stream_events_from_cache(context):
+    events = context["events"]
+    tokens = [e["content"] for e in events if e["type"] == "token"]
+    assert tokens == ["週六 10:00-22:00 營業"]
+    sources = [e for e in events if e["type"] == "sources"]
+    assert sources[0]["sources"][0]["chunk_id"] == "c-1"
+    assert events[-1]["type"] == "done"
@@ -0,0 +1,227 @@
+"""對話視窗載入 — 只載最後 K 則訊息 + DB 摘要，heavy JSON 延遲解碼。"""
+from __future__ import annotations
+
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.application.agent.send_message_use_case import (
+    SendMessageCommand,
+    SendMessageUseCase,
+    _bump_conversation_counters,
+)
+from src.domain.conversation.entity import Conversation
+from src.domain.conversation.value_objects import ConversationId
+from src.infrastructure.conversation.sliding_window_strategy import (
+    SlidingWindowStrategy,
+)
+from src.infrastructure.db.base import Base
+from src.infrastructure.db.models.conversation_model import ConversationModel
+from src.infrastructure.db.models.message_model import MessageModel
+from src.infrastructure.db.repositories.conversation_repository import (
+    SQLAlchemyConversationRepository,
+)
+
+_T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+async def _seed_repo(message_total: int):
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            Base.metadata.create_all,
+            tables=[ConversationModel.__table__, MessageModel.__table__],
+        )
+    session = async_sessionmaker(engine, expire_on_commit=False)()
+    session.add(
+        ConversationModel(
+            id="conv-1", tenant_id="t-1", visitor_id="U1", bot_id="bot-1",
+            created_at=_T0, summary="客戶在問退貨", message_count=message_total,
+        )
+    )
+    for i in range(message_total):
+        session.add(
+            MessageModel(
+                id=f"m-{i:03d}",
+                conversation_id="conv-1",
+                role="user" if i % 2 == 0 else "assistant",
+                content=f"msg {i}",
+                tool_calls_json=json.dumps([{"tool_name": f"t{i}"}]),
+                retrieved_chunks=json.dumps([{"chunk": i}]),
+                created_at=_T0 + timedelta(seconds=i),
+            )
+        )
+    await session.commit()
+    return engine, session
+
+
+def test_find_window_loads_tail_and_counts_offset():
+    async def scenario():
+        engine, session = await _seed_repo(30)
+        try:
+            repo = SQLAlchemyConversationRepository(session)
+            return (
+                await repo.find_window("conv-1", 6),
+                await repo.find_latest_window_by_visitor("U1", "bot-1", 50),
+            )
+        finally:
+            await session.close()
+            await engine.dispose()
+
+    window, full = _run(scenario())
+
+    assert [m.content for m in window.messages] == [
+        f"msg {i}" for i in range(24, 30)
+    ]
+    assert window.history_offset == 24
+    assert window.total_messages == 30
+    assert window.summary == "客戶在問退貨"
+    # 不足 K 則 → 完整歷史
+    assert len(full.messages) == 30 and full.history_offset == 0
+
+
+def test_window_messages_decode_heavy_json_lazily():
+    async def scenario():
+        engine, session = await _seed_repo(4)
+        try:
+            repo = SQLAlchemyConversationRepository(session)
+            return await repo.find_window("conv-1", 2)
+        finally:
+            await session.close()
+            await engine.dispose()
+
+    last = _run(scenario()).messages[-1]
+
+    assert "tool_calls" not in last.__dict__
+    assert "retrieved_chunks" not in last.__dict__
+    assert last.tool_calls == [{"tool_name": "t3"}]
+    assert last.retrieved_chunks == [{"chunk": 3}]
+    assert last.structured_content is None
+    last.tool_calls = []
+    assert last.tool_calls == []
+
+
+def test_send_message_loads_window_and_keeps_total_count():
+    conversation = Conversation(
+        id=ConversationId(value="conv-1"), tenant_id="t-1",
+        summary="客戶在問退貨",
+    )
+    for i in range(30):
+        conversation.add_message("user", f"msg {i}")
+    conversation.keep_last(10)
+    repo = AsyncMock()
+    repo.find_window = AsyncMock(return_value=conversation)
+    use_case = SendMessageUseCase(
+        agent_service=AsyncMock(),
+        conversation_repository=repo,
+        history_strategy=SlidingWindowStrategy(),
+        history_window=10,
+    )
+    command = SendMessageCommand(tenant_id="t-1", conversation_id="conv-1")
+
+    loaded = _run(use_case._load_or_create_conversation(command, 20))
+    _, history_context, _ = _run(
+        use_case._resolve_history(loaded.messages, 20, loaded.summary)
+    )
+    loaded.add_message("user", "new")
+    _bump_conversation_counters(loaded)
+
+    repo.find_window.assert_awaited_once_with("conv-1", 20)
+    repo.find_by_id.assert_not_called()
+    assert history_context.startswith("[對話摘要] 客戶在問退貨\n\n")
+    assert loaded.message_count == 31
+
+
+def test_save_inserts_only_new_messages_without_id_lookup():
+    async def scenario():
+        engine, session = await _seed_repo(30)
+        statements: list[str] = []
+        event.listen(
+            engine.sync_engine,
+            "before_cursor_execute",
+            lambda conn, cursor, stmt, *a: statements.append(stmt),
+        )
+        try:
+            repo = SQLAlchemyConversationRepository(session)
+            conv = await repo.find_window("conv-1", 5)
+            conv.add_message("user", "new q")
+            conv.add_message("assistant", "new a")
+            conv.message_count = conv.total_messages
+            conv.visitor_id = "U-other"
+            statements.clear()
+            await repo.save(conv)
+            writes = list(statements)
+            # 重複 save：沒有新訊息 → 只剩 header UPDATE
+            await repo.save(conv)
+            reloaded = await SQLAlchemyConversationRepository(
+                session
+            ).find_by_id("conv-1")
+            return writes, reloaded
+        finally:
+            await session.close()
+            await engine.dispose()
+
+    writes, reloaded = _run(scenario())
+
+    assert not any(" IN (" in s for s in writes)
+    assert sum(s.lstrip().startswith("INSERT") for s in writes) == 1
+    assert len(reloaded.messages) == 32
+    assert reloaded.messages[-1].content == "new a"
+    assert reloaded.message_count == 32
+    assert reloaded.visitor_id == "U1"  # 既有 visitor_id 不被覆寫
+
+
+def test_save_new_conversation_inserts_header_and_messages():
+    async def scenario():
+        engine, session = await _seed_repo(0)
+        try:
+            repo = SQLAlchemyConversationRepository(session)
+            conv = Conversation(tenant_id="t-1", visitor_id="U2", bot_id="bot-1")
+            conv.add_message("user", "hi")
+            await repo.save(conv)
+            conv.add_message("assistant", "hello")
+            await repo.save(conv)
+            return await repo.find_by_id(conv.id.value)
+        finally:
+            await session.close()
+            await engine.dispose()
+
+    loaded = _run(scenario())
+
+    assert [m.content for m in loaded.messages] == ["hi", "hello"]
+    assert loaded.visitor_id == "U2"
+    assert loaded.new_messages == []
+
+
+def test_save_keeps_tracked_conversation_row_in_sync():
+    async def scenario():
+        engine, session = await _seed_repo(4)
+        try:
+            repo = SQLAlchemyConversationRepository(session)
+            tracked = await session.get(ConversationModel, "conv-1")
+            conv = await repo.find_window("conv-1", 5)
+            conv.add_message("user", "new q")
+            conv.message_count = conv.total_messages
+            conv.summary = "客戶改問換貨"
+            await repo.save(conv)
+            return tracked.summary, tracked.message_count
+        finally:
+            await session.close()
+            await engine.dispose()
+
+    summary, message_count = _run(scenario())
+
+    assert summary == "客戶改問換貨"
+    assert message_count == 5
@@ -0,0 +1,332 @@
+"""BatchWriter — write-behind 批次寫入 request log / trace / usage record。"""
+from __future__ import annotations
+
+import asyncio
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import event, func, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.domain.usage.entity import UsageRecord
+from src.infrastructure.db.base import Base
+from src.infrastructure.db.batch_writer import BatchWriter, BatchWriterConfig
+from src.infrastructure.db.models.request_log_model import RequestLogModel
+from src.infrastructure.db.models.usage_cycle_rollup_model import (
+    UsageCycleRollupModel,
+)
+from src.infrastructure.db.models.usage_record_model import UsageRecordModel
+from src.infrastructure.db.repositories.usage_repository import (
+    SQLAlchemyUsageRepository,
+)
+
+
+def _run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def _log(path: str = "/api/v1/ping", request_id: str = "req-1"):
+    return RequestLogModel(
+        id=uuid.uuid4().hex,
+        request_id=request_id,
+        method="GET",
+        path=path,
+        status_code=200,
+        elapsed_ms=1.0,
+    )
+
+
+async def _with_engine(scenario):
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            Base.metadata.create_all,
+            tables=[
+                RequestLogModel.__table__,
+                UsageRecordModel.__table__,
+                UsageCycleRollupModel.__table__,
+            ],
+        )
+    inserts: list[str] = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("INSERT INTO REQUEST_LOGS"):
+            inserts.append(statement)
+
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    try:
+        return await scenario(factory, inserts)
+    finally:
+        await engine.dispose()
+
+
+class _DownSession:
+    async def __aenter__(self):
+        raise OperationalError("INSERT", None, ConnectionRefusedError("db down"))
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _HangingSession:
+    async def __aenter__(self):
+        await asyncio.Event().wait()
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _OutageFactory:
+    """前 ``failures`` 次開 session 連線失敗；``hang`` 時第一次開 session 卡住。"""
+
+    def __init__(self, factory, failures: int = 0, hang: bool = False):
+        self._factory = factory
+        self.failures = failures
+        self.hang = hang
+
+    def __call__(self):
+        if self.hang:
+            self.hang = False
+            return _HangingSession()
+        if self.failures:
+            self.failures -= 1
+            return _DownSession()
+        return self._factory()
+
+
+async def _save_usage(factory, writer, tokens_list) -> None:
+    async with factory() as session:
+        repo = SQLAlchemyUsageRepository(session, batch_writer=writer)
+        for tokens in tokens_list:
+            await repo.save(
+                UsageRecord(
+                    tenant_id="t-1",
+                    request_type="chat_web",
+                    model="gpt-4o-mini",
+                    input_tokens=tokens,
+                    created_at=datetime(2026, 4, 10, tzinfo=timezone.utc),
+                )
+            )
+
+
+async def _rollup_tokens(factory) -> list[int]:
+    async with factory() as session:
+        rollup = (await session.execute(select(UsageCycleRollupModel))).scalars()
+        return [r.tokens for r in rollup.all()]
+
+
+async def _count_rows(factory, model) -> int:
+    async with factory() as session:
+        result = await session.execute(select(func.count()).select_from(model))
+        return result.scalar_one()
+
+
+def test_size_trigger_flushes_rows_in_one_statement():
+    async def scenario(factory, inserts):
+        writer = BatchWriter(
+            factory, BatchWriterConfig(max_batch=5, flush_interval=5.0)
+        )
+        for i in range(5):
+            assert writer.offer(_log(request_id=f"r{i}"))
+        for _ in range(50):
+            if writer.flushed_rows_total == 5:
+                break
+            await asyncio.sleep(0.01)
+        stats = writer.stats()
+        await writer.aclose()
+        return stats, len(inserts), await _count_rows(factory, RequestLogModel)
+
+    stats, insert_statements, rows = _run(_with_engine(scenario))
+    assert rows == 5
+    assert insert_statements == 1
+    assert stats["flush_batches_total"] == 1
+    assert stats["flushed_by_model"] == {"RequestLogModel": 5}
+
+
+def test_time_trigger_flushes_partial_batch():
+    async def scenario(factory, inserts):
+        writer = BatchWriter(
+            factory, BatchWriterConfig(max_batch=100, flush_interval=0.05)
+        )
+        writer.offer(_log())
+        writer.offer(_log())
+        await asyncio.sleep(0.3)
+        flushed = writer.flushed_rows_total
+        await writer.aclose()
+        return flushed
+
+    assert _run(_with_engine(scenario)) == 2
+
+
+def test_offer_drops_and_counts_when_queue_is_full():
+    async def scenario(factory, inserts):
+        writer = BatchWriter(
+            factory, BatchWriterConfig(max_queue=2, flush_interval=5.0)
+        )
+        results = [writer.offer(_log()) for _ in range(4)]
+        stats = writer.stats()
+        await writer.aclose()
+        return results, stats
+
+    results, stats = _run(_with_engine(scenario))
+    # flusher 尚未取走任何一筆（沒有 await），queue 容量 2
+    assert results == [True, True, False, False]
+    assert stats["dropped_total"] == 2
+
+
+def test_put_waits_for_space_instead_of_dropping():
+    async def scenario(factory, inserts):
+        writer = BatchWriter(
+            factory,
+            BatchWriterConfig(max_queue=2, max_batch=2, flush_interval=0.01),
+        )
+        for i in range(10):
+            await writer.put(_log(request_id=f"r{i}"))
+        await writer.aclose()
+        return writer.stats(), await _count_rows(factory, RequestLogModel)
+
+    stats, rows = _run(_with_engine(scenario))
+    assert rows == 10
+    assert stats["dropped_total"] == 0
+
+
+def test_aclose_drains_queued_rows_and_stops_accepting():
+    async def scenario(factory, inserts):
+        writer = BatchWriter(
+            factory, BatchWriterConfig(max_batch=100, flush_interval=60.0)
+        )
+        for _ in range(7):
+            writer.offer(_log())
+        await writer.aclose()
+        accepted_after_close = writer.offer(_log())
+        return accepted_after_close, await _count_rows(factory, RequestLogModel)
+
+    accepted_after_close, rows = _run(_with_engine(scenario))
+    assert rows == 7
+    assert accepted_after_close is False
+
+
+def test_failed_batch_is_retried_row_by_row():
+    async def scenario(factory, inserts):
+        writer = BatchWriter(
+            factory, BatchWriterConfig(max_batch=10, flush_interval=0.01)
+        )
+        bad = _log()
+        bad.status_code = None  # NOT NULL → 整批失敗
+        writer.offer(_log())
+        writer.offer(bad)
+        writer.offer(_log())
+        await writer.aclose()
+        return writer.stats(), await _count_rows(factory, RequestLogModel)
+
+    stats, rows = _run(_with_engine(scenario))
+    assert rows == 2
+    assert stats["failed_rows_total"] == 1
+    assert stats["retried_batches_total"] == 1
+
+
+def test_usage_records_are_batched_with_rollup_hook():
+    async def scenario(factory, inserts):
+        writer = BatchWriter(
+            factory, BatchWriterConfig(max_batch=100, flush_interval=0.01)
+        )
+        async with factory() as session:
+            repo = SQLAlchemyUsageRepository(session, batch_writer=writer)
+            for tokens in (100, 200, 300):
+                await repo.save(
+                    UsageRecord(
+                        tenant_id="t-1",
+                        request_type="chat_web",
+                        model="gpt-4o-mini",
+                        input_tokens=tokens,
+                        created_at=datetime(2026, 4, 10, tzinfo=timezone.utc),
+                    )
+                )
+        await writer.aclose()
+        async with factory() as session:
+            rollup = (
+                await session.execute(select(UsageCycleRollupModel))
+            ).scalars().all()
+        return (
+            await _count_rows(factory, UsageRecordModel),
+            [(r.cycle_year_month, r.request_type, r.tokens) for r in rollup],
+        )
+
+    records, rollup = _run(_with_engine(scenario))
+    assert records == 3
+    assert rollup == [("2026-04", "chat_web", 600)]
+
+
+def test_transient_db_outage_is_retried_with_backoff():
+    async def scenario(factory, inserts):
+        writer = BatchWriter(
+            _OutageFactory(factory, failures=2),
+            BatchWriterConfig(
+                max_batch=100, flush_interval=0.01, retry_backoff=0.01
+            ),
+        )
+        await _save_usage(factory, writer, (100, 200, 300))
+        await writer.aclose()
+        return (
+            writer.stats(),
+            await _count_rows(factory, UsageRecordModel),
+            await _rollup_tokens(factory),
+        )
+
+    stats, records, rollup = _run(_with_engine(scenario))
+    assert records == 3
+    assert rollup == [600]
+    assert stats["transient_retries_total"] == 2
+    assert stats["lost_rows_total"] == 0
+
+
+def test_usage_rows_lost_only_after_retry_budget_is_counted():
+    async def scenario(factory, inserts):
+        writer = BatchWriter(
+            _OutageFactory(factory, failures=100),
+            BatchWriterConfig(
+                max_batch=100,
+                flush_interval=0.01,
+                retry_attempts=2,
+                retry_backoff=0.01,
+            ),
+        )
+        await _save_usage(factory, writer, (100, 200))
+        await writer.aclose()
+        return writer.stats(), await _count_rows(factory, UsageRecordModel)
+
+    stats, records = _run(_with_engine(scenario))
+    assert records == 0
+    assert stats["lost_rows_total"] == 2
+    assert stats["failed_rows_total"] == 2
+
+
+def test_drain_timeout_writes_pending_usage_rows_directly():
+    async def scenario(factory, inserts):
+        writer = BatchWriter(
+            _OutageFactory(factory, hang=True),
+            BatchWriterConfig(
+                max_batch=100, flush_interval=0.01, drain_timeout=0.1
+            ),
+        )
+        await _save_usage(factory, writer, (100, 200, 300))
+        writer.offer(_log())
+        await asyncio.sleep(0.05)  # flusher 卡在第一批
+        await writer.aclose()
+        return (
+            writer.stats(),
+            await _count_rows(factory, UsageRecordModel),
+            await _rollup_tokens(factory),
+        )
+
+    stats, records, rollup = _run(_with_engine(scenario))
+    assert records == 3
+    assert rollup == [600]
+    assert stats["lost_rows_total"] == 0
+    assert stats["dropped_total"] == 1
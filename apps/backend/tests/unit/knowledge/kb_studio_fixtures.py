@@ -226,6 +226,23 @@ class FakeCategoryRepo(ChunkCategoryRepository):
     async def update_chunk_counts(self, kb_id):
         pass
 
+    async def find_unclassified_chunk_ids(self, kb_id):
+        if self._doc_repo is None:
+            return []
+        doc_ids = {
+            d.id.value for d in self._doc_repo.docs.values() if d.kb_id == kb_id
+        }
+        return [
+            c.id.value
+            for c in self._doc_repo.chunks.values()
+            if c.document_id in doc_ids and c.category_id is None
+        ]
+
+    async def update_centroids(self, centroids):
+        for cat_id, centroid in centroids.items():
+            if cat_id in self.items:
+                self.items[cat_id].centroid = centroid
+
     async def delete_by_id(self, category_id: str) -> None:
         self.items.pop(category_id, None)
 
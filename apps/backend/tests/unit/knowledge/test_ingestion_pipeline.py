@@ -0,0 +1,299 @@
+"""IngestionPipeline — stage 重疊、各 stage 併發上限、bounded queue、metrics。"""
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.application.knowledge.ingestion_pipeline import IngestionPipeline, Stage
+from src.application.knowledge.process_document_use_case import (
+    ProcessDocumentUseCase,
+)
+from src.domain.knowledge.entity import Chunk, Document, KnowledgeBase
+from src.domain.knowledge.value_objects import ChunkId, DocumentId
+
+
+def _run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+class _Probe:
+    """記錄每個 stage 同時在途數與事件順序。"""
+
+    def __init__(self) -> None:
+        self.active: dict[str, int] = {}
+        self.peak: dict[str, int] = {}
+        self.events: list[tuple[str, str, int]] = []
+
+    def stage(self, name: str, delay: float, fail_on: int | None = None):
+        async def fn(batch: list[int]) -> list[int]:
+            self.active[name] = self.active.get(name, 0) + 1
+            self.peak[name] = max(self.peak.get(name, 0), self.active[name])
+            self.events.append(("start", name, batch[0]))
+            try:
+                await asyncio.sleep(delay)
+                if batch[0] == fail_on:
+                    raise RuntimeError(f"{name} failed on {batch[0]}")
+                return batch
+            finally:
+                self.active[name] -= 1
+                self.events.append(("end", name, batch[0]))
+
+        return fn
+
+
+def _batches(n: int) -> list[list[int]]:
+    return [[i, i] for i in range(n)]
+
+
+def test_stages_overlap_within_their_concurrency_limits():
+    probe = _Probe()
+    pipeline = IngestionPipeline(
+        [
+            Stage("embed", probe.stage("embed", 0.01), concurrency=2),
+            Stage("upsert", probe.stage("upsert", 0.02), concurrency=1),
+        ],
+        queue_size=1,
+    )
+
+    results = _run(pipeline.run(_batches(8)))
+
+    assert sorted(b[0] for b in results) == list(range(8))
+    assert probe.peak == {"embed": 2, "upsert": 1}
+    # 第一批 upsert 結束前，後面的 batch 已經在 embed（兩段重疊）
+    first_upsert_end = probe.events.index(("end", "upsert", 0))
+    assert ("start", "embed", 3) in probe.events[:first_upsert_end]
+    metrics = pipeline.metrics()
+    assert metrics["embed"]["batches"] == 8
+    assert metrics["upsert"]["items"] == 16
+    assert metrics["upsert"]["items_per_sec"] > 0
+
+
+def test_bounded_queues_limit_batches_in_flight():
+    embedded: set[int] = set()
+    max_pending = 0
+
+    async def embed(batch):
+        embedded.add(batch[0])
+        return batch
+
+    async def upsert(batch):
+        nonlocal max_pending
+        max_pending = max(max_pending, len(embedded))
+        await asyncio.sleep(0.005)
+        embedded.discard(batch[0])
+        return batch
+
+    pipeline = IngestionPipeline(
+        [Stage("embed", embed, concurrency=1), Stage("upsert", upsert, concurrency=1)],
+        queue_size=2,
+    )
+    _run(pipeline.run(_batches(30)))
+
+    # embed worker 手上 1 + queue 2 + upsert 手上 1
+    assert max_pending <= 4
+    assert pipeline.metrics()["embed"]["blocked_ms"] > 0
+
+
+def test_stage_failure_cancels_pipeline_and_propagates():
+    probe = _Probe()
+    pipeline = IngestionPipeline(
+        [
+            Stage("embed", probe.stage("embed", 0.005, fail_on=2), concurrency=2),
+            Stage("upsert", probe.stage("upsert", 0.05), concurrency=1),
+        ]
+    )
+
+    with pytest.raises(RuntimeError, match="embed failed on 2"):
+        _run(pipeline.run(_batches(20)))
+
+    assert probe.active == {"embed": 0, "upsert": 0}
+    started = {b for kind, name, b in probe.events if kind == "start" and name == "embed"}
+    assert len(started) < 20
+
+
+class _MemoryVectorStore:
+    """只記 point id → payload；delete 依 payload 欄位過濾。"""
+
+    def __init__(self) -> None:
+        self.points: dict[str, dict] = {}
+        self.upserted_total = 0
+
+    async def ensure_collection(self, collection, vector_size):
+        return None
+
+    async def upsert(self, collection, ids, vectors, payloads):
+        await asyncio.sleep(0)
+        self.points.update(zip(ids, payloads, strict=True))
+        self.upserted_total += len(ids)
+
+    async def delete(self, collection, filters, *, raise_on_error=False):
+        self.points = {
+            pid: p
+            for pid, p in self.points.items()
+            if any(p.get(k) != v for k, v in filters.items())
+        }
+
+
+def _use_case(chunks, **kwargs):
+    doc = Document(
+        id=DocumentId(value="doc-1"),
+        kb_id="kb-1",
+        tenant_id="t-1",
+        filename="a.txt",
+        content_type="text/plain",
+        raw_content=b"x" * 100,
+    )
+    doc_repo = AsyncMock()
+    doc_repo.find_by_id = AsyncMock(return_value=doc)
+    del doc_repo._session
+    kb_repo = AsyncMock()
+    kb_repo.find_by_id = AsyncMock(
+        return_value=KnowledgeBase(ocr_mode="general", context_model="m")
+    )
+    splitter = MagicMock()
+    splitter.split.return_value = chunks
+    parser = MagicMock()
+    parser.parse.return_value = "some text " * 50
+    del parser.parse_pdf_async
+    parser.last_input_tokens = parser.last_output_tokens = 0
+    storage = AsyncMock()
+    storage.load = AsyncMock(side_effect=FileNotFoundError)
+    detector = MagicMock()
+    detector.detect.return_value = "zh-TW"
+
+    embedding = MagicMock()
+
+    async def embed_texts(texts):
+        embedding.last_total_tokens = 10 * len(texts)
+        await asyncio.sleep(0)
+        return [[0.1] * 4 for _ in texts]
+
+    embedding.embed_texts = AsyncMock(side_effect=embed_texts)
+    embedding._model = "emb"
+
+    context_service = MagicMock()
+
+    async def generate_contexts(content, batch, model=""):
+        context_service.last_input_tokens = len(batch)
+        context_service.last_output_tokens = 1
+        context_service.last_cache_read_tokens = 0
+        context_service.last_cache_creation_tokens = 0
+        for c in batch:
+            c.context_text = f"ctx-{c.chunk_index}"
+        return batch
+
+    context_service.generate_contexts = AsyncMock(side_effect=generate_contexts)
+    context_service.last_model = "m"
+    vector_store = kwargs.pop("vector_store", None) or AsyncMock()
+    record_usage = AsyncMock()
+    task_repo = AsyncMock()
+    use_case = ProcessDocumentUseCase(
+        document_repository=doc_repo,
+        processing_task_repository=task_repo,
+        knowledge_base_repository=kb_repo,
+        text_splitter_service=splitter,
+        embedding_service=embedding,
+        vector_store=vector_store,
+        language_detection_service=detector,
+        file_parser_service=parser,
+        document_file_storage=storage,
+        record_usage_use_case=record_usage,
+        chunk_context_service=context_service,
+        **kwargs,
+    )
+    return use_case, doc_repo, task_repo, vector_store, record_usage, embedding
+
+
+def test_process_document_streams_chunk_batches_through_stages(monkeypatch):
+    monkeypatch.setattr(
+        "src.application.knowledge.process_document_use_case._update_progress",
+        AsyncMock(),
+    )
+    monkeypatch.setattr(
+        ProcessDocumentUseCase, "_maybe_trigger_classification", AsyncMock()
+    )
+    chunks = [
+        Chunk(
+            id=ChunkId(value=f"c{i}"),
+            document_id="doc-1",
+            tenant_id="t-1",
+            content=f"這是第 {i} 段內容，長度足以通過品質過濾的門檻。" * 2,
+            chunk_index=i,
+        )
+        for i in range(7)
+    ]
+    use_case, doc_repo, task_repo, vector_store, record_usage, embedding = _use_case(
+        chunks, ingest_batch_size=3
+    )
+
+    _run(use_case.execute("doc-1", "task-1"))
+
+    assert [len(c.args[0]) for c in embedding.embed_texts.call_args_list] == [3, 3, 1]
+    assert vector_store.ensure_collection.await_count == 1
+    assert sorted(
+        cid for c in vector_store.upsert.call_args_list for cid in c.args[1]
+    ) == [f"c{i}" for i in range(7)]
+    saved = doc_repo.save_chunks.call_args.args[0]
+    assert [c.chunk_index for c in saved] == list(range(7))
+    assert all(c.context_text for c in saved)
+
+    usage = {
+        c.kwargs["request_type"]: c.kwargs["usage"]
+        for c in record_usage.execute.call_args_list
+    }
+    assert usage["embedding"].input_tokens == 70
+    assert usage["contextual_retrieval"].input_tokens == 7
+
+    metrics = task_repo.update_metrics.call_args.args[1]
+    assert set(metrics) == {"context", "embed", "upsert"}
+    assert metrics["upsert"]["items"] == 7
+    assert task_repo.update_status.call_args.args[1] == "completed"
+
+
+def test_failed_middle_batch_leaves_no_vectors_behind(monkeypatch):
+    monkeypatch.setattr(
+        "src.application.knowledge.process_document_use_case._update_progress",
+        AsyncMock(),
+    )
+    monkeypatch.setattr(
+        ProcessDocumentUseCase, "_maybe_trigger_classification", AsyncMock()
+    )
+    chunks = [
+        Chunk(
+            id=ChunkId(value=f"c{i}"),
+            document_id="doc-1",
+            tenant_id="t-1",
+            content=f"這是第 {i} 段內容，長度足以通過品質過濾的門檻。" * 2,
+            chunk_index=i,
+        )
+        for i in range(9)
+    ]
+    store = _MemoryVectorStore()
+    use_case, doc_repo, task_repo, _, _, embedding = _use_case(
+        chunks, ingest_batch_size=3, vector_store=store
+    )
+
+    async def embed_texts(texts):
+        if any("第 4 段" in t for t in texts):
+            # 第一批先寫進 vector store 之後，中間這批才失敗
+            while not store.upserted_total:
+                await asyncio.sleep(0.001)
+            raise RuntimeError("embedding provider down")
+        await asyncio.sleep(0)
+        return [[0.1] * 4 for _ in texts]
+
+    embedding.embed_texts = AsyncMock(side_effect=embed_texts)
+
+    with pytest.raises(RuntimeError, match="embedding provider down"):
+        _run(use_case.execute("doc-1", "task-1"))
+
+    assert store.upserted_total > 0
+    assert store.points == {}
+    doc_repo.save_chunks.assert_not_awaited()
+    assert task_repo.update_status.call_args.args[1] == "failed"
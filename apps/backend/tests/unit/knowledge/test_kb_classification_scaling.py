@@ -0,0 +1,234 @@
+"""KB 自動分類 — sample 聚類 + centroid 指派、off-loop、增量指派新 chunk。"""
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+
+from src.application.knowledge.classify_kb_use_case import ClassifyKbUseCase
+from src.domain.knowledge.entity import Chunk, ChunkCategory, Document
+from src.domain.knowledge.value_objects import ChunkId, DocumentId
+from src.infrastructure.classification.cluster_classification_service import (
+    ClusterClassificationService,
+    cluster_vectors,
+    shutdown_cluster_executor,
+)
+from src.infrastructure.llm.llm_caller import LLMCallResult
+from tests.unit.knowledge.kb_studio_fixtures import (
+    FakeCategoryRepo,
+    FakeDocumentRepo,
+    FakeKbRepo,
+    run,
+)
+
+DIM = 16
+
+
+def _blobs(per_cluster: int, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    """3 個彼此正交的方向 + 小雜訊。"""
+    rng = np.random.default_rng(seed)
+    centers = np.eye(DIM, dtype=np.float32)[:3]
+    X = np.concatenate([
+        c + rng.normal(0, 0.05, size=(per_cluster, DIM)).astype(np.float32)
+        for c in centers
+    ])
+    truth = np.repeat(np.arange(3), per_cluster)
+    return X, truth
+
+
+def _axis(i: int, noise: float = 0.0) -> list[float]:
+    v = [noise] * DIM
+    v[i] = 1.0
+    return v
+
+
+def test_sampled_clustering_assigns_every_vector_consistently():
+    X, truth = _blobs(per_cluster=400)
+    labels, centroids = cluster_vectors(X, max_sample=60, seed=1)
+
+    assert len(labels) == len(X)
+    assert centroids.shape == (3, DIM)
+    # 每個真實群只對應到一個 label，且不同群不共用 label
+    mapping = {t: set(labels[truth == t].tolist()) for t in range(3)}
+    assert all(len(v) == 1 for v in mapping.values())
+    assert len(set.union(*mapping.values())) == 3
+
+
+def _llm_result(text: str = "分類") -> LLMCallResult:
+    return LLMCallResult(text=text, input_tokens=10, output_tokens=2)
+
+
+def test_classify_runs_off_loop_and_returns_centroids():
+    X, _ = _blobs(per_cluster=10)
+    service = ClusterClassificationService(process_workers=0, max_cluster_sample=12)
+    with patch(
+        "src.infrastructure.llm.llm_caller.call_llm",
+        AsyncMock(return_value=_llm_result()),
+    ):
+        categories, chunk_to_cat = run(service.classify(
+            chunk_ids=[f"c{i}" for i in range(len(X))],
+            chunk_contents=["x"] * len(X),
+            vectors=X.tolist(),
+            kb_id="kb-1",
+            tenant_id="t-1",
+        ))
+
+    assert len(categories) == 3
+    assert len(chunk_to_cat) == len(X)
+    assert all(c.centroid and len(c.centroid) == DIM for c in categories)
+    assert sum(c.chunk_count for c in categories) == len(X)
+
+
+def test_cluster_work_runs_in_process_pool():
+    X, _ = _blobs(per_cluster=5)
+    service = ClusterClassificationService(process_workers=1)
+    categories = [
+        ChunkCategory(id=f"cat-{i}", centroid=_axis(i)) for i in range(3)
+    ]
+    try:
+        assigned = run(service.assign(X.tolist(), categories))
+    finally:
+        shutdown_cluster_executor()
+    assert assigned == ["cat-0"] * 5 + ["cat-1"] * 5 + ["cat-2"] * 5
+
+
+def _kb_with_chunks(classified: int, new: int):
+    doc_repo = FakeDocumentRepo()
+    doc = Document(id=DocumentId(value="doc-1"), kb_id="kb-1", tenant_id="t-1")
+    doc_repo.docs[doc.id.value] = doc
+    vectors: dict[str, list[float]] = {}
+    for i in range(classified + new):
+        cid = f"chunk-{i}"
+        doc_repo.chunks[cid] = Chunk(
+            id=ChunkId(value=cid),
+            document_id="doc-1",
+            tenant_id="t-1",
+            category_id=("cat-0" if i % 2 == 0 else "cat-1") if i < classified else None,
+        )
+        vectors[cid] = _axis(i % 2, noise=0.01)
+    cat_repo = FakeCategoryRepo(doc_repo)
+    for k in range(2):
+        cat_repo.items[f"cat-{k}"] = ChunkCategory(
+            id=f"cat-{k}",
+            kb_id="kb-1",
+            tenant_id="t-1",
+            chunk_count=classified // 2,
+            centroid=_axis(k),
+        )
+    kb_repo = FakeKbRepo()
+    kb_repo.items["kb-1"] = type("KB", (), {"id": "kb-1", "classification_model": "openai:gpt-4o-mini"})()
+
+    vector_store = AsyncMock()
+
+    async def fetch_vectors(collection, ids):
+        return [(cid, vectors[cid], {"content": cid}) for cid in ids]
+
+    vector_store.fetch_vectors = AsyncMock(side_effect=fetch_vectors)
+    return doc_repo, cat_repo, kb_repo, vector_store
+
+
+def _use_case(doc_repo, cat_repo, kb_repo, vector_store, service, **kwargs):
+    return ClassifyKbUseCase(
+        knowledge_base_repository=kb_repo,
+        document_repository=doc_repo,
+        category_repository=cat_repo,
+        vector_store=vector_store,
+        classification_service=service,
+        **kwargs,
+    )
+
+
+def test_incremental_run_assigns_only_new_chunks_without_reclustering():
+    doc_repo, cat_repo, kb_repo, vector_store = _kb_with_chunks(classified=40, new=8)
+    service = ClusterClassificationService(process_workers=0)
+    service.classify = AsyncMock()
+    assigned_pages: list[int] = []
+    assign_chunks = cat_repo.assign_chunks
+
+    async def record_assign(category_id, chunk_ids):
+        assigned_pages.append(len(chunk_ids))
+        await assign_chunks(category_id, chunk_ids)
+
+    cat_repo.assign_chunks = record_assign
+    use_case = _use_case(
+        doc_repo, cat_repo, kb_repo, vector_store, service, assign_batch_size=3
+    )
+
+    run(use_case.execute("kb-1", "t-1", incremental=True))
+
+    service.classify.assert_not_called()
+    fetched = [cid for call in vector_store.fetch_vectors.call_args_list for cid in call.args[1]]
+    assert sorted(fetched) == sorted(f"chunk-{i}" for i in range(40, 48))
+    for i in range(40, 48):
+        assert doc_repo.chunks[f"chunk-{i}"].category_id == f"cat-{i % 2}"
+    # 每個 category 4 筆新 chunk，依 assign_batch_size=3 分頁 UPDATE
+    assert sorted(assigned_pages) == [1, 1, 3, 3]
+    assert cat_repo.items["cat-0"].chunk_count == 24
+    assert np.isclose(np.linalg.norm(cat_repo.items["cat-0"].centroid), 1.0)
+
+
+def test_incremental_falls_back_to_full_clustering_when_many_new_chunks():
+    doc_repo, cat_repo, kb_repo, vector_store = _kb_with_chunks(classified=4, new=10)
+    doc_repo.find_chunk_ids_by_kb = AsyncMock(
+        return_value={"doc-1": list(doc_repo.chunks)}
+    )
+    service = ClusterClassificationService(process_workers=0)
+    service.classify = AsyncMock(return_value=([], {}))
+    use_case = _use_case(doc_repo, cat_repo, kb_repo, vector_store, service)
+
+    run(use_case.execute("kb-1", "t-1", incremental=True))
+
+    service.classify.assert_awaited_once()
+
+
+class _FakeSession:
+    def __init__(self) -> None:
+        self.statements: list = []
+
+    async def execute(self, stmt):
+        self.statements.append(stmt)
+
+    async def commit(self):
+        pass
+
+
+def test_full_run_clusters_a_sample_and_assigns_the_rest_in_pages():
+    doc_repo, cat_repo, kb_repo, vector_store = _kb_with_chunks(classified=0, new=30)
+    doc_repo.find_chunk_ids_by_kb = AsyncMock(
+        return_value={"doc-1": list(doc_repo.chunks)}
+    )
+    service = ClusterClassificationService(process_workers=0)
+
+    async def classify(chunk_ids, chunk_contents, vectors, kb_id, tenant_id, model=""):
+        cats = [
+            ChunkCategory(id=f"new-{k}", kb_id=kb_id, centroid=_axis(k))
+            for k in range(2)
+        ]
+        return cats, {
+            cid: f"new-{int(v[1] == 1.0)}"
+            for cid, v in zip(chunk_ids, vectors, strict=True)
+        }
+
+    service.classify = AsyncMock(side_effect=classify)
+    session = _FakeSession()
+
+    @asynccontextmanager
+    async def session_factory():
+        yield session
+
+    use_case = _use_case(
+        doc_repo, cat_repo, kb_repo, vector_store, service,
+        max_cluster_sample=10, assign_batch_size=8,
+    )
+    with patch(
+        "src.infrastructure.db.engine.async_session_factory", session_factory
+    ):
+        run(use_case.execute("kb-1", "t-1"))
+
+    calls = vector_store.fetch_vectors.call_args_list
+    assert len(calls[0].args[1]) == 10  # 只抓 sample 做聚類
+    assert [len(c.args[1]) for c in calls[1:]] == [8, 8, 4]
+    assert set(cat_repo.items) == {"new-0", "new-1"}
+    # 每個 category 15 筆，IN list 依 assign_batch_size=8 拆成 2 條 UPDATE
+    assert len(session.statements) == 2 * 2
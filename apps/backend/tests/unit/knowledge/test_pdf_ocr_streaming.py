@@ -0,0 +1,148 @@
+"""PDF OCR streaming pipeline — 逐頁 render、bounded in-flight window、逐頁回報。"""
+from __future__ import annotations
+
+import asyncio
+import io
+
+import pytest
+
+from src.domain.shared.exceptions import OcrProcessingError
+from src.infrastructure.file_parser.ocr_file_parser_service import (
+    OcrFileParserService,
+)
+from src.infrastructure.file_parser.pdf_page_extractor import PdfPageRenderer
+
+
+def _run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def _make_blank_pdf(num_pages: int) -> bytes:
+    from pypdf import PdfWriter
+
+    writer = PdfWriter()
+    for _ in range(num_pages):
+        writer.add_blank_page(width=72, height=72)
+    buf = io.BytesIO()
+    writer.write(buf)
+    return buf.getvalue()
+
+
+class _SlowOcrEngine:
+    """記錄同時在途的頁數；第 ``fail_on`` 次呼叫丟例外。"""
+
+    def __init__(self, delay: float = 0.01, fail_on: int | None = None) -> None:
+        self.delay = delay
+        self.fail_on = fail_on
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.cancelled = 0
+        self.last_input_tokens = 0
+        self.last_output_tokens = 0
+        self._model = "fake-ocr"
+
+    async def ocr_page(self, image_bytes: bytes, prompt: str) -> str:
+        self.calls += 1
+        call = self.calls
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            # 後送的頁先完成，確認輸出仍依頁碼排序
+            await asyncio.sleep(self.delay * (1 + (call % 3)))
+            if call == self.fail_on:
+                raise OcrProcessingError(f"page {call} failed")
+            return f"page-{call}"
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture
+def render_log(monkeypatch):
+    """記錄 render 了哪些頁。"""
+    rendered: list[int] = []
+    original = PdfPageRenderer._render
+
+    def _render(self, index):
+        rendered.append(index)
+        return original(self, index)
+
+    monkeypatch.setattr(PdfPageRenderer, "_render", _render)
+    return rendered
+
+
+def test_in_flight_pages_are_bounded_by_window(render_log):
+    engine = _SlowOcrEngine()
+    parser = OcrFileParserService(ocr_engine=engine, window=3)
+
+    content = _run(parser.parse_pdf_async(_make_blank_pdf(10), ocr_mode="catalog"))
+
+    assert content.split("\f") == [f"page-{i}" for i in range(1, 11)]
+    assert engine.max_in_flight == 3
+    assert render_log == list(range(10))
+
+
+def test_max_pages_skips_rendering_remaining_pages(render_log):
+    engine = _SlowOcrEngine()
+    parser = OcrFileParserService(ocr_engine=engine, window=2)
+
+    content = _run(
+        parser.parse_pdf_async(_make_blank_pdf(8), ocr_mode="catalog", max_pages=3)
+    )
+
+    assert content.count("\f") == 2
+    assert render_log == [0, 1, 2]
+
+
+def test_progress_and_page_callbacks_fire_per_page():
+    engine = _SlowOcrEngine()
+    parser = OcrFileParserService(ocr_engine=engine, window=2)
+    progress: list[tuple[int, int]] = []
+    pages: dict[int, str] = {}
+
+    async def on_progress(done: int, total: int) -> None:
+        progress.append((done, total))
+
+    async def on_page(page_number: int, text: str) -> None:
+        pages[page_number] = text
+
+    content = _run(parser.parse_pdf_async(
+        _make_blank_pdf(5),
+        ocr_mode="catalog",
+        on_progress=on_progress,
+        on_page=on_page,
+    ))
+
+    assert progress == [(i, 5) for i in range(1, 6)]
+    assert sorted(pages) == [1, 2, 3, 4, 5]
+    assert content.split("\f") == [pages[i] for i in range(1, 6)]
+
+
+def test_page_failure_cancels_in_flight_pages_and_propagates(render_log):
+    engine = _SlowOcrEngine(delay=0.05, fail_on=1)
+    parser = OcrFileParserService(ocr_engine=engine, window=3)
+
+    with pytest.raises(OcrProcessingError):
+        _run(parser.parse_pdf_async(_make_blank_pdf(20), ocr_mode="catalog"))
+
+    assert engine.cancelled >= 1
+    assert engine.in_flight == 0
+    assert len(render_log) < 20  # 失敗後不再 render 後面的頁
+
+
+def test_sync_parse_uses_the_same_pipeline():
+    engine = _SlowOcrEngine()
+    parser = OcrFileParserService(ocr_engine=engine, window=2)
+
+    content = parser.parse(_make_blank_pdf(3), "application/pdf", "catalog")
+
+    assert content.split("\f") == ["page-1", "page-2", "page-3"]
+    assert engine.max_in_flight == 2
+    assert parser.last_model == "fake-ocr"
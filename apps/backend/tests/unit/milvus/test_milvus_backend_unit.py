@@ -0,0 +1,116 @@
+"""Milvus RPC backends — dedicated executor metrics + AsyncMilvusClient path.
+
+No Milvus instance required: MilvusClient / AsyncMilvusClient are patched.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.infrastructure.milvus.milvus_executor import InstrumentedExecutor
+from src.infrastructure.milvus.milvus_vector_store import MilvusVectorStore
+
+
+def _run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def test_executor_reports_queue_depth_when_saturated():
+    executor = InstrumentedExecutor(max_workers=1, name="test-milvus")
+    release = threading.Event()
+
+    async def scenario():
+        tasks = [
+            asyncio.ensure_future(executor.run(release.wait, 5)) for _ in range(3)
+        ]
+        await asyncio.sleep(0.05)
+        depth_while_blocked = executor.queue_depth
+        release.set()
+        await asyncio.gather(*tasks)
+        return depth_while_blocked
+
+    try:
+        depth = _run(scenario())
+    finally:
+        executor.shutdown()
+
+    stats = executor.stats()
+    assert depth == 2
+    assert stats["max_queue_depth"] >= 2
+    assert stats["calls_total"] == 3
+    assert stats["queue_depth"] == 0
+    assert stats["running"] == 0
+
+
+def test_cancelled_queued_call_does_not_leak_queue_depth():
+    executor = InstrumentedExecutor(max_workers=1, name="test-milvus")
+    release = threading.Event()
+
+    async def scenario():
+        blocker = asyncio.ensure_future(executor.run(release.wait, 5))
+        queued = asyncio.ensure_future(executor.run(lambda: "never"))
+        await asyncio.sleep(0.05)
+        queued.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+        release.set()
+        await blocker
+        await asyncio.sleep(0.05)
+
+    try:
+        _run(scenario())
+    finally:
+        executor.shutdown()
+
+    assert executor.queue_depth == 0
+    assert executor.stats()["calls_total"] == 1
+
+
+def test_async_backend_uses_async_client_method():
+    with patch(
+        "src.infrastructure.milvus.milvus_vector_store.MilvusClient"
+    ) as client_cls:
+        sync_client = MagicMock()
+        client_cls.return_value = sync_client
+        store = MilvusVectorStore(uri="http://milvus:19530", backend="async")
+
+    async_client = MagicMock()
+    async_client.has_collection = AsyncMock(return_value=True)
+    async_client.load_collection = AsyncMock(return_value=None)
+    with patch("pymilvus.AsyncMilvusClient", return_value=async_client):
+        _run(store.ensure_collection("kb_k-1", 4))
+
+    async_client.has_collection.assert_awaited_once()
+    async_client.load_collection.assert_awaited_once()
+    sync_client.has_collection.assert_not_called()
+    assert store.runtime_stats()["backend"] == "async"
+
+
+def test_executor_backend_runs_sync_client_off_loop():
+    with patch(
+        "src.infrastructure.milvus.milvus_vector_store.MilvusClient"
+    ) as client_cls:
+        sync_client = MagicMock()
+        sync_client.has_collection.return_value = True
+        client_cls.return_value = sync_client
+        store = MilvusVectorStore(uri="http://milvus:19530")
+
+    _run(store.ensure_collection("kb_k-1", 4))
+
+    sync_client.has_collection.assert_called_once()
+    sync_client.load_collection.assert_called_once()
+    assert store.runtime_stats()["executor"]["calls_total"] >= 2
+
+
+def test_unknown_backend_rejected():
+    with patch("src.infrastructure.milvus.milvus_vector_store.MilvusClient"):
+        with pytest.raises(ValueError):
+            MilvusVectorStore(uri="http://milvus:19530", backend="grpc")
@@ -0,0 +1,162 @@
+"""Partition-key collection layout + migration through RebuildIndexUseCase.
+
+No Milvus instance required: MilvusClient is patched.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.application.milvus.rebuild_index_use_case import (
+    RebuildIndexCommand,
+    RebuildIndexUseCase,
+)
+from src.infrastructure.milvus.milvus_vector_store import (
+    MilvusVectorStore,
+    _build_schema,
+)
+
+
+def _run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def _make_store(**kwargs):
+    with patch(
+        "src.infrastructure.milvus.milvus_vector_store.MilvusClient"
+    ) as client_cls:
+        client = MagicMock()
+        client_cls.return_value = client
+        store = MilvusVectorStore(uri="http://milvus:19530", **kwargs)
+    return store, client
+
+
+def _describe(partition_key: str = "") -> dict:
+    return {
+        "fields": [
+            {"name": "id"},
+            {"name": "vector", "params": {"dim": 4}},
+            {"name": "tenant_id", "is_partition_key": partition_key == "tenant_id"},
+            {
+                "name": "document_id",
+                "is_partition_key": partition_key == "document_id",
+            },
+            {"name": "content"},
+        ]
+    }
+
+
+def _iterator(batches: list[list[dict]]) -> MagicMock:
+    it = MagicMock()
+    it.next.side_effect = [*batches, []]
+    return it
+
+
+def test_schema_marks_partition_key_field():
+    schema = _build_schema(4, "document_id")
+    assert schema.partition_key_field.name == "document_id"
+    assert _build_schema(4).partition_key_field is None
+    with pytest.raises(ValueError):
+        _build_schema(4, "content")
+
+
+def test_new_collection_uses_configured_partition_key():
+    store, client = _make_store(partition_key="tenant_id", num_partitions=32)
+    client.has_collection.return_value = False
+
+    _run(store.ensure_collection("conv_summaries", 4))
+
+    kwargs = client.create_collection.call_args.kwargs
+    assert kwargs["schema"].partition_key_field.name == "tenant_id"
+    assert kwargs["num_partitions"] == 32
+
+
+def test_default_layout_has_no_partition_key():
+    store, client = _make_store()
+    client.has_collection.return_value = False
+
+    _run(store.ensure_collection("kb_k-1", 4))
+
+    kwargs = client.create_collection.call_args.kwargs
+    assert kwargs["schema"].partition_key_field is None
+    assert "num_partitions" not in kwargs
+
+
+def test_migration_copies_rows_then_swaps_collections():
+    store, client = _make_store()
+    client.describe_collection.return_value = _describe()
+    client.has_collection.return_value = False
+    rows = [{"id": f"c{i}", "vector": [0.1] * 4} for i in range(3)]
+    client.query_iterator.return_value = _iterator([rows[:2], rows[2:]])
+    client.query.return_value = [{"count(*)": 3}]
+
+    result = _run(store.migrate_partition_key("kb_k-1", "document_id"))
+
+    assert result == {
+        "partition_key": "document_id",
+        "previous_partition_key": None,
+        "migrated": True,
+        "rows": 3,
+    }
+    created = client.create_collection.call_args.kwargs
+    assert created["collection_name"] == "kb_k_1__pk_migration"
+    assert created["schema"].partition_key_field.name == "document_id"
+    assert client.insert.call_count == 2
+    client.drop_collection.assert_called_once_with(collection_name="kb_k_1")
+    client.rename_collection.assert_called_once_with(
+        old_name="kb_k_1__pk_migration", new_name="kb_k_1"
+    )
+    client.query_iterator.return_value.close.assert_called_once()
+
+
+def test_migration_is_noop_when_layout_already_matches():
+    store, client = _make_store()
+    client.describe_collection.return_value = _describe("tenant_id")
+
+    result = _run(store.migrate_partition_key("kb_k-1", "tenant_id"))
+
+    assert result == {"partition_key": "tenant_id", "migrated": False}
+    client.create_collection.assert_not_called()
+
+
+def test_migration_keeps_original_on_count_mismatch():
+    store, client = _make_store()
+    client.describe_collection.return_value = _describe()
+    client.has_collection.return_value = False
+    client.query_iterator.return_value = _iterator([[{"id": "c1"}]])
+    client.query.return_value = [{"count(*)": 2}]
+
+    with pytest.raises(RuntimeError):
+        _run(store.migrate_partition_key("kb_k-1", "tenant_id"))
+
+    client.drop_collection.assert_called_once_with(
+        collection_name="kb_k_1__pk_migration"
+    )
+    client.rename_collection.assert_not_called()
+
+
+def test_use_case_routes_partition_key_to_migration():
+    vs = MagicMock()
+
+    async def _migrate(collection, partition_key):
+        return {"partition_key": partition_key, "migrated": True}
+
+    vs.migrate_partition_key = _migrate
+    use_case = RebuildIndexUseCase(vector_store=vs)
+
+    result = _run(
+        use_case.execute(
+            RebuildIndexCommand(collection_name="kb_k1", partition_key="tenant_id")
+        )
+    )
+
+    assert result["status"] == "ok"
+    assert result["partition_key"] == "tenant_id"
+    vs.rebuild_scalar_indexes.assert_not_called()
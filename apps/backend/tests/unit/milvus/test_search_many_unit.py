@@ -0,0 +1,144 @@
+"""search_many — multi-vector single-RPC Milvus search.
+
+No Milvus instance required: MilvusClient is patched and we pin the RPC
+shape (one search call with every query vector) plus the per-query demux.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+from src.application.rag.query_rag_use_case import QueryRAGCommand, QueryRAGUseCase
+from src.domain.rag.value_objects import SearchResult
+from src.infrastructure.milvus.milvus_vector_store import MilvusVectorStore
+from tests.unit.knowledge.kb_studio_fixtures import (
+    FakeEmbeddingService,
+    FakeKbRepo,
+    FakeVectorStore,
+    make_kb,
+)
+
+
+def _run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def _hit(cid: str, score: float) -> dict:
+    return {"id": cid, "distance": score, "entity": {"content": cid, "tenant_id": "T1"}}
+
+
+def _make_store(search_return):
+    with patch(
+        "src.infrastructure.milvus.milvus_vector_store.MilvusClient"
+    ) as client_cls:
+        client = MagicMock()
+        client.describe_collection.return_value = {"fields": []}
+        client.search.return_value = search_return
+        client_cls.return_value = client
+        store = MilvusVectorStore(uri="http://milvus:19530")
+    return store, client
+
+
+def test_search_many_sends_all_vectors_in_one_rpc():
+    store, client = _make_store(
+        [[_hit("a", 0.9)], [_hit("b", 0.8)], [_hit("c", 0.7)]]
+    )
+    vectors = [[0.1, 0.2], [0.3, 0.4], [0.5, 0.6]]
+
+    results = _run(
+        store.search_many(
+            collection="kb_k-1",
+            query_vectors=vectors,
+            limit=5,
+            filters={"tenant_id": "T1"},
+        )
+    )
+
+    assert client.search.call_count == 1
+    kwargs = client.search.call_args.kwargs
+    assert kwargs["data"] == vectors
+    assert kwargs["collection_name"] == "kb_k_1"
+    assert kwargs["filter"] == 'tenant_id == "T1"'
+    assert [[r.id for r in batch] for batch in results] == [["a"], ["b"], ["c"]]
+
+
+def test_search_many_applies_threshold_per_query():
+    store, _ = _make_store([[_hit("a", 0.9), _hit("low", 0.1)], []])
+
+    results = _run(
+        store.search_many(
+            collection="kb_1",
+            query_vectors=[[0.1], [0.2]],
+            score_threshold=0.3,
+        )
+    )
+
+    assert [r.id for r in results[0]] == ["a"]
+    assert results[1] == []
+
+
+def test_search_delegates_to_single_vector_search_many():
+    store, client = _make_store([[_hit("a", 0.9)]])
+
+    results = _run(store.search(collection="kb_1", query_vector=[0.1]))
+
+    assert client.search.call_args.kwargs["data"] == [[0.1]]
+    assert [r.id for r in results] == ["a"]
+
+
+class _CountingVectorStore(FakeVectorStore):
+    def __init__(self) -> None:
+        super().__init__()
+        self.search_many_calls: list[tuple[str, int]] = []
+
+    async def search_many(
+        self, collection, query_vectors, limit=5, score_threshold=0.3, filters=None
+    ):
+        self.search_many_calls.append((collection, len(query_vectors)))
+        return [
+            [SearchResult(id=f"{collection}-{i}", score=0.9 - i * 0.1, payload={})]
+            for i in range(len(query_vectors))
+        ]
+
+
+def test_retrieve_issues_one_search_many_per_kb():
+    kb_repo = FakeKbRepo()
+    for kid in ("k1", "k2"):
+        _run(kb_repo.save(make_kb(kid, "T1")))
+    vs = _CountingVectorStore()
+    use_case = QueryRAGUseCase(
+        knowledge_base_repository=kb_repo,
+        embedding_service=FakeEmbeddingService(),
+        vector_store=vs,
+        llm_service=None,
+    )
+
+    with patch(
+        "src.application.rag.query_rag_use_case.rewrite_query",
+        side_effect=lambda q, **_: f"rw {q}",
+    ), patch(
+        "src.application.rag.query_rag_use_case.generate_hyde",
+        side_effect=lambda q, **_: f"hyde {q}",
+    ):
+        result = _run(
+            use_case.retrieve(
+                QueryRAGCommand(
+                    tenant_id="T1",
+                    kb_id="k1",
+                    kb_ids=["k1", "k2"],
+                    query="退貨",
+                    top_k=10,
+                    retrieval_modes=["raw", "rewrite", "hyde"],
+                )
+            )
+        )
+
+    assert sorted(vs.search_many_calls) == [("kb_k1", 3), ("kb_k2", 3)]
+    # 每個 kb 每個 mode 的結果都 demux 回來並 union
+    assert len(result.sources) == 6
+    assert {s.kb_id for s in result.sources} == {"k1", "k2"}
@@ -20,6 +20,10 @@ from src.infrastructure.embedding.dynamic_embedding_factory import (
     DynamicEmbeddingServiceFactory,
     DynamicEmbeddingServiceProxy,
 )
+from src.infrastructure.embedding.embedding_client_registry import (
+    EmbeddingClientRegistry,
+    EmbeddingPoolConfig,
+)
 
 scenarios("unit/platform/dynamic_embedding_factory.feature")
 
@@ -192,3 +196,96 @@ def proxy_call_embed_query(context, fallback_service):
 def verify_embed_query(context):
     context["fallback"].embed_query.assert_called_once_with("hello")
     assert context["query_result"] == [0.2] * 3
+
+
+# --- Pooled client registry ---
+
+
+def _make_factory(context, fallback_service, registry):
+    return DynamicEmbeddingServiceFactory(
+        provider_setting_repo_factory=lambda: context["repo"],
+        encryption_service=context["encryption"],
+        fallback_service=fallback_service,
+        client_registry=registry,
+    )
+
+
+@when("工廠連續兩次解析 Embedding 服務")
+def resolve_twice(context, fallback_service):
+    registry = EmbeddingClientRegistry()
+    factory = _make_factory(context, fallback_service, registry)
+    context["first"] = _run(factory.get_service())
+    context["second"] = _run(factory.get_service())
+    context["registry"] = registry
+
+
+@when("工廠解析 Embedding 服務後 API key 變更再解析一次")
+def resolve_then_rotate_key(context, fallback_service):
+    registry = EmbeddingClientRegistry()
+    factory = _make_factory(context, fallback_service, registry)
+    context["first"] = _run(factory.get_service())
+    rotated = ProviderSetting(
+        id=ProviderSettingId(value="s1"),
+        provider_type=ProviderType.LLM,
+        provider_name=ProviderName.OPENAI,
+        display_name="OpenAI LLM",
+        is_enabled=True,
+        api_key_encrypted="enc:sk-rotated",
+    )
+    context["repo"].find_by_type_and_name = AsyncMock(return_value=rotated)
+    context["second"] = _run(factory.get_service())
+    context["registry"] = registry
+
+
+@then("兩次應回傳同一個 Embedding 服務實例")
+def same_instance(context):
+    assert context["first"] is context["second"]
+
+
+@then("兩次應回傳不同的 Embedding 服務實例")
+def different_instance(context):
+    assert context["first"] is not context["second"]
+    assert context["second"]._api_key == "sk-rotated"
+
+
+@then("Client registry 應只建立過 1 個 client")
+def registry_built_once(context):
+    assert context["registry"].rebuilds_total == 1
+    assert len(context["registry"].stats()["clients"]) == 1
+
+
+@then("Client registry 應只保留 1 個 client")
+def registry_keeps_one(context):
+    stats = context["registry"].stats()
+    assert context["registry"].rebuilds_total == 2
+    assert len(stats["clients"]) == 1
+    assert stats["in_use"] == 0
+
+
+@given("Client registry 的 request timeout 為 0 秒")
+def registry_zero_timeout(context):
+    context["registry"] = EmbeddingClientRegistry(
+        EmbeddingPoolConfig(http2=False, timeout=0.0)
+    )
+
+
+@when("淘汰一個 close 會失敗的 pooled client 並等待 close 執行")
+def retire_failing_client(context):
+    registry = context["registry"]
+    service = registry.get_service(api_key="sk-a", model="m", base_url="http://x")
+    entry = next(iter(registry._entries.values()))
+    assert entry.service is service
+    entry.client.aclose = AsyncMock(side_effect=RuntimeError("close failed"))
+
+    async def _retire_and_wait():
+        registry._retire(entry)
+        await asyncio.sleep(0.02)
+
+    _run(_retire_and_wait())
+    context["close_mock"] = entry.client.aclose
+
+
+@then("延後 close 的 task 應已清除")
+def close_tasks_cleared(context):
+    context["close_mock"].assert_awaited_once()
+    assert context["registry"]._close_tasks == set()
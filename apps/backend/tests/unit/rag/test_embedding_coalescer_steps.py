@@ -0,0 +1,192 @@
+"""Embedding Coalescer BDD Step Definitions"""
+
+import asyncio
+
+import pytest
+from pytest_bdd import given, parsers, scenarios, then, when
+
+from src.domain.rag.services import EmbeddingService
+from src.infrastructure.embedding.coalescing_embedding_service import (
+    CoalescingEmbeddingService,
+)
+
+scenarios("unit/rag/embedding_coalescer.feature")
+
+
+def _run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+class _RecordingEmbedding(EmbeddingService):
+    """向量 = [len(text)]，方便驗證 fan-out 對應正確。"""
+
+    def __init__(self, fail: bool = False, mode: str = ""):
+        self.batches: list[list[str]] = []
+        self._fail = fail
+        self._mode = mode
+
+    async def embed_texts(self, texts):
+        return [[float(len(t))] for t in texts]
+
+    async def embed_query(self, text):
+        return [float(len(text))]
+
+    async def embed_queries(self, texts):
+        self.batches.append(list(texts))
+        await asyncio.sleep(0)
+        if self._fail:
+            raise RuntimeError("provider down")
+        if self._mode == "hang":
+            await asyncio.Event().wait()
+        if self._mode == "short":
+            return [[float(len(t))] for t in texts[:-1]]
+        return [[float(len(t))] for t in texts]
+
+
+@pytest.fixture
+def context():
+    return {}
+
+
+def _setup(context, wait_ms, batch, fail=False, mode=""):
+    inner = _RecordingEmbedding(fail=fail, mode=mode)
+    context["inner"] = inner
+    context["service"] = CoalescingEmbeddingService(
+        inner=inner, max_wait_ms=wait_ms, max_batch_size=batch
+    )
+
+
+@given(parsers.parse("一個 max_wait {wait:d}ms、max_batch {batch:d} 的 embedding coalescer"))
+def coalescer(context, wait, batch):
+    _setup(context, wait, batch)
+
+
+@given(
+    parsers.parse(
+        "一個 max_wait {wait:d}ms、max_batch {batch:d} 的 embedding coalescer 且底層會失敗"
+    )
+)
+def failing_coalescer(context, wait, batch):
+    _setup(context, wait, batch, fail=True)
+
+
+@given(
+    parsers.parse(
+        "一個 max_wait {wait:d}ms、max_batch {batch:d} 的 embedding coalescer 且底層少回向量"
+    )
+)
+def short_coalescer(context, wait, batch):
+    _setup(context, wait, batch, mode="short")
+
+
+@given(
+    parsers.parse(
+        "一個 max_wait {wait:d}ms、max_batch {batch:d} 的 embedding coalescer 且底層不會回應"
+    )
+)
+def hanging_coalescer(context, wait, batch):
+    _setup(context, wait, batch, mode="hang")
+
+
+@when(parsers.parse("併發送出 {n:d} 條 embed_query 後 cancel 批次 task"))
+def queries_then_cancel_dispatch(context, n):
+    svc = context["service"]
+
+    async def _go():
+        callers = [
+            asyncio.ensure_future(svc.embed_query("q" * (i + 1))) for i in range(n)
+        ]
+        while not context["inner"].batches:
+            await asyncio.sleep(0.005)
+        for task in list(svc._dispatch_tasks):
+            task.cancel()
+        return await asyncio.wait_for(
+            asyncio.gather(*callers, return_exceptions=True), timeout=1
+        )
+
+    context["results"] = _run(_go())
+
+
+@when(parsers.parse("併發送出 {n:d} 條不同的 embed_query"))
+def concurrent_queries(context, n):
+    svc = context["service"]
+    texts = ["q" * (i + 1) for i in range(n)]
+
+    async def _go():
+        return await asyncio.wait_for(
+            asyncio.gather(
+                *(svc.embed_query(t) for t in texts), return_exceptions=True
+            ),
+            timeout=1,
+        )
+
+    context["texts"] = texts
+    context["results"] = _run(_go())
+
+
+@when("併發送出 3 條單一 query 與 1 組 3 條的 mode query")
+def mixed_queries(context):
+    svc = context["service"]
+    group = ["raw 問題", "rewrite 問題", "hyde 答案"]
+
+    async def _go():
+        return await asyncio.gather(
+            svc.embed_query("a"),
+            svc.embed_query("bb"),
+            svc.embed_query("ccc"),
+            svc.embed_queries(group),
+        )
+
+    context["group"] = group
+    context["results"] = _run(_go())
+
+
+@then(parsers.parse("底層只收到 1 次批次請求且含 {n:d} 條 query"))
+def single_batch(context, n):
+    assert len(context["inner"].batches) == 1
+    assert len(context["inner"].batches[0]) == n
+
+
+@then("每個 caller 拿到自己 query 的向量")
+def fan_out_matches(context):
+    for text, vec in zip(context["texts"], context["results"], strict=True):
+        assert vec == [float(len(text))]
+
+
+@then(parsers.parse("底層共收到 {n:d} 次批次請求"))
+def batch_count(context, n):
+    assert len(context["inner"].batches) == n
+    assert all(len(b) <= 4 for b in context["inner"].batches)
+
+
+@then("該組 mode query 落在同一批次")
+def group_not_split(context):
+    group = context["group"]
+    assert any(
+        all(t in batch for t in group) for batch in context["inner"].batches
+    )
+    assert context["results"][3] == [[float(len(t))] for t in group]
+
+
+@then(parsers.parse("{n:d} 個 caller 都收到例外"))
+def all_failed(context, n):
+    errors = [r for r in context["results"] if isinstance(r, RuntimeError)]
+    assert len(errors) == n
+
+
+@then(parsers.parse("{n:d} 個 caller 都收到 ValueError"))
+def all_value_error(context, n):
+    errors = [r for r in context["results"] if isinstance(r, ValueError)]
+    assert len(errors) == n
+
+
+@then(parsers.parse("{n:d} 個 caller 都被 cancel"))
+def all_cancelled(context, n):
+    cancelled = [
+        r for r in context["results"] if isinstance(r, asyncio.CancelledError)
+    ]
+    assert len(cancelled) == n
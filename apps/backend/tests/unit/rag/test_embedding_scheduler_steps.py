@@ -0,0 +1,314 @@
+"""Embedding Batch Scheduler BDD Step Definitions"""
+
+import asyncio
+import time
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+from pytest_bdd import given, parsers, scenarios, then, when
+
+from src.infrastructure.embedding.embedding_scheduler import (
+    AimdConcurrencyLimiter,
+    estimate_tokens,
+    pack_batches,
+)
+from src.infrastructure.embedding.openai_embedding_service import (
+    OpenAIEmbeddingService,
+)
+
+scenarios("unit/rag/embedding_scheduler.feature")
+
+
+def _run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+@pytest.fixture
+def context():
+    return {}
+
+
+# --- pack_batches ---
+
+
+@given(parsers.parse("每批最多 {items:d} 筆、估算 token 上限 {tokens:d}"))
+def batch_limits(context, items, tokens):
+    context["max_items"] = items
+    context["max_tokens"] = tokens
+
+
+@when(parsers.parse("對 {n:d} 段各約 20 token 的文字與 1 段超長文字分批"))
+def do_pack(context, n):
+    texts = [f"第{i}段內容" + "價格說明" * 4 for i in range(n)]
+    texts.insert(4, "超長" * 100)
+    context["texts"] = texts
+    context["ranges"] = pack_batches(
+        texts, context["max_items"], context["max_tokens"]
+    )
+
+
+@then("每批估算 token 不超過上限（超長文字自成一批）")
+def batches_within_budget(context):
+    texts = context["texts"]
+    for start, end in context["ranges"]:
+        cost = sum(estimate_tokens(t) for t in texts[start:end])
+        assert cost <= context["max_tokens"] or end - start == 1
+    assert (4, 5) in context["ranges"]
+
+
+@then("分批依原順序涵蓋全部文字")
+def batches_cover_in_order(context):
+    flat = [i for start, end in context["ranges"] for i in range(start, end)]
+    assert flat == list(range(len(context["texts"])))
+
+
+# --- AIMD limiter ---
+
+
+@given(parsers.parse("一個初始併發 {initial:d}、上限 {limit:d} 的 AIMD limiter"))
+def aimd_limiter(context, initial, limit):
+    context["limiter"] = AimdConcurrencyLimiter(initial=initial, max_limit=limit)
+
+
+@when(parsers.parse("連續成功完成 {n:d} 個 request"))
+def successful_requests(context, n):
+    limiter = context["limiter"]
+
+    async def _go():
+        for _ in range(n):
+            ticket = await limiter.acquire()
+            limiter.release(ticket, success=True)
+
+    _run(_go())
+
+
+@then(parsers.parse("併發上限成長到 {limit:d}"))
+def limit_grew(context, limit):
+    assert context["limiter"].limit == limit
+
+
+@when(
+    parsers.parse(
+        "{n:d} 個同時在途的 request 都收到 429 且 Retry-After {seconds:d} 秒"
+    )
+)
+def throttled_wave(context, n, seconds):
+    limiter = context["limiter"]
+
+    async def _go():
+        tickets = [await limiter.acquire() for _ in range(n)]
+        for ticket in tickets:
+            limiter.release(ticket, success=False, throttled=True, pause=seconds)
+
+    _run(_go())
+    context["pause"] = seconds
+
+
+@then(parsers.parse("併發上限變為 {limit:d}"))
+def limit_is(context, limit):
+    assert context["limiter"].limit == limit
+    assert context["limiter"].decreases_total == 1
+
+
+@then(parsers.parse("limiter 暫停約 {seconds:d} 秒"))
+def limiter_paused(context, seconds):
+    paused = context["limiter"].stats()["paused_seconds"]
+    assert seconds - 0.5 < paused <= seconds
+
+
+@when(
+    parsers.parse(
+        "排隊中有 1 個 request 時在途 request 收到 429 且 Retry-After {ms:d} ms"
+    )
+)
+def throttled_while_queued(context, ms):
+    limiter = context["limiter"]
+
+    async def _go():
+        ticket = await limiter.acquire()
+        t0 = time.monotonic()
+        queued = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0.01)
+        assert not queued.done()
+        limiter.release(ticket, success=False, throttled=True, pause=ms / 1000)
+        await asyncio.wait_for(queued, timeout=2)
+        return time.monotonic() - t0
+
+    context["queued_after"] = _run(_go())
+
+
+@then(parsers.parse("排隊的 request 在 {ms:d} ms 暫停結束後才取得名額"))
+def queued_waits_for_pause(context, ms):
+    assert context["queued_after"] >= ms / 1000
+
+
+# --- shared service ---
+
+
+@given(
+    parsers.parse(
+        "一個初始併發 {initial:d}、上限 {limit:d} 的 OpenAI embedding service"
+        "（每批 {size:d} 筆）"
+    )
+)
+def shared_service(context, initial, limit, size):
+    state = {"active": 0, "peak": 0}
+
+    async def mock_post(url, **kwargs):
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        try:
+            await asyncio.sleep(0.005)
+        finally:
+            state["active"] -= 1
+        texts = kwargs["json"]["input"]
+        resp = MagicMock()
+        resp.raise_for_status = MagicMock()
+        resp.json.return_value = {
+            "data": [{"embedding": [float(t.split("-")[1])]} for t in texts],
+            "usage": {"total_tokens": len(texts)},
+        }
+        return resp
+
+    client = MagicMock()
+    client.post = mock_post
+    context["state"] = state
+    context["service"] = OpenAIEmbeddingService(
+        api_key="test-key",
+        batch_size=size,
+        initial_concurrency=initial,
+        max_concurrency=limit,
+        client=client,
+    )
+
+
+@when(parsers.parse("{docs:d} 份文件各 {n:d} 個 chunk 同時 embed"))
+def concurrent_documents(context, docs, n):
+    service = context["service"]
+
+    async def _go():
+        return await asyncio.gather(
+            *(
+                service.embed_texts([f"d{d}-{i}" for i in range(n)])
+                for d in range(docs)
+            )
+        )
+
+    context["results"] = _run(_go())
+
+
+@then(parsers.parse("每份文件拿到依序對應的 {n:d} 個向量"))
+def vectors_in_order(context, n):
+    for vectors in context["results"]:
+        assert vectors == [[float(i)] for i in range(n)]
+
+
+@then(parsers.parse("同時在途的 embedding request 不超過 {limit:d}"))
+def bounded_in_flight(context, limit):
+    assert 1 < context["state"]["peak"] <= limit
+    stats = context["service"].scheduler_stats()
+    assert stats["in_flight"] == 0
+    assert stats["peak_in_flight"] == context["state"]["peak"]
+
+
+# --- query lane ---
+
+
+def _lane_service(context, bulk_delay=0.0, bulk_retry_after=None):
+    state = {"bulk_done": 0}
+
+    async def mock_post(url, **kwargs):
+        texts = kwargs["json"]["input"]
+        resp = MagicMock()
+        if texts[0].startswith("bulk"):
+            if bulk_retry_after is not None:
+                error_resp = MagicMock(status_code=429)
+                error_resp.headers = {"Retry-After": str(bulk_retry_after)}
+                resp.raise_for_status = MagicMock(
+                    side_effect=httpx.HTTPStatusError(
+                        "429", request=MagicMock(), response=error_resp
+                    )
+                )
+                return resp
+            await asyncio.sleep(bulk_delay)
+            state["bulk_done"] += 1
+        resp.raise_for_status = MagicMock()
+        resp.json.return_value = {
+            "data": [{"embedding": [1.0]} for _ in texts],
+            "usage": {"total_tokens": len(texts)},
+        }
+        return resp
+
+    client = MagicMock()
+    client.post = mock_post
+    context["state"] = state
+    context["service"] = OpenAIEmbeddingService(
+        api_key="test-key",
+        batch_size=1,
+        initial_concurrency=1,
+        max_concurrency=1,
+        client=client,
+    )
+
+
+@given(
+    parsers.parse(
+        "一個 bulk 併發 1 的 OpenAI embedding service，每個 bulk request 需要 {ms:d} ms"
+    )
+)
+def lane_service_slow_bulk(context, ms):
+    _lane_service(context, bulk_delay=ms / 1000)
+
+
+@given(
+    parsers.parse(
+        "一個 bulk 併發 1 的 OpenAI embedding service，"
+        "bulk request 會收到 429 且 Retry-After {seconds:d} 秒"
+    )
+)
+def lane_service_throttled_bulk(context, seconds):
+    _lane_service(context, bulk_retry_after=seconds)
+
+
+@when(parsers.parse("bulk embed {n:d} 批的同時送出 1 條 chat query"))
+def bulk_and_query(context, n):
+    service = context["service"]
+
+    async def _go():
+        bulk = asyncio.ensure_future(
+            service.embed_texts([f"bulk-{i}" for i in range(n)])
+        )
+        await asyncio.sleep(0.01)
+        start = time.monotonic()
+        vector = await asyncio.wait_for(service.embed_query("q-退貨"), timeout=2)
+        context["query_seconds"] = time.monotonic() - start
+        context["bulk_done_at_query"] = context["state"]["bulk_done"]
+        context["stats"] = service.scheduler_stats()
+        bulk.cancel()
+        await asyncio.gather(bulk, return_exceptions=True)
+        return vector
+
+    context["vector"] = _run(_go())
+
+
+@then("chat query 應在第一個 bulk request 完成前拿到向量")
+def query_before_bulk(context):
+    assert context["vector"] == [1.0]
+    assert context["bulk_done_at_query"] == 0
+
+
+@then(parsers.parse("chat query 應在 {seconds:d} 秒內拿到向量"))
+def query_fast(context, seconds):
+    assert context["vector"] == [1.0]
+    assert context["query_seconds"] < seconds
+
+
+@then("query lane 不應被暫停")
+def query_lane_not_paused(context):
+    assert context["stats"]["paused_seconds"] > 0
+    assert context["stats"]["query_lane"]["paused_seconds"] == 0
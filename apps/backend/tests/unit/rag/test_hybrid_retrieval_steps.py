@@ -0,0 +1,328 @@
+"""BDD: unit/rag/hybrid_retrieval.feature — BM25 + 向量 RRF 混合檢索。"""
+
+from __future__ import annotations
+
+import pytest
+from pytest_bdd import given, parsers, scenarios, then, when
+
+from src.application.rag.query_rag_use_case import (
+    QueryRAGCommand,
+    QueryRAGUseCase,
+)
+from src.domain.rag.value_objects import SearchResult
+from src.domain.shared.config_invalidation import SCOPE_KNOWLEDGE_BASE
+from src.infrastructure.cache.config_invalidation_bus import (
+    InProcessConfigInvalidationBus,
+)
+from src.infrastructure.rag.bm25_lexical_search import (
+    Bm25Index,
+    Bm25LexicalSearchService,
+)
+from tests.unit.knowledge.kb_studio_fixtures import (
+    FakeEmbeddingService,
+    FakeKbRepo,
+    FakeVectorStore,
+    make_kb,
+    run,
+)
+
+scenarios("unit/rag/hybrid_retrieval.feature")
+
+
+class _ScannableVectorStore(FakeVectorStore):
+    """search 回固定的 dense 結果；scan 依 payload 過濾 ``rows``。"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.rows: list[SearchResult] = []
+        self.scan_calls = 0
+        self.after_next_scan = None  # scan 讀完資料、回傳前執行一次
+
+    async def scan(self, collection, filters, batch_size=1000):
+        self.scan_calls += 1
+        rows = [
+            SearchResult(id=r.id, score=0.0, payload=r.payload)
+            for r in self.rows
+            if all(r.payload.get(k) == v for k, v in filters.items())
+        ]
+        hook, self.after_next_scan = self.after_next_scan, None
+        if hook is not None:
+            await hook()
+        return rows
+
+
+class _RecordingEmbeddingService(FakeEmbeddingService):
+    def __init__(self) -> None:
+        super().__init__()
+        self.query_batches: list[list[str]] = []
+
+    async def embed_queries(self, texts):
+        self.query_batches.append(list(texts))
+        return [[0.1] * 3072 for _ in texts]
+
+
+def _chunk(cid: str, content: str, tenant_id: str = "T001") -> SearchResult:
+    return SearchResult(
+        id=cid,
+        score=0.0,
+        payload={
+            "content": content,
+            "tenant_id": tenant_id,
+            "document_id": "d1",
+            "document_name": "doc",
+        },
+    )
+
+
+@pytest.fixture
+def ctx():
+    return {}
+
+
+# ── QueryRAGUseCase ─────────────────────────────────────────────
+
+
+@given(parsers.parse('KB "{kb_id}" 向量檢索只回傳一般說明 chunks'))
+def seed_dense(ctx, kb_id):
+    kb_repo = FakeKbRepo()
+    run(kb_repo.save(make_kb(kb_id, "T001")))
+    vs = _ScannableVectorStore()
+    general = [
+        ("c-0", "退貨需在七天內申請"),
+        ("c-1", "保固期間請保留發票"),
+        ("c-2", "運費由買方負擔"),
+    ]
+    vs.search_results = [
+        SearchResult(id=cid, score=0.9 - i * 0.1, payload=_chunk(cid, text).payload)
+        for i, (cid, text) in enumerate(general)
+    ]
+    vs.rows = [_chunk(cid, text) for cid, text in general]
+    embed = _RecordingEmbeddingService()
+    lexical = Bm25LexicalSearchService(vector_store=vs)
+    ctx.update(
+        kb_id=kb_id,
+        vs=vs,
+        embed=embed,
+        use_case=QueryRAGUseCase(
+            knowledge_base_repository=kb_repo,
+            embedding_service=embed,
+            vector_store=vs,
+            llm_service=None,
+            lexical_search=lexical,
+        ),
+    )
+
+
+@given(parsers.parse('KB "{kb_id}" 另有一筆含型號 "{sku}" 的 chunk'))
+def seed_sku_chunk(ctx, kb_id, sku):
+    ctx["vs"].rows.append(_chunk("c-sku", f"{sku} 防水藍牙耳機 保固一年"))
+
+
+@given(parsers.parse('向量檢索的第二名也含型號 "{sku}"'))
+def seed_dense_second_has_sku(ctx, sku):
+    vs = ctx["vs"]
+    second = vs.search_results[1]
+    payload = {**second.payload, "content": f"{sku} 保固期間請保留發票"}
+    vs.search_results[1] = SearchResult(id=second.id, score=second.score, payload=payload)
+    vs.rows = [
+        _chunk(r.id, payload["content"]) if r.id == second.id else r for r in vs.rows
+    ]
+
+
+def _retrieve(ctx, modes, query):
+    cmd = QueryRAGCommand(
+        tenant_id="T001",
+        kb_id=ctx["kb_id"],
+        query=query,
+        top_k=10,
+        score_threshold=0.0,
+        retrieval_modes=list(modes),
+    )
+    ctx["result"] = run(ctx["use_case"].retrieve(cmd))
+
+
+@when(parsers.parse('我以 retrieval_modes=["raw","hybrid"] 查詢 "{query}"'))
+def when_raw_hybrid(ctx, query):
+    _retrieve(ctx, ["raw", "hybrid"], query)
+
+
+@when(parsers.parse('我以 retrieval_modes=["hybrid"] 查詢 "{query}"'))
+def when_hybrid_only(ctx, query):
+    _retrieve(ctx, ["hybrid"], query)
+
+
+@when(parsers.parse('我以 retrieval_modes=["raw"] 查詢 "{query}"'))
+def when_raw_only(ctx, query):
+    _retrieve(ctx, ["raw"], query)
+
+
+@then("結果應包含型號 chunk")
+def then_has_sku(ctx):
+    assert "c-sku" in [s.chunk_id for s in ctx["result"].sources]
+
+
+@then("結果不應包含型號 chunk")
+def then_no_sku(ctx):
+    assert "c-sku" not in [s.chunk_id for s in ctx["result"].sources]
+
+
+@then("型號 chunk 的命中 mode 應包含 hybrid")
+def then_sku_mode(ctx):
+    # mode_queries 帶 hybrid → lexical 有跑；型號 chunk 只可能來自 lexical
+    assert ctx["result"].mode_queries["hybrid"]
+    assert "c-sku" not in [r.id for r in ctx["vs"].search_results]
+
+
+@then("第一筆結果應為向量第二名的 chunk 且分數為 1.0")
+def then_fused_first(ctx):
+    top = ctx["result"].sources[0]
+    assert top.chunk_id == "c-1"
+    assert top.score == pytest.approx(1.0)
+    assert all(s.score <= 1.0 for s in ctx["result"].sources)
+
+
+@then("mode_queries 應為 raw 與 hybrid 且皆為原始 query")
+def then_mode_queries(ctx):
+    mq = ctx["result"].mode_queries
+    assert set(mq) == {"raw", "hybrid"}
+    assert mq["raw"] == mq["hybrid"] == "AB-1234"
+
+
+@then("embedding 應只送出 1 條 query")
+def then_one_embed(ctx):
+    assert ctx["embed"].query_batches == [["AB-1234"]]
+
+
+@then("vector store 不應被 scan")
+def then_no_scan(ctx):
+    assert ctx["vs"].scan_calls == 0
+
+
+# ── Bm25Index ───────────────────────────────────────────────────
+
+
+@given(parsers.parse('BM25 索引含 "{first}" 與 "{second}" 兩筆 chunk'))
+def seed_index(ctx, first, second):
+    ctx["index"] = Bm25Index([_chunk("a", first), _chunk("b", second)])
+
+
+@when(parsers.parse('以 "{query}" 查詢 BM25 索引'))
+def when_index_search(ctx, query):
+    ctx["hits"] = ctx["index"].search(query, limit=5)
+
+
+@then(parsers.parse('第一筆命中應為 "{content}"'))
+def then_first_hit(ctx, content):
+    assert ctx["hits"], "no hits"
+    assert ctx["hits"][0].payload["content"] == content
+
+
+# ── Bm25LexicalSearchService ────────────────────────────────────
+
+
+@given(
+    parsers.parse(
+        'lexical 檢索服務的 vector store 含租戶 "{t1}" 與 "{t2}" 各一筆 "{sku}" chunk'
+    )
+)
+def seed_service(ctx, t1, t2, sku):
+    vs = _ScannableVectorStore()
+    vs.rows = [_chunk(f"{t1}-sku", sku, t1), _chunk(f"{t2}-sku", sku, t2)]
+    ctx["vs"] = vs
+    ctx["bus"] = InProcessConfigInvalidationBus()
+    ctx["min_rebuild_interval"] = 0.0
+
+
+@given(parsers.parse("索引最短重建間隔為 {seconds:d} 秒"))
+def set_min_rebuild(ctx, seconds):
+    ctx["min_rebuild_interval"] = float(seconds)
+
+
+def _service(ctx) -> Bm25LexicalSearchService:
+    if "service" not in ctx:
+        ctx["service"] = Bm25LexicalSearchService(
+            vector_store=ctx["vs"],
+            invalidation_bus=ctx["bus"],
+            min_rebuild_interval=ctx["min_rebuild_interval"],
+        )
+    return ctx["service"]
+
+
+def _lexical(ctx, tenant_id, query):
+    ctx["hits"] = run(
+        _service(ctx).search("kb_kb-1", query, limit=5, filters={"tenant_id": tenant_id})
+    )
+
+
+@given(parsers.parse('已以租戶 "{tenant_id}" 做過 lexical 檢索'))
+def given_searched(ctx, tenant_id):
+    _lexical(ctx, tenant_id, "AB-1234")
+
+
+@when(parsers.parse('以租戶 "{tenant_id}" 做 lexical 檢索 "{query}"'))
+def when_lexical(ctx, tenant_id, query):
+    _lexical(ctx, tenant_id, query)
+
+
+@when(
+    parsers.parse(
+        'vector store 新增一筆租戶 "{tenant_id}" 的 "{sku}" chunk 並發布 KB 變更'
+    )
+)
+def when_add_chunk(ctx, tenant_id, sku):
+    ctx["vs"].rows.append(_chunk("new-sku", sku, tenant_id))
+    run(ctx["bus"].publish(SCOPE_KNOWLEDGE_BASE, "kb-1"))
+
+
+def _add_chunk_during_next_scan(ctx, tenant_id, sku):
+    async def _change():
+        ctx["vs"].rows.append(_chunk("new-sku", sku, tenant_id))
+        await ctx["bus"].publish(SCOPE_KNOWLEDGE_BASE, "kb-1")
+
+    ctx["vs"].after_next_scan = _change
+
+
+@given(
+    parsers.parse(
+        '下一次 scan 期間 vector store 新增租戶 "{tenant_id}" 的 "{sku}" chunk 並發布 KB 變更'
+    )
+)
+def given_change_during_scan(ctx, tenant_id, sku):
+    _service(ctx)
+    _add_chunk_during_next_scan(ctx, tenant_id, sku)
+
+
+@when(
+    parsers.parse(
+        'vector store 的 KB 變更發布後，下一次 scan 期間又新增租戶 "{tenant_id}" 的 "{sku}" chunk 並發布 KB 變更'
+    )
+)
+def when_change_during_rebuild(ctx, tenant_id, sku):
+    run(ctx["bus"].publish(SCOPE_KNOWLEDGE_BASE, "kb-1"))
+    _add_chunk_during_next_scan(ctx, tenant_id, sku)
+
+
+@then(parsers.parse('只應命中租戶 "{tenant_id}" 的 chunk'))
+def then_tenant_only(ctx, tenant_id):
+    assert [h.payload["tenant_id"] for h in ctx["hits"]] == [tenant_id]
+
+
+@then("應命中新增的 chunk")
+def then_new_hit(ctx):
+    assert [h.id for h in ctx["hits"]] == ["new-sku"]
+
+
+@then("不應命中任何 chunk")
+def then_no_hit(ctx):
+    assert ctx["hits"] == []
+
+
+@then(parsers.parse("索引應已重建 {n:d} 次"))
+def then_builds(ctx, n):
+    assert ctx["service"].builds == n
+
+
+@then(parsers.parse('租戶 "{tenant_id}" 的索引應回報為過期'))
+def then_stale(ctx, tenant_id):
+    assert ctx["service"].is_stale("kb_kb-1", tenant_id)
+    assert not ctx["service"].is_stale("kb_kb-1", "T002")
@@ -0,0 +1,77 @@
+"""BDD: unit/rag/kb_change_notifier.feature — KB 變更通知合併。"""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+from pytest_bdd import given, parsers, scenarios, then, when
+
+from src.domain.shared.config_invalidation import SCOPE_KNOWLEDGE_BASE
+from src.infrastructure.cache.config_invalidation_bus import (
+    InProcessConfigInvalidationBus,
+)
+from src.infrastructure.milvus.kb_change_notifier import KnowledgeChangeNotifier
+
+scenarios("unit/rag/kb_change_notifier.feature")
+
+
+@pytest.fixture
+def ctx():
+    # 窗口 timer 綁在 event loop 上，整個 scenario 共用同一個 loop
+    loop = asyncio.new_event_loop()
+    yield {"loop": loop, "published": []}
+    loop.close()
+
+
+def _run(ctx, coro):
+    return ctx["loop"].run_until_complete(coro)
+
+
+@given(parsers.parse("合併窗口為 {seconds:g} 秒的 KB 變更通知器"))
+def given_notifier(ctx, seconds):
+    bus = InProcessConfigInvalidationBus()
+    bus.subscribe(lambda scope, key: ctx["published"].append((scope, key)))
+    ctx["seconds"] = seconds
+    ctx["notifier"] = KnowledgeChangeNotifier(
+        AsyncMock(), bus, debounce_seconds=seconds
+    )
+
+
+def _write(ctx, collection, n):
+    async def _go():
+        for i in range(n):
+            await ctx["notifier"].upsert(collection, [f"c{i}"], [[0.1]], [{}])
+
+    _run(ctx, _go())
+
+
+@when(parsers.parse('對 KB "{kb_id}" 連續寫入 {n:d} 批'))
+def when_write_kb(ctx, kb_id, n):
+    _write(ctx, f"kb_{kb_id}", n)
+
+
+@when(parsers.parse('對 collection "{collection}" 寫入 {n:d} 批'))
+def when_write_collection(ctx, collection, n):
+    _write(ctx, collection, n)
+
+
+@when("等待合併窗口結束")
+def when_wait_window(ctx):
+    _run(ctx, asyncio.sleep(ctx["seconds"] * 2))
+
+
+@when("flush 變更通知器")
+def when_flush(ctx):
+    _run(ctx, ctx["notifier"].flush())
+
+
+@then(parsers.parse('KB "{kb_id}" 應收到 {n:d} 次變更通知'))
+def then_notified(ctx, kb_id, n):
+    assert ctx["published"].count((SCOPE_KNOWLEDGE_BASE, kb_id)) == n
+
+
+@then("不應收到任何變更通知")
+def then_none(ctx):
+    assert ctx["published"] == []
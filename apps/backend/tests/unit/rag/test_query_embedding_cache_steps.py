@@ -0,0 +1,128 @@
+"""Query Embedding Cache BDD Step Definitions"""
+
+import asyncio
+
+import pytest
+from pytest_bdd import given, parsers, scenarios, then, when
+
+from src.domain.rag.services import EmbeddingService
+from src.infrastructure.cache.two_tier_cache import TwoTierCache
+from src.infrastructure.embedding.cached_embedding_service import (
+    CachedEmbeddingService,
+    encode_vector,
+)
+
+scenarios("unit/rag/query_embedding_cache.feature")
+
+
+def _run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+class _CountingEmbedding(EmbeddingService):
+    def __init__(self):
+        self.query_calls = 0
+
+    async def embed_texts(self, texts):
+        return [[0.5, -0.25, 0.125] for _ in texts]
+
+    async def embed_query(self, text):
+        self.query_calls += 1
+        await asyncio.sleep(0.01)
+        return [0.5, -0.25, 0.125]
+
+
+class _DictRedis:
+    """最小 Redis stub：get / setex / delete（bytes in, bytes out）。"""
+
+    def __init__(self):
+        self.store: dict[str, bytes] = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.store[key] = value
+
+    async def delete(self, key):
+        self.store.pop(key, None)
+
+
+@pytest.fixture
+def context():
+    return {}
+
+
+def _make_service(inner, redis, model="openai:text-embedding-3-small"):
+    cache = TwoTierCache(namespace="qemb", redis_client=redis, max_entries=16)
+    return CachedEmbeddingService(
+        inner=inner, cache=cache, model=model, dimensions=3
+    )
+
+
+@given("一個包了兩層快取的 Embedding 服務")
+def cached_service(context):
+    inner = _CountingEmbedding()
+    context["inner"] = inner
+    context["redis"] = _DictRedis()
+    context["service"] = _make_service(inner, context["redis"])
+
+
+@given(parsers.parse('Redis 已有 "{text}" 的 float32 向量'))
+def redis_has_vector(context, text):
+    key = context["service"].cache_key(text)
+    context["redis"].store[f"qemb:{key}"] = encode_vector([1.0, 2.0, 3.0])
+
+
+@when(parsers.parse('連續兩次 embed_query "{text}"'))
+def embed_twice(context, text):
+    svc = context["service"]
+    context["results"] = [_run(svc.embed_query(text)), _run(svc.embed_query(text))]
+
+
+@when(parsers.parse('依序 embed_query "{first}" 與 "{second}"'))
+def embed_variants(context, first, second):
+    svc = context["service"]
+    context["results"] = [_run(svc.embed_query(first)), _run(svc.embed_query(second))]
+
+
+@when(parsers.parse('並發 {n:d} 次 embed_query "{text}"'))
+def embed_concurrently(context, n, text):
+    svc = context["service"]
+
+    async def _go():
+        return await asyncio.gather(*(svc.embed_query(text) for _ in range(n)))
+
+    context["results"] = _run(_go())
+
+
+@then(parsers.parse("底層 embedding 服務只被呼叫 {n:d} 次"))
+def inner_called(context, n):
+    assert context["inner"].query_calls == n
+    first = context["results"][0]
+    assert all(r == first for r in context["results"])
+
+
+@then(parsers.parse("快取統計 L1 命中 {hits:d} 次且 miss {misses:d} 次"))
+def l1_stats(context, hits, misses):
+    stats = context["service"].stats()
+    assert stats["l1_hits"] == hits
+    assert stats["misses"] == misses
+
+
+@then(parsers.parse("快取統計 L2 命中 {hits:d} 次"))
+def l2_stats(context, hits):
+    stats = context["service"].stats()
+    assert stats["l2_hits"] == hits
+    assert stats["l1_hits"] == 1
+    assert context["results"][0] == [1.0, 2.0, 3.0]
+
+
+@then(parsers.parse('"{text}" 在不同 model 下的快取 key 不同'))
+def keys_differ_by_model(context, text):
+    other = _make_service(context["inner"], context["redis"], model="google:x")
+    assert other.cache_key(text) != context["service"].cache_key(text)
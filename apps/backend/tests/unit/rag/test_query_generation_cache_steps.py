@@ -0,0 +1,199 @@
+"""BDD: unit/rag/query_generation_cache.feature — rewrite / HyDE 生成快取。"""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from pytest_bdd import given, parsers, scenarios, then, when
+
+from src.application.rag.query_generation_cache import QueryGenerationCache
+from src.application.rag.query_rag_use_case import (
+    QueryRAGCommand,
+    QueryRAGUseCase,
+)
+from src.domain.rag.value_objects import SearchResult
+from src.infrastructure.cache.two_tier_cache import TwoTierCache
+from src.infrastructure.observability.agent_trace_collector import AgentTraceCollector
+from tests.unit.knowledge.kb_studio_fixtures import (
+    FakeEmbeddingService,
+    FakeKbRepo,
+    FakeVectorStore,
+    make_kb,
+    run,
+)
+
+scenarios("unit/rag/query_generation_cache.feature")
+
+
+@pytest.fixture
+def ctx():
+    return {
+        "results": [],
+        "llm_calls": {"rewrite": 0, "hyde": 0},
+        "llm_delay": {"rewrite": 0.0, "hyde": 0.0},
+        "llm_fails": set(),
+    }
+
+
+def _setup(ctx, kb_id, budget_ms=0):
+    store = FakeVectorStore()
+    store.search_results = [
+        SearchResult(
+            id=f"c-{i}",
+            score=0.9 - i * 0.1,
+            payload={"content": f"退貨政策片段 {i}", "tenant_id": "T001"},
+        )
+        for i in range(3)
+    ]
+    kb_repo = FakeKbRepo()
+    run(kb_repo.save(make_kb(kb_id, "T001")))
+    cache = QueryGenerationCache(TwoTierCache(namespace="qgen"))
+    ctx.update(
+        kb_id=kb_id,
+        cache=cache,
+        use_case=QueryRAGUseCase(
+            knowledge_base_repository=kb_repo,
+            embedding_service=FakeEmbeddingService(),
+            vector_store=store,
+            llm_service=None,
+            generation_cache=cache,
+            speculative_budget_ms=budget_ms,
+        ),
+    )
+
+
+def _fake_llm(ctx, kind):
+    async def _generate(raw_query, model="", bot_system_prompt="", extra_hint="", **_):
+        ctx["llm_calls"][kind] += 1
+        await asyncio.sleep(ctx["llm_delay"][kind])
+        if kind in ctx["llm_fails"]:
+            return raw_query
+        return f"{kind}:{raw_query.strip()}:{extra_hint}"
+
+    return _generate
+
+
+def _command(ctx, modes, query, hint=""):
+    return QueryRAGCommand(
+        tenant_id="T001",
+        kb_id=ctx["kb_id"],
+        query=query,
+        top_k=3,
+        score_threshold=0.0,
+        retrieval_modes=modes.split(","),
+        query_rewrite_extra_hint=hint,
+    )
+
+
+def _run_with_fake_llm(ctx, coro_factory):
+    AgentTraceCollector.start("T001", "react")
+    try:
+        with patch(
+            "src.application.rag.query_rag_use_case.rewrite_query",
+            _fake_llm(ctx, "rewrite"),
+        ), patch(
+            "src.application.rag.query_rag_use_case.generate_hyde",
+            _fake_llm(ctx, "hyde"),
+        ):
+            return run(coro_factory())
+    finally:
+        ctx["trace"] = AgentTraceCollector.finish(0)
+
+
+@given(parsers.parse('KB "{kb_id}" 已有 chunks 並啟用生成快取'))
+def given_cache(ctx, kb_id):
+    _setup(ctx, kb_id)
+
+
+@given(parsers.parse('KB "{kb_id}" 已有 chunks、啟用生成快取且 speculative budget {ms:d} ms'))
+def given_speculative(ctx, kb_id, ms):
+    _setup(ctx, kb_id, budget_ms=ms)
+
+
+@given(parsers.parse("{kind} LLM 會失敗"))
+def given_llm_fails(ctx, kind):
+    ctx["llm_fails"].add(kind)
+
+
+@given(parsers.parse("{kind} LLM 需要 {ms:d} ms"))
+def given_llm_delay(ctx, kind, ms):
+    ctx["llm_delay"][kind] = ms / 1000
+
+
+@when(parsers.parse('以 modes "{modes}" 與 hint "{hint}" 檢索 "{query}"'))
+def when_retrieve_with_hint(ctx, modes, hint, query):
+    ctx["results"].append(
+        _run_with_fake_llm(
+            ctx, lambda: ctx["use_case"].retrieve(_command(ctx, modes, query, hint))
+        )
+    )
+
+
+@when(parsers.parse('以 modes "{modes}" 檢索 "{query}"'))
+def when_retrieve(ctx, modes, query):
+    ctx["results"].append(
+        _run_with_fake_llm(
+            ctx, lambda: ctx["use_case"].retrieve(_command(ctx, modes, query))
+        )
+    )
+
+
+@when(parsers.parse('同時以 modes "{modes}" 檢索 "{query}" {n:d} 次'))
+def when_retrieve_concurrently(ctx, modes, query, n):
+    async def _all():
+        return await asyncio.gather(
+            *(
+                ctx["use_case"].retrieve(_command(ctx, modes, query))
+                for _ in range(n)
+            )
+        )
+
+    ctx["results"].extend(_run_with_fake_llm(ctx, _all))
+
+
+@when(parsers.parse('以 modes "{modes}" 檢索 "{query}"，等待 {ms:d} ms 後再檢索一次'))
+def when_retrieve_twice(ctx, modes, query, ms):
+    async def _twice():
+        first = await ctx["use_case"].retrieve(_command(ctx, modes, query))
+        await asyncio.sleep(ms / 1000)
+        second = await ctx["use_case"].retrieve(_command(ctx, modes, query))
+        return [first, second]
+
+    ctx["results"].extend(_run_with_fake_llm(ctx, _twice))
+
+
+@then(parsers.parse("{kind} LLM 應只呼叫 {n:d} 次"))
+@then(parsers.parse("{kind} LLM 應呼叫 {n:d} 次"))
+def then_llm_calls(ctx, kind, n):
+    assert ctx["llm_calls"][kind] == n
+
+
+@then("兩次的 rewrite query 應相同")
+def then_same_rewrite(ctx):
+    first, second = ctx["results"]
+    assert first.mode_queries["rewrite"] == second.mode_queries["rewrite"]
+
+
+@then(parsers.parse("生成快取的 {kind} fallback 次數應為 {n:d}"))
+def then_fallbacks(ctx, kind, n):
+    assert ctx["cache"].stats()["per_kind"][kind]["fallbacks"] == n
+    assert ctx["cache"].stats()["per_kind"][kind]["stores"] == 0
+
+
+@then(parsers.parse('檢索結果的 modes 應為 "{modes}"'))
+def then_modes(ctx, modes):
+    assert list(ctx["results"][-1].mode_queries) == modes.split(",")
+
+
+@then(parsers.parse('第 {i:d} 次檢索結果的 modes 應為 "{modes}"'))
+def then_nth_modes(ctx, i, modes):
+    assert list(ctx["results"][i - 1].mode_queries) == modes.split(",")
+
+
+@then(parsers.parse('向量搜尋 trace 應記錄被丟棄的 mode "{mode}"'))
+def then_trace_dropped(ctx, mode):
+    nodes = [n for n in ctx["trace"].nodes if n.label == "RAG 向量搜尋"]
+    assert nodes[0].metadata["speculative_dropped_modes"] == [mode]
+    assert "speculative_dropped_modes" not in nodes[1].metadata
@@ -0,0 +1,184 @@
+"""BDD: unit/rag/reranker.feature — RerankService backends / 快取 / trace。"""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from pytest_bdd import given, parsers, scenarios, then, when
+
+from src.domain.rag.value_objects import SearchResult, TokenUsage
+from src.infrastructure.observability.agent_trace_collector import AgentTraceCollector
+from src.infrastructure.rag.llm_reranker import LlmScoreResult
+from src.infrastructure.rag.reranker import RerankService
+from tests.unit.knowledge.kb_studio_fixtures import run
+
+scenarios("unit/rag/reranker.feature")
+
+
+@pytest.fixture
+def ctx():
+    return {"service": RerankService(llm_batch_size=20), "llm_calls": []}
+
+
+def _results(contents: list[str]) -> list[SearchResult]:
+    return [
+        SearchResult(id=f"c-{i}", score=0.9 - i * 0.01, payload={"content": c})
+        for i, c in enumerate(contents)
+    ]
+
+
+@given(parsers.parse('召回結果依序為 "{a}" "{b}" "{c}"'))
+def given_three(ctx, a, b, c):
+    ctx["results"] = _results([a, b, c])
+
+
+@given(parsers.parse("召回結果有 {n:d} 筆 chunk"))
+def given_n(ctx, n):
+    ctx["results"] = _results([f"片段內容 {i}" for i in range(n)])
+
+
+@given(parsers.parse("LLM 評分每批回傳 input {inp:d} output {out:d} token"))
+def given_llm_scores(ctx, inp, out):
+    async def fake_llm_score(query, contents, model="", **kwargs):
+        ctx["llm_calls"].append(list(contents))
+        return LlmScoreResult(
+            # 越後面的 chunk 分數越高 → 看得出有重排
+            scores={i: float(i % 10) for i in range(len(contents))},
+            usage=TokenUsage(model=model, input_tokens=inp, output_tokens=out),
+            raw="[]",
+            user_prompt="",
+        )
+
+    ctx["llm_score"] = fake_llm_score
+
+
+@given("LLM 評分會失敗")
+def given_llm_fails(ctx):
+    async def failing_llm_score(query, contents, model="", **kwargs):
+        ctx["llm_calls"].append(list(contents))
+        raise RuntimeError("simulated anthropic outage")
+
+    ctx["llm_score"] = failing_llm_score
+
+
+def _rerank(ctx, model, query, k):
+    async def unexpected_llm_call(*args, **kwargs):
+        ctx["llm_calls"].append(args)
+        raise AssertionError("LLM should not be called")
+
+    record_usage = ctx.setdefault("record_usage", AsyncMock())
+    AgentTraceCollector.start("T001", "react")
+    try:
+        with patch(
+            "src.infrastructure.rag.reranker.llm_score",
+            side_effect=ctx.get("llm_score", unexpected_llm_call),
+        ):
+            ctx["output"] = run(
+                ctx["service"].rerank(
+                    query,
+                    ctx["results"],
+                    top_k=k,
+                    model=model,
+                    tenant_id="T001",
+                    record_usage=record_usage,
+                )
+            )
+    finally:
+        trace = AgentTraceCollector.finish(0)
+    ctx["rerank_nodes"] = [n for n in trace.nodes if n.label.startswith("rerank")]
+
+
+@given(parsers.parse('已以 rerank_model "" 重排過 "{query}" 取 top {k:d}'))
+def given_reranked_default(ctx, query, k):
+    _rerank(ctx, "", query, k)
+
+
+@when(parsers.parse('以 rerank_model "{model}" 重排 "{query}" 取 top {k:d}'))
+def when_rerank(ctx, model, query, k):
+    _rerank(ctx, model, query, k)
+
+
+@when(parsers.parse('以 rerank_model "" 重排 "{query}" 取 top {k:d}'))
+def when_rerank_default(ctx, query, k):
+    _rerank(ctx, "", query, k)
+
+
+@when(
+    parsers.parse(
+        '第 {i:d} 筆 chunk 內容被修改後再以 rerank_model "" 重排 "{query}" 取 top {k:d}'
+    )
+)
+def when_modified_rerank(ctx, i, query, k):
+    old = ctx["results"][i - 1]
+    ctx["results"][i - 1] = SearchResult(
+        id=old.id, score=old.score, payload={"content": "修改後的內容"}
+    )
+    ctx["hits_before"] = ctx["service"].cache_hits
+    _rerank(ctx, "", query, k)
+
+
+@then(parsers.parse('第一筆應為 "{content}"'))
+def then_first(ctx, content):
+    assert ctx["output"][0].payload["content"] == content
+
+
+@then(parsers.parse('結果應為 "{a}" "{b}"'))
+def then_pair(ctx, a, b):
+    assert [r.payload["content"] for r in ctx["output"]] == [a, b]
+
+
+@then("不應呼叫 LLM")
+def then_no_llm(ctx):
+    assert ctx["llm_calls"] == []
+
+
+@then(parsers.parse('trace 應有 backend 為 "{backend}" 的 rerank 節點且無 token 用量'))
+def then_trace_local(ctx, backend):
+    (node,) = ctx["rerank_nodes"]
+    assert node.metadata["backend"] == backend
+    assert node.token_usage is None
+    assert node.metadata["scored_chunks"] == 3
+
+
+@then(parsers.parse("LLM 應被呼叫 {n:d} 次"))
+def then_llm_calls(ctx, n):
+    assert len(ctx["llm_calls"]) == n
+
+
+@then(parsers.parse("token 用量應記錄 {n:d} 次且 input 為 {inp:d}"))
+def then_usage_recorded(ctx, n, inp):
+    calls = ctx["record_usage"].execute.call_args_list
+    assert len(calls) == n
+    assert calls[0].kwargs["request_type"] == "rerank"
+    assert calls[0].kwargs["usage"].input_tokens == inp
+
+
+@then(parsers.parse("trace 應有 {n:d} 個批次的 rerank 節點且 input token 為 {inp:d}"))
+def then_trace_batches(ctx, n, inp):
+    (node,) = ctx["rerank_nodes"]
+    assert node.metadata["batches"] == n
+    assert node.token_usage["input_tokens"] == inp
+
+
+@then(parsers.parse("第二次 LLM 呼叫只應評分 {n:d} 筆 chunk"))
+def then_second_call_size(ctx, n):
+    assert len(ctx["llm_calls"][1]) == n
+    assert ctx["llm_calls"][1][0] == "修改後的內容"
+
+
+@then(parsers.parse("快取命中應為 {n:d} 筆"))
+def then_cache_hits(ctx, n):
+    assert ctx["service"].cache_hits - ctx["hits_before"] == n
+    assert ctx["rerank_nodes"][0].metadata["cache_hits"] == n
+
+
+@then(parsers.parse("結果應為召回的前 {n:d} 筆"))
+def then_recall_order(ctx, n):
+    assert [r.id for r in ctx["output"]] == [r.id for r in ctx["results"][:n]]
+
+
+@then(parsers.parse('trace 的 rerank 節點 outcome 應為 "{outcome}"'))
+def then_outcome(ctx, outcome):
+    (node,) = ctx["rerank_nodes"]
+    assert node.outcome == outcome
@@ -0,0 +1,187 @@
+"""BDD: unit/rag/retrieval_result_cache.feature — retrieve() 結果快取。"""
+
+from __future__ import annotations
+
+import pytest
+from pytest_bdd import given, parsers, scenarios, then, when
+
+from src.application.rag.query_rag_use_case import (
+    QueryRAGCommand,
+    QueryRAGUseCase,
+)
+from src.application.rag.retrieval_result_cache import RetrievalResultCache
+from src.domain.rag.services import LexicalSearchService
+from src.domain.rag.value_objects import SearchResult
+from src.infrastructure.cache.config_invalidation_bus import (
+    InProcessConfigInvalidationBus,
+)
+from src.infrastructure.milvus.kb_change_notifier import KnowledgeChangeNotifier
+from tests.unit.knowledge.kb_studio_fixtures import (
+    FakeEmbeddingService,
+    FakeKbRepo,
+    FakeVectorStore,
+    make_kb,
+    run,
+)
+
+scenarios("unit/rag/retrieval_result_cache.feature")
+
+
+class _CountingVectorStore(FakeVectorStore):
+    def __init__(self) -> None:
+        super().__init__()
+        self.search_calls = 0
+        self.during_search = None
+
+    async def search(
+        self, collection, query_vector, limit=5, score_threshold=0.3, filters=None
+    ):
+        self.search_calls += 1
+        if self.during_search is not None:
+            await self.during_search()
+        return list(self.search_results[:limit])
+
+
+class _StubLexicalSearch(LexicalSearchService):
+    def __init__(self, stale: bool) -> None:
+        self._stale = stale
+
+    async def search(self, collection, query, limit=5, filters=None):
+        return []
+
+    def is_stale(self, collection, tenant_id):
+        return self._stale
+
+
+@pytest.fixture
+def ctx():
+    return {"kbs": {}, "results": []}
+
+
+def _setup(ctx, tenant_id, kb_id, max_chunks=5000):
+    if "use_case" not in ctx:
+        bus = InProcessConfigInvalidationBus()
+        inner = _CountingVectorStore()
+        inner.search_results = [
+            SearchResult(
+                id=f"c-{i}",
+                score=0.9 - i * 0.1,
+                payload={
+                    "content": f"退貨政策片段 {i}",
+                    "tenant_id": tenant_id,
+                    "document_id": "d1",
+                    "document_name": "退貨.pdf",
+                },
+            )
+            for i in range(3)
+        ]
+        kb_repo = FakeKbRepo()
+        cache = RetrievalResultCache(invalidation_bus=bus, max_chunks=max_chunks)
+        ctx.update(
+            bus=bus,
+            inner=inner,
+            kb_repo=kb_repo,
+            cache=cache,
+            use_case=QueryRAGUseCase(
+                knowledge_base_repository=kb_repo,
+                embedding_service=FakeEmbeddingService(),
+                vector_store=KnowledgeChangeNotifier(inner, bus),
+                llm_service=None,
+                retrieval_cache=cache,
+            ),
+        )
+    run(ctx["kb_repo"].save(make_kb(kb_id, tenant_id)))
+    ctx["kbs"][tenant_id] = kb_id
+
+
+@given(parsers.parse('租戶 "{tenant_id}" 的 KB "{kb_id}" 已有 3 筆 chunks 並啟用檢索快取'))
+def given_cached(ctx, tenant_id, kb_id):
+    _setup(ctx, tenant_id, kb_id)
+
+
+@given(
+    parsers.parse(
+        '租戶 "{tenant_id}" 的 KB "{kb_id}" 已有 3 筆 chunks 並啟用檢索快取且 chunk cache 上限 {n:d}'
+    )
+)
+def given_small_chunk_cache(ctx, tenant_id, kb_id, n):
+    _setup(ctx, tenant_id, kb_id, max_chunks=n)
+
+
+@given(parsers.parse('租戶 "{tenant_id}" 的 KB "{kb_id}" 已有 3 筆 chunks'))
+def given_other_tenant(ctx, tenant_id, kb_id):
+    _setup(ctx, tenant_id, kb_id)
+
+
+@given(parsers.parse('向量搜尋期間 KB "{kb_id}" 會被更新'))
+def given_concurrent_update(ctx, kb_id):
+    vs = ctx["use_case"]._vector_store
+
+    async def _update():
+        await vs.upsert_single(f"kb_{kb_id}", "new", [0.1], {"content": "新內容"})
+
+    ctx["inner"].during_search = _update
+
+
+@given("BM25 索引仍在沿用失效前的舊索引")
+def given_stale_lexical(ctx):
+    ctx["use_case"]._lexical_search = _StubLexicalSearch(stale=True)
+
+
+@given("BM25 索引是最新的")
+def given_fresh_lexical(ctx):
+    ctx["use_case"]._lexical_search = _StubLexicalSearch(stale=False)
+
+
+def _retrieve(ctx, tenant_id, query, k, modes):
+    cmd = QueryRAGCommand(
+        tenant_id=tenant_id,
+        kb_id=ctx["kbs"][tenant_id],
+        query=query,
+        top_k=k,
+        score_threshold=0.0,
+        retrieval_modes=modes,
+    )
+    ctx["results"].append(run(ctx["use_case"].retrieve(cmd)))
+
+
+@when(parsers.parse('租戶 "{tenant_id}" 檢索 "{query}" top_k {k:d}'))
+def when_retrieve(ctx, tenant_id, query, k):
+    _retrieve(ctx, tenant_id, query, k, ["raw"])
+
+
+@when(parsers.parse('租戶 "{tenant_id}" 以 hybrid 檢索 "{query}" top_k {k:d}'))
+def when_retrieve_hybrid(ctx, tenant_id, query, k):
+    _retrieve(ctx, tenant_id, query, k, ["raw", "hybrid"])
+
+
+@when(parsers.parse('KB "{kb_id}" 經 vector store 寫入新的 chunk'))
+def when_kb_write(ctx, kb_id):
+    vs = ctx["use_case"]._vector_store
+    run(vs.upsert(f"kb_{kb_id}", ["new"], [[0.1]], [{"content": "新內容"}]))
+
+
+@then(parsers.parse("向量搜尋應只執行 {n:d} 次"))
+@then(parsers.parse("向量搜尋應執行 {n:d} 次"))
+def then_search_calls(ctx, n):
+    assert ctx["inner"].search_calls == n
+
+
+@then("兩次檢索結果應相同")
+def then_same(ctx):
+    first, second = ctx["results"]
+    assert second.chunks == first.chunks
+    assert second.sources == first.sources
+    assert second.mode_queries == first.mode_queries
+
+
+@then(parsers.parse("快取應記錄 {n:d} 次過期寫入且沒有 entry"))
+def then_stale_put(ctx, n):
+    stats = ctx["cache"].stats()
+    assert stats["stale_puts"] == n
+    assert stats["entries"] == 0
+
+
+@then(parsers.parse('租戶 "{tenant_id}" 的 hit ratio 應為 {ratio:f}'))
+def then_hit_ratio(ctx, tenant_id, ratio):
+    assert ctx["cache"].stats()["per_tenant"][tenant_id]["hit_ratio"] == ratio
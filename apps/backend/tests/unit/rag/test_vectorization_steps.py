@@ -181,6 +181,7 @@ def do_openai_vectorize(context):
             return await service.embed_texts(context["chunks"])
 
     context["vectors"] = _run(_execute())
+    context["service"] = service
 
 
 @then(parsers.parse("API 呼叫次數為 {count:d}"))
@@ -288,17 +289,11 @@ def verify_80_chunks(context):
     assert len(context["vectors"]) == 80
 
 
-@then("後續 batch 的 chunk 數應小於初始 batch size")
-def verify_batch_size_reduced(context):
-    # batch_sizes tracks actual API calls:
-    # call 1: 50 (429 fail)
-    # call 2: 50 (retry success)
-    # call 3+: should use reduced batch size (25)
-    batch_sizes = context["batch_sizes"]
-    assert len(batch_sizes) >= 3, f"Expected at least 3 API calls, got {batch_sizes}"
-    # After first batch (50) succeeded with 429, subsequent batches should be smaller
-    subsequent_sizes = batch_sizes[2:]  # skip the 429 call and its retry
-    for size in subsequent_sizes:
-        assert size < 50, (
-            f"Expected reduced batch size < 50, got {size} in {batch_sizes}"
-        )
+@then("429 後併發上限減半且 batch 大小不變")
+def verify_concurrency_halved(context):
+    # 80 chunks → [50, 30] 兩批同時送；50 那批 429 後以同樣大小重送
+    assert sorted(context["batch_sizes"]) == [30, 50, 50]
+    stats = context["service"].scheduler_stats()
+    assert stats["throttled_total"] == 1
+    assert stats["decreases_total"] == 1
+    assert stats["in_flight"] == 0
@@ -0,0 +1,139 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from pytest_bdd import given, parsers, scenarios, then, when
+
+from src.domain.ratelimit.rate_limiter_service import RateLimitLayer
+from src.infrastructure.ratelimit.redis_rate_limiter import (
+    GCRA_LUA,
+    RedisRateLimiter,
+)
+
+scenarios("unit/ratelimit/gcra_rate_limiter.feature")
+
+
+def _run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+@pytest.fixture
+def mock_script():
+    return AsyncMock(return_value=[1, 0, 9, 0])
+
+
+@pytest.fixture
+def mock_redis(mock_script):
+    redis = MagicMock()
+    redis.register_script = MagicMock(return_value=mock_script)
+    return redis
+
+
+@pytest.fixture
+def rate_limiter(mock_redis):
+    return RedisRateLimiter(redis_client=mock_redis)
+
+
+@pytest.fixture
+def context():
+    return {}
+
+
+@given(parsers.parse("限流設定為每分鐘 {limit:d} 次"))
+def set_limit(context, limit):
+    context["limit"] = limit
+
+
+@given(parsers.parse("script 回傳放行且剩餘 {remaining:d} 次"))
+def script_allows(mock_script, remaining):
+    mock_script.return_value = [1, 0, remaining, 0]
+
+
+@given(
+    parsers.parse("script 回傳第 {index:d} 層超限且 {retry_ms:d} ms 後可重試")
+)
+def script_denies(mock_script, index, retry_ms):
+    mock_script.return_value = [0, index, 0, retry_ms]
+
+
+@given(
+    parsers.parse(
+        "三層限流設定 global {g:d} 次、tenant {t:d} 次 burst {b:d}、user {u:d} 次"
+    )
+)
+def three_layers(context, g, t, b, u):
+    context["layers"] = [
+        RateLimitLayer(key="rl:gcra:global:rag:60", limit=g, window_seconds=60),
+        RateLimitLayer(
+            key="rl:gcra:t-1:rag:60", limit=t, window_seconds=60, burst=b
+        ),
+        RateLimitLayer(key="rl:gcra:t-1:u-1:rag:60", limit=u, window_seconds=60),
+    ]
+
+
+@given("Redis 連線已斷開")
+def redis_disconnected(mock_script):
+    from redis.exceptions import ConnectionError as RedisConnectionError
+
+    mock_script.side_effect = RedisConnectionError("Connection refused")
+
+
+@when("檢查限流")
+def check_rate_limit(context, rate_limiter):
+    context["result"] = _run(
+        rate_limiter.check_rate_limit(
+            key="test:key",
+            limit=context["limit"],
+            window_seconds=60,
+        )
+    )
+
+
+@when("檢查多層限流")
+def check_layers(context, rate_limiter):
+    context["result"] = _run(rate_limiter.check_layers(context["layers"]))
+
+
+@then("請求應被允許")
+def request_allowed(context):
+    assert context["result"].allowed is True
+
+
+@then("請求應被拒絕")
+def request_rejected(context):
+    assert context["result"].allowed is False
+
+
+@then(parsers.parse("剩餘次數應為 {remaining:d}"))
+def remaining_count(context, remaining):
+    assert context["result"].remaining == remaining
+
+
+@then(parsers.parse("retry_after 應為 {seconds:d} 秒"))
+def retry_after_seconds(context, seconds):
+    assert context["result"].retry_after == seconds
+
+
+@then(parsers.parse("script 應只被呼叫 {n:d} 次且帶 {k:d} 個 key"))
+def script_called_once(mock_redis, mock_script, n, k):
+    mock_redis.register_script.assert_called_once_with(GCRA_LUA)
+    assert mock_script.await_count == n
+    assert len(mock_script.await_args.kwargs["keys"]) == k
+
+
+@then("每層參數應為 limit、window ms、burst")
+def script_args(mock_script):
+    assert mock_script.await_args.kwargs["args"] == [
+        1000, 60000, 1000,
+        100, 60000, 120,
+        50, 60000, 50,
+    ]
+
+
+@then(parsers.parse("被擋下的限額應為 {limit:d}"))
+def denied_limit(context, limit):
+    assert context["result"].limit == limit
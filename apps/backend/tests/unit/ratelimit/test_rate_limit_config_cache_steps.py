@@ -0,0 +1,150 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+from pytest_bdd import given, parsers, scenarios, then, when
+
+from src.application.agent.bot_runtime_snapshot import BotRuntimeSnapshotCache
+from src.application.ratelimit.update_rate_limit_use_case import (
+    UpdateRateLimitCommand,
+    UpdateRateLimitUseCase,
+)
+from src.domain.ratelimit.entity import RateLimitConfig
+from src.domain.ratelimit.value_objects import EndpointGroup, RateLimitConfigId
+from src.domain.shared.config_invalidation import SCOPE_RATE_LIMIT
+from src.infrastructure.cache.config_invalidation_bus import (
+    InProcessConfigInvalidationBus,
+)
+from src.infrastructure.ratelimit.config_loader import RateLimitConfigLoader
+
+scenarios("unit/ratelimit/rate_limit_config_cache.feature")
+
+
+def _run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+@pytest.fixture
+def context():
+    return {"configs": {}}
+
+
+@pytest.fixture
+def bus():
+    return InProcessConfigInvalidationBus()
+
+
+@pytest.fixture
+def repo(context):
+    async def _find(tenant_id, group):
+        await asyncio.sleep(0)
+        return context["configs"].get((tenant_id, group))
+
+    async def _save(config):
+        context["configs"][(config.tenant_id, config.endpoint_group.value)] = (
+            config
+        )
+
+    mock = AsyncMock()
+    mock.find_by_tenant_and_group = AsyncMock(side_effect=_find)
+    mock.save = AsyncMock(side_effect=_save)
+    return mock
+
+
+@pytest.fixture
+def loader(repo, bus):
+    return RateLimitConfigLoader(
+        rate_limit_config_repo_factory=lambda: repo,
+        invalidation_bus=bus,
+        cache_ttl=60,
+    )
+
+
+@given(parsers.parse('租戶 "{tenant_id}" 的 "{group}" 限流設定為每分鐘 {rpm:d} 次'))
+def tenant_config(context, tenant_id, group, rpm):
+    context["configs"][(tenant_id, group)] = RateLimitConfig(
+        id=RateLimitConfigId(),
+        tenant_id=tenant_id,
+        endpoint_group=EndpointGroup(group),
+        requests_per_minute=rpm,
+        burst_size=rpm,
+        per_user_requests_per_minute=None,
+    )
+
+
+@given(parsers.parse('已查詢過租戶 "{tenant_id}" 的 "{group}" 設定'))
+@when(parsers.parse('查詢租戶 "{tenant_id}" 的 "{group}" 設定'))
+def query_once(context, loader, tenant_id, group):
+    context["result"] = _run(loader.get_config(tenant_id, group))
+
+
+@when(parsers.parse('連續查詢租戶 "{tenant_id}" 的 "{group}" 設定 {n:d} 次'))
+def query_sequential(context, loader, tenant_id, group, n):
+    async def _query():
+        for _ in range(n):
+            context["result"] = await loader.get_config(tenant_id, group)
+
+    _run(_query())
+
+
+@when(parsers.parse('同時查詢租戶 "{tenant_id}" 的 "{group}" 設定 {n:d} 次'))
+def query_concurrent(context, loader, tenant_id, group, n):
+    async def _query():
+        return await asyncio.gather(
+            *(loader.get_config(tenant_id, group) for _ in range(n))
+        )
+
+    context["results"] = _run(_query())
+
+
+@when(
+    parsers.parse(
+        'system_admin 將租戶 "{tenant_id}" 的 "{group}" 限流改為每分鐘 {rpm:d} 次'
+    )
+)
+def admin_updates(repo, bus, tenant_id, group, rpm):
+    use_case = UpdateRateLimitUseCase(
+        rate_limit_config_repository=repo, config_invalidation_bus=bus
+    )
+    _run(
+        use_case.execute(
+            UpdateRateLimitCommand(
+                tenant_id=tenant_id,
+                endpoint_group=group,
+                requests_per_minute=rpm,
+                burst_size=rpm,
+                caller_role="system_admin",
+            )
+        )
+    )
+
+
+@given("bot runtime 快取已有一筆 snapshot")
+def snapshot_cached(context, bus):
+    cache = BotRuntimeSnapshotCache(invalidation_bus=bus)
+    cache.put("t-1", "bot-1", {"system_prompt": "hi"}, cache.generation)
+    context["snapshot_cache"] = cache
+
+
+@when("收到限流設定失效通知")
+def rate_limit_invalidated(bus):
+    _run(bus.publish(SCOPE_RATE_LIMIT, "t-1"))
+
+
+@then(parsers.parse("DB 應只被查詢 {n:d} 次"))
+def db_queried(repo, n):
+    assert repo.find_by_tenant_and_group.await_count == n
+
+
+@then(parsers.parse("取得的限額應為 {rpm:d}"))
+def resolved_rpm(context, rpm):
+    assert context["result"].requests_per_minute == rpm
+
+
+@then("bot runtime 快取仍保有該 snapshot")
+def snapshot_kept(context):
+    assert context["snapshot_cache"].get("t-1", "bot-1") is not None
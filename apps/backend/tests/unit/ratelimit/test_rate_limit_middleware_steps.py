@@ -7,7 +7,11 @@ from starlette.requests import Request
 from starlette.responses import JSONResponse, Response
 from starlette.testclient import TestClient
 
-from src.domain.ratelimit.rate_limiter_service import RateLimitResult
+from src.domain.ratelimit.rate_limiter_service import (
+    RateLimiterService,
+    RateLimitLayer,
+    RateLimitResult,
+)
 from src.infrastructure.ratelimit.config_loader import ResolvedRateLimitConfig
 from src.interfaces.api.rate_limit_middleware import RateLimitMiddleware
 
@@ -22,13 +26,49 @@ def _run(coro):
         loop.close()
 
 
+class _PerLayerLimiter(RateLimiterService):
+    """逐層判斷的測試用 limiter，每層結果由 step 替換的 ``decide`` mock 決定。
+
+    middleware 應一次呼叫 ``check_layers``；``check_rate_limit`` 轉成單層
+    ``check_layers`` 並計數，退回舊的逐層呼叫路徑時 scenario 會抓到。
+    """
+
+    def __init__(self):
+        self.decide = AsyncMock(
+            return_value=RateLimitResult(allowed=True, remaining=10)
+        )
+        self.layer_calls: list[list[RateLimitLayer]] = []
+        self.legacy_calls = 0
+
+    async def check_rate_limit(self, key, limit, window_seconds):
+        self.legacy_calls += 1
+        return await self.check_layers(
+            [RateLimitLayer(key=key, limit=limit, window_seconds=window_seconds)]
+        )
+
+    async def check_layers(self, layers):
+        self.layer_calls.append(list(layers))
+        remaining = None
+        for layer in layers:
+            result = await self.decide(layer.key, layer.limit, layer.window_seconds)
+            if not result.allowed:
+                return RateLimitResult(
+                    allowed=False,
+                    remaining=0,
+                    retry_after=result.retry_after,
+                    limit=layer.limit,
+                )
+            remaining = (
+                result.remaining
+                if remaining is None
+                else min(remaining, result.remaining)
+            )
+        return RateLimitResult(allowed=True, remaining=remaining or 0)
+
+
 @pytest.fixture
 def mock_rate_limiter():
-    limiter = AsyncMock()
-    limiter.check_rate_limit = AsyncMock(
-        return_value=RateLimitResult(allowed=True, remaining=10)
-    )
-    return limiter
+    return _PerLayerLimiter()
 
 
 @pytest.fixture
@@ -94,14 +134,12 @@ def middleware_configured(context, mock_rate_limiter, mock_config_loader):
 
 @given(parsers.parse('租戶 "{tenant_id}" 的 "{group}" 端點群組已超過限額'))
 def tenant_over_limit(context, mock_rate_limiter, tenant_id, group):
-    original = mock_rate_limiter.check_rate_limit
-
     async def _side_effect(key, limit, window):
         if tenant_id in key and "global" not in key and "user" not in key:
             return RateLimitResult(allowed=False, remaining=0, retry_after=42)
         return RateLimitResult(allowed=True, remaining=10)
 
-    mock_rate_limiter.check_rate_limit = AsyncMock(side_effect=_side_effect)
+    mock_rate_limiter.decide = AsyncMock(side_effect=_side_effect)
 
 
 @given(parsers.parse('IP "{ip}" 的 "{group}" 端點群組已超過限額'))
@@ -112,7 +150,7 @@ def ip_over_limit(context, mock_rate_limiter, ip, group):
             return RateLimitResult(allowed=False, remaining=0, retry_after=30)
         return RateLimitResult(allowed=True, remaining=10)
 
-    mock_rate_limiter.check_rate_limit = AsyncMock(side_effect=_side_effect)
+    mock_rate_limiter.decide = AsyncMock(side_effect=_side_effect)
 
 
 @given(parsers.parse('租戶 "{tenant_id}" 的 "{group}" 端點群組未超過限額'))
@@ -123,14 +161,12 @@ def tenant_under_limit(context, mock_rate_limiter, tenant_id, group):
 
 @given(parsers.parse('使用者 "{user_id}" 的 per-user 限額已超過'))
 def user_over_limit(context, mock_rate_limiter, user_id):
-    original_side_effect = mock_rate_limiter.check_rate_limit.side_effect
-
     async def _side_effect(key, limit, window):
         if user_id in key:
             return RateLimitResult(allowed=False, remaining=0, retry_after=15)
         return RateLimitResult(allowed=True, remaining=10)
 
-    mock_rate_limiter.check_rate_limit = AsyncMock(side_effect=_side_effect)
+    mock_rate_limiter.decide = AsyncMock(side_effect=_side_effect)
 
 
 @when(parsers.parse('租戶 "{tenant_id}" 請求 "{path}"'))
@@ -181,3 +217,10 @@ def request_passes_through(context, mock_rate_limiter):
     assert context["response"].status_code == 200
     # For health endpoint (exempt), rate limiter should not be called
     # But it might be called 0 times for the exempt path
+
+
+@then("所有限流層在單次 check_layers 內判斷")
+def single_check_layers_call(mock_rate_limiter):
+    assert mock_rate_limiter.legacy_calls == 0
+    assert len(mock_rate_limiter.layer_calls) == 1
+    assert len(mock_rate_limiter.layer_calls[0]) > 1
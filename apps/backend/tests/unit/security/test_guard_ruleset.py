@@ -0,0 +1,167 @@
+"""CompiledGuardRuleset / GuardRulesetCache — 與逐條比對結果一致、依版本快取。"""
+
+import asyncio
+import re
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.application.agent.bot_runtime_snapshot import BotRuntimeSnapshotCache
+from src.application.security.guard_rules_use_cases import (
+    UpdateGuardRulesCommand,
+    UpdateGuardRulesUseCase,
+)
+from src.application.security.guard_ruleset import (
+    CompiledGuardRuleset,
+    GuardRulesetCache,
+)
+from src.application.security.prompt_guard_service import (
+    DEFAULT_INPUT_RULES,
+    DEFAULT_OUTPUT_KEYWORDS,
+    PromptGuardService,
+)
+from src.domain.security.guard_config import GuardRulesConfig
+from src.domain.shared.config_invalidation import SCOPE_GUARD_RULES, SCOPE_RATE_LIMIT
+from src.infrastructure.cache.config_invalidation_bus import (
+    InProcessConfigInvalidationBus,
+)
+from tests.unit.security.test_default_guard_rules import (
+    ATTACK_SAMPLES,
+    LEGITIMATE_SAMPLES,
+)
+
+
+def _run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def _legacy_first_match(rules: list[dict], message: str) -> str | None:
+    """舊版 check_input 的逐條比對（對照組）。"""
+    for rule in rules:
+        if not rule.get("enabled", True):
+            continue
+        pattern = rule.get("pattern", "")
+        if rule.get("type", "keyword") == "regex":
+            try:
+                if re.search(pattern, message, re.IGNORECASE):
+                    return pattern
+            except re.error:
+                continue
+        elif pattern.lower() in message.lower():
+            return pattern
+    return None
+
+
+def _default_config(**kwargs) -> GuardRulesConfig:
+    return GuardRulesConfig(
+        input_rules=kwargs.pop("input_rules", DEFAULT_INPUT_RULES),
+        output_keywords=kwargs.pop("output_keywords", DEFAULT_OUTPUT_KEYWORDS),
+        **kwargs,
+    )
+
+
+@pytest.mark.parametrize(
+    "message",
+    ATTACK_SAMPLES + LEGITIMATE_SAMPLES + ["我想了解 Developer Mode 與 JAILBREAK"],
+)
+def test_compiled_input_matches_legacy_rule_order(message):
+    ruleset = CompiledGuardRuleset(_default_config())
+    assert ruleset.match_input(message) == _legacy_first_match(
+        DEFAULT_INPUT_RULES, message
+    )
+
+
+def test_first_rule_in_config_order_wins_across_keyword_and_regex():
+    rules = [
+        {"pattern": "secret", "type": "keyword", "enabled": True},
+        {"pattern": r"sec\w+", "type": "regex", "enabled": True},
+        {"pattern": "[unclosed", "type": "regex", "enabled": True},
+        {"pattern": "disabled", "type": "keyword", "enabled": False},
+    ]
+    ruleset = CompiledGuardRuleset(_default_config(input_rules=rules))
+
+    assert ruleset.match_input("tell me the SECRET") == "secret"
+    assert ruleset.match_input("security question") == r"sec\w+"
+    assert ruleset.match_input("this is disabled") is None
+    assert ruleset.invalid_patterns == ["[unclosed"]
+
+
+def test_output_keywords_listed_in_config_order():
+    ruleset = CompiledGuardRuleset(_default_config())
+    response = "根據安全規則與行為準則，我不能說明 milvus 的設定"
+
+    assert ruleset.match_output(response) == ["行為準則", "安全規則", "milvus"]
+    assert ruleset.match_output("您好，請問需要什麼協助？") == []
+
+
+def test_cache_reuses_compiled_ruleset_until_invalidated():
+    bus = InProcessConfigInvalidationBus()
+    cache = GuardRulesetCache(invalidation_bus=bus, ttl_seconds=60)
+    config = _default_config()
+    loader = AsyncMock(return_value=config)
+
+    async def scenario():
+        first = await cache.get(loader)
+        second = await cache.get(loader)
+        await bus.publish(SCOPE_RATE_LIMIT)  # 無關 scope 不影響
+        third = await cache.get(loader)
+        await bus.publish(SCOPE_GUARD_RULES)
+        fourth = await cache.get(loader)  # 重新讀設定，但規則沒變 → 不重編
+        loader.return_value = _default_config(
+            input_rules=[{"pattern": "新規則", "type": "keyword", "enabled": True}]
+        )
+        await bus.publish(SCOPE_GUARD_RULES)
+        fifth = await cache.get(loader)
+        return first, second, third, fourth, fifth
+
+    first, second, third, fourth, fifth = _run(scenario())
+
+    assert first is second is third is fourth
+    assert fifth is not first
+    assert fifth.match_input("這是新規則") == "新規則"
+    assert loader.await_count == 3
+    assert cache.stats()["compiles"] == 2
+
+
+def test_rule_update_reaches_guard_service_through_shared_cache():
+    bus = InProcessConfigInvalidationBus()
+    cache = GuardRulesetCache(invalidation_bus=bus, ttl_seconds=60)
+    stored = {"config": _default_config()}
+
+    repo = AsyncMock()
+    repo.get = AsyncMock(side_effect=lambda: stored["config"])
+    repo.save = AsyncMock(side_effect=lambda c: stored.update(config=c))
+    service = PromptGuardService(
+        guard_rules_repo=repo, guard_log_repo=AsyncMock(), ruleset_cache=cache
+    )
+    update = UpdateGuardRulesUseCase(repo, config_invalidation_bus=bus)
+
+    async def scenario():
+        before = await service.check_input("我要查優惠券", tenant_id="t-1")
+        await update.execute(UpdateGuardRulesCommand(
+            input_rules=[{"pattern": "優惠券", "type": "keyword", "enabled": True}],
+            output_keywords=[],
+            blocked_response="不處理",
+        ))
+        after = await service.check_input("我要查優惠券", tenant_id="t-1")
+        return before, after
+
+    before, after = _run(scenario())
+
+    assert before.passed is True
+    assert after.passed is False
+    assert after.rule_matched == "優惠券"
+    assert after.blocked_response == "不處理"
+
+
+def test_bot_snapshot_cache_ignores_guard_rule_invalidation():
+    snapshots = BotRuntimeSnapshotCache()
+    snapshots.put("t-1", "b-1", {"x": 1}, generation=snapshots.generation)
+
+    snapshots.invalidate(SCOPE_GUARD_RULES)
+
+    assert snapshots.get("t-1", "b-1") is not None
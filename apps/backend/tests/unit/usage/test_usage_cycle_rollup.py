@@ -0,0 +1,141 @@
+"""token_usage_cycle_rollups — quota 讀 rollup，reconcile 以 records 為準。"""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.application.usage.reconcile_usage_rollups_use_case import (
+    ReconcileUsageRollupsUseCase,
+)
+from src.domain.usage.entity import UsageRecord
+from src.infrastructure.db.base import Base
+from src.infrastructure.db.models.usage_cycle_rollup_model import (
+    UsageCycleRollupModel,
+)
+from src.infrastructure.db.models.usage_record_model import UsageRecordModel
+from src.infrastructure.db.repositories.usage_repository import (
+    SQLAlchemyUsageRepository,
+)
+
+
+def _run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def _record(request_type: str, tokens: int, day: int = 10, month: int = 4):
+    return UsageRecord(
+        tenant_id="t-1",
+        request_type=request_type,
+        model="gpt-4o-mini",
+        input_tokens=tokens,
+        created_at=datetime(2026, month, day, tzinfo=timezone.utc),
+    )
+
+
+async def _with_repo(scenario):
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            Base.metadata.create_all,
+            tables=[UsageRecordModel.__table__, UsageCycleRollupModel.__table__],
+        )
+    session = async_sessionmaker(engine, expire_on_commit=False)()
+    try:
+        return await scenario(session, SQLAlchemyUsageRepository(session))
+    finally:
+        await session.close()
+        await engine.dispose()
+
+
+def test_save_increments_rollup_and_quota_sums_read_it():
+    async def scenario(session, repo):
+        for record in (
+            _record("chat_web", 100),
+            _record("chat_web", 50),
+            _record("embedding", 30),
+            _record("chat_web", 999, month=3),
+        ):
+            await repo.save(record)
+        rollups = (
+            await session.execute(
+                select(UsageCycleRollupModel).order_by(
+                    UsageCycleRollupModel.cycle_year_month,
+                    UsageCycleRollupModel.request_type,
+                )
+            )
+        ).scalars().all()
+        return (
+            [(r.cycle_year_month, r.request_type, r.tokens) for r in rollups],
+            await repo.sum_tokens_in_cycle("t-1", "2026-04"),
+            await repo.sum_billable_tokens_in_cycle(
+                "t-1", "2026-04", ["chat_web"]
+            ),
+            await repo.sum_billable_tokens_in_cycle("t-1", "2026-04", []),
+        )
+
+    rollups, audit, billable, none_billable = _run(_with_repo(scenario))
+
+    assert rollups == [
+        ("2026-03", "chat_web", 999),
+        ("2026-04", "chat_web", 150),
+        ("2026-04", "embedding", 30),
+    ]
+    assert audit == 180
+    assert billable == 150
+    assert none_billable == 0
+
+
+def test_reconcile_corrects_drift_from_writes_bypassing_repository():
+    async def scenario(session, repo):
+        await repo.save(_record("chat_web", 100))
+        dropped = _record("chat_web", 40)
+        await repo.save(dropped)
+        # 繞過 repository：直接刪 record、直接插 record（舊版 / 手動 SQL）
+        await session.execute(
+            delete(UsageRecordModel).where(UsageRecordModel.id == dropped.id)
+        )
+        session.add(
+            UsageRecordModel(
+                id="raw-1", tenant_id="t-1", request_type="rerank",
+                model="m", input_tokens=7, output_tokens=0,
+                created_at=datetime(2026, 4, 11, tzinfo=timezone.utc),
+            )
+        )
+        await session.commit()
+        before = await repo.sum_tokens_in_cycle("t-1", "2026-04")
+        corrected = await repo.reconcile_cycle_rollups("2026-04")
+        after = await repo.sum_tokens_in_cycle("t-1", "2026-04")
+        truth = await repo.sum_tokens_in_range(
+            "t-1",
+            datetime(2026, 4, 1, tzinfo=timezone.utc),
+            datetime(2026, 5, 1, tzinfo=timezone.utc),
+        )
+        again = await repo.reconcile_cycle_rollups("2026-04")
+        return before, corrected, after, truth, again
+
+    before, corrected, after, truth, again = _run(_with_repo(scenario))
+
+    assert before == 140
+    assert corrected == 2  # chat_web -40、rerank +7
+    assert after == truth == 107
+    assert again == 0
+
+
+def test_reconcile_use_case_covers_current_and_previous_cycle():
+    repo = AsyncMock()
+    repo.reconcile_cycle_rollups = AsyncMock(side_effect=[0, 3])
+    use_case = ReconcileUsageRollupsUseCase(usage_repository=repo)
+
+    result = _run(
+        use_case.execute(now=datetime(2026, 1, 3, tzinfo=timezone.utc))
+    )
+
+    assert result == {"2025-12": 0, "2026-01": 3}
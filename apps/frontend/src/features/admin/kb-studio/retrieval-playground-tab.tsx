@@ -31,6 +31,7 @@ const MODE_LABELS: Record<RetrievalMode, { label: string; hint: string }> = {
   raw: { label: "Raw", hint: "原始 query" },
   rewrite: { label: "Rewrite", hint: "LLM 改寫" },
   hyde: { label: "HyDE", hint: "LLM 假答案" },
+  hybrid: { label: "Hybrid", hint: "BM25 + 向量 RRF" },
 };
 
 export function RetrievalPlaygroundTab({ kbId }: RetrievalPlaygroundTabProps) {
@@ -437,6 +438,9 @@ export function RetrievalPlaygroundTab({ kbId }: RetrievalPlaygroundTabProps) {
                         <SelectItem value={NONE_VALUE}>
                           預設 (claude-haiku-4-5)
                         </SelectItem>
+                        <SelectItem value="local:lexical">
+                          本地 Lexical + MMR（不耗 token）
+                        </SelectItem>
                         {(enabledModels ?? []).map((m) => {
                           const spec = `${m.provider_name}:${m.model_id}`;
                           return (
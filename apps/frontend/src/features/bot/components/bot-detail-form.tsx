@@ -81,6 +81,7 @@ const RAG_TOOL_NAMES = ["rag_query", "query_dm_with_image"] as const;
 const RERANK_MODEL_OPTIONS: ModelOption[] = [
   { value: "claude-haiku-4-5-20251001", label: "Claude Haiku 4.5" },
   { value: "claude-sonnet-4-20250514", label: "Claude Sonnet 4" },
+  { value: "local:lexical", label: "本地 Lexical + MMR（不耗 token）" },
 ];
 
 const toolRagConfigSchema = z
@@ -160,7 +161,7 @@ const botFormSchema = z.object({
   rerank_top_n: z.coerce.number().int().min(5).max(50).default(20),
   // Issue #43 — Bot-level RAG retrieval modes
   rag_retrieval_modes: z
-    .array(z.enum(["raw", "rewrite", "hyde"]))
+    .array(z.enum(["raw", "rewrite", "hyde", "hybrid"]))
     .min(1, "至少選 1 個 retrieval mode")
     .default(["raw"]),
   query_rewrite_enabled: z.boolean().default(false),
@@ -195,7 +196,7 @@ const TAB_KEYS = {
 /**
  * Issue #43 — Bot-level RAG retrieval modes panel.
  *
- * 3 個 checkbox (raw / rewrite / hyde) — 至少 1 個（zod schema 已強制）
+ * 4 個 checkbox (raw / rewrite / hyde / hybrid) — 至少 1 個（zod schema 已強制）
  * - rewrite checked → 顯示 model picker + extra_hint textarea
  * - hyde checked → 顯示 model picker + extra_hint textarea
  *
@@ -223,6 +224,10 @@ const RETRIEVAL_MODE_LABELS: Record<RetrievalMode, { label: string; hint: string
     label: "HyDE（假設答案檢索）",
     hint: "LLM 先生成假答案，再用假答案做檢索",
   },
+  hybrid: {
+    label: "Hybrid（關鍵字 + 向量）",
+    hint: "原始 query 另跑 BM25 關鍵字檢索，與向量結果以 RRF 合併（適合 SKU / 型號）",
+  },
 };
 
 function RetrievalModesSection({
@@ -1146,7 +1151,7 @@ export function BotDetailForm({
                         <div>
                           <Label className="text-sm">啟用 Reranking</Label>
                           <p className="text-xs text-muted-foreground">
-                            用 LLM 對 RAG 召回結果重新評分排序
+                            對 RAG 召回結果重新評分排序（LLM 或本地模型）
                           </p>
                         </div>
                         <Switch
@@ -5,9 +5,9 @@ export interface IntentRoute {
 }
 
 /** Issue #43 — Bot-level RAG retrieval mode */
-export type RetrievalMode = "raw" | "rewrite" | "hyde";
+export type RetrievalMode = "raw" | "rewrite" | "hyde" | "hybrid";
 
-export const RETRIEVAL_MODES: RetrievalMode[] = ["raw", "rewrite", "hyde"];
+export const RETRIEVAL_MODES: RetrievalMode[] = ["raw", "rewrite", "hyde", "hybrid"];
 
 /**
  * Per-tool RAG 參數覆蓋。
@@ -31,7 +31,7 @@ export interface RetrievalTestRequest {
   rerank_model?: string;
   rerank_top_n?: number;
   // Issue #43 — multi-mode retrieval
-  retrieval_modes?: ("raw" | "rewrite" | "hyde")[];
+  retrieval_modes?: ("raw" | "rewrite" | "hyde" | "hybrid")[];
   query_rewrite_enabled?: boolean;
   query_rewrite_model?: string;
   query_rewrite_extra_hint?: string;